@@ -117,6 +117,9 @@ class AzureAppConfigurationClient:
                 DistributedTracingPolicy(**kwargs),
                 HttpLoggingPolicy(**kwargs),
             ]
+            if kwargs.get("metrics_sink"):
+                from azure.core.pipeline.policies import MetricsPolicy  # added in azure-core 1.1.0
+                policies.insert(policies.index(self._config.retry_policy), MetricsPolicy(**kwargs))
 
         if not transport:
             transport = AsyncioRequestsTransport(**kwargs)
@@ -1,20 +1,58 @@
 import collections
+import heapq
 import importlib
+import itertools
 import logging
-import threading
-import types
+import time
 import sys
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+
+from msrest.exceptions import ClientRequestError
 
 from ..models import BatchErrorException, TaskAddCollectionResult, TaskAddStatus
 from ..custom.custom_errors import CreateTasksErrorException
 from ..operations._task_operations import TaskOperations
 
 MAX_TASKS_PER_REQUEST = 100
+# How many times a chunk is retried after transient errors before giving up on it
+MAX_CHUNK_RETRIES = 5
+# Seconds before the first retry of a chunk, doubled for each further retry
+_RETRY_BACKOFF = 1.0
+_MAX_RETRY_BACKOFF = 30.0
 _LOGGER = logging.getLogger(__name__)
 
+
+def _is_transient(error):
+    """Whether a failed add_collection request is worth retrying as it is.
+
+    :param Exception error: The error of the request
+    :rtype: bool
+    """
+    if isinstance(error, ClientRequestError):
+        return True
+    if isinstance(error, BatchErrorException):
+        status_code = error.response.status_code
+        return status_code == 429 or 500 <= status_code <= 599
+    return False
+
+
+def _retry_after(error):
+    try:
+        return float(error.response.headers['Retry-After'])
+    except (AttributeError, KeyError, TypeError, ValueError):
+        return None
+
+
 class _TaskWorkflowManager(object):
     """Worker class for one add_collection request
 
+    Pending tasks are indexed by ID. The calling thread takes chunks of them,
+    submits each chunk to the executor, if any, and handles the responses
+    as they come back, so the pending tasks and the results are only
+    touched by one thread. Chunks that fail with transient errors, and the
+    tasks of a chunk that failed with server errors, are retried after a
+    backoff, while other chunks go on.
+
     :param ~TaskOperations task_operations: Parent object which instantiated this
     :param str job_id: The ID of the job to which the task collection is to be
         added.
@@ -28,6 +66,9 @@ class _TaskWorkflowManager(object):
     :param dict custom_headers: headers that will be added to the request
     :param bool raw: returns the direct response alongside the
         deserialized response
+    :param callable progress_callback: Called in the calling thread with the
+        list of :class:`TaskAddResult<azure.batch.models.TaskAddResult>` of
+        each chunk once it is done with.
     """
 
     def __init__(
@@ -39,20 +80,32 @@ class _TaskWorkflowManager(object):
             task_add_collection_options=None,
             custom_headers=None,
             raw=False,
+            progress_callback=None,
             **kwargs):
-        # Append operations thread safe - Only read once all threads have completed
         # List of tasks which failed to add due to a returned client error
         self.failure_tasks = collections.deque()
         # List of unknown exceptions which occurred during requests.
         self.errors = collections.deque()
+        # Results of the tasks which were added
+        self.results = []
 
-        # synchronized through lock variables
         self._max_tasks_per_request = MAX_TASKS_PER_REQUEST
-        self.tasks_to_add = collections.deque(tasks_to_add)
-
-        self._error_lock = threading.Lock()
-        self._max_tasks_lock = threading.Lock()
-        self._pending_queue_lock = threading.Lock()
+        # Tasks not submitted yet, by ID, in the order they were given
+        self.tasks_to_add = collections.OrderedDict()
+        duplicate_ids = []
+        for task in tasks_to_add:
+            if task.id in self.tasks_to_add:
+                duplicate_ids.append(task.id)
+            self.tasks_to_add[task.id] = task
+        if duplicate_ids:
+            # Keyed by ID, only the last of the tasks would be added
+            raise ValueError("Task IDs must be unique, found duplicates: {}".format(
+                ", ".join(sorted(set(duplicate_ids)))))
+        # Chunks waiting to be retried, as (retry time, sequence, chunk, attempts)
+        self._retries = []
+        self._sequence = itertools.count()
+        # Tasks of chunks whose requests failed in an unknown state
+        self._unknown_tasks = []
 
         # Variables to be used for task add_collection requests
         self._client = client
@@ -61,28 +114,77 @@ class _TaskWorkflowManager(object):
         self._task_add_collection_options = task_add_collection_options
         self._custom_headers = custom_headers
         self._raw = raw
+        self._progress_callback = progress_callback
         self._kwargs = dict(**kwargs)
 
-    def _bulk_add_tasks(self, results_queue, chunk_tasks_to_add):
-        """Adds a chunk of tasks to the job
+    @property
+    def pending_tasks(self):
+        """Tasks which were not added, nor failed to add.
+
+        :rtype: list[~TaskAddParameter]
+        """
+        pending = list(self._unknown_tasks)
+        for _, _, chunk, _ in sorted(self._retries):
+            pending.extend(chunk)
+        pending.extend(self.tasks_to_add.values())
+        return pending
+
+    def _add_chunk(self, chunk_tasks_to_add):
+        return self._original_add_collection(
+            self._client,
+            self._job_id,
+            chunk_tasks_to_add,
+            self._task_add_collection_options,
+            self._custom_headers,
+            self._raw,
+            **self._kwargs)
+
+    def _schedule(self, chunk_tasks_to_add, attempts, delay=0):
+        heapq.heappush(self._retries, (time.time() + delay, next(self._sequence), chunk_tasks_to_add, attempts))
+
+    def _next_chunk(self):
+        """The next chunk to submit: a chunk due for retry, or else new pending tasks.
+
+        :return: The chunk and how many times it was attempted, or None if no chunk is ready
+        """
+        if self._retries and self._retries[0][0] <= time.time():
+            _, _, chunk_tasks_to_add, attempts = heapq.heappop(self._retries)
+            return chunk_tasks_to_add, attempts
+        chunk_tasks_to_add = []
+        while len(chunk_tasks_to_add) < self._max_tasks_per_request and self.tasks_to_add:
+            chunk_tasks_to_add.append(self.tasks_to_add.popitem(last=False)[1])
+        return (chunk_tasks_to_add, 0) if chunk_tasks_to_add else None
+
+    def _retry(self, chunk_tasks_to_add, attempts, error=None, task_results=None):
+        """Schedule a chunk to be retried after a backoff, unless it ran out of retries."""
+        if attempts >= MAX_CHUNK_RETRIES:
+            if error is not None:
+                # Unknown State - don't know if tasks failed to add or were successful
+                self._unknown_tasks.extend(chunk_tasks_to_add)
+                self.errors.appendleft(error)
+            else:
+                self.failure_tasks.extendleft(task_results)
+            return
+        delay = _retry_after(error)
+        if delay is None:
+            delay = min(_RETRY_BACKOFF * 2 ** attempts, _MAX_RETRY_BACKOFF)
+        _LOGGER.info("Retrying %s tasks in %s seconds", len(chunk_tasks_to_add), delay)
+        self._schedule(chunk_tasks_to_add, attempts + 1, delay)
+
+    def _handle_response(self, chunk_tasks_to_add, attempts, future):
+        """Handle the response of the request for a chunk of tasks
 
         Retry chunk if body exceeds the maximum request size and retry tasks
         if failed due to server errors.
 
-        :param results_queue: Queue to place the return value of the request
-        :type results_queue: collections.deque
-        :param chunk_tasks_to_add: Chunk of at most 100 tasks with retry details
-        :type chunk_tasks_to_add: list[~TrackedCloudTask]
+        :param chunk_tasks_to_add: Chunk of at most 100 tasks
+        :type chunk_tasks_to_add: list[~TaskAddParameter]
+        :param int attempts: How many times the chunk was retried
+        :param future: The request for the chunk
+        :type future: ~concurrent.futures.Future
         """
-
         try:
-            add_collection_response = self._original_add_collection(
-                self._client,
-                self._job_id,
-                chunk_tasks_to_add,
-                self._task_add_collection_options,
-                self._custom_headers,
-                self._raw)
+            add_collection_response = future.result()
         except BatchErrorException as e:
             # In case of a chunk exceeding the MaxMessageSize split chunk in half
             # and resubmit smaller chunk requests
@@ -102,88 +204,100 @@ class _TaskWorkflowManager(object):
                     # we should decrease the initial task collection size to avoid repeating the error
                     # Midpoint is lower bounded by 1 due to above base case
                     midpoint = int(len(chunk_tasks_to_add) / 2)
-                    # Restrict one thread at a time to do this compare and set,
-                    # therefore forcing max_tasks_per_request to be strictly decreasing
-                    with self._max_tasks_lock:
-                        if midpoint < self._max_tasks_per_request:
-                            self._max_tasks_per_request = midpoint
-                            _LOGGER.info("Amount of tasks per request reduced from %s to %s due to the"
-                                         " request body being too large", str(self._max_tasks_per_request),
-                                         str(midpoint))
-
-                    # Not the most efficient solution for all cases, but the goal of this is to handle this
-                    # exception and have it work in all cases where tasks are well behaved
-                    # Behavior retries as a smaller chunk and
-                    # appends extra tasks to queue to be picked up by another thread .
-                    self.tasks_to_add.extendleft(chunk_tasks_to_add[midpoint:])
-                    self._bulk_add_tasks(results_queue, chunk_tasks_to_add[:midpoint])
-            # Retry server side errors
-            elif 500 <= e.response.status_code <= 599:
-                self.tasks_to_add.extendleft(chunk_tasks_to_add)
+                    if midpoint < self._max_tasks_per_request:
+                        _LOGGER.info("Amount of tasks per request reduced from %s to %s due to the"
+                                     " request body being too large", str(self._max_tasks_per_request),
+                                     str(midpoint))
+                        self._max_tasks_per_request = midpoint
+                    # Resubmit both halves right away, as the chunk was not processed
+                    self._schedule(chunk_tasks_to_add[:midpoint], attempts)
+                    self._schedule(chunk_tasks_to_add[midpoint:], attempts)
+            elif _is_transient(e):
+                self._retry(chunk_tasks_to_add, attempts, error=e)
             else:
-                # Re-add to pending queue as unknown status / don't have result
-                self.tasks_to_add.extendleft(chunk_tasks_to_add)
                 # Unknown State - don't know if tasks failed to add or were successful
+                self._unknown_tasks.extend(chunk_tasks_to_add)
                 self.errors.appendleft(e)
         except Exception as e:  # pylint: disable=broad-except
-            # Re-add to pending queue as unknown status / don't have result
-            self.tasks_to_add.extendleft(chunk_tasks_to_add)
-            # Unknown State - don't know if tasks failed to add or were successful
-            self.errors.appendleft(e)
+            if _is_transient(e):
+                self._retry(chunk_tasks_to_add, attempts, error=e)
+            else:
+                # Unknown State - don't know if tasks failed to add or were successful
+                self._unknown_tasks.extend(chunk_tasks_to_add)
+                self.errors.appendleft(e)
         else:
             try:
                 add_collection_response = add_collection_response.output
             except AttributeError:
                 pass
 
+            tasks_by_id = None
+            server_error_tasks = []
+            server_error_results = []
+            done = []
             for task_result in add_collection_response.value:  # pylint: disable=no-member
                 if task_result.status == TaskAddStatus.server_error:
                     # Server error will be retried
-                    with self._pending_queue_lock:
-                        for task in chunk_tasks_to_add:
-                            if task.id == task_result.task_id:
-                                self.tasks_to_add.appendleft(task)
+                    if tasks_by_id is None:
+                        tasks_by_id = {task.id: task for task in chunk_tasks_to_add}
+                    server_error_tasks.append(tasks_by_id[task_result.task_id])
+                    server_error_results.append(task_result)
                 elif (task_result.status == TaskAddStatus.client_error
                         and not task_result.error.code == "TaskExists"):
                     # Client error will be recorded unless Task already exists
                     self.failure_tasks.appendleft(task_result)
+                    done.append(task_result)
                 else:
-                    results_queue.appendleft(task_result)
-
-    def task_collection_thread_handler(self, results_queue):
-        """Main method for worker to run
-
-        Pops a chunk of tasks off the collection of pending tasks to be added and submits them to be added.
-
-        :param collections.deque results_queue: Queue for worker to output results to
+                    self.results.append(task_result)
+                    done.append(task_result)
+            if server_error_tasks:
+                self._retry(server_error_tasks, attempts, task_results=server_error_results)
+            if self._progress_callback and done:
+                self._progress_callback(done)
+
+    def run(self, executor=None, max_in_flight=1):
+        """Add all the tasks, then return
+
+        Stops submitting chunks, and waits for the requests in flight, once a
+        chunk fails with an unexpected error.
+
+        :param executor: Executor to submit requests to, or None to submit them
+            on the calling thread.
+        :type executor: ~concurrent.futures.Executor
+        :param int max_in_flight: How many requests to keep in flight.
         """
-        # Add tasks until either we run out or we run into an unexpected error
-        while self.tasks_to_add and not self.errors:
-            max_tasks = self._max_tasks_per_request  # local copy
-            chunk_tasks_to_add = []
-            with self._pending_queue_lock:
-                while len(chunk_tasks_to_add) < max_tasks and self.tasks_to_add:
-                    chunk_tasks_to_add.append(self.tasks_to_add.pop())
-
-            if chunk_tasks_to_add:
-                self._bulk_add_tasks(results_queue, chunk_tasks_to_add)
-
-
-def _handle_output(results_queue):
-    """Scan output for exceptions
-
-    If there is an output from an add task collection call add it to the results.
-
-    :param results_queue: Queue containing results of attempted add_collection's
-    :type results_queue: collections.deque
-    :return: list of TaskAddResults
-    :rtype: list[~TaskAddResult]
-    """
-    results = []
-    while results_queue:
-        queue_item = results_queue.pop()
-        results.append(queue_item)
-    return results
+        in_flight = {}
+        while True:
+            while not self.errors and len(in_flight) < max_in_flight:
+                next_chunk = self._next_chunk()
+                if next_chunk is None:
+                    break
+                chunk_tasks_to_add, attempts = next_chunk
+                if executor is None:
+                    future = Future()
+                    try:
+                        future.set_result(self._add_chunk(chunk_tasks_to_add))
+                    except Exception as e:  # pylint: disable=broad-except
+                        future.set_exception(e)
+                else:
+                    future = executor.submit(self._add_chunk, chunk_tasks_to_add)
+                in_flight[future] = (chunk_tasks_to_add, attempts)
+
+            if not in_flight:
+                if self.errors or not self._retries:
+                    return
+                # Only chunks waiting for their retry are left
+                time.sleep(max(self._retries[0][0] - time.time(), 0))
+                continue
+
+            timeout = None
+            if self._retries and not self.errors and len(in_flight) < max_in_flight:
+                # Wake up for the next retry
+                timeout = max(self._retries[0][0] - time.time(), 0)
+            done, _ = wait(in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                chunk_tasks_to_add, attempts = in_flight.pop(future)
+                self._handle_response(chunk_tasks_to_add, attempts, future)
 
 
 def build_new_add_collection(original_add_collection):
@@ -195,6 +309,7 @@ def build_new_add_collection(original_add_collection):
             custom_headers=None,
             raw=False,
             threads=0,
+            progress_callback=None,
             **operation_config):
         """Adds a collection of tasks to the specified job.
 
@@ -215,6 +330,10 @@ def build_new_add_collection(original_add_collection):
         terminated by the Batch service and left in whatever state it was in at
         that time.
 
+        Requests which fail with throttling, server or connection errors, and
+        tasks which fail with server errors, are retried after a backoff, up
+        to 5 times, while the other tasks are being added.
+
         :param job_id: The ID of the job to which the task collection is to be
             added.
         :type job_id: str
@@ -233,8 +352,11 @@ def build_new_add_collection(original_add_collection):
         :param bool raw: returns the direct response alongside the
             deserialized response
         :param int threads: number of threads to use in parallel when adding tasks. If specified
-            and greater than 0, will start additional threads to submit requests and wait for them to finish.
+            and greater than 0, will submit requests from a pool of this many threads and wait for them to finish.
             Otherwise will submit add_collection requests sequentially on main thread
+        :param callable progress_callback: called on the calling thread with the list of
+            :class:`TaskAddResult<azure.batch.models.TaskAddResult>` of each chunk of tasks as soon as it is
+            done with, to report progress while the collection is added.
         :return: :class:`TaskAddCollectionResult
             <azure.batch.models.TaskAddCollectionResult>` or
             :class:`ClientRawResponse<msrest.pipeline.ClientRawResponse>` if
@@ -244,9 +366,12 @@ def build_new_add_collection(original_add_collection):
             :class:`ClientRawResponse<msrest.pipeline.ClientRawResponse>`
         :raises:
             :class:`CreateTasksErrorException<azure.batch.custom.CreateTasksErrorException>`
+        :raises ValueError: if two tasks of the collection have the same ID, before any of them is added
         """
 
-        results_queue = collections.deque()  # deque operations(append/pop) are thread-safe
+        if threads < 0:
+            raise ValueError("Threads must be positive or 0")
+
         task_workflow_manager = _TaskWorkflowManager(
             self,
             original_add_collection,
@@ -255,34 +380,25 @@ def build_new_add_collection(original_add_collection):
             task_add_collection_options,
             custom_headers,
             raw,
+            progress_callback,
             **operation_config)
 
         # multi-threaded behavior
         if threads:
-            if threads < 0:
-                raise ValueError("Threads must be positive or 0")
-
-            active_threads = []
-            for i in range(threads):
-                active_threads.append(threading.Thread(
-                    target=task_workflow_manager.task_collection_thread_handler,
-                    args=(results_queue,)))
-                active_threads[-1].start()
-            for thread in active_threads:
-                thread.join()
+            with ThreadPoolExecutor(max_workers=threads) as executor:
+                task_workflow_manager.run(executor, max_in_flight=threads)
         # single-threaded behavior
         else:
-            task_workflow_manager.task_collection_thread_handler(results_queue)
+            task_workflow_manager.run()
 
-        # Only define error if all threads have finished and there were failures
+        # Only define error if all requests have finished and there were failures
         if task_workflow_manager.failure_tasks or task_workflow_manager.errors:
             raise CreateTasksErrorException(
-                    task_workflow_manager.tasks_to_add,
+                    task_workflow_manager.pending_tasks,
                     task_workflow_manager.failure_tasks,
                     task_workflow_manager.errors)
         else:
-            submitted_tasks = _handle_output(results_queue)
-            return TaskAddCollectionResult(value=submitted_tasks)
+            return TaskAddCollectionResult(value=task_workflow_manager.results)
     bulk_add_collection.metadata = {'url': '/jobs/{jobId}/addtaskcollection'}
     return bulk_add_collection
 
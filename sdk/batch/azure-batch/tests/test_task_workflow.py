@@ -0,0 +1,156 @@
+# coding: utf-8
+
+#-------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+#--------------------------------------------------------------------------
+import json
+import threading
+
+import pytest
+import requests
+from msrest import Deserializer
+from msrest.exceptions import ClientRequestError
+
+from azure.batch import models
+from azure.batch.custom import patch
+from azure.batch.custom.custom_errors import CreateTasksErrorException
+
+DESERIALIZER = Deserializer({k: v for k, v in models.__dict__.items() if isinstance(v, type)})
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(patch, '_RETRY_BACKOFF', 0)
+
+
+def _tasks(count):
+    return [models.TaskAddParameter(id='task{}'.format(i), command_line='sleep 1') for i in range(count)]
+
+
+def _batch_error(status_code, code):
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers['Content-Type'] = 'application/json'
+    response._content = json.dumps({'code': code, 'message': {'lang': 'en-US', 'value': code}}).encode('utf-8')
+    return models.BatchErrorException(DESERIALIZER, response)
+
+
+def _result(task, status=models.TaskAddStatus.success, code=None):
+    error = models.BatchError(code=code, message=models.ErrorMessage(value=code)) if code else None
+    return models.TaskAddResult(status=status, task_id=task.id, error=error)
+
+
+class _Service(object):
+    """Stands in for add_collection, answering each chunk with respond(chunk, call)."""
+
+    def __init__(self, respond=None):
+        self.respond = respond or (lambda chunk, call: [_result(task) for task in chunk])
+        self.chunks = []
+        self.kwargs = []
+        self._lock = threading.Lock()
+
+    def __call__(self, client, job_id, value, options, custom_headers, raw, **operation_config):
+        with self._lock:
+            call = len(self.chunks)
+            self.chunks.append([task.id for task in value])
+            self.kwargs.append(operation_config)
+        return models.TaskAddCollectionResult(value=self.respond(value, call))
+
+
+def _add_collection(service, tasks, **kwargs):
+    return patch.build_new_add_collection(service)(None, 'job', tasks, **kwargs)
+
+
+@pytest.mark.parametrize('threads', [0, 4])
+def test_adds_all_tasks_in_chunks(threads):
+    service = _Service()
+    progress = []
+    result = _add_collection(service, _tasks(733), threads=threads, progress_callback=progress.append, timeout=30)
+    assert sorted(r.task_id for r in result.value) == sorted(t.id for t in _tasks(733))
+    assert sorted(len(chunk) for chunk in service.chunks) == [33] + [100] * 7
+    assert sum(len(results) for results in progress) == 733
+    assert service.kwargs[0] == {'timeout': 30}
+
+
+def test_server_errors_are_retried_by_id():
+    def respond(chunk, call):
+        if call == 0:
+            return [_result(task, models.TaskAddStatus.server_error) if i % 10 == 0 else _result(task)
+                    for i, task in enumerate(chunk)]
+        return [_result(task) for task in chunk]
+
+    service = _Service(respond)
+    result = _add_collection(service, _tasks(100))
+    assert len(result.value) == 100
+    assert service.chunks[1] == ['task{}'.format(i) for i in range(0, 100, 10)]
+
+
+def test_server_errors_give_up_after_retries():
+    service = _Service(lambda chunk, call: [_result(task, models.TaskAddStatus.server_error, 'ServerBusy')
+                                            if task.id == 'task3' else _result(task) for task in chunk])
+    with pytest.raises(CreateTasksErrorException) as error:
+        _add_collection(service, _tasks(5))
+    assert [r.task_id for r in error.value.failure_tasks] == ['task3']
+    assert len(service.chunks) == 1 + patch.MAX_CHUNK_RETRIES
+
+
+@pytest.mark.parametrize('error', [_batch_error(503, 'ServerBusy'), ClientRequestError('connection reset')])
+def test_transient_errors_are_retried(error):
+    def respond(chunk, call):
+        if call < 2:
+            raise error
+        return [_result(task) for task in chunk]
+
+    service = _Service(respond)
+    assert len(_add_collection(service, _tasks(150), threads=2).value) == 150
+
+
+def test_chunks_shrink_when_request_body_too_large():
+    def respond(chunk, call):
+        if len(chunk) > 30:
+            raise _batch_error(413, 'RequestBodyTooLarge')
+        return [_result(task) for task in chunk]
+
+    service = _Service(respond)
+    assert len(_add_collection(service, _tasks(200)).value) == 200
+    assert max(len(chunk) for chunk in service.chunks[-3:]) <= 25
+
+
+def test_unexpected_errors_stop_adding():
+    def respond(chunk, call):
+        if call == 1:
+            raise _batch_error(403, 'Forbidden')
+        return [_result(task) for task in chunk]
+
+    service = _Service(respond)
+    with pytest.raises(CreateTasksErrorException) as error:
+        _add_collection(service, _tasks(350))
+    assert len(service.chunks) == 2
+    assert [t.id for t in error.value.pending_tasks] == ['task{}'.format(i) for i in range(100, 350)]
+    assert error.value.errors[0].error.code == 'Forbidden'
+
+
+def test_client_errors_are_failures():
+    service = _Service(lambda chunk, call: [
+        _result(task, models.TaskAddStatus.client_error, 'TaskExists' if task.id == 'task0' else 'InvalidProperty')
+        if task.id in ('task0', 'task1') else _result(task) for task in chunk])
+    with pytest.raises(CreateTasksErrorException) as error:
+        _add_collection(service, _tasks(3))
+    assert [r.task_id for r in error.value.failure_tasks] == ['task1']
+    assert error.value.pending_tasks == []
+
+
+def test_negative_threads():
+    with pytest.raises(ValueError):
+        _add_collection(_Service(), _tasks(1), threads=-1)
+
+
+def test_duplicate_task_ids():
+    service = _Service()
+    tasks = _tasks(3) + _tasks(2)
+    with pytest.raises(ValueError) as error:
+        _add_collection(service, tasks)
+    assert 'task0, task1' in str(error.value)
+    assert service.chunks == []
@@ -33,6 +33,7 @@ from typing import (
     Tuple,
     Optional,
     Awaitable,
+    Union,
 )
 
 
@@ -80,7 +81,8 @@ class AsyncPageIterator(AsyncIterator[AsyncIterator[ReturnType]]):
 
         :param get_next: Callable that take the continuation token and return a HTTP response
         :param extract_data: Callable that take an HTTP response and return a tuple continuation token,
-         list of ReturnType
+         list of ReturnType. The continuation token can also be a callable returning it, called when the
+         continuation token is needed
         :param str continuation_token: The continuation token needed by get_next
         """
         self._get_next = get_next
@@ -90,6 +92,17 @@ class AsyncPageIterator(AsyncIterator[AsyncIterator[ReturnType]]):
         self._response = None
         self._current_page = None
 
+    @property
+    def continuation_token(self) -> Optional[str]:
+        """The continuation token of the next page, None after the last page."""
+        if callable(self._continuation_token):
+            self._continuation_token = self._continuation_token()
+        return self._continuation_token
+
+    @continuation_token.setter
+    def continuation_token(self, value: Optional[Union[str, Callable[[], Optional[str]]]]) -> None:
+        self._continuation_token = value
+
     async def __anext__(self):
         if self.continuation_token is None and self._did_a_call_already:
             raise StopAsyncIteration("End of paging")
@@ -31,6 +31,7 @@ from typing import (  # pylint: disable=unused-import
     Iterator,
     Iterable,
     Tuple,
+    Union,
 )
 import logging
 
@@ -52,7 +53,9 @@ class PageIterator(Iterator[Iterator[ReturnType]]):
 
         :param get_next: Callable that take the continuation token and return a HTTP response
         :param extract_data: Callable that take an HTTP response and return a tuple continuation token,
-         list of ReturnType
+         list of ReturnType. The continuation token can also be a callable returning it, called when the
+         continuation token is needed, so that items decoded lazily from the response don't have to be
+         decoded at once to find it
         :param str continuation_token: The continuation token needed by get_next
         """
         self._get_next = get_next
@@ -62,6 +65,19 @@ class PageIterator(Iterator[Iterator[ReturnType]]):
         self._response = None  # type: Optional[ResponseType]
         self._current_page = None  # type: Optional[Iterable[ReturnType]]
 
+    @property
+    def continuation_token(self):
+        # type: () -> Optional[str]
+        """The continuation token of the next page, None after the last page."""
+        if callable(self._continuation_token):
+            self._continuation_token = self._continuation_token()
+        return self._continuation_token
+
+    @continuation_token.setter
+    def continuation_token(self, value):
+        # type: (Optional[Union[str, Callable[[], Optional[str]]]]) -> None
+        self._continuation_token = value
+
     def __iter__(self):
         """Return 'self'."""
         return self
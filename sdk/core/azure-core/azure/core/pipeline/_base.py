@@ -86,6 +86,81 @@ class _SansIOHTTPPolicyRunner(HTTPPolicy, Generic[HTTPRequestType, HTTPResponseT
         return response
 
 
+def _implements_hook(policy, name):
+    # type: (SansIOHTTPPolicy, str) -> bool
+    """Whether policy implements the hook "name", rather than inheriting the no-op from SansIOHTTPPolicy."""
+    hook = getattr(getattr(policy, name), "__func__", None)
+    default = getattr(SansIOHTTPPolicy, name)
+    return hook is not getattr(default, "__func__", default)
+
+
+class _SansIOHTTPPolicyGroup(HTTPPolicy, Generic[HTTPRequestType, HTTPResponseType]):
+    """Runs consecutive SansIO policies as one node of a compiled pipeline.
+
+    Hooks are called in the order nested runners would call them, including the on_exception
+    of the outer policies when an inner hook raises, but from flat lists without no-op hooks.
+    Hook results aren't checked for awaitables.
+
+    :param list policies: The SansIO policies, outermost first.
+    """
+
+    def __init__(self, policies):
+        # type: (List[SansIOHTTPPolicy]) -> None
+        super(_SansIOHTTPPolicyGroup, self).__init__()
+        self._on_request = [
+            (index, policy.on_request)
+            for index, policy in enumerate(policies) if _implements_hook(policy, "on_request")
+        ]
+        self._on_response = [
+            (index, policy.on_response)
+            for index, policy in enumerate(policies) if _implements_hook(policy, "on_response")
+        ][::-1]
+        self._on_exception = [
+            (index, policy.on_exception)
+            for index, policy in enumerate(policies) if _implements_hook(policy, "on_exception")
+        ][::-1]
+        self._count = len(policies)
+
+    def send(self, request):
+        # type: (PipelineRequest) -> PipelineResponse
+        """Modifies the request and sends to the next policy in the chain.
+
+        An exception marked as handled by an on_exception hook isn't raised to the outer policies,
+        and the group returns None.
+
+        :param request: The PipelineRequest object.
+        :type request: ~azure.core.pipeline.PipelineRequest
+        :return: The PipelineResponse object.
+        :rtype: ~azure.core.pipeline.PipelineResponse
+        """
+        # policies below "entered" have run on_request and haven't run on_response yet
+        entered = 0
+        try:
+            for entered, on_request in self._on_request:
+                on_request(request)
+            entered = self._count
+            response = self.next.send(request)
+            for entered, on_response in self._on_response:
+                on_response(request, response)
+        except Exception:  # pylint: disable=broad-except
+            return self._handle_exception(request, entered)
+        return response
+
+    def _handle_exception(self, request, entered):
+        # type: (PipelineRequest, int) -> None
+        """Call on_exception for the policies below "entered", innermost first. Must be called in an except block."""
+        for index, on_exception in self._on_exception:
+            if index < entered:
+                try:
+                    handled = on_exception(request)
+                except Exception:  # pylint: disable=broad-except
+                    # the outer policies see the exception raised by this hook, as they would when nested
+                    return self._handle_exception(request, index)
+                if handled:
+                    return None
+        raise  # pylint: disable=misplaced-bare-raise
+
+
 class _TransportRunner(HTTPPolicy):
     """Transport runner.
 
@@ -122,6 +197,9 @@ class Pipeline(AbstractContextManager, Generic[HTTPRequestType, HTTPResponseType
 
     :param transport: The Http Transport instance
     :param list policies: List of configured policies.
+    :keyword bool compiled: Run each sequence of consecutive SansIOHTTPPolicy as a single node, calling only
+     the hooks they implement. This saves a nested call per policy, but hooks returning awaitables aren't
+     detected. Defaults to False.
 
     .. admonition:: Example:
 
@@ -133,16 +211,30 @@ class Pipeline(AbstractContextManager, Generic[HTTPRequestType, HTTPResponseType
             :caption: Builds the pipeline for synchronous transport.
     """
 
-    def __init__(self, transport, policies=None):
-        # type: (HttpTransportType, PoliciesType) -> None
+    def __init__(self, transport, policies=None, **kwargs):
+        # type: (HttpTransportType, PoliciesType, Any) -> None
         self._impl_policies = []  # type: List[HTTPPolicy]
         self._transport = transport  # type: ignore
 
-        for policy in policies or []:
-            if isinstance(policy, SansIOHTTPPolicy):
-                self._impl_policies.append(_SansIOHTTPPolicyRunner(policy))
-            elif policy:
-                self._impl_policies.append(policy)
+        if kwargs.pop("compiled", False):
+            group = []  # type: List[SansIOHTTPPolicy]
+            for policy in policies or []:
+                if isinstance(policy, SansIOHTTPPolicy):
+                    group.append(policy)
+                    continue
+                if group:
+                    self._impl_policies.append(_SansIOHTTPPolicyGroup(group))
+                    group = []
+                if policy:
+                    self._impl_policies.append(policy)
+            if group:
+                self._impl_policies.append(_SansIOHTTPPolicyGroup(group))
+        else:
+            for policy in policies or []:
+                if isinstance(policy, SansIOHTTPPolicy):
+                    self._impl_policies.append(_SansIOHTTPPolicyRunner(policy))
+                elif policy:
+                    self._impl_policies.append(policy)
         for index in range(len(self._impl_policies) - 1):
             self._impl_policies[index].next = self._impl_policies[index + 1]
         if self._impl_policies:
@@ -170,21 +262,13 @@ class Pipeline(AbstractContextManager, Generic[HTTPRequestType, HTTPResponseType
         requests = multipart_mixed_info[0]  # type: List[HTTPRequestType]
         policies = multipart_mixed_info[1]  # type: List[SansIOHTTPPolicy]
 
-        # Apply on_requests concurrently to all requests
-        import concurrent.futures
-
-        def prepare_requests(req):
+        # SansIO policies only do CPU work, so a thread pool per batch costs more than it saves
+        for req in requests:
             context = PipelineContext(None)
             pipeline_request = PipelineRequest(req, context)
             for policy in policies:
                 _await_result(policy.on_request, pipeline_request)
 
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            # List comprehension to raise exceptions if happened
-            [  # pylint: disable=expression-not-assigned
-                _ for _ in executor.map(prepare_requests, requests)
-            ]
-
     def run(self, request, **kwargs):
         # type: (HTTPRequestType, Any) -> PipelineResponse
         """Runs the HTTP Request through the chained policies.
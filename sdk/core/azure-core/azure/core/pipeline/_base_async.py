@@ -29,6 +29,7 @@ from typing import Any, Union, List, Generic, TypeVar
 
 from azure.core.pipeline import PipelineRequest, PipelineResponse, PipelineContext
 from azure.core.pipeline.policies import AsyncHTTPPolicy, SansIOHTTPPolicy
+from ._base import _implements_hook
 
 AsyncHTTPResponseType = TypeVar("AsyncHTTPResponseType")
 HTTPRequestType = TypeVar("HTTPRequestType")
@@ -97,6 +98,64 @@ class _SansIOAsyncHTTPPolicyRunner(
         return response
 
 
+class _SansIOAsyncHTTPPolicyGroup(
+    AsyncHTTPPolicy[HTTPRequestType, AsyncHTTPResponseType]
+):  # pylint: disable=unsubscriptable-object
+    """Async implementation of the SansIO policy group.
+
+    Runs consecutive SansIO policies as one node of a compiled pipeline, calling only the hooks they implement.
+
+    :param list policies: The SansIO policies, outermost first.
+    """
+
+    def __init__(self, policies: List[SansIOHTTPPolicy]) -> None:
+        super(_SansIOAsyncHTTPPolicyGroup, self).__init__()
+        self._on_request = [
+            (index, policy.on_request)
+            for index, policy in enumerate(policies) if _implements_hook(policy, "on_request")
+        ]
+        self._on_response = [
+            (index, policy.on_response)
+            for index, policy in enumerate(policies) if _implements_hook(policy, "on_response")
+        ][::-1]
+        self._on_exception = [
+            (index, policy.on_exception)
+            for index, policy in enumerate(policies) if _implements_hook(policy, "on_exception")
+        ][::-1]
+        self._count = len(policies)
+
+    async def send(self, request: PipelineRequest) -> PipelineResponse:
+        """Modifies the request and sends to the next policy in the chain.
+
+        :param request: The PipelineRequest object.
+        :type request: ~azure.core.pipeline.PipelineRequest
+        :return: The PipelineResponse object.
+        :rtype: ~azure.core.pipeline.PipelineResponse
+        """
+        entered = 0
+        try:
+            for entered, on_request in self._on_request:
+                await _await_result(on_request, request)
+            entered = self._count
+            response = await self.next.send(request)  # type: ignore
+            for entered, on_response in self._on_response:
+                await _await_result(on_response, request, response)
+        except Exception:  # pylint: disable=broad-except
+            return await self._handle_exception(request, entered)
+        return response
+
+    async def _handle_exception(self, request: PipelineRequest, entered: int) -> None:
+        for index, on_exception in self._on_exception:
+            if index < entered:
+                try:
+                    handled = await _await_result(on_exception, request)
+                except Exception:  # pylint: disable=broad-except
+                    return await self._handle_exception(request, index)
+                if handled:
+                    return None
+        raise  # pylint: disable=misplaced-bare-raise
+
+
 class _AsyncTransportRunner(
     AsyncHTTPPolicy[HTTPRequestType, AsyncHTTPResponseType]
 ):  # pylint: disable=unsubscriptable-object
@@ -136,6 +195,8 @@ class AsyncPipeline(
 
     :param transport: The async Http Transport instance.
     :param list policies: List of configured policies.
+    :keyword bool compiled: Run each sequence of consecutive SansIOHTTPPolicy as a single node, calling only
+     the hooks they implement. Defaults to False.
 
     .. admonition:: Example:
 
@@ -147,15 +208,29 @@ class AsyncPipeline(
             :caption: Builds the async pipeline for asynchronous transport.
     """
 
-    def __init__(self, transport, policies: AsyncPoliciesType = None) -> None:
+    def __init__(self, transport, policies: AsyncPoliciesType = None, **kwargs: Any) -> None:
         self._impl_policies = []  # type: ImplPoliciesType
         self._transport = transport
 
-        for policy in policies or []:
-            if isinstance(policy, SansIOHTTPPolicy):
-                self._impl_policies.append(_SansIOAsyncHTTPPolicyRunner(policy))
-            elif policy:
-                self._impl_policies.append(policy)
+        if kwargs.pop("compiled", False):
+            group = []  # type: List[SansIOHTTPPolicy]
+            for policy in policies or []:
+                if isinstance(policy, SansIOHTTPPolicy):
+                    group.append(policy)
+                    continue
+                if group:
+                    self._impl_policies.append(_SansIOAsyncHTTPPolicyGroup(group))
+                    group = []
+                if policy:
+                    self._impl_policies.append(policy)
+            if group:
+                self._impl_policies.append(_SansIOAsyncHTTPPolicyGroup(group))
+        else:
+            for policy in policies or []:
+                if isinstance(policy, SansIOHTTPPolicy):
+                    self._impl_policies.append(_SansIOAsyncHTTPPolicyRunner(policy))
+                elif policy:
+                    self._impl_policies.append(policy)
         for index in range(len(self._impl_policies) - 1):
             self._impl_policies[index].next = self._impl_policies[index + 1]
         if self._impl_policies:
@@ -28,8 +28,10 @@ from ._base import HTTPPolicy, SansIOHTTPPolicy, RequestHistory
 from ._authentication import BearerTokenCredentialPolicy
 from ._custom_hook import CustomHookPolicy
 from ._redirect import RedirectPolicy
-from ._retry import RetryPolicy
+from ._retry import RetryPolicy, RetryBudget
+from ._hedging import HedgingPolicy
 from ._distributed_tracing import DistributedTracingPolicy
+from ._metrics import HistogramMetricsSink, MetricsKey, MetricsPolicy, MetricsSink, OperationMetrics
 from ._universal import (
     HeadersPolicy,
     UserAgentPolicy,
@@ -48,12 +50,19 @@ __all__ = [
     'NetworkTraceLoggingPolicy',
     'ContentDecodePolicy',
     'RetryPolicy',
+    'RetryBudget',
+    'HedgingPolicy',
     'RedirectPolicy',
     'ProxyPolicy',
     'CustomHookPolicy',
     'DistributedTracingPolicy',
     'RequestHistory',
     'HttpLoggingPolicy',
+    'MetricsPolicy',
+    'MetricsSink',
+    'HistogramMetricsSink',
+    'MetricsKey',
+    'OperationMetrics',
 ]
 
 #pylint: disable=unused-import
@@ -63,11 +72,13 @@ try:
     from ._authentication_async import AsyncBearerTokenCredentialPolicy
     from ._redirect_async import AsyncRedirectPolicy
     from ._retry_async import AsyncRetryPolicy
+    from ._hedging_async import AsyncHedgingPolicy
     __all__.extend([
         'AsyncHTTPPolicy',
         'AsyncBearerTokenCredentialPolicy',
         'AsyncRedirectPolicy',
-        'AsyncRetryPolicy'
+        'AsyncRetryPolicy',
+        'AsyncHedgingPolicy',
     ])
 except (ImportError, SyntaxError):
     pass  # Async not supported
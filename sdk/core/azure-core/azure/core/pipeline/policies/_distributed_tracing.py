@@ -29,7 +29,7 @@ import sys
 from six.moves import urllib
 
 from azure.core.pipeline.policies import SansIOHTTPPolicy
-from azure.core.settings import settings
+from azure.core.settings import _tracing_implementation
 
 try:
     from typing import TYPE_CHECKING
@@ -80,7 +80,7 @@ class DistributedTracingPolicy(SansIOHTTPPolicy):
         # type: (PipelineRequest) -> None
         ctxt = request.context.options
         try:
-            span_impl_type = settings.tracing_implementation()
+            span_impl_type = _tracing_implementation()
             if span_impl_type is None:
                 return
 
@@ -0,0 +1,314 @@
+# --------------------------------------------------------------------------
+#
+# Copyright (c) Microsoft Corporation. All rights reserved.
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the ""Software""), to
+# deal in the Software without restriction, including without limitation the
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+# sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED *AS IS*, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#
+# --------------------------------------------------------------------------
+"""
+This module is the requests implementation of the hedging policy.
+"""
+from collections import deque
+from concurrent import futures
+import copy
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Set  # pylint: disable=unused-import
+
+from six.moves import queue
+from six.moves.urllib.parse import urlparse
+
+from azure.core.pipeline import PipelineContext, PipelineRequest, PipelineResponse
+from azure.core.tracing.common import with_current_context
+
+from ._base import HTTPPolicy
+
+if TYPE_CHECKING:
+    from typing import Deque  # pylint: disable=ungrouped-imports
+
+_LOGGER = logging.getLogger(__name__)
+
+# hedged sends are latency sensitive, so percentiles come from the most recent ones
+_LATENCY_WINDOW = 100
+
+
+class _HostStats(object):
+    __slots__ = ("latencies", "tokens")
+
+    def __init__(self, tokens):
+        # type: (float) -> None
+        self.latencies = deque(maxlen=_LATENCY_WINDOW)  # type: Deque[float]
+        self.tokens = tokens
+
+
+def _close(response):
+    # type: (PipelineResponse) -> None
+    """Release the connection of a response nobody will read."""
+    close = getattr(response.http_response.internal_response, "close", None)
+    if close:
+        try:
+            close()
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.debug("Failed to close a hedged response", exc_info=True)
+
+
+class _SendThreads(object):
+    """Runs sends on threads started as needed, so a send never waits for a free thread.
+
+    Finished threads wait for more sends, up to ``max_idle`` of them at once; the others exit.
+    """
+
+    def __init__(self, max_idle):
+        # type: (int) -> None
+        self._max_idle = max_idle
+        self._idle = 0
+        self._work = queue.Queue()  # type: queue.Queue
+        self._threads = set()  # type: Set[threading.Thread]
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def submit(self, fn, *args):
+        # type: (Callable, *Any) -> futures.Future
+        future = futures.Future()  # type: futures.Future
+        item = (future, fn, args)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("The hedging policy has been closed")
+            if self._idle:
+                self._idle -= 1
+                self._work.put(item)
+                return future
+            thread = threading.Thread(target=self._run, args=(item,), name="HedgingPolicy")
+            thread.daemon = True
+            self._threads.add(thread)
+        thread.start()
+        return future
+
+    def _run(self, item):
+        while item is not None:
+            future, fn, args = item
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(fn(*args))
+                except BaseException as ex:  # pylint: disable=broad-except
+                    future.set_exception(ex)
+            with self._lock:
+                if self._closed or self._idle >= self._max_idle:
+                    self._threads.discard(threading.current_thread())
+                    return
+                self._idle += 1
+            item = self._work.get()
+        with self._lock:
+            self._threads.discard(threading.current_thread())
+
+    def close(self):
+        # type: () -> None
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, 0
+            threads = list(self._threads)
+        for _ in range(idle):
+            self._work.put(None)
+        for thread in threads:
+            if thread is not threading.current_thread():
+                thread.join()
+
+
+class HedgingPolicy(HTTPPolicy):
+    """A policy sending a backup of an idempotent request that's slow to get a response.
+
+    If no response arrived ``hedge_delay`` seconds after a GET, HEAD or OPTIONS request without a body was sent, the
+    policy sends a copy of it and returns the first successful response (a status below 500, other than 429). The
+    slower request's response is closed when it arrives. When a percentile is configured, the delay is instead that
+    percentile of the host's recent response times, once enough of them are known.
+
+    Every request adds ``hedge_ratio`` to a per host budget of at most ``max_hedge_burst`` hedges, and every hedge
+    costs 1, so hedges never exceed that fraction of a host's requests for long.
+
+    Add it after the retry policy, so each attempt is hedged. The sync policy sends hedgeable requests and their hedges
+    from threads it owns, started as needed so a request never waits for one, and the delay before hedging is counted
+    from when the request starts sending. Call :func:`close` to release them.
+
+    :keyword float hedge_delay: Seconds to wait for a response before hedging. Default value is 0.1.
+    :keyword float hedge_percentile: If set, hedge requests still pending after this percentile of
+     their host's recent response times, for example 95. Not set by default.
+    :keyword float hedge_ratio: The fraction of a host's requests that can be hedged. Default value is 0.05.
+    :keyword float max_hedge_burst: The maximum number of hedges to a host in a burst. Default value is 10.
+    :keyword int max_idle_threads: The number of idle threads the sync policy keeps for later requests.
+     Default value is 32.
+
+    :ivar int hedges_sent: Backup requests sent.
+    :ivar int hedges_won: Backup requests whose response was returned.
+    :ivar int hedges_denied: Requests that weren't hedged because their host's budget was spent.
+    """
+
+    def __init__(self, **kwargs):
+        # type: (**Any) -> None
+        self.hedge_delay = kwargs.pop('hedge_delay', 0.1)
+        self.hedge_percentile = kwargs.pop('hedge_percentile', None)
+        self.hedge_ratio = kwargs.pop('hedge_ratio', 0.05)
+        self.max_hedge_burst = kwargs.pop('max_hedge_burst', 10)
+        self._max_idle_threads = kwargs.pop('max_idle_threads', 32)
+        self._methods = frozenset(['GET', 'HEAD', 'OPTIONS'])
+        self.hedges_sent = 0
+        self.hedges_won = 0
+        self.hedges_denied = 0
+        self._hosts = {}  # type: Dict[str, _HostStats]
+        self._lock = threading.Lock()
+        self._threads = None  # type: Optional[_SendThreads]
+        super(HedgingPolicy, self).__init__()
+
+    def close(self):
+        # type: () -> None
+        """Stop the sync policy's threads, once the requests they're sending complete."""
+        with self._lock:
+            threads, self._threads = self._threads, None
+        if threads:
+            threads.close()
+
+    def _is_hedgeable(self, request):
+        # type: (PipelineRequest) -> bool
+        http_request = request.http_request
+        return http_request.method.upper() in self._methods and not http_request.body and not http_request.files
+
+    def _host_stats(self, request):
+        # type: (PipelineRequest) -> _HostStats
+        host = urlparse(request.http_request.url).netloc
+        with self._lock:
+            stats = self._hosts.get(host)
+            if stats is None:
+                stats = self._hosts[host] = _HostStats(self.max_hedge_burst)
+            stats.tokens = min(self.max_hedge_burst, stats.tokens + self.hedge_ratio)
+            return stats
+
+    def _get_hedge_delay(self, stats):
+        # type: (_HostStats) -> float
+        """The time to wait for a response before hedging a request to a host."""
+        if self.hedge_percentile is None or len(stats.latencies) < _LATENCY_WINDOW // 10:
+            return self.hedge_delay
+        latencies = sorted(stats.latencies)
+        index = int(round(self.hedge_percentile / 100.0 * (len(latencies) - 1)))
+        return latencies[min(max(index, 0), len(latencies) - 1)]
+
+    def _acquire_hedge(self, stats):
+        # type: (_HostStats) -> bool
+        with self._lock:
+            if stats.tokens >= 1:
+                stats.tokens -= 1
+                self.hedges_sent += 1
+                return True
+            self.hedges_denied += 1
+            return False
+
+    def _record_latency(self, stats, start):
+        # type: (_HostStats, float) -> None
+        with self._lock:
+            stats.latencies.append(time.time() - start)
+
+    @staticmethod
+    def _copy_request(request):
+        # type: (PipelineRequest) -> PipelineRequest
+        """A copy of request the rest of the pipeline can modify independently.
+
+        Taken before the request is sent, because the policies after this one modify it.
+        """
+        http_request = copy.copy(request.http_request)
+        http_request.headers = request.http_request.headers.copy()
+        context = PipelineContext(request.context.transport, **request.context.options)
+        for key, value in request.context.items():
+            context[key] = value
+        return PipelineRequest(http_request, context)
+
+    @staticmethod
+    def _is_success(response):
+        # type: (PipelineResponse) -> bool
+        status_code = response.http_response.status_code
+        return status_code < 500 and status_code != 429
+
+    @staticmethod
+    def _as_response(request, winner):
+        # type: (PipelineRequest, PipelineResponse) -> PipelineResponse
+        """The hedge's response, in the context of the original request."""
+        for key, value in winner.context.items():
+            request.context[key] = value
+        return PipelineResponse(request.http_request, winner.http_response, context=request.context)
+
+    def _timed_send(self, request, stats, started=None):
+        # type: (PipelineRequest, _HostStats, Optional[threading.Event]) -> PipelineResponse
+        if started:
+            started.set()
+        start = time.time()
+        response = self.next.send(request)
+        self._record_latency(stats, start)
+        return response
+
+    def send(self, request):
+        # type: (PipelineRequest) -> PipelineResponse
+        """Sends the request, and a backup if it's slow to get a response.
+
+        :param request: The PipelineRequest object
+        :type request: ~azure.core.pipeline.PipelineRequest
+        :return: The first successful PipelineResponse, or the original request's response if none succeeded.
+        :rtype: ~azure.core.pipeline.PipelineResponse
+        """
+        if not self._is_hedgeable(request):
+            return self.next.send(request)
+        stats = self._host_stats(request)
+        backup = self._copy_request(request)
+        with self._lock:
+            if not self._threads:
+                self._threads = _SendThreads(self._max_idle_threads)
+            threads = self._threads
+
+        started = threading.Event()
+        primary = threads.submit(with_current_context(self._timed_send), request, stats, started)
+        # the delay is counted from when the request starts sending, not from when its thread was requested
+        started.wait()
+        done, _ = futures.wait([primary], timeout=self._get_hedge_delay(stats))
+        if done or not self._acquire_hedge(stats):
+            return primary.result()
+
+        hedge = threads.submit(with_current_context(self._timed_send), backup, stats)
+        pending = set([primary, hedge])
+        while pending:
+            done, pending = futures.wait(pending, return_when=futures.FIRST_COMPLETED)
+            for winner in done:
+                if winner.exception() is None and self._is_success(winner.result()):
+                    loser = hedge if winner is primary else primary
+                    # runs now if the loser is done already
+                    loser.add_done_callback(self._close_loser)
+                    if winner is primary:
+                        return winner.result()
+                    with self._lock:
+                        self.hedges_won += 1
+                    return self._as_response(request, winner.result())
+
+        # neither succeeded: answer as if there was no hedge
+        if hedge.exception() is None:
+            _close(hedge.result())
+        return primary.result()
+
+    @staticmethod
+    def _close_loser(future):
+        # type: (futures.Future) -> None
+        if future.exception() is None:
+            _close(future.result())
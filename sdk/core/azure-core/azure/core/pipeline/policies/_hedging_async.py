@@ -0,0 +1,118 @@
+# --------------------------------------------------------------------------
+#
+# Copyright (c) Microsoft Corporation. All rights reserved.
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the ""Software""), to
+# deal in the Software without restriction, including without limitation the
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+# sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED *AS IS*, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#
+# --------------------------------------------------------------------------
+import asyncio
+import time
+
+from azure.core.pipeline import PipelineRequest, PipelineResponse
+
+from ._base_async import AsyncHTTPPolicy
+from ._hedging import HedgingPolicy, _HostStats, _close
+
+
+def _close_loser(task: "asyncio.Future") -> None:
+    if task.cancelled():
+        return
+    if task.exception() is None:
+        _close(task.result())
+
+
+class AsyncHedgingPolicy(HedgingPolicy, AsyncHTTPPolicy):  # type: ignore
+    """Async flavor of the hedging policy.
+
+    If no response arrived ``hedge_delay`` seconds after a GET, HEAD or OPTIONS request without a body was sent, the
+    policy sends a copy of it and returns the first successful response (a status below 500, other than 429). The
+    slower request is cancelled. When a percentile is configured, the delay is instead that percentile of the host's
+    recent response times, once enough of them are known.
+
+    Every request adds ``hedge_ratio`` to a per host budget of at most ``max_hedge_burst`` hedges, and every hedge
+    costs 1, so hedges never exceed that fraction of a host's requests for long.
+
+    Add it after the retry policy, so each attempt is hedged. Requires asyncio.
+
+    :keyword float hedge_delay: Seconds to wait for a response before hedging. Default value is 0.1.
+    :keyword float hedge_percentile: If set, hedge requests still pending after this percentile of
+     their host's recent response times, for example 95. Not set by default.
+    :keyword float hedge_ratio: The fraction of a host's requests that can be hedged. Default value is 0.05.
+    :keyword float max_hedge_burst: The maximum number of hedges to a host in a burst. Default value is 10.
+
+    :ivar int hedges_sent: Backup requests sent.
+    :ivar int hedges_won: Backup requests whose response was returned.
+    :ivar int hedges_denied: Requests that weren't hedged because their host's budget was spent.
+    """
+
+    async def _timed_send(self, request: PipelineRequest, stats: _HostStats) -> PipelineResponse:  # type: ignore
+        start = time.time()
+        response = await self.next.send(request)  # type: ignore
+        self._record_latency(stats, start)
+        return response
+
+    async def send(self, request: PipelineRequest) -> PipelineResponse:  # type: ignore
+        """Sends the request, and a backup if it's slow to get a response.
+
+        :param request: The PipelineRequest object
+        :type request: ~azure.core.pipeline.PipelineRequest
+        :return: The first successful PipelineResponse, or the original request's response if none succeeded.
+        :rtype: ~azure.core.pipeline.PipelineResponse
+        """
+        if not self._is_hedgeable(request):
+            return await self.next.send(request)  # type: ignore
+        stats = self._host_stats(request)
+        backup = self._copy_request(request)
+
+        primary = asyncio.ensure_future(self._timed_send(request, stats))
+        try:
+            done, _ = await asyncio.wait([primary], timeout=self._get_hedge_delay(stats))
+        except asyncio.CancelledError:
+            primary.cancel()
+            raise
+        if done or not self._acquire_hedge(stats):
+            return await primary
+
+        hedge = asyncio.ensure_future(self._timed_send(backup, stats))
+        pending = set([primary, hedge])
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for winner in done:
+                    if winner.exception() is None and self._is_success(winner.result()):
+                        loser = hedge if winner is primary else primary
+                        loser.cancel()
+                        # also called if the loser is done already
+                        loser.add_done_callback(_close_loser)
+                        if winner is primary:
+                            return winner.result()
+                        with self._lock:
+                            self.hedges_won += 1
+                        return self._as_response(request, winner.result())
+        except asyncio.CancelledError:
+            for task in pending:
+                task.cancel()
+            raise
+
+        # neither succeeded: answer as if there was no hedge
+        if hedge.exception() is None:
+            _close(hedge.result())
+        return primary.result()
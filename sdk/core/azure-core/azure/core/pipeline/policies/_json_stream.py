@@ -0,0 +1,186 @@
+# --------------------------------------------------------------------------
+#
+# Copyright (c) Microsoft Corporation. All rights reserved.
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the ""Software""), to
+# deal in the Software without restriction, including without limitation the
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+# sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED *AS IS*, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#
+# --------------------------------------------------------------------------
+import codecs
+import collections
+import json
+import re
+
+import six
+
+from azure.core.exceptions import DecodeError
+
+try:
+    from typing import TYPE_CHECKING
+except ImportError:
+    TYPE_CHECKING = False
+
+if TYPE_CHECKING:
+    # pylint: disable=unused-import
+    from typing import Any, Deque, Dict, Iterable, Iterator, Optional
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# characters that can continue a number: raw_decode stops before them when the rest of the number is still unread
+_NUMBER_CHARS = frozenset(u"0123456789.eE+-")
+
+
+class JsonItemStream(six.Iterator):
+    """Iterates over the items of an array in a JSON object, decoding them as the body is read.
+
+    Only the item being decoded and the unread part of the current chunk are kept in memory, whatever the
+    number of items. The object's other members are available from :attr:`members` once all items are decoded.
+
+    :param chunks: The body of the response, as chunks of bytes
+    :type chunks: iterable[bytes]
+    :param str member: The name of the member holding the array
+    :param response: The response, to annotate decoding errors with
+    :type response: ~azure.core.pipeline.transport.HttpResponse
+    :raises ~azure.core.exceptions.DecodeError: While iterating, if the body isn't a valid JSON object
+    """
+
+    def __init__(self, chunks, member, response=None):
+        # type: (Iterable[bytes], str, Any) -> None
+        self._chunks = iter(chunks)
+        self._text_decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self._json_decoder = json.JSONDecoder()
+        self._buffer = u""
+        self._pos = 0
+        self._eof = False
+        self._member = member
+        self._members = {}  # type: Dict[str, Any]
+        self._ahead = collections.deque()  # type: Deque[Any]
+        self._response = response
+        self._items = self._parse()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        # type: () -> Any
+        if self._ahead:
+            return self._ahead.popleft()
+        return next(self._items)
+
+    @property
+    def members(self):
+        # type: () -> Dict[str, Any]
+        """The members of the JSON object other than the array, like its next link.
+
+        If items are still to be iterated over, reading them decodes and keeps them in memory.
+
+        :rtype: dict
+        """
+        self._ahead.extend(self._items)
+        return self._members
+
+    def _error(self, message):
+        # type: (Any) -> DecodeError
+        return DecodeError(message="JSON is invalid: {}".format(message), response=self._response)
+
+    def _read(self, size=1):
+        # type: (int) -> bool
+        """Add at least size characters to the buffer, or as many as remain. Returns False at the end of the body."""
+        if self._eof:
+            return False
+        self._buffer = self._buffer[self._pos:]
+        self._pos = 0
+        expected = len(self._buffer) + size
+        for chunk in self._chunks:
+            self._buffer += self._text_decoder.decode(chunk)
+            if len(self._buffer) >= expected:
+                return True
+        self._buffer += self._text_decoder.decode(b"", True)
+        self._eof = True
+        return len(self._buffer) > expected - size
+
+    def _peek(self):
+        # type: () -> str
+        """The next character other than whitespace, or an empty string at the end of the body."""
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._read():
+                return u""
+
+    def _expect(self, expected):
+        # type: (str) -> str
+        char = self._peek()
+        if not char or char not in expected:
+            raise self._error("expected one of '{}' at {!r}".format(expected, self._buffer[self._pos:self._pos + 20]))
+        self._pos += 1
+        return char
+
+    def _value(self):
+        # type: () -> Any
+        self._peek()
+        while True:
+            try:
+                value, end = self._json_decoder.raw_decode(self._buffer, self._pos)
+            except ValueError as err:
+                # the value may continue in the next chunks: read as much again as is buffered, so that
+                # decoding a value spanning many chunks doesn't take quadratic time
+                if self._read(max(len(self._buffer) - self._pos, 1)):
+                    continue
+                raise self._error(err)
+            if (
+                isinstance(value, six.integer_types + (float,))
+                and not isinstance(value, bool)
+                and (end == len(self._buffer) or self._buffer[end] in _NUMBER_CHARS)
+                and self._read()
+            ):
+                # the number may continue in the next chunk, as "1" of "1.5" split after "1."
+                continue
+            self._pos = end
+            return value
+
+    def _parse(self):
+        # type: () -> Iterator[Any]
+        if not self._peek():
+            return
+        self._expect(u"{")
+        if self._peek() == u"}":
+            self._pos += 1
+        else:
+            while True:
+                key = self._value()
+                if not isinstance(key, six.string_types):
+                    raise self._error("expected a member name, got {!r}".format(key))
+                self._expect(u":")
+                if key == self._member and self._peek() == u"[":
+                    self._pos += 1
+                    if self._peek() == u"]":
+                        self._pos += 1
+                    else:
+                        while True:
+                            yield self._value()
+                            if self._expect(u",]") == u"]":
+                                break
+                else:
+                    self._members[key] = self._value()
+                if self._expect(u",}") == u"}":
+                    break
+        if self._peek():
+            raise self._error("extra data after the object")
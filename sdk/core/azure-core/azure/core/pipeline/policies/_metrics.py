@@ -0,0 +1,360 @@
+# --------------------------------------------------------------------------
+#
+# Copyright (c) Microsoft Corporation. All rights reserved.
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the ""Software""), to
+# deal in the Software without restriction, including without limitation the
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+# sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED *AS IS*, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#
+# --------------------------------------------------------------------------
+"""Aggregates numeric metrics of the requests a pipeline sends."""
+from collections import namedtuple
+from math import frexp
+import threading
+from timeit import default_timer
+
+import six
+
+from azure.core.pipeline.policies import SansIOHTTPPolicy
+
+try:
+    from typing import TYPE_CHECKING
+except ImportError:
+    TYPE_CHECKING = False
+
+if TYPE_CHECKING:
+    # pylint: disable=unused-import
+    from typing import Any, Callable, Dict, List, Optional, Tuple
+    from azure.core.pipeline import PipelineRequest, PipelineResponse
+    from azure.core.pipeline.transport import HttpRequest
+
+
+_STATUS_CLASSES = {1: "1xx", 2: "2xx", 3: "3xx", 4: "4xx", 5: "5xx"}
+
+MetricsKey = namedtuple("MetricsKey", ["service", "operation", "status_class"])
+MetricsKey.__doc__ = """What requests are aggregated by.
+
+:ivar str service: The host the requests were sent to, unless the policy was given a service name.
+:ivar str operation: The name given to the requests by the policy's operation namer: their HTTP method by default.
+:ivar str status_class: "2xx", "3xx", "4xx" or "5xx", or "error" when no response was received.
+"""
+
+
+def _bucket(duration):
+    # type: (float) -> int
+    """The histogram bucket of a duration in seconds.
+
+    Each power of 2 microseconds is split in 16 buckets, so percentiles are within 7% of the actual duration.
+    """
+    # frexp is much cheaper than log. The mantissa is in [0.5, 1), so each exponent gets 16 consecutive indexes
+    mantissa, exponent = frexp(duration * 1e6)
+    return (exponent << 4) + int(mantissa * 32)
+
+
+def _bucket_upper_bound(index):
+    # type: (int) -> float
+    """The duration in seconds ending the bucket."""
+    return ((index & 15) + 17) / 32.0 * 2.0 ** ((index >> 4) - 1) / 1e6
+
+
+def _default_operation_namer(http_request):
+    # type: (HttpRequest) -> str
+    return http_request.method
+
+
+class _Histogram(object):
+    __slots__ = ("count", "duration", "bytes_sent", "bytes_received", "retries", "buckets")
+
+    def __init__(self):
+        # type: () -> None
+        self.count = 0
+        self.duration = 0.0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.retries = 0
+        self.buckets = {}  # type: Dict[int, int]
+
+
+class OperationMetrics(object):
+    """The metrics of the requests sharing a :class:`MetricsKey`, as of a :func:`HistogramMetricsSink.snapshot`.
+
+    :ivar int count: The number of requests.
+    :ivar float total_duration: Their total duration, in seconds, including retries.
+    :ivar int bytes_sent: Total length of their bodies, when known.
+    :ivar int bytes_received: Total Content-Length of their responses. Responses without one aren't counted.
+    :ivar int retries: The number of times they were retried.
+    """
+
+    def __init__(self):
+        # type: () -> None
+        self.count = 0
+        self.total_duration = 0.0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.retries = 0
+        self._buckets = {}  # type: Dict[int, int]
+
+    def __repr__(self):
+        # type: () -> str
+        return "<OperationMetrics count={} p50={:.4f} p99={:.4f}>".format(
+            self.count, self.percentile(50), self.percentile(99)
+        )
+
+    @property
+    def mean_duration(self):
+        # type: () -> float
+        """The mean duration of the requests, in seconds
+
+        :rtype: float
+        """
+        return self.total_duration / self.count if self.count else 0.0
+
+    def percentile(self, percent):
+        # type: (float) -> float
+        """The duration, in seconds, that the given percentage of requests didn't exceed, within 7%.
+
+        :param float percent: A number from 0 to 100, for example 99
+        :rtype: float
+        """
+        if not self.count:
+            return 0.0
+        rank = percent / 100.0 * self.count
+        seen = 0
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if seen >= rank:
+                break
+        return _bucket_upper_bound(index)  # pylint: disable=undefined-loop-variable
+
+    def _merge(self, histogram):
+        # type: (_Histogram) -> None
+        self.count += histogram.count
+        self.total_duration += histogram.duration
+        self.bytes_sent += histogram.bytes_sent
+        self.bytes_received += histogram.bytes_received
+        self.retries += histogram.retries
+        for index, count in list(histogram.buckets.items()):
+            self._buckets[index] = self._buckets.get(index, 0) + count
+
+
+class MetricsSink(object):
+    """Receives the measurements of a :class:`MetricsPolicy`.
+
+    Subclass it to forward them to a metrics library; :class:`HistogramMetricsSink` aggregates them in memory.
+    """
+
+    def record(self, service, operation, status_class, duration, bytes_sent, bytes_received, retries):
+        # type: (str, str, str, float, int, int, int) -> None
+        """Called once for each request a pipeline sent, by the thread that sent it.
+
+        :param str service: The service name given to the policy, or the host the request was sent to.
+        :param str operation: The name the policy's operation namer gave the request.
+        :param str status_class: "2xx", "3xx", "4xx" or "5xx", or "error" when no response was received.
+        :param float duration: Seconds from sending the request to receiving its response, including retries.
+        :param int bytes_sent: The length of the request body, or 0 when unknown.
+        :param int bytes_received: The Content-Length of the response, or 0.
+        :param int retries: The number of times the request was retried.
+        """
+        raise NotImplementedError("This method needs to be implemented")
+
+    def add_connection_pool(self, connection_stats):
+        # type: (Any) -> None
+        """Called with the connection reuse counters of each transport the policy sends requests through.
+
+        Only transports with a ``connection_stats`` attribute, such as
+        :class:`~azure.core.pipeline.transport.RequestsTransport`, have counters.
+
+        :param connection_stats: The counters; they keep being updated.
+        :type connection_stats: ~azure.core.pipeline.transport.ConnectionPoolStats
+        """
+
+
+class HistogramMetricsSink(MetricsSink):
+    """Aggregates request metrics in memory, into latency histograms and totals.
+
+    Each thread aggregates into its own histograms, so recording takes no lock. :func:`snapshot` merges them.
+    """
+
+    def __init__(self):
+        # type: () -> None
+        self._local = threading.local()
+        self._shards = []  # type: List[Dict[Tuple[str, str, str], _Histogram]]
+        self._connection_pools = []  # type: List[Any]
+        self._lock = threading.Lock()
+
+    def record(self, service, operation, status_class, duration, bytes_sent, bytes_received, retries):
+        # type: (str, str, str, float, int, int, int) -> None
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._shards.append(shard)
+        key = (service, operation, status_class)
+        histogram = shard.get(key)
+        if histogram is None:
+            histogram = shard[key] = _Histogram()
+        histogram.count += 1
+        histogram.duration += duration
+        histogram.bytes_sent += bytes_sent
+        histogram.bytes_received += bytes_received
+        histogram.retries += retries
+        index = _bucket(duration)
+        histogram.buckets[index] = histogram.buckets.get(index, 0) + 1
+
+    def add_connection_pool(self, connection_stats):
+        # type: (Any) -> None
+        with self._lock:
+            if not any(stats is connection_stats for stats in self._connection_pools):
+                self._connection_pools.append(connection_stats)
+
+    def snapshot(self):
+        # type: () -> Dict[MetricsKey, OperationMetrics]
+        """The metrics recorded so far by all threads, by service, operation and status class.
+
+        Requests completing while the snapshot is taken may be partially counted.
+
+        :rtype: dict[~azure.core.pipeline.policies.MetricsKey, ~azure.core.pipeline.policies.OperationMetrics]
+        """
+        with self._lock:
+            shards = list(self._shards)
+        metrics = {}  # type: Dict[MetricsKey, OperationMetrics]
+        for shard in shards:
+            for key, histogram in list(shard.items()):
+                key = MetricsKey._make(key)
+                if key not in metrics:
+                    metrics[key] = OperationMetrics()
+                metrics[key]._merge(histogram)  # pylint: disable=protected-access
+        return metrics
+
+    @property
+    def connection_stats(self):
+        # type: () -> Dict[str, int]
+        """Connections opened, reused and discarded by the transports of the policies using this sink
+
+        :rtype: dict[str, int]
+        """
+        with self._lock:
+            pools = list(self._connection_pools)
+        return {
+            name: sum(getattr(stats, name) for stats in pools)
+            for name in ("opened", "reused", "discarded")
+        }
+
+    def reset(self):
+        # type: () -> None
+        """Forget the metrics recorded so far."""
+        with self._lock:
+            for shard in self._shards:
+                shard.clear()
+
+
+class MetricsPolicy(SansIOHTTPPolicy):
+    """A policy recording the duration, size and retries of requests into a metrics sink.
+
+    Requests are named by service, operation and status class. Add it before the retry policy, so that a request's
+    duration includes its retries and their count is known.
+
+    :keyword metrics_sink: Where to record the metrics. Defaults to a new
+     :class:`~azure.core.pipeline.policies.HistogramMetricsSink`.
+    :paramtype metrics_sink: ~azure.core.pipeline.policies.MetricsSink
+    :keyword str metrics_service_name: The service name to record. Defaults to the host of each request.
+    :keyword metrics_operation_namer: A callable naming the operation of a request. Defaults to its HTTP method.
+    :paramtype metrics_operation_namer: callable[[~azure.core.pipeline.transport.HttpRequest], str]
+
+    :ivar sink: Where the metrics are recorded.
+    :vartype sink: ~azure.core.pipeline.policies.MetricsSink
+    """
+    START_TIME = "METRICS_START_TIME"
+
+    def __init__(self, **kwargs):
+        # type: (**Any) -> None
+        self.sink = kwargs.get("metrics_sink") or HistogramMetricsSink()  # type: MetricsSink
+        self._service_name = kwargs.get("metrics_service_name")
+        self._operation_namer = kwargs.get(
+            "metrics_operation_namer", _default_operation_namer
+        )  # type: Callable[[HttpRequest], str]
+        self._transport = None  # type: Any
+
+    def on_request(self, request):
+        # type: (PipelineRequest) -> None
+        transport = request.context.transport
+        if transport is not self._transport:
+            self._transport = transport
+            connection_stats = getattr(transport, "connection_stats", None)
+            if connection_stats is not None:
+                self.sink.add_connection_pool(connection_stats)
+        request.context[self.START_TIME] = default_timer()
+
+    def on_response(self, request, response):
+        # type: (PipelineRequest, PipelineResponse) -> None
+        http_response = response.http_response
+        self._record(
+            request,
+            _STATUS_CLASSES.get(http_response.status_code // 100, "error"),
+            _content_length(http_response.headers)
+        )
+
+    def on_exception(self, request):  # pylint: disable=unused-argument
+        # type: (PipelineRequest) -> bool
+        self._record(request, "error", 0)
+        return False
+
+    def _record(self, request, status_class, bytes_received):
+        # type: (PipelineRequest, str, int) -> None
+        start = request.context.get(self.START_TIME)
+        if start is None:
+            return
+        duration = default_timer() - start
+        http_request = request.http_request
+        self.sink.record(
+            self._service_name or _host(http_request.url),
+            self._operation_namer(http_request),
+            status_class,
+            duration,
+            _request_length(http_request),
+            bytes_received,
+            len(request.context.get("history") or ()),
+        )
+
+
+def _host(url):
+    # type: (str) -> str
+    # much cheaper than urlparse, and this runs for every request
+    parts = url.split("/", 3)
+    return parts[2] if len(parts) > 2 else ""
+
+
+def _request_length(http_request):
+    # type: (HttpRequest) -> int
+    # the length of bytes and str bodies, as set in Content-Length, without a case insensitive header lookup
+    body = http_request.data
+    if body is None:
+        return 0
+    if isinstance(body, (six.binary_type, six.text_type)):
+        return len(body)
+    return _content_length(http_request.headers)
+
+
+def _content_length(headers):
+    # type: (Any) -> int
+    try:
+        return int(headers.get("Content-Length") or 0)
+    except ValueError:
+        return 0
@@ -29,9 +29,12 @@ This module is the requests implementation of Pipeline ABC
 """
 from __future__ import absolute_import  # we have a "requests" module that conflicts with "requests" on Py2.7
 import logging
+import threading
 import time
 import email
 from typing import TYPE_CHECKING, List, Callable, Iterator, Any, Union, Dict, Optional  # pylint: disable=unused-import
+from six.moves.urllib.parse import urlparse
+
 from azure.core.pipeline import PipelineResponse
 from azure.core.exceptions import (
     AzureError,
@@ -45,6 +48,98 @@ from ._base import HTTPPolicy, RequestHistory
 
 _LOGGER = logging.getLogger(__name__)
 
+_THROTTLED_STATUS_CODES = frozenset([429, 503])
+
+
+class RetryBudget(object):
+    """Limits the retries of every retry policy sharing it, and holds back requests to hosts that asked to slow down.
+
+    Retries spend tokens from a bucket that successful responses refill, so once failures outnumber successes
+    retries stop until the service recovers, instead of multiplying the load on it. When a host answers 429 or 503,
+    every request to that host waits for the delay given by Retry-After or, without that header, for a delay that
+    doubles with each consecutive throttled response.
+
+    A budget is thread safe and can be shared by the sync and async policies of several clients.
+
+    :keyword float max_tokens: Capacity of the bucket, which starts full: the number of retries allowed
+     in a burst. Default value is 10.
+    :keyword float token_ratio: Tokens a successful response adds to the bucket. A retry costs 1. Default value
+     is 0.1, allowing one retry per ten successful requests once the bucket is empty.
+    :keyword float throttle_backoff: Hold back for a throttled response without Retry-After, doubled for each
+     consecutive one. Default value is 1 second.
+    :keyword float throttle_backoff_max: The maximum hold back for a throttled response without Retry-After.
+     Default value is 60 seconds.
+
+    :ivar int retries_spent: Retries the budget allowed.
+    :ivar int retries_denied: Retries the budget denied.
+    :ivar int requests_held_back: Requests delayed because their host was throttling.
+    :ivar float hold_back_time: Total time requests were delayed, in seconds.
+    """
+
+    def __init__(self, **kwargs):
+        self.max_tokens = kwargs.pop('max_tokens', 10)
+        self.token_ratio = kwargs.pop('token_ratio', 0.1)
+        self.throttle_backoff = kwargs.pop('throttle_backoff', 1)
+        self.throttle_backoff_max = kwargs.pop('throttle_backoff_max', 60)
+        self.retries_spent = 0
+        self.retries_denied = 0
+        self.requests_held_back = 0
+        self.hold_back_time = 0.0
+        self._tokens = float(self.max_tokens)
+        self._hosts = {}  # type: Dict[str, List[float]]
+        self._lock = threading.Lock()
+
+    @property
+    def tokens(self):
+        # type: () -> float
+        """The tokens left in the bucket.
+
+        :rtype: float
+        """
+        return self._tokens
+
+    def _acquire_retry(self):
+        # type: () -> bool
+        with self._lock:
+            if self._tokens >= 1:
+                self._tokens -= 1
+                self.retries_spent += 1
+                return True
+            self.retries_denied += 1
+            return False
+
+    def _record_response(self, host, status_code, retry_after):
+        # type: (str, int, Optional[float]) -> None
+        with self._lock:
+            if status_code in _THROTTLED_STATUS_CODES:
+                # [time until which requests to this host wait, consecutive throttled responses]
+                state = self._hosts.setdefault(host, [0.0, 0])
+                if retry_after is None:
+                    retry_after = min(self.throttle_backoff_max, self.throttle_backoff * (2 ** state[1]))
+                state[0] = max(state[0], time.time() + retry_after)
+                state[1] += 1
+                return
+            if status_code < 500:
+                self._tokens = min(self.max_tokens, self._tokens + self.token_ratio)
+                if host in self._hosts:
+                    self._hosts[host][1] = 0
+
+    def _hold_back(self, host):
+        # type: (str) -> float
+        """The time a request to host should wait before it's sent."""
+        with self._lock:
+            state = self._hosts.get(host)
+            if not state:
+                return 0
+            delay = state[0] - time.time()
+            if delay <= 0:
+                if not state[1]:
+                    del self._hosts[host]
+                return 0
+            self.requests_held_back += 1
+            self.hold_back_time += delay
+            return delay
+
 
 class RetryPolicy(HTTPPolicy):
     """A retry policy.
@@ -72,6 +167,10 @@ class RetryPolicy(HTTPPolicy):
 
     :keyword int retry_backoff_max: The maximum back off time. Default value is 120 seconds (2 minutes).
 
+    :keyword retry_budget: A budget shared by several policies, limiting their retries and holding back
+     requests to throttling hosts. Not set by default.
+    :paramtype retry_budget: ~azure.core.pipeline.policies.RetryBudget
+
     .. admonition:: Example:
 
         .. literalinclude:: ../samples/test_example_sync.py
@@ -92,6 +191,7 @@ class RetryPolicy(HTTPPolicy):
         self.status_retries = kwargs.pop('retry_status', 3)
         self.backoff_factor = kwargs.pop('retry_backoff_factor', 0.8)
         self.backoff_max = kwargs.pop('retry_backoff_max', self.BACKOFF_MAX)
+        self.retry_budget = kwargs.pop('retry_budget', None)  # type: Optional[RetryBudget]
 
         safe_codes = [i for i in range(500) if i != 408] + [501, 505]
         retry_codes = [i for i in range(999) if i not in safe_codes]
@@ -330,6 +430,38 @@ class RetryPolicy(HTTPPolicy):
         if retry_settings['history']:
             context['history'] = retry_settings['history']
 
+    def _hold_back(self, request):
+        """The time to wait before sending request, when its host is throttling.
+
+        :param request: The PipelineRequest object
+        :type request: ~azure.core.pipeline.PipelineRequest
+        :rtype: float
+        """
+        if not self.retry_budget:
+            return 0
+        return self.retry_budget._hold_back(urlparse(request.http_request.url).netloc)  # pylint: disable=protected-access
+
+    def _record_response(self, response):
+        """Report a response to the retry budget.
+
+        :param response: The PipelineResponse object
+        :type response: ~azure.core.pipeline.PipelineResponse
+        """
+        if not self.retry_budget:
+            return
+        status_code = response.http_response.status_code
+        retry_after = self.get_retry_after(response) if status_code in _THROTTLED_STATUS_CODES else None
+        self.retry_budget._record_response(  # pylint: disable=protected-access
+            urlparse(response.http_request.url).netloc, status_code, retry_after
+        )
+
+    def _acquire_retry(self):
+        """Whether the retry budget, if any, allows one more retry.
+
+        :rtype: bool
+        """
+        return not self.retry_budget or self.retry_budget._acquire_retry()  # pylint: disable=protected-access
+
     def send(self, request):
         """Sends the PipelineRequest object to the next policy. Uses retry settings if necessary.
 
@@ -344,10 +476,14 @@ class RetryPolicy(HTTPPolicy):
         response = None
         retry_settings = self.configure_retries(request.context.options)
         while retry_active:
+            hold_back = self._hold_back(request)
+            if hold_back > 0:
+                request.context.transport.sleep(hold_back)
             try:
                 response = self.next.send(request)
+                self._record_response(response)
                 if self.is_retry(retry_settings, response):
-                    retry_active = self.increment(retry_settings, response=response)
+                    retry_active = self.increment(retry_settings, response=response) and self._acquire_retry()
                     if retry_active:
                         self.sleep(retry_settings, request.context.transport, response=response)
                         continue
@@ -358,7 +494,8 @@ class RetryPolicy(HTTPPolicy):
                 raise
             except AzureError as err:
                 if self._is_method_retryable(retry_settings, request.http_request):
-                    retry_active = self.increment(retry_settings, response=request, error=err)
+                    retry_active = self.increment(retry_settings, response=request, error=err) \
+                        and self._acquire_retry()
                     if retry_active:
                         self.sleep(retry_settings, request.context.transport)
                         continue
@@ -65,6 +65,10 @@ class AsyncRetryPolicy(RetryPolicy, AsyncHTTPPolicy):  # type: ignore
 
     :keyword int retry_backoff_max: The maximum back off time. Default value is 120 seconds (2 minutes).
 
+    :keyword retry_budget: A budget shared by several policies, limiting their retries and holding back
+     requests to throttling hosts. Not set by default.
+    :paramtype retry_budget: ~azure.core.pipeline.policies.RetryBudget
+
     .. admonition:: Example:
 
         .. literalinclude:: ../samples/test_example_async.py
@@ -132,10 +136,14 @@ class AsyncRetryPolicy(RetryPolicy, AsyncHTTPPolicy):  # type: ignore
         response = None
         retry_settings = self.configure_retries(request.context.options)
         while retry_active:
+            hold_back = self._hold_back(request)
+            if hold_back > 0:
+                await request.context.transport.sleep(hold_back)
             try:
                 response = await self.next.send(request)
+                self._record_response(response)
                 if self.is_retry(retry_settings, response):
-                    retry_active = self.increment(retry_settings, response=response)
+                    retry_active = self.increment(retry_settings, response=response) and self._acquire_retry()
                     if retry_active:
                         await self.sleep(retry_settings, request.context.transport, response=response)
                         continue
@@ -146,7 +154,8 @@ class AsyncRetryPolicy(RetryPolicy, AsyncHTTPPolicy):  # type: ignore
                 raise
             except AzureError as err:
                 if self._is_method_retryable(retry_settings, request.http_request):
-                    retry_active = self.increment(retry_settings, response=request, error=err)
+                    retry_active = self.increment(retry_settings, response=request, error=err) \
+                        and self._acquire_retry()
                     if retry_active:
                         await self.sleep(retry_settings, request.context.transport)
                         continue
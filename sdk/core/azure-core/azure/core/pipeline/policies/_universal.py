@@ -46,6 +46,7 @@ from azure.core.exceptions import (
 
 from azure.core.pipeline import PipelineRequest, PipelineResponse
 from ._base import SansIOHTTPPolicy
+from ._json_stream import JsonItemStream
 
 if TYPE_CHECKING:
     from azure.core.pipeline.transport import HttpResponse, AsyncHttpResponse
@@ -371,6 +372,13 @@ class HttpLoggingPolicy(SansIOHTTPPolicy):
 
 class ContentDecodePolicy(SansIOHTTPPolicy):
     """Policy for decoding unstreamed response content.
+
+    Requests sent with the ``stream_items`` option set to the name of a member of the JSON object responses
+    hold, for example "value", aren't decoded at once. Their context holds a
+    :class:`~azure.core.pipeline.policies._json_stream.JsonItemStream` instead, which decodes the items of that
+    array as they're iterated over, and gives the object's other members once they're all decoded. With a sync
+    transport, the body is then read as the items are decoded, so that memory use doesn't grow with the number of
+    items. Error responses and other content types are decoded at once as usual.
     """
     # Accept "text" because we're open minded people...
     JSON_REGEXP = re.compile(r'^(application|text)/([0-9a-z+.]+\+)?json$')
@@ -378,6 +386,9 @@ class ContentDecodePolicy(SansIOHTTPPolicy):
     # Name used in context
     CONTEXT_NAME = "deserialized_data"
 
+    # Name of the JSON array to decode lazily, in context
+    STREAM_ITEMS_CONTEXT_NAME = "stream_items"
+
     @classmethod
     def deserialize_from_text(
         cls,  # type: Type[ContentDecodePolicyType]
@@ -473,6 +484,40 @@ class ContentDecodePolicy(SansIOHTTPPolicy):
 
         return cls.deserialize_from_text(response.text(), mime_type, response=response)
 
+    def on_request(self, request):
+        # type: (PipelineRequest[HTTPRequestType]) -> None
+        """Prepare decoding the items of a JSON array as the response body is read, when asked for.
+
+        :param request: The PipelineRequest object.
+        :type request: ~azure.core.pipeline.PipelineRequest
+        """
+        options = request.context.options
+        member = options.pop("stream_items", None)
+        if member is None or options.get("stream", True):
+            return
+        request.context[self.STREAM_ITEMS_CONTEXT_NAME] = member
+        from azure.core.pipeline.transport import HttpTransport  # pylint: disable=cyclic-import
+        if isinstance(request.context.transport, HttpTransport):
+            # async responses can't be read from on_response, so they're loaded at once
+            options["stream"] = True
+
+    def _stream_items(self, response, member):
+        # type: (PipelineResponse[HTTPRequestType, Union[HttpResponse, AsyncHttpResponse]], str) -> Any
+        http_response = response.http_response
+        mime_type = (http_response.content_type or "application/json").split(";")[0].strip().lower()
+        if not 200 <= http_response.status_code < 300 or not self.JSON_REGEXP.match(mime_type):
+            return self.deserialize_from_http_generics(http_response)
+
+        chunks = None
+        if response.context.options.get("stream"):
+            from azure.core.pipeline import Pipeline  # pylint: disable=cyclic-import
+            chunks = http_response.stream_download(Pipeline(response.context.transport))
+        if chunks is None:
+            body = http_response.body()
+            block_size = http_response.block_size
+            chunks = (body[index:index + block_size] for index in range(0, len(body), block_size))
+        return JsonItemStream(chunks, member, response=http_response)
+
     def on_response(self,
         request, # type: PipelineRequest[HTTPRequestType]
         response  # type: PipelineResponse[HTTPRequestType, Union[HttpResponse, AsyncHttpResponse]]
@@ -494,6 +539,11 @@ class ContentDecodePolicy(SansIOHTTPPolicy):
         :raises xml.etree.ElementTree.ParseError: If bytes is not valid XML
         :raises ~azure.core.exceptions.DecodeError: If deserialization fails
         """
+        member = response.context.get(self.STREAM_ITEMS_CONTEXT_NAME)
+        if member is not None:
+            response.context[self.CONTEXT_NAME] = self._stream_items(response, member)
+            return
+
         # If response was asked as stream, do NOT read anything and quit now
         if response.context.options.get("stream", True):
             return
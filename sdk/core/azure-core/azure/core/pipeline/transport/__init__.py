@@ -25,12 +25,13 @@
 # --------------------------------------------------------------------------
 
 from ._base import HttpTransport, HttpRequest, HttpResponse
-from ._requests_basic import RequestsTransport, RequestsTransportResponse
+from ._requests_basic import ConnectionPoolStats, RequestsTransport, RequestsTransportResponse
 
 __all__ = [
     'HttpTransport',
     'HttpRequest',
     'HttpResponse',
+    'ConnectionPoolStats',
     'RequestsTransport',
     'RequestsTransportResponse',
 ]
@@ -38,7 +38,7 @@ from azure.core.configuration import ConnectionConfiguration
 from azure.core.exceptions import ServiceRequestError, ServiceResponseError, AzureError
 from azure.core.pipeline import Pipeline
 
-from ._base import HttpRequest
+from ._base import HttpRequest, _SSLContextCache
 from ._base_async import (
     AsyncHttpTransport,
     AsyncHttpResponse,
@@ -75,6 +75,7 @@ class AioHttpTransport(AsyncHttpTransport):
         self.session = session
         self.connection_config = ConnectionConfiguration(**kwargs)
         self._use_env_settings = kwargs.pop('use_env_settings', True)
+        self._ssl_contexts = _SSLContextCache()
 
     async def __aenter__(self):
         await self.open()
@@ -104,18 +105,10 @@ class AioHttpTransport(AsyncHttpTransport):
             self._session_owner = False
             self.session = None
 
-    def _build_ssl_config(self, cert, verify):  # pylint: disable=no-self-use
-        ssl_ctx = None
-
+    def _build_ssl_config(self, cert, verify):
         if cert or verify not in (True, False):
-            import ssl
-            if verify not in (True, False):
-                ssl_ctx = ssl.create_default_context(cafile=verify)
-            else:
-                ssl_ctx = ssl.create_default_context()
-            if cert:
-                ssl_ctx.load_cert_chain(*cert)
-            return ssl_ctx
+            # contexts are cached, so aiohttp can also reuse the pooled connections made with them
+            return self._ssl_contexts.get(cert, verify if verify not in (True, False) else None)
         return verify
 
     def _get_request_data(self, request): #pylint: disable=no-self-use
@@ -25,16 +25,11 @@
 # --------------------------------------------------------------------------
 from __future__ import absolute_import
 import abc
-from email.message import Message
-
-try:
-    from email import message_from_bytes as message_parser
-except ImportError:  # 2.7
-    from email import message_from_string as message_parser  # type: ignore
 from io import BytesIO
 import json
 import logging
 import os
+import threading
 import time
 
 try:
@@ -71,6 +66,7 @@ from azure.core.pipeline import (
     PipelineContext,
 )
 from .._base import _await_result
+from . import _multipart
 
 
 if TYPE_CHECKING:
@@ -166,6 +162,57 @@ def _serialize_request(http_request):
     return serializer.buffer
 
 
+class _SSLContextCache(object):
+    """Creates one SSL context per (client certificate, CA bundle) pair and reuses it.
+
+    Building a context parses the CA bundle and the client certificate from disk, so
+    transports keep the contexts they create instead of building one per request or connection.
+
+    :param bool check_hostname: Whether the contexts check the server's host name during the
+     handshake. Defaults to True; disable it for libraries that match the host name themselves.
+    """
+
+    def __init__(self, check_hostname=True):
+        # type: (bool) -> None
+        self._check_hostname = check_hostname
+        self._contexts = {}  # type: Dict[Tuple[Any, Optional[str]], Any]
+        self._lock = threading.Lock()
+
+    def get(self, cert, cafile=None):
+        # type: (Any, Optional[str]) -> Any
+        """Get the SSL context for a client certificate and a CA bundle.
+
+        :param cert: None, the path of a certificate file including its key, or a (certificate, key) pair of paths.
+        :param str cafile: The path of a CA bundle file or directory. None to trust the system's default CAs.
+        :rtype: ssl.SSLContext
+        """
+        if isinstance(cert, list):
+            cert = tuple(cert)
+        key = (cert, cafile)
+        context = self._contexts.get(key)
+        if context is None:
+            with self._lock:
+                context = self._contexts.get(key)
+                if context is None:
+                    context = self._contexts[key] = self._create(cert, cafile, self._check_hostname)
+        return context
+
+    @staticmethod
+    def _create(cert, cafile, check_hostname):
+        import ssl
+        if cafile and os.path.isdir(cafile):
+            context = ssl.create_default_context(capath=cafile)
+        else:
+            context = ssl.create_default_context(cafile=cafile)
+        context.check_hostname = check_hostname
+        if cert:
+            if isinstance(cert, tuple):
+                context.load_cert_chain(*cert)
+            else:
+                context.load_cert_chain(cert)
+        return context
+
+
 class HttpTransport(
     AbstractContextManager, ABC, Generic[HTTPRequestType, HTTPResponseType]
 ):  # type: ignore
@@ -390,39 +437,12 @@ class HttpRequest(object):
             return
 
         requests = self.multipart_mixed_info[0]  # type: List[HttpRequest]
-        boundary = self.multipart_mixed_info[2]  # type: Optional[str]
-
-        # Update the main request with the body
-        main_message = Message()
-        main_message.add_header("Content-Type", "multipart/mixed")
-        if boundary:
-            main_message.set_boundary(boundary)
-        for i, req in enumerate(requests):
-            part_message = Message()
-            part_message.add_header("Content-Type", "application/http")
-            part_message.add_header("Content-Transfer-Encoding", "binary")
-            part_message.add_header("Content-ID", str(i))
-            part_message.set_payload(req.serialize())
-            main_message.attach(part_message)
+        boundary = self.multipart_mixed_info[2] or _multipart.make_boundary()  # type: str
 
-        try:
-            from email.policy import HTTP
-
-            full_message = main_message.as_bytes(policy=HTTP)
-            eol = b"\r\n"
-        except ImportError:  # Python 2.7
-            # Right now we decide to not support Python 2.7 on serialization, since
-            # it doesn't serialize a valid HTTP request (and our main scenario Storage refuses it)
-            raise NotImplementedError(
-                "Multipart request are not supported on Python 2.7"
-            )
-            # full_message = main_message.as_string()
-            # eol = b'\n'
-        _, _, body = full_message.split(eol, 2)
-        self.set_bytes_body(body)
-        self.headers["Content-Type"] = (
-            "multipart/mixed; boundary=" + main_message.get_boundary()
+        self.set_bytes_body(
+            _multipart.encode_multipart_mixed([req.serialize() for req in requests], boundary)
         )
+        self.headers["Content-Type"] = "multipart/mixed; boundary=" + boundary
 
     def serialize(self):
         # type: () -> bytes
@@ -430,7 +450,11 @@ class HttpRequest(object):
 
         :rtype: bytes
         """
-        return _serialize_request(self)
+        serialized = _multipart.serialize_request(self)
+        if serialized is None:
+            # streamed body, let http.client frame it
+            serialized = _serialize_request(self)
+        return serialized
 
 
 class _HttpResponseBase(object):
@@ -481,25 +505,20 @@ class _HttpResponseBase(object):
         if http_response_type is None:
             http_response_type = HttpClientTransportResponse
 
-        body_as_bytes = self.body()
-        # In order to use email.message parser, I need full HTTP bytes. Faking something to make the parser happy
-        http_body = (
-            b"Content-Type: "
-            + self.content_type.encode("ascii")
-            + b"\r\n\r\n"
-            + body_as_bytes
-        )
-
-        message = message_parser(http_body)  # type: Message
+        boundary = _multipart.get_boundary(self.content_type)
+        if not boundary:
+            raise ValueError("Multipart response has no boundary: {}".format(self.content_type))
 
-        # Rebuild an HTTP response from pure string
+        # Rebuild an HTTP response from pure bytes
         requests = self.request.multipart_mixed_info[0]  # type: List[HttpRequest]
         responses = []
-        for request, raw_reponse in zip(requests, message.get_payload()):
-            if raw_reponse.get_content_type() == "application/http":
+        for request, (content_type, raw_response) in zip(
+            requests, _multipart.decode_multipart_mixed(self.body(), boundary)
+        ):
+            if content_type == "application/http":
                 responses.append(
                     _deserialize_response(
-                        raw_reponse.get_payload(decode=True),
+                        raw_response,
                         request,
                         http_response_type=http_response_type,
                     )
@@ -538,10 +557,8 @@ class HttpResponse(_HttpResponseBase):  # pylint: disable=abstract-method
         if self.request.multipart_mixed_info:
             policies = self.request.multipart_mixed_info[1]  # type: List[SansIOHTTPPolicy]
 
-            # Apply on_response concurrently to all requests
-            import concurrent.futures
-
-            def parse_responses(response):
+            # Apply on_response inline, like the pipeline applies on_request
+            for response in responses:
                 http_request = response.request
                 context = PipelineContext(None)
                 pipeline_request = PipelineRequest(http_request, context)
@@ -552,12 +569,6 @@ class HttpResponse(_HttpResponseBase):  # pylint: disable=abstract-method
                 for policy in policies:
                     _await_result(policy.on_response, pipeline_request, pipeline_response)
 
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                # List comprehension to raise exceptions if happened
-                [  # pylint: disable=expression-not-assigned
-                    _ for _ in executor.map(parse_responses, responses)
-                ]
-
         return responses
 
 
@@ -608,6 +619,9 @@ class BytesIOSocket(object):
 def _deserialize_response(
     http_response_as_bytes, http_request, http_response_type=HttpClientTransportResponse
 ):
+    response = _multipart.parse_response(http_response_as_bytes, http_request.method)
+    if response is not None:
+        return http_response_type(http_request, response)
     local_socket = BytesIOSocket(http_response_as_bytes)
     response = _HTTPResponse(local_socket, method=http_request.method)
     response.begin()
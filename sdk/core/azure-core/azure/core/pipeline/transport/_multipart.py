@@ -0,0 +1,283 @@
+# --------------------------------------------------------------------------
+#
+# Copyright (c) Microsoft Corporation. All rights reserved.
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the ""Software""), to
+# deal in the Software without restriction, including without limitation the
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+# sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED *AS IS*, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#
+# --------------------------------------------------------------------------
+"""Bytes-level encoder and decoder for multipart/mixed batches of application/http parts.
+
+This replaces the "email" package and "http.client" round trips for the common cases (bytes or str bodies,
+Content-Length framed responses). Anything unusual returns None, so that callers can fall back to the
+stdlib implementation.
+"""
+import base64
+import quopri
+import re
+import uuid
+
+from typing import TYPE_CHECKING
+
+import six
+
+if TYPE_CHECKING:
+    from typing import Any, List, Mapping, Optional, Sequence, Tuple  # pylint: disable=unused-import
+
+_CRLF = b"\r\n"
+_METHODS_EXPECTING_BODY = frozenset(("PATCH", "POST", "PUT"))
+_NO_BODY_STATUSES = frozenset((204, 304))
+_BOUNDARY_PARAM = re.compile(r'boundary\s*=\s*(?:"([^"]*)"|([^;\s]+))', re.IGNORECASE)
+
+
+def _encode_header_value(value):
+    # type: (Any) -> bytes
+    # same encoding rules as http.client.HTTPConnection.putheader
+    if isinstance(value, bytes):
+        return value
+    if isinstance(value, six.integer_types):
+        return str(value).encode("ascii")
+    return value.encode("latin-1")
+
+
+def serialize_request(http_request):
+    # type: (Any) -> Optional[bytes]
+    """Serialize a request with a bytes, str or empty body as an application/http part.
+
+    The output is what http.client would send, without the Host and Accept-Encoding headers.
+
+    :return: The serialized request, or None if the body is a stream or iterable.
+    :rtype: bytes or None
+    """
+    body = http_request.body
+    if isinstance(body, six.text_type):
+        body = body.encode("latin-1")
+    elif body is not None and not isinstance(body, bytes):
+        return None
+
+    lines = [
+        "{} {} HTTP/1.1".format(http_request.method, http_request.url or "/").encode("ascii")
+    ]
+    has_length = False
+    for name, value in http_request.headers.items():
+        lowered = name.lower()
+        if lowered in ("host", "accept-encoding"):
+            continue
+        if lowered in ("content-length", "transfer-encoding"):
+            has_length = True
+        lines.append(name.encode("ascii") + b": " + _encode_header_value(value))
+    if not has_length:
+        if body is not None:
+            lines.append(b"Content-Length: " + str(len(body)).encode("ascii"))
+        elif http_request.method.upper() in _METHODS_EXPECTING_BODY:
+            lines.append(b"Content-Length: 0")
+    lines.append(body or b"")
+    return _CRLF.join(lines[:-1]) + _CRLF + _CRLF + lines[-1]
+
+
+def make_boundary():
+    # type: () -> str
+    return "batch_" + str(uuid.uuid4())
+
+
+def encode_multipart_mixed(payloads, boundary):
+    # type: (Sequence[bytes], str) -> bytes
+    """Build a multipart/mixed body with one application/http part per payload.
+
+    Parts get their index as Content-ID.
+    """
+    delimiter = b"--" + boundary.encode("ascii")
+    part_header = (
+        delimiter + _CRLF
+        + b"Content-Type: application/http" + _CRLF
+        + b"Content-Transfer-Encoding: binary" + _CRLF
+        + b"Content-ID: "
+    )
+    chunks = []
+    for index, payload in enumerate(payloads):
+        chunks.append(part_header + str(index).encode("ascii") + _CRLF + _CRLF)
+        chunks.append(payload)
+        chunks.append(_CRLF)
+    chunks.append(delimiter + b"--" + _CRLF)
+    return b"".join(chunks)
+
+
+def get_boundary(content_type):
+    # type: (str) -> Optional[str]
+    match = _BOUNDARY_PARAM.search(content_type)
+    if not match:
+        return None
+    return match.group(1) if match.group(1) is not None else match.group(2)
+
+
+def _strip_line_ending(data, end):
+    # type: (bytes, int) -> int
+    if end > 0 and data[end - 1:end] == b"\n":
+        end -= 1
+        if end > 0 and data[end - 1:end] == b"\r":
+            end -= 1
+    return end
+
+
+def _parse_headers(data, start):
+    # type: (bytes, int) -> Tuple[List[Tuple[str, str]], int]
+    """Parse "name: value" lines from start to the first empty line.
+
+    :return: The headers, and the offset of the content after the empty line.
+    :raises ValueError: on folded or malformed headers
+    """
+    headers = []
+    length = len(data)
+    while start < length:
+        end = data.find(b"\n", start)
+        if end == -1:
+            end = length
+        line = data[start:end]
+        start = end + 1
+        if line.endswith(b"\r"):
+            line = line[:-1]
+        if not line:
+            break
+        if line[:1] in (b" ", b"\t"):
+            raise ValueError("Folded header")
+        name, sep, value = line.partition(b":")
+        if not sep:
+            raise ValueError("Malformed header")
+        headers.append((name.decode("latin-1"), value.lstrip(b" \t").decode("latin-1")))
+    return headers, min(start, length)
+
+
+def decode_multipart_mixed(body, boundary):
+    # type: (bytes, str) -> List[Tuple[str, bytes]]
+    """Split a multipart/mixed body into the content type and decoded payload of each part.
+
+    Delimiters are only recognized at the start of a line. A missing close delimiter ends the last part at the
+    end of the body.
+
+    :raises ValueError: if a part's headers can't be parsed
+    """
+    delimiter = b"--" + boundary.encode("ascii")
+    parts = []
+    position = body.find(delimiter)
+    while position > 0 and body[position - 1:position] != b"\n":
+        position = body.find(delimiter, position + 1)
+
+    while position != -1:
+        position += len(delimiter)
+        if body[position:position + 2] == b"--":
+            break  # close delimiter
+        line_end = body.find(b"\n", position)
+        if line_end == -1:
+            break
+        start = line_end + 1
+
+        end = body.find(delimiter, start)
+        while end > 0 and body[end - 1:end] != b"\n":
+            end = body.find(delimiter, end + 1)
+        part_end = len(body) if end == -1 else _strip_line_ending(body, end)
+
+        headers, content_start = _parse_headers(body, start)
+        content_type = "text/plain"
+        encoding = ""
+        for name, value in headers:
+            name = name.lower()
+            if name == "content-type":
+                content_type = value.split(";", 1)[0].strip().lower()
+            elif name == "content-transfer-encoding":
+                encoding = value.strip().lower()
+        payload = body[content_start:part_end] if content_start < part_end else b""
+        if encoding == "base64":
+            payload = base64.b64decode(payload)
+        elif encoding == "quoted-printable":
+            payload = quopri.decodestring(payload)
+        parts.append((content_type, payload))
+        position = end
+    return parts
+
+
+class BytesHTTPResponse(object):
+    """The subset of http.client.HTTPResponse that HttpClientTransportResponse reads, parsed from bytes."""
+
+    def __init__(self, status, reason, headers, body):
+        # type: (int, str, List[Tuple[str, str]], bytes) -> None
+        self.status = status
+        self.reason = reason
+        self._headers = headers
+        self._body = body
+
+    def getheaders(self):
+        # type: () -> List[Tuple[str, str]]
+        return self._headers
+
+    def getheader(self, name, default=None):
+        # type: (str, Optional[str]) -> Optional[str]
+        name = name.lower()
+        for key, value in self._headers:
+            if key.lower() == name:
+                return value
+        return default
+
+    def read(self, amt=None):
+        # type: (Optional[int]) -> bytes
+        if amt is None:
+            data, self._body = self._body, b""
+        else:
+            data, self._body = self._body[:amt], self._body[amt:]
+        return data
+
+
+def parse_response(data, method):
+    # type: (bytes, str) -> Optional[BytesHTTPResponse]
+    """Parse an application/http response.
+
+    :return: The response, or None if it needs the stdlib parser (chunked body, unusual status line...)
+    """
+    line_end = data.find(b"\n")
+    if line_end == -1:
+        return None
+    status_line = data[:line_end].rstrip(b"\r").split(None, 2)
+    if len(status_line) < 2 or not status_line[0].startswith(b"HTTP/1.") or len(status_line[1]) != 3:
+        return None
+    try:
+        status = int(status_line[1])
+        headers, content_start = _parse_headers(data, line_end + 1)
+    except ValueError:
+        return None
+    if status < 200:
+        return None
+    reason = status_line[2].strip().decode("latin-1") if len(status_line) > 2 else ""
+
+    length = None
+    for name, value in headers:
+        name = name.lower()
+        if name == "transfer-encoding":
+            return None
+        if name == "content-length":
+            try:
+                length = int(value)
+            except ValueError:
+                return None
+    if method.upper() == "HEAD" or status in _NO_BODY_STATUSES:
+        body = b""
+    elif length is not None:
+        body = data[content_start:content_start + length]
+    else:
+        body = data[content_start:]
+    return BytesHTTPResponse(status, reason, headers, body)
@@ -25,10 +25,12 @@
 # --------------------------------------------------------------------------
 from __future__ import absolute_import
 import logging
+import threading
 from typing import Iterator, Optional, Any, Union, TypeVar
 import time
 import urllib3 # type: ignore
 from urllib3.util.retry import Retry # type: ignore
+from six.moves import queue
 import requests
 
 from azure.core.configuration import ConnectionConfiguration
@@ -41,7 +43,8 @@ from . import HttpRequest # pylint: disable=unused-import
 from ._base import (
     HttpTransport,
     HttpResponse,
-    _HttpResponseBase
+    _HttpResponseBase,
+    _SSLContextCache
 )
 
 PipelineType = TypeVar("PipelineType")
@@ -142,12 +145,141 @@ class RequestsTransportResponse(HttpResponse, _RequestsTransportResponseBase):
         return StreamDownloadGenerator(pipeline, self)
 
 
+class ConnectionPoolStats(object):
+    """Connection reuse counters of a :class:`RequestsTransport`.
+
+    Connections opened through a proxy are not counted.
+
+    :ivar int opened: Connections opened to send a request.
+    :ivar int reused: Requests sent on a connection taken back from the pool.
+    :ivar int discarded: Connections closed after a request because the pool was already full.
+     A growing count means `pool_maxsize` is smaller than the number of concurrent requests.
+    """
+    def __init__(self):
+        self.opened = 0
+        self.reused = 0
+        self.discarded = 0
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return "ConnectionPoolStats(opened={}, reused={}, discarded={})".format(
+            self.opened, self.reused, self.discarded
+        )
+
+    def _increment(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+
+class _PoolStatsMixin(object):
+    """Counts the connections a urllib3 connection pool opens, reuses and discards."""
+    stats = None  # type: Optional[ConnectionPoolStats]
+
+    def _new_conn(self):
+        conn = super(_PoolStatsMixin, self)._new_conn()  # type: ignore
+        conn.azure_core_new = True
+        if self.stats:
+            self.stats._increment('opened')  # pylint: disable=protected-access
+        return conn
+
+    def _get_conn(self, timeout=None):
+        conn = super(_PoolStatsMixin, self)._get_conn(timeout)  # type: ignore
+        if getattr(conn, 'azure_core_new', False):
+            conn.azure_core_new = False
+        elif self.stats:
+            self.stats._increment('reused')  # pylint: disable=protected-access
+        return conn
+
+    def _put_conn(self, conn):
+        pool = self.pool  # type: ignore
+        if conn is not None and pool is not None:
+            try:
+                pool.put(conn, block=False)
+                return
+            except queue.Full:
+                # discarded here: urllib3 would try to put the connection back again, and could succeed
+                _LOGGER.warning(
+                    "Connection pool is full, discarding connection: %s. Connection pool size: %s",
+                    self.host,  # type: ignore
+                    pool.qsize(),
+                )
+                if self.stats:
+                    self.stats._increment('discarded')  # pylint: disable=protected-access
+                conn.close()
+                return
+        # the pool is closed: urllib3 closes the connection
+        super(_PoolStatsMixin, self)._put_conn(conn)  # type: ignore
+
+
+class _HTTPConnectionPool(_PoolStatsMixin, urllib3.HTTPConnectionPool):
+    pass
+
+
+class _HTTPSConnectionPool(_PoolStatsMixin, urllib3.HTTPSConnectionPool):
+    pass
+
+
+class _PoolStatsManager(urllib3.PoolManager):
+    def __init__(self, stats, **kwargs):
+        super(_PoolStatsManager, self).__init__(**kwargs)
+        self.pool_classes_by_scheme = {'http': _HTTPConnectionPool, 'https': _HTTPSConnectionPool}
+        self._stats = stats
+
+    def _new_pool(self, *args, **kwargs):  # pylint: disable=arguments-differ
+        pool = super(_PoolStatsManager, self)._new_pool(*args, **kwargs)
+        pool.stats = self._stats
+        return pool
+
+
+class _TransportAdapter(requests.adapters.HTTPAdapter):
+    """HTTPAdapter whose connection pools update a ConnectionPoolStats and share cached SSL contexts."""
+
+    def __init__(self, stats, ssl_contexts, **kwargs):
+        self._stats = stats
+        self._ssl_contexts = ssl_contexts
+        super(_TransportAdapter, self).__init__(**kwargs)
+
+    def init_poolmanager(self, connections, maxsize, block=requests.adapters.DEFAULT_POOLBLOCK, **pool_kwargs):
+        # pylint: disable=attribute-defined-outside-init
+        self._pool_connections = connections
+        self._pool_maxsize = maxsize
+        self._pool_block = block
+        self.poolmanager = _PoolStatsManager(
+            self._stats, num_pools=connections, maxsize=maxsize, block=block, **pool_kwargs
+        )
+
+    def cert_verify(self, conn, url, verify, cert):
+        super(_TransportAdapter, self).cert_verify(conn, url, verify, cert)
+        if not url.lower().startswith('https'):
+            return
+        if not verify:
+            # the pool may have verified an earlier request
+            conn.conn_kw.pop('ssl_context', None)
+            return
+        # Left to itself, urllib3 loads the CA bundle and client certificate into a new
+        # SSL context for every connection it opens; hand it a context loaded once instead.
+        cafile = requests.utils.DEFAULT_CA_BUNDLE_PATH if verify is True else verify
+        conn.conn_kw['ssl_context'] = self._ssl_contexts.get(cert, cafile)
+        conn.ca_certs = None
+        conn.ca_cert_dir = None
+        conn.cert_file = None
+        conn.key_file = None
+
+
 class RequestsTransport(HttpTransport):
     """Implements a basic requests HTTP sender.
 
-    Since requests team recommends to use one session per requests, you should
-    not consider this class as thread-safe, since it will use one Session
-    per instance.
+    The transport creates its session once, under a lock, and the session's connection
+    pools are thread-safe, so a transport can send requests from several threads. To share
+    one transport between many clients, create it with `shared=True`: the session is then
+    closed when the last client using it as a context manager exits, or when `close` is called,
+    instead of when the first client exits.
+
+    Connections are kept in one pool per host. When more requests are in flight to a host
+    than `pool_maxsize`, the extra connections are closed once their request completes,
+    and the next requests pay for a new connection and TLS handshake. Size the pool to the
+    concurrency of the clients using the transport, for instance the `max_concurrency` of
+    storage uploads and downloads. `connection_stats` shows how often connections are reused.
 
     In this simple implementation:
     - You provide the configured session if you want to, or a basic session is created.
@@ -156,6 +288,15 @@ class RequestsTransport(HttpTransport):
     :keyword requests.Session session: Request session to use instead of the default one.
     :keyword bool session_owner: Decide if the session provided by user is owned by this transport. Default to True.
     :keyword bool use_env_settings: Uses proxy settings from environment. Defaults to True.
+    :keyword int pool_connections: The number of hosts to keep connection pools for. Defaults to 10.
+    :keyword int pool_maxsize: The number of connections kept open to each host. Defaults to 10.
+    :keyword bool pool_block: Whether a request waits for a connection of the pool to become free,
+     instead of opening a connection that will be discarded, when `pool_maxsize` requests to the host
+     are already in flight. Defaults to False.
+    :keyword bool shared: Whether the transport is shared between clients, which closes it only when
+     the last of them exits its context manager. Defaults to False.
+    :ivar connection_stats: Connection reuse counters. Not updated when a session is provided.
+    :vartype connection_stats: ~azure.core.pipeline.transport.ConnectionPoolStats
 
     .. admonition:: Example:
 
@@ -173,15 +314,32 @@ class RequestsTransport(HttpTransport):
         # type: (Any) -> None
         self.session = kwargs.get('session', None)
         self._session_owner = kwargs.get('session_owner', True)
+        self._pool_connections = kwargs.pop('pool_connections', requests.adapters.DEFAULT_POOLSIZE)
+        self._pool_maxsize = kwargs.pop('pool_maxsize', requests.adapters.DEFAULT_POOLSIZE)
+        self._pool_block = kwargs.pop('pool_block', requests.adapters.DEFAULT_POOLBLOCK)
+        self._shared = kwargs.pop('shared', False)
+        if self._pool_connections < 1 or self._pool_maxsize < 1:
+            raise ValueError("pool_connections and pool_maxsize must be at least 1")
         self.connection_config = ConnectionConfiguration(**kwargs)
         self._use_env_settings = kwargs.pop('use_env_settings', True)
+        self.connection_stats = ConnectionPoolStats()
+        # urllib3 matches the host name itself, including IP addresses it doesn't send for SNI
+        self._ssl_contexts = _SSLContextCache(check_hostname=False)
+        self._lock = threading.Lock()
+        self._users = 0
 
     def __enter__(self):
         # type: () -> RequestsTransport
+        with self._lock:
+            self._users += 1
         self.open()
         return self
 
     def __exit__(self, *args):  # pylint: disable=arguments-differ
+        with self._lock:
+            self._users -= 1
+            if self._shared and self._users > 0:
+                return
         self.close()
 
     def _init_session(self, session):
@@ -192,20 +350,33 @@ class RequestsTransport(HttpTransport):
         """
         session.trust_env = self._use_env_settings
         disable_retries = Retry(total=False, redirect=False, raise_on_status=False)
-        adapter = requests.adapters.HTTPAdapter(max_retries=disable_retries)
+        adapter = _TransportAdapter(
+            self.connection_stats,
+            self._ssl_contexts,
+            pool_connections=self._pool_connections,
+            pool_maxsize=self._pool_maxsize,
+            pool_block=self._pool_block,
+            max_retries=disable_retries
+        )
         for p in self._protocols:
             session.mount(p, adapter)
 
     def open(self):
         if not self.session and self._session_owner:
-            self.session = requests.Session()
-            self._init_session(self.session)
+            with self._lock:
+                # another thread may have opened the session while this one waited for the lock
+                if not self.session and self._session_owner:
+                    session = requests.Session()
+                    self._init_session(session)
+                    self.session = session
 
     def close(self):
-        if self._session_owner:
-            self.session.close()
-            self._session_owner = False
-            self.session = None
+        with self._lock:
+            if self._session_owner:
+                if self.session:
+                    self.session.close()
+                self._session_owner = False
+                self.session = None
 
     def send(self, request, **kwargs): # type: ignore
         # type: (HttpRequest, Any) -> HttpResponse
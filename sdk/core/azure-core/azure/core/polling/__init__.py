@@ -26,10 +26,13 @@
 import sys
 
 from ._poller import LROPoller, NoPolling, PollingMethod
-__all__ = ['LROPoller', 'NoPolling', 'PollingMethod']
+from ._scheduler import PollingScheduler, StepPollingMethod, as_completed, wait_all
+__all__ = [
+    'LROPoller', 'NoPolling', 'PollingMethod', 'PollingScheduler', 'StepPollingMethod', 'as_completed', 'wait_all'
+]
 
 #pylint: disable=unused-import
 if sys.version_info >= (3, 5, 2):
     # Not executed on old Python, no syntax error
-    from ._async_poller import AsyncNoPolling, AsyncPollingMethod, async_poller
-    __all__ += ['AsyncNoPolling', 'AsyncPollingMethod', 'async_poller']
+    from ._async_poller import AsyncNoPolling, AsyncPollingMethod, AsyncStepPollingMethod, async_poller
+    __all__ += ['AsyncNoPolling', 'AsyncPollingMethod', 'AsyncStepPollingMethod', 'async_poller']
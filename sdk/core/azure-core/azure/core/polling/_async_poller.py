@@ -23,7 +23,10 @@
 # IN THE SOFTWARE.
 #
 # --------------------------------------------------------------------------
+import asyncio
+
 from ._poller import NoPolling as _NoPolling
+from ._scheduler import StepPollingMethod
 
 class AsyncPollingMethod(object):
     """ABC class for polling method.
@@ -53,6 +56,28 @@ class AsyncNoPolling(_NoPolling):
         """
 
 
+class AsyncStepPollingMethod(StepPollingMethod, AsyncPollingMethod):  # type: ignore
+    """Async flavor of :class:`~azure.core.polling.StepPollingMethod`.
+
+    Subclasses implement :func:`update_status` as a coroutine. The event loop polls any number of operations
+    on one thread already, so async operations need no scheduler; :func:`run` waits as long as the service's
+    Retry-After header says between status requests.
+
+    :param float polling_interval: Seconds between status requests, when the service doesn't send Retry-After.
+     Default value is 30.
+    """
+
+    async def update_status(self):  # pylint: disable=invalid-overridden-method
+        """Send one status request, and update the status from its response."""
+        raise NotImplementedError("This method needs to be implemented")
+
+    async def run(self):  # pylint: disable=invalid-overridden-method
+        """Poll until the operation finishes."""
+        while not self.finished():
+            await asyncio.sleep(self.polling_delay())
+            await self.update_status()
+
+
 async def async_poller(client, initial_response, deserialization_callback, polling_method):
     """Async Poller for long running operations.
 
@@ -115,10 +115,13 @@ class LROPoller(object):
     :type deserialization_callback: callable or msrest.serialization.Model
     :param polling_method: The polling strategy to adopt
     :type polling_method: ~azure.core.polling.PollingMethod
+    :keyword polling_scheduler: Poll the operation with this scheduler rather than in a thread of its own,
+     if the polling method is a :class:`~azure.core.polling.StepPollingMethod`. Not set by default.
+    :paramtype polling_scheduler: ~azure.core.polling.PollingScheduler
     """
 
-    def __init__(self, client, initial_response, deserialization_callback, polling_method):
-        # type: (Any, HttpResponse, DeserializationCallbackType, PollingMethod) -> None
+    def __init__(self, client, initial_response, deserialization_callback, polling_method, **kwargs):
+        # type: (Any, HttpResponse, DeserializationCallbackType, PollingMethod, **Any) -> None
         self._client = client
         self._response = initial_response
         self._callbacks = []  # type: List[Callable]
@@ -139,6 +142,12 @@ class LROPoller(object):
         self._exception = None
         if not self._polling_method.finished():
             self._done = threading.Event()
+            polling_scheduler = kwargs.get("polling_scheduler")
+            if polling_scheduler is not None:
+                from ._scheduler import StepPollingMethod
+                if isinstance(self._polling_method, StepPollingMethod):
+                    polling_scheduler.submit(self)
+                    return
             self._thread = threading.Thread(
                 target=with_current_context(self._start),
                 name="LROPoller({})".format(uuid.uuid4()))
@@ -160,6 +169,20 @@ class LROPoller(object):
         finally:
             self._done.set()
 
+        self._run_callbacks()
+
+    def _finish(self, exception):
+        # type: (Optional[Exception]) -> None
+        """Complete an operation polled by a scheduler, and run any callbacks.
+
+        :param exception: The exception polling raised, if any
+        """
+        self._exception = exception
+        self._done.set()  # type: ignore
+        self._run_callbacks()
+
+    def _run_callbacks(self):
+        # type: () -> None
         callbacks, self._callbacks = self._callbacks, []
         while callbacks:
             for call in callbacks:
@@ -198,9 +221,12 @@ class LROPoller(object):
          operation to complete (in seconds).
         :raises ~azure.core.exceptions.HttpResponseError: Server problem with the query.
         """
-        if self._thread is None:
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+        elif self._done is not None:
+            self._done.wait(timeout)
+        else:
             return
-        self._thread.join(timeout=timeout)
         try:
             # Let's handle possible None in forgiveness here
             raise self._exception  # type: ignore
@@ -214,7 +240,9 @@ class LROPoller(object):
         :returns: 'True' if the process has completed, else 'False'.
         :rtype: bool
         """
-        return self._thread is None or not self._thread.is_alive()
+        if self._thread is None:
+            return self._done is None or self._done.is_set()
+        return not self._thread.is_alive()
 
     def add_done_callback(self, func):
         # type: (Callable) -> None
@@ -0,0 +1,301 @@
+# --------------------------------------------------------------------------
+#
+# Copyright (c) Microsoft Corporation. All rights reserved.
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the ""Software""), to
+# deal in the Software without restriction, including without limitation the
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+# sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED *AS IS*, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#
+# --------------------------------------------------------------------------
+import email.utils
+import heapq
+import itertools
+import threading
+import time
+import uuid
+
+from typing import Any, Iterable, Iterator, List, Optional, Set, Tuple, TYPE_CHECKING
+
+from six.moves import queue
+
+from azure.core.exceptions import AzureError
+from azure.core.tracing.common import with_current_context
+
+from ._poller import PollingMethod
+
+if TYPE_CHECKING:
+    from typing import Callable  # pylint: disable=ungrouped-imports
+    from ._poller import LROPoller  # pylint: disable=unused-import
+
+# how often as_completed checks pollers whose done callback may have been missed
+_DONE_CHECK_INTERVAL = 1.0
+
+
+def get_retry_after(http_response):
+    # type: (Any) -> Optional[float]
+    """The seconds to wait given by a response's Retry-After header, in seconds or as an HTTP date.
+
+    :param http_response: The response
+    :type http_response: ~azure.core.pipeline.transport.HttpResponse
+    :return: The seconds to wait, or None if the response has no valid Retry-After header
+    :rtype: float or None
+    """
+    value = http_response.headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        parsed = email.utils.parsedate_tz(value)
+        if parsed is None:
+            return None
+        return max(email.utils.mktime_tz(parsed) - time.time(), 0.0)
+
+
+class StepPollingMethod(PollingMethod):
+    """Base class for polling methods that check the status of an operation with one request at a time.
+
+    Subclasses implement :func:`update_status`, which sends one status request, and pass its response to
+    :func:`set_retry_after`. :class:`~azure.core.polling.LROPoller` then polls them with the
+    :class:`~azure.core.polling.PollingScheduler` it's given, rather than in a thread of its own.
+
+    :param float polling_interval: Seconds between status requests, when the service doesn't send Retry-After.
+     Default value is 30.
+    """
+
+    def __init__(self, polling_interval=30):
+        # type: (float) -> None
+        self._polling_interval = polling_interval
+        self._retry_after = None  # type: Optional[float]
+
+    def update_status(self):
+        # type: () -> None
+        """Send one status request, and update the status from its response."""
+        raise NotImplementedError("This method needs to be implemented")
+
+    def set_retry_after(self, http_response):
+        # type: (Any) -> None
+        """Wait as long as the response's Retry-After header says before the next status request, if it has one.
+
+        :param http_response: The latest initial or status response
+        :type http_response: ~azure.core.pipeline.transport.HttpResponse
+        """
+        self._retry_after = get_retry_after(http_response)
+
+    def polling_delay(self):
+        # type: () -> float
+        """Seconds to wait before the next status request.
+
+        :rtype: float
+        """
+        return self._polling_interval if self._retry_after is None else self._retry_after
+
+    def run(self):
+        # type: () -> None
+        """Poll until the operation finishes, in the calling thread."""
+        while not self.finished():
+            time.sleep(self.polling_delay())
+            self.update_status()
+
+
+class PollingScheduler(object):
+    """Polls the long running operations of any number of pollers from a fixed number of threads.
+
+    One thread keeps the time each operation is next due in a heap, and hands due operations to
+    ``max_concurrency`` threads sending the status requests. Polling 5,000 operations therefore takes
+    ``max_concurrency`` + 1 threads rather than 5,000, with at most ``max_concurrency`` requests in flight.
+    Operations are polled again after the delay their last response's Retry-After header gave, or their
+    polling interval.
+
+    Give it to :class:`~azure.core.polling.LROPoller` with the ``polling_scheduler`` keyword argument. Only
+    operations whose polling method is a :class:`~azure.core.polling.StepPollingMethod` are scheduled; others
+    are polled in a thread of their own, as without a scheduler. The threads start with the first operation.
+
+    :keyword int max_concurrency: The maximum number of status requests in flight. Default value is 10.
+    """
+
+    def __init__(self, **kwargs):
+        # type: (**Any) -> None
+        self._max_concurrency = kwargs.pop("max_concurrency", 10)
+        if self._max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self._heap = []  # type: List[Tuple[float, int, LROPoller, Callable[[], None]]]
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._due = queue.Queue()  # type: queue.Queue
+        self._threads = []  # type: List[threading.Thread]
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        # type: () -> int
+        """The number of operations waiting for their next status request."""
+        return len(self._heap)
+
+    def close(self):
+        # type: () -> None
+        """Stop polling, once the status requests in flight complete.
+
+        Pollers of operations still in progress won't complete; wait for them before closing the scheduler.
+        """
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify()
+            del self._heap[:]
+        for _ in range(self._max_concurrency):
+            self._due.put(None)
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join()
+
+    def _schedule(self, poller, update_status, delay):
+        # type: (LROPoller, Callable[[], None], float) -> None
+        with self._condition:
+            if self._closed:
+                raise ValueError("The polling scheduler is closed")
+            if not self._threads:
+                self._start_threads()
+            heapq.heappush(self._heap, (time.time() + delay, next(self._counter), poller, update_status))
+            if self._heap[0][2] is poller:
+                # the scheduler thread may be waiting for a later deadline
+                self._condition.notify()
+
+    def submit(self, poller):
+        # type: (LROPoller) -> None
+        """Poll the operation of a poller created without a scheduler, from now on.
+
+        :param poller: The poller of an operation with a :class:`~azure.core.polling.StepPollingMethod`,
+         which isn't polled yet
+        :type poller: ~azure.core.polling.LROPoller
+        """
+        polling_method = poller._polling_method  # pylint: disable=protected-access
+        self._schedule(poller, with_current_context(polling_method.update_status), polling_method.polling_delay())
+
+    def _start_threads(self):
+        # type: () -> None
+        name = "PollingScheduler({})".format(uuid.uuid4())
+        self._threads.append(threading.Thread(target=self._dispatch, name=name))
+        for index in range(self._max_concurrency):
+            self._threads.append(threading.Thread(target=self._poll, name="{}-{}".format(name, index)))
+        for thread in self._threads:
+            thread.daemon = True
+            thread.start()
+
+    def _dispatch(self):
+        # type: () -> None
+        """Hand operations to the polling threads when they're due."""
+        with self._condition:
+            while not self._closed:
+                if not self._heap:
+                    self._condition.wait()
+                    continue
+                delay = self._heap[0][0] - time.time()
+                if delay > 0:
+                    self._condition.wait(delay)
+                    continue
+                _, _, poller, update_status = heapq.heappop(self._heap)
+                self._due.put((poller, update_status))
+
+    def _poll(self):
+        # type: () -> None
+        while True:
+            item = self._due.get()
+            if item is None:
+                return
+            poller, update_status = item
+            polling_method = poller._polling_method  # pylint: disable=protected-access
+            try:
+                update_status()
+                if not polling_method.finished():
+                    self._schedule(poller, update_status, polling_method.polling_delay())
+                    continue
+                error = None  # type: Optional[Exception]
+            except Exception as err:  # pylint: disable=broad-except
+                error = err
+            poller._finish(error)  # pylint: disable=protected-access
+
+
+def _completed(pollers, timeout):
+    # type: (Iterable[LROPoller], Optional[float]) -> Iterator[LROPoller]
+    pending = set(pollers)  # type: Set[LROPoller]
+    completed = queue.Queue()  # type: queue.Queue
+    for poller in pending:
+        poller.add_done_callback(lambda _, poller=poller: completed.put(poller))
+    deadline = None if timeout is None else time.time() + timeout
+
+    while pending:
+        wait = _DONE_CHECK_INTERVAL
+        if deadline is not None:
+            wait = min(wait, deadline - time.time())
+            if wait <= 0:
+                return
+        try:
+            poller = completed.get(timeout=wait)
+        except queue.Empty:
+            # a callback added while an operation completes may not be called
+            for poller in [poller for poller in pending if poller.done()]:
+                pending.discard(poller)
+                yield poller
+            continue
+        if poller in pending:
+            pending.discard(poller)
+            yield poller
+
+
+def as_completed(pollers, timeout=None):
+    # type: (Iterable[LROPoller], Optional[float]) -> Iterator[LROPoller]
+    """Iterate over pollers as their operations complete, successfully or not.
+
+    :param pollers: The pollers to wait for
+    :type pollers: iterable[~azure.core.polling.LROPoller]
+    :param float timeout: The maximum number of seconds to wait for all of them. Not set by default.
+    :rtype: iterator[~azure.core.polling.LROPoller]
+    :raises ~azure.core.exceptions.AzureError: if operations are still in progress when the timeout elapses
+    """
+    pollers = set(pollers)
+    remaining = len(pollers)
+    for poller in _completed(pollers, timeout):
+        remaining -= 1
+        yield poller
+    if remaining:
+        raise AzureError("{} of {} operations didn't complete within {} seconds".format(
+            remaining, len(pollers), timeout
+        ))
+
+
+def wait_all(pollers, timeout=None):
+    # type: (Iterable[LROPoller], Optional[float]) -> Tuple[Set[LROPoller], Set[LROPoller]]
+    """Wait for the operations of pollers to complete, successfully or not.
+
+    :param pollers: The pollers to wait for
+    :type pollers: iterable[~azure.core.polling.LROPoller]
+    :param float timeout: The maximum number of seconds to wait. Not set by default.
+    :return: The pollers whose operation completed, and those whose operation is still in progress
+    :rtype: tuple[set[~azure.core.polling.LROPoller], set[~azure.core.polling.LROPoller]]
+    """
+    pollers = set(pollers)
+    done = set(_completed(pollers, timeout))
+    return done, pollers - done
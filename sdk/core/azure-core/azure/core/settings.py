@@ -40,7 +40,7 @@ except ImportError:
     TYPE_CHECKING = False
 
 if TYPE_CHECKING:
-    from typing import Any, Union
+    from typing import Any, Tuple, Union
     try:
         # pylint:disable=unused-import
         from azure.core.tracing.ext.opencensus_span import OpenCensusSpan  # pylint:disable=redefined-outer-name
@@ -215,6 +215,7 @@ class PrioritizedSetting(object):
         self._default = default
         self._convert = convert if convert else lambda x: x
         self._user_value = _Unset
+        self._version = 0
 
     def __repr__(self):
         # type () -> str
@@ -273,11 +274,19 @@ class PrioritizedSetting(object):
 
         """
         self._user_value = value
+        self._version += 1
 
     def unset_value(self):
         # () -> None
         """Unset the previous user value such that the priority is reset."""
         self._user_value = _Unset
+        self._version += 1
+
+    @property
+    def version(self):
+        # type: () -> int
+        """A number incremented each time the user value is set or unset."""
+        return self._version
 
     @property
     def env_var(self):
@@ -288,6 +297,36 @@ class PrioritizedSetting(object):
         return self._default
 
 
+class _SettingSnapshot(object):
+    """The value of a setting without a system hook, computed again only when it may have changed.
+
+    That is when the setting's user value is set or unset, or when an environment variable is added or removed,
+    or a module is imported (converting a value may depend on what is imported: opencensus is the default
+    tracing implementation once imported). Changing the value of an existing environment variable isn't
+    noticed until one of these happens.
+
+    Reading it costs a couple of len() calls, which makes it suitable for code running on every SDK call.
+    """
+
+    __slots__ = ("_setting", "_state")
+
+    def __init__(self, setting):
+        # type: (PrioritizedSetting) -> None
+        self._setting = setting
+        self._state = (None, None)  # type: Tuple[Any, Any]
+
+    def __call__(self):
+        # type: () -> Any
+        key = (self._setting.version, len(os.environ), len(sys.modules))
+        # key and value are replaced together, so that concurrent readers never mix them
+        state = self._state
+        if state[0] == key:
+            return state[1]
+        value = self._setting()
+        self._state = (key, value)
+        return value
+
+
 class Settings(object):
     """Settings for globally used Azure configuration values.
 
@@ -438,3 +477,6 @@ settings = Settings()
 
 :type settings: Settings
 """
+
+# read by the tracing decorators and policies on every call, to skip span work when tracing is off
+_tracing_implementation = _SettingSnapshot(Settings.tracing_implementation)
@@ -28,7 +28,7 @@ from contextlib import contextmanager
 import warnings
 
 from ._abstract_span import AbstractSpan
-from ..settings import settings
+from ..settings import _tracing_implementation
 
 
 try:
@@ -77,7 +77,7 @@ def change_context(span):
     :type span: AbstractSpan
     :rtype: contextmanager
     """
-    span_impl_type = settings.tracing_implementation()  # type: Type[AbstractSpan]
+    span_impl_type = _tracing_implementation()  # type: Type[AbstractSpan]
     if span_impl_type is None or span is None:
         yield
     else:
@@ -103,7 +103,7 @@ def with_current_context(func):
     :return: The func wrapped with correct context
     :rtype: callable
     """
-    span_impl_type = settings.tracing_implementation()  # type: Type[AbstractSpan]
+    span_impl_type = _tracing_implementation()  # type: Type[AbstractSpan]
     if span_impl_type is None:
         return func
 
@@ -28,7 +28,7 @@
 import functools
 
 from .common import change_context, get_function_and_class_name
-from ..settings import settings
+from ..settings import _tracing_implementation
 
 try:
     from typing import TYPE_CHECKING
@@ -57,7 +57,7 @@ def distributed_trace(func=None, name_of_span=None):
         merge_span = kwargs.pop('merge_span', False)
         passed_in_parent = kwargs.pop("parent_span", None)
 
-        span_impl_type = settings.tracing_implementation()
+        span_impl_type = _tracing_implementation()
         if span_impl_type is None:
             return func(*args, **kwargs) # type: ignore
 
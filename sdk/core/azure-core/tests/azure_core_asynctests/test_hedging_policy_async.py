@@ -0,0 +1,95 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See LICENSE.txt in the project root for
+# license information.
+# -------------------------------------------------------------------------
+import asyncio
+from unittest import mock
+
+from azure.core.pipeline import AsyncPipeline
+from azure.core.pipeline.policies import AsyncHedgingPolicy
+from azure.core.pipeline.transport import AsyncHttpResponse, AsyncHttpTransport, HttpRequest
+
+import pytest
+
+
+class _Response(AsyncHttpResponse):
+    def __init__(self, request, status_code, tag):
+        super(_Response, self).__init__(request, mock.Mock())
+        self.status_code = status_code
+        self.headers = {"tag": tag}
+
+    def body(self):
+        return b""
+
+
+class _Transport(AsyncHttpTransport):
+    """Answers each request with the next (status, seconds to wait) it was given."""
+
+    def __init__(self, *answers):
+        self._answers = list(answers)
+        self.requests = []
+        self.cancelled = []
+
+    async def __aexit__(self, *args):
+        pass
+
+    async def open(self):
+        pass
+
+    async def close(self):
+        pass
+
+    async def send(self, request, **kwargs):
+        index = len(self.requests)
+        self.requests.append(request)
+        status_code, delay = self._answers[index]
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled.append(index)
+            raise
+        return _Response(request, status_code, str(index))
+
+
+async def _run(policy, transport):
+    request = HttpRequest("GET", "https://account.blob.core.windows.net/container/blob")
+    async with AsyncPipeline(transport, [policy]) as pipeline:
+        return await pipeline.run(request)
+
+
+@pytest.mark.asyncio
+async def test_slow_response_is_hedged_and_loser_cancelled():
+    policy = AsyncHedgingPolicy(hedge_delay=0.01)
+    transport = _Transport((200, 5), (200, 0))
+
+    response = await _run(policy, transport)
+    await asyncio.sleep(0)
+
+    assert response.http_response.headers["tag"] == "1"
+    assert response.http_request is transport.requests[0]
+    assert policy.hedges_sent == policy.hedges_won == 1
+    assert transport.cancelled == [0]
+
+
+@pytest.mark.asyncio
+async def test_fast_response_isnt_hedged():
+    policy = AsyncHedgingPolicy(hedge_delay=5)
+    transport = _Transport((200, 0))
+
+    response = await _run(policy, transport)
+
+    assert response.http_response.headers["tag"] == "0"
+    assert len(transport.requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_hedge_waits_for_the_original():
+    policy = AsyncHedgingPolicy(hedge_delay=0.01)
+    transport = _Transport((200, 0.1), (503, 0))
+
+    response = await _run(policy, transport)
+
+    assert response.http_response.headers["tag"] == "0"
+    assert policy.hedges_sent == 1
+    assert policy.hedges_won == 0
@@ -41,6 +41,55 @@ import trio
 import pytest
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize("fail_on", [None, "request", "response", "transport"])
+async def test_compiled_pipeline_calls_hooks_like_nested_runners(fail_on):
+    class RecordingPolicy(SansIOHTTPPolicy):
+        def __init__(self, name, calls):
+            self.name = name
+            self.calls = calls
+
+        async def on_request(self, request):
+            self.calls.append((self.name, "request"))
+            if fail_on == "request" and self.name == "b":
+                raise ValueError(self.name)
+
+        def on_response(self, request, response):
+            self.calls.append((self.name, "response"))
+            if fail_on == "response" and self.name == "b":
+                raise ValueError(self.name)
+
+        async def on_exception(self, request):
+            self.calls.append((self.name, "exception"))
+            return False
+
+    class Transport(AsyncHttpTransport):
+        async def __aexit__(self, *args):
+            pass
+
+        async def open(self):
+            pass
+
+        async def close(self):
+            pass
+
+        async def send(self, request, **kwargs):
+            if fail_on == "transport":
+                raise ValueError("transport")
+
+    async def run(compiled):
+        calls = []
+        policies = [RecordingPolicy("a", calls), SansIOHTTPPolicy(), RecordingPolicy("b", calls)]
+        pipeline = AsyncPipeline(Transport(), policies, compiled=compiled)
+        try:
+            await pipeline.run(HttpRequest("GET", "https://bing.com"))
+        except ValueError as ex:
+            calls.append(("raised", str(ex)))
+        return calls
+
+    assert await run(compiled=True) == await run(compiled=False)
+
+
 @pytest.mark.asyncio
 async def test_sans_io_exception():
     class BrokenSender(AsyncHttpTransport):
@@ -0,0 +1,52 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See LICENSE.txt in the project root for
+# license information.
+# -------------------------------------------------------------------------
+import asyncio
+import time
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+import pytest
+
+from azure.core.polling import AsyncStepPollingMethod, async_poller
+
+
+class _Steps(AsyncStepPollingMethod):
+    def __init__(self, steps):
+        super(_Steps, self).__init__(polling_interval=5)
+        self._steps = steps
+        self.requests = 0
+
+    def initialize(self, client, initial_response, deserialization_callback):
+        self.set_retry_after(initial_response)
+
+    async def update_status(self):
+        await asyncio.sleep(0)
+        self.requests += 1
+        self.set_retry_after(mock.Mock(headers={"Retry-After": "0.01"}))
+
+    def status(self):
+        return "succeeded" if self.finished() else "running"
+
+    def finished(self):
+        return self.requests >= self._steps
+
+    def resource(self):
+        return self.requests
+
+
+@pytest.mark.asyncio
+async def test_step_polling_honors_retry_after():
+    start = time.time()
+    initial_response = mock.Mock(headers={"Retry-After": "0.05"})
+    results = await asyncio.gather(
+        *[async_poller(None, initial_response, lambda r: r, _Steps(3)) for _ in range(100)]
+    )
+    assert results == [3] * 100
+    # polled every Retry-After seconds, not every polling interval
+    assert time.time() - start < 2
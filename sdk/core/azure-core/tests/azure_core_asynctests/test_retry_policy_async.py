@@ -0,0 +1,76 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See LICENSE.txt in the project root for
+# license information.
+# -------------------------------------------------------------------------
+"""Tests for the async retry policy's shared retry budget"""
+from azure.core.pipeline import AsyncPipeline, PipelineContext, PipelineRequest
+from azure.core.pipeline.policies import AsyncRetryPolicy, RetryBudget, RetryPolicy
+from azure.core.pipeline.transport import AsyncHttpResponse, AsyncHttpTransport, HttpRequest
+
+import pytest
+
+
+class _Response(AsyncHttpResponse):
+    def __init__(self, request, status_code, headers=None):
+        super(_Response, self).__init__(request, None)
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    def body(self):
+        return b""
+
+
+class _Transport(AsyncHttpTransport):
+    def __init__(self, *answers):
+        self._answers = iter(answers)
+        self.sleeps = []
+
+    async def __aexit__(self, *args):
+        pass
+
+    async def open(self):
+        pass
+
+    async def close(self):
+        pass
+
+    async def send(self, request, **kwargs):
+        status_code, headers = next(self._answers)
+        return _Response(request, status_code, headers)
+
+    async def sleep(self, duration):
+        self.sleeps.append(duration)
+
+
+async def _run(budget, transport):
+    policy = AsyncRetryPolicy(retry_budget=budget, retry_backoff_factor=0)
+    return await AsyncPipeline(transport, [policy]).run(
+        HttpRequest("GET", "https://account.blob.core.windows.net/container")
+    )
+
+
+@pytest.mark.asyncio
+async def test_retries_spend_tokens_until_denied():
+    budget = RetryBudget(max_tokens=1)
+
+    response = await _run(budget, _Transport((500, None), (500, None), (200, None)))
+
+    assert response.http_response.status_code == 500
+    assert budget.retries_spent == 1
+    assert budget.retries_denied == 1
+
+
+@pytest.mark.asyncio
+async def test_throttled_host_holds_back_sync_and_async_requests():
+    budget = RetryBudget()
+    await _run(budget, _Transport((429, {"Retry-After": "30"}), (200, None)))
+
+    transport = _Transport((200, None))
+    await _run(budget, transport)
+    assert len(transport.sleeps) == 1
+    assert 29 < transport.sleeps[0] <= 30
+
+    # a sync policy sharing the budget sees the same hold back
+    request = PipelineRequest(HttpRequest("GET", "https://account.blob.core.windows.net/blob"), PipelineContext(None))
+    assert 29 < RetryPolicy(retry_budget=budget)._hold_back(request) <= 30
@@ -0,0 +1,37 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See LICENSE.txt in the project root for
+# license information.
+# -------------------------------------------------------------------------
+from unittest import mock
+
+from azure.core.pipeline.transport import AioHttpTransport, AsyncioRequestsTransport, HttpRequest
+from azure.core.pipeline.transport._base import _SSLContextCache
+import pytest
+
+
+@pytest.mark.asyncio
+async def test_aiohttp_transport_reuses_ssl_context(tls_server):
+    url, ca_path = tls_server
+    create = mock.Mock(wraps=_SSLContextCache._create)
+    with mock.patch.object(_SSLContextCache, "_create", create):
+        async with AioHttpTransport(connection_verify=ca_path) as transport:
+            for _ in range(3):
+                response = await transport.send(HttpRequest("GET", url))
+                assert response.body() == b"ok"
+            # the same context lets aiohttp reuse its pooled connection
+            connections = transport.session.connector._conns
+            assert sum(len(pooled) for pooled in connections.values()) == 1
+    create.assert_called_once_with(None, ca_path, True)
+
+
+@pytest.mark.asyncio
+async def test_asyncio_requests_transport_reuses_ssl_context(tls_server):
+    url, ca_path = tls_server
+    create = mock.Mock(wraps=_SSLContextCache._create)
+    with mock.patch.object(_SSLContextCache, "_create", create):
+        async with AsyncioRequestsTransport(connection_verify=ca_path) as transport:
+            for _ in range(2):
+                response = await transport.send(HttpRequest("GET", url))
+                assert response.body() == b"ok"
+    create.assert_called_once_with(None, ca_path, False)
@@ -25,7 +25,96 @@
 # --------------------------------------------------------------------------
 import sys
 
-# Ignore collection of async tests for Python 2
+import pytest
+
+# Ignore collection of async tests and performance tests for Python 2
 collect_ignore = []
 if sys.version_info < (3, 5):
     collect_ignore.append("azure_core_asynctests")
+    collect_ignore.append("perfstress_tests")
+
+
+def _write_certificates(directory):
+    """Writes a CA certificate, and a certificate and key it issued for 127.0.0.1, to directory."""
+    import datetime
+    import ipaddress
+    import os
+    from cryptography import x509
+    from cryptography.hazmat.backends import default_backend
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from cryptography.x509.oid import NameOID
+
+    def build(subject, issuer, public_key, signing_key, ca):
+        now = datetime.datetime.utcnow()
+        builder = (
+            x509.CertificateBuilder()
+            .subject_name(x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, subject)]))
+            .issuer_name(x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, issuer)]))
+            .public_key(public_key)
+            .serial_number(x509.random_serial_number())
+            .not_valid_before(now - datetime.timedelta(days=1))
+            .not_valid_after(now + datetime.timedelta(days=1))
+            .add_extension(x509.BasicConstraints(ca=ca, path_length=None), critical=True)
+        )
+        if not ca:
+            builder = builder.add_extension(
+                x509.SubjectAlternativeName([x509.IPAddress(ipaddress.ip_address(u"127.0.0.1"))]), critical=False
+            )
+        return builder.sign(signing_key, hashes.SHA256(), default_backend())
+
+    ca_key = ec.generate_private_key(ec.SECP256R1(), default_backend())
+    ca_cert = build(u"azure-core test CA", u"azure-core test CA", ca_key.public_key(), ca_key, ca=True)
+    server_key = ec.generate_private_key(ec.SECP256R1(), default_backend())
+    server_cert = build(u"127.0.0.1", u"azure-core test CA", server_key.public_key(), ca_key, ca=False)
+
+    paths = [os.path.join(directory, name) for name in ("ca.pem", "server.pem", "server.key")]
+    with open(paths[0], "wb") as f:
+        f.write(ca_cert.public_bytes(serialization.Encoding.PEM))
+    with open(paths[1], "wb") as f:
+        f.write(server_cert.public_bytes(serialization.Encoding.PEM))
+    with open(paths[2], "wb") as f:
+        f.write(server_key.private_bytes(
+            serialization.Encoding.PEM, serialization.PrivateFormat.TraditionalOpenSSL, serialization.NoEncryption()
+        ))
+    return paths
+
+
+@pytest.fixture
+def tls_server(tmpdir):
+    """An HTTPS server on 127.0.0.1 answering b"ok", with the path of the CA bundle that trusts it"""
+    pytest.importorskip("cryptography")
+    if sys.version_info < (3, 5):
+        pytest.skip("Uses the Python 3 http.server")
+    import ssl
+    import threading
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+
+    ca_path, cert_path, key_path = _write_certificates(str(tmpdir))
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"ok")
+
+        def log_message(self, *args):
+            pass
+
+    class Server(ThreadingMixIn, HTTPServer):
+        daemon_threads = True
+
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert_path, key_path)
+    httpd = Server(("127.0.0.1", 0), Handler)
+    httpd.socket = context.wrap_socket(httpd.socket, server_side=True)
+    thread = threading.Thread(target=httpd.serve_forever)
+    thread.daemon = True
+    thread.start()
+    yield "https://127.0.0.1:{}".format(httpd.server_address[1]), ca_path
+    httpd.shutdown()
+    httpd.server_close()
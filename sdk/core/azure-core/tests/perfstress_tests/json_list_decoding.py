@@ -0,0 +1,66 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See LICENSE.txt in the project root for
+# license information.
+# -------------------------------------------------------------------------
+"""Decodes a large JSON list page item by item, as ContentDecodePolicy does with stream_items, or at once.
+
+The page has --items Key Vault like items, read in 4 KiB chunks. Compare runs with and without --at-once, for
+throughput and peak memory: the chunks are held by the test, so the difference is what decoding allocates.
+
+Usage, from the root of this package, with azure-devtools installed:
+    perfstress JsonListDecodingTest --mode process [--items 5000] [--at-once]
+"""
+import json
+
+from azure.core.pipeline.policies._json_stream import JsonItemStream
+from azure_devtools.perfstress_tests import PerfStressTest
+
+CHUNK_SIZE = 4096
+
+
+def _page(items):
+    return json.dumps({
+        "value": [
+            {
+                "kid": "https://vault.vault.azure.net/keys/key-{}".format(i),
+                "attributes": {"enabled": True, "created": 1575000000 + i, "updated": 1575000000 + i,
+                               "recoveryLevel": "Recoverable+Purgeable"},
+                "tags": {"team": "inventory", "index": str(i)},
+                "managed": False,
+            }
+            for i in range(items)
+        ],
+        "nextLink": "https://vault.vault.azure.net/keys?api-version=7.0&$skiptoken=abc",
+    }).encode("utf-8")
+
+
+def _at_once(chunks):
+    body = b"".join(chunks)
+    page = json.loads(body.decode("utf-8-sig"))
+    del body
+    count = sum(1 for _ in page["value"])
+    return count, page["nextLink"]
+
+
+def _item_by_item(chunks):
+    stream = JsonItemStream(chunks, "value")
+    count = sum(1 for _ in stream)
+    return count, stream.members["nextLink"]
+
+
+class JsonListDecodingTest(PerfStressTest):
+    def __init__(self, arguments):
+        super(JsonListDecodingTest, self).__init__(arguments)
+        data = _page(arguments.items)
+        self.chunks = [data[i:i + CHUNK_SIZE] for i in range(0, len(data), CHUNK_SIZE)]
+        self.decode = _at_once if arguments.at_once else _item_by_item
+
+    def run_sync(self):
+        self.decode(iter(self.chunks))
+
+    @staticmethod
+    def add_arguments(parser):
+        parser.add_argument("--items", type=int, default=5000, help="Items in the page. Default 5000.")
+        parser.add_argument("--at-once", action="store_true",
+                            help="Decode the whole page at once, as ContentDecodePolicy does without stream_items.")
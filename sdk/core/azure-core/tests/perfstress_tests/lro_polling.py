@@ -0,0 +1,90 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See LICENSE.txt in the project root for
+# license information.
+# -------------------------------------------------------------------------
+"""Polls many long running operations to completion, with a thread each or with a PollingScheduler.
+
+Each operation starts --operations long running operations, which complete after --steps status requests
+taking --latency seconds each, answered with a Retry-After of --retry-after seconds. Compare runs with and
+without --scheduler, for throughput and peak memory.
+
+Usage, from the root of this package, with azure-devtools installed:
+    perfstress LroPollingTest --duration 30 [--operations 2000] [--scheduler] [--max-concurrency 16]
+"""
+import time
+
+from azure.core.polling import LROPoller, PollingScheduler, StepPollingMethod, wait_all
+from azure_devtools.perfstress_tests import PerfStressTest
+
+
+class _Response(object):  # pylint: disable=too-few-public-methods
+    def __init__(self, retry_after):
+        self.headers = {"Retry-After": str(retry_after)}
+
+
+class _Operation(StepPollingMethod):
+    def __init__(self, steps, latency, retry_after):
+        super(_Operation, self).__init__()
+        self._steps = steps
+        self._latency = latency
+        self._response = _Response(retry_after)
+        self._requests = 0
+
+    def initialize(self, client, initial_response, deserialization_callback):
+        self.set_retry_after(initial_response)
+
+    def update_status(self):
+        time.sleep(self._latency)
+        self._requests += 1
+        self.set_retry_after(self._response)
+
+    def status(self):
+        return "succeeded" if self.finished() else "running"
+
+    def finished(self):
+        return self._requests >= self._steps
+
+    def resource(self):
+        return self._requests
+
+
+class LroPollingTest(PerfStressTest):
+    def __init__(self, arguments):
+        super(LroPollingTest, self).__init__(arguments)
+        self.scheduler = None
+        if arguments.scheduler:
+            self.scheduler = PollingScheduler(max_concurrency=arguments.max_concurrency)
+
+    async def close(self):
+        if self.scheduler:
+            self.scheduler.close()
+
+    def run_sync(self):
+        args = self.args
+        pollers = [
+            LROPoller(
+                None,
+                _Response(args.retry_after),
+                None,
+                _Operation(args.steps, args.latency, args.retry_after),
+                polling_scheduler=self.scheduler,
+            )
+            for _ in range(args.operations)
+        ]
+        wait_all(pollers)
+
+    @staticmethod
+    def add_arguments(parser):
+        parser.add_argument("--operations", type=int, default=2000,
+                            help="Operations polled at once. Default 2000.")
+        parser.add_argument("--steps", type=int, default=3,
+                            help="Status requests until an operation completes. Default 3.")
+        parser.add_argument("--latency", type=float, default=0.002,
+                            help="Seconds each status request takes. Default 0.002.")
+        parser.add_argument("--retry-after", type=float, default=0.5,
+                            help="Seconds between the status requests of an operation. Default 0.5.")
+        parser.add_argument("--scheduler", action="store_true",
+                            help="Poll from a PollingScheduler, instead of a thread per operation.")
+        parser.add_argument("--max-concurrency", type=int, default=16,
+                            help="Threads of the PollingScheduler. Default 16.")
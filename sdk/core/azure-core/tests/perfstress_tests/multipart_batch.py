@@ -0,0 +1,130 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See LICENSE.txt in the project root for
+# license information.
+# -------------------------------------------------------------------------
+"""Builds or parses a 256 part storage batch (bulk delete), the largest batch storage accepts.
+
+With --stdlib, the batch is built or parsed with the "email" package, as the pipeline did before it had a
+dedicated multipart encoder and decoder.
+
+Usage, from the root of this package, with azure-devtools installed:
+    perfstress MultipartBatchTest --operation decode [--parts 256] [--stdlib]
+"""
+from email import message_from_bytes
+from email.message import Message
+from email.policy import HTTP
+
+from azure.core.pipeline import Pipeline
+from azure.core.pipeline.policies import HeadersPolicy
+from azure.core.pipeline.transport import HttpRequest, HttpResponse, HttpTransport
+from azure.core.pipeline.transport._base import (
+    BytesIOSocket,
+    HttpClientTransportResponse,
+    _HTTPResponse,
+    _serialize_request,
+)
+from azure_devtools.perfstress_tests import PerfStressTest
+
+
+class _NoTransport(HttpTransport):
+    def __exit__(self, *args):
+        pass
+
+    def open(self):
+        pass
+
+    def close(self):
+        pass
+
+    def send(self, request, **kwargs):
+        pass
+
+
+class _BatchResponse(HttpResponse):
+    def __init__(self, request, body, content_type):
+        super(_BatchResponse, self).__init__(request, None)
+        self._body = body
+        self.content_type = content_type
+
+    def body(self):
+        return self._body
+
+
+def _batch_request(parts):
+    request = HttpRequest("POST", "https://account.blob.core.windows.net/container?restype=container&comp=batch")
+    request.set_multipart_mixed(
+        *[HttpRequest("DELETE", "/container/blob{}".format(i)) for i in range(parts)],
+        policies=[HeadersPolicy({"x-ms-date": "Thu, 14 Jun 2018 16:46:54 GMT", "x-ms-version": "2019-02-02"})]
+    )
+    return request
+
+
+def _batch_response(request, parts):
+    boundary = "batchresponse_66925647-d0cb-4109-b6d3-28efe3e1e5ed"
+    body = b"".join(
+        b"--" + boundary.encode("ascii") + b"\r\n"
+        b"Content-Type: application/http\r\n"
+        b"Content-ID: " + str(i).encode("ascii") + b"\r\n"
+        b"\r\n"
+        b"HTTP/1.1 202 Accepted\r\n"
+        b"x-ms-delete-type-permanent: true\r\n"
+        b"x-ms-request-id: 778fdc83-801e-0000-62ff-0334671e284f\r\n"
+        b"x-ms-version: 2019-02-02\r\n"
+        b"\r\n"
+        for i in range(parts)
+    ) + b"--" + boundary.encode("ascii") + b"--"
+    return _BatchResponse(request, body, "multipart/mixed; boundary=" + boundary)
+
+
+def _stdlib_encode(request):
+    message = Message()
+    message.add_header("Content-Type", "multipart/mixed")
+    for i, req in enumerate(request.multipart_mixed_info[0]):
+        part = Message()
+        part.add_header("Content-Type", "application/http")
+        part.add_header("Content-Transfer-Encoding", "binary")
+        part.add_header("Content-ID", str(i))
+        part.set_payload(_serialize_request(req))
+        message.attach(part)
+    return message.as_bytes(policy=HTTP)
+
+
+def _stdlib_decode(response):
+    message = message_from_bytes(
+        b"Content-Type: " + response.content_type.encode("ascii") + b"\r\n\r\n" + response.body()
+    )
+    responses = []
+    for request, part in zip(response.request.multipart_mixed_info[0], message.get_payload()):
+        http_response = _HTTPResponse(BytesIOSocket(part.get_payload(decode=True)), method=request.method)
+        http_response.begin()
+        responses.append(HttpClientTransportResponse(request, http_response))
+    return responses
+
+
+class MultipartBatchTest(PerfStressTest):
+    def __init__(self, arguments):
+        super(MultipartBatchTest, self).__init__(arguments)
+        self.pipeline = Pipeline(_NoTransport())
+        request = _batch_request(arguments.parts)
+        # running the request prepares its parts, as sending the batch would
+        self.pipeline.run(request)
+        self.response = _batch_response(request, arguments.parts)
+
+    def run_sync(self):
+        if self.args.operation == "encode":
+            if self.args.stdlib:
+                _stdlib_encode(_batch_request(self.args.parts))
+            else:
+                self.pipeline.run(_batch_request(self.args.parts))
+        elif self.args.stdlib:
+            _stdlib_decode(self.response)
+        else:
+            self.response.parts()
+
+    @staticmethod
+    def add_arguments(parser):
+        parser.add_argument("--operation", choices=("encode", "decode"), default="encode",
+                            help="Build the batch request, or parse the batch response. Default encode.")
+        parser.add_argument("--parts", type=int, default=256, help="Requests in the batch. Default 256.")
+        parser.add_argument("--stdlib", action="store_true", help="Use the email package of the standard library.")
@@ -0,0 +1,86 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See LICENSE.txt in the project root for
+# license information.
+# -------------------------------------------------------------------------
+"""Runs a request through the policies a storage client uses, with a transport answering in memory.
+
+Compare runs with and without --compiled for the cost of nesting the policies, and with --metrics for the
+cost of recording metrics.
+
+Usage, from the root of this package, with azure-devtools installed:
+    perfstress PipelineRunTest --parallel 4 --mode asyncio [--compiled] [--metrics]
+"""
+from azure.core.pipeline import AsyncPipeline, Pipeline
+from azure.core.pipeline.policies import (
+    AsyncRedirectPolicy,
+    AsyncRetryPolicy,
+    ContentDecodePolicy,
+    CustomHookPolicy,
+    DistributedTracingPolicy,
+    HeadersPolicy,
+    HttpLoggingPolicy,
+    MetricsPolicy,
+    NetworkTraceLoggingPolicy,
+    ProxyPolicy,
+    RedirectPolicy,
+    RetryPolicy,
+    SansIOHTTPPolicy,
+    UserAgentPolicy,
+)
+from azure.core.pipeline.transport import HttpRequest
+from azure_devtools.perfstress_tests import PerfStressTest
+from azure_devtools.perfstress_tests.mock_transport import AsyncMockTransport, MockTransport
+
+
+_URL = "https://account.queue.core.windows.net/queue/messages"
+
+
+class _SharedKeyPolicy(SansIOHTTPPolicy):
+    # stands in for storage's authentication policy
+    def on_request(self, request):
+        request.http_request.headers["Authorization"] = "SharedKey account:signature"
+
+
+def _respond(request):  # pylint: disable=unused-argument
+    return 200, {"x-ms-request-id": "778fdc83-801e-0000-62ff-0334671e284f", "Content-Length": "0"}, b""
+
+
+def _policies(retry_policy, redirect_policy, metrics):
+    policies = [
+        HeadersPolicy({"x-ms-version": "2019-02-02"}),
+        ProxyPolicy(),
+        UserAgentPolicy(sdk_moniker="storage-queue/12.0.0"),
+        _SharedKeyPolicy(),
+        ContentDecodePolicy(),
+        redirect_policy,
+        retry_policy,
+        CustomHookPolicy(),
+        NetworkTraceLoggingPolicy(),
+        DistributedTracingPolicy(),
+        HttpLoggingPolicy(),
+    ]
+    if metrics:
+        policies.insert(5, MetricsPolicy())  # before redirect and retry
+    return policies
+
+
+class PipelineRunTest(PerfStressTest):
+    def __init__(self, arguments):
+        super(PipelineRunTest, self).__init__(arguments)
+        self.pipeline = Pipeline(
+            MockTransport(_respond), _policies(RetryPolicy(), RedirectPolicy(), arguments.metrics), compiled=arguments.compiled)
+        self.async_pipeline = AsyncPipeline(
+            AsyncMockTransport(_respond), _policies(AsyncRetryPolicy(), AsyncRedirectPolicy(), arguments.metrics),
+            compiled=arguments.compiled)
+
+    def run_sync(self):
+        self.pipeline.run(HttpRequest("GET", _URL))
+
+    async def run_async(self):
+        await self.async_pipeline.run(HttpRequest("GET", _URL))
+
+    @staticmethod
+    def add_arguments(parser):
+        parser.add_argument("--compiled", action="store_true", help="Run the policies as a compiled pipeline.")
+        parser.add_argument("--metrics", action="store_true", help="Add a MetricsPolicy to the policies.")
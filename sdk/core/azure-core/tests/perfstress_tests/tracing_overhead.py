@@ -0,0 +1,59 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See LICENSE.txt in the project root for
+# license information.
+# -------------------------------------------------------------------------
+"""Measures the cost of tracing code when no tracing implementation is configured.
+
+Each operation makes --calls calls of one of: a lookup of the tracing setting, a lookup of its cached
+snapshot, a plain method, the same method decorated with distributed_trace, or
+DistributedTracingPolicy.on_request. Compare the operations per second of the calls.
+
+Usage, from the root of this package, with azure-devtools installed:
+    perfstress TracingOverheadTest --call distributed_trace [--calls 1000]
+"""
+from azure.core.pipeline import PipelineContext, PipelineRequest
+from azure.core.pipeline.policies import DistributedTracingPolicy
+from azure.core.pipeline.transport import HttpRequest
+from azure.core.settings import settings, _tracing_implementation
+from azure.core.tracing.decorator import distributed_trace
+from azure_devtools.perfstress_tests import PerfStressTest
+
+
+class _Client(object):
+    def get(self, name, **kwargs):  # pylint: disable=unused-argument
+        return name
+
+    @distributed_trace
+    def traced_get(self, name, **kwargs):  # pylint: disable=unused-argument
+        return name
+
+
+class TracingOverheadTest(PerfStressTest):
+    def __init__(self, arguments):
+        super(TracingOverheadTest, self).__init__(arguments)
+        if settings.tracing_implementation() is not None:
+            raise ValueError("Unset AZURE_SDK_TRACING_IMPLEMENTATION and don't import opencensus.")
+        client = _Client()
+        policy = DistributedTracingPolicy()
+        request = PipelineRequest(HttpRequest("GET", "https://account.blob.core.windows.net/"), PipelineContext(None))
+        self.call = {
+            "setting": settings.tracing_implementation,
+            "snapshot": _tracing_implementation,
+            "plain": lambda: client.get("key"),
+            "distributed_trace": lambda: client.traced_get("key"),
+            "policy": lambda: policy.on_request(request),
+        }[arguments.call]
+
+    def run_sync(self):
+        call = self.call
+        for _ in range(self.args.calls):
+            call()
+
+    @staticmethod
+    def add_arguments(parser):
+        parser.add_argument("--call", default="distributed_trace",
+                            choices=("setting", "snapshot", "plain", "distributed_trace", "policy"),
+                            help="What to call. Default distributed_trace.")
+        parser.add_argument("--calls", type=int, default=1000,
+                            help="Calls in each operation, so that the runner's own cost is negligible. Default 1000.")
@@ -0,0 +1,185 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See LICENSE.txt in the project root for
+# license information.
+# -------------------------------------------------------------------------
+import threading
+import time
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+from azure.core.pipeline import Pipeline
+from azure.core.pipeline.policies import HedgingPolicy, SansIOHTTPPolicy
+from azure.core.pipeline.transport import HttpRequest, HttpResponse, HttpTransport
+
+import pytest
+
+
+class _Response(HttpResponse):
+    def __init__(self, request, status_code, tag):
+        super(_Response, self).__init__(request, mock.Mock())
+        self.status_code = status_code
+        self.headers = {"tag": tag}
+
+    def body(self):
+        return b""
+
+
+class _Transport(HttpTransport):
+    """Answers each request with the next (status, seconds to wait) it was given."""
+
+    def __init__(self, *answers):
+        self._answers = list(answers)
+        self._lock = threading.Lock()
+        self.requests = []
+        self.responses = []
+        self.release = threading.Event()
+
+    def __exit__(self, *args):
+        pass
+
+    def open(self):
+        pass
+
+    def close(self):
+        pass
+
+    def send(self, request, **kwargs):
+        with self._lock:
+            index = len(self.requests)
+            self.requests.append(request)
+        status_code, delay = self._answers[index]
+        if delay is None:
+            # blocks until the test releases it
+            self.release.wait(5)
+        elif delay:
+            self.release.wait(delay)
+        response = _Response(request, status_code, str(index))
+        self.responses.append(response)
+        return response
+
+
+class _Counter(SansIOHTTPPolicy):
+    """Stands in for policies that modify each attempt, like authentication"""
+
+    def on_request(self, request):
+        request.http_request.headers["x-attempt"] = request.http_request.headers.get("x-attempt", "") + "+"
+
+
+def _run(policy, transport, method="GET"):
+    request = HttpRequest(method, "https://account.blob.core.windows.net/container/blob")
+    with Pipeline(transport, [policy, _Counter()]) as pipeline:
+        return pipeline.run(request)
+
+
+def test_fast_response_isnt_hedged():
+    policy = HedgingPolicy(hedge_delay=5)
+    transport = _Transport((200, 0))
+
+    response = _run(policy, transport)
+
+    assert response.http_response.headers["tag"] == "0"
+    assert len(transport.requests) == 1
+    assert policy.hedges_sent == 0
+    policy.close()
+
+
+def test_slow_response_is_hedged_and_loser_closed():
+    policy = HedgingPolicy(hedge_delay=0.01)
+    transport = _Transport((200, None), (200, 0))
+
+    response = _run(policy, transport)
+    assert response.http_response.headers["tag"] == "1"
+    assert policy.hedges_sent == policy.hedges_won == 1
+    # each copy went through the rest of the pipeline on its own
+    assert [r.headers["x-attempt"] for r in transport.requests] == ["+", "+"]
+    assert transport.requests[0] is not transport.requests[1]
+    # the winning response is returned for the original request
+    assert response.http_request is transport.requests[0]
+
+    transport.release.set()
+    policy.close()
+    primary = transport.responses[1]
+    assert primary.headers["tag"] == "0"
+    assert primary.internal_response.close.call_count == 1
+    assert transport.responses[0].internal_response.close.call_count == 0
+
+
+def test_failed_hedge_waits_for_the_original():
+    policy = HedgingPolicy(hedge_delay=0.01)
+    transport = _Transport((200, 0.2), (503, 0))
+
+    response = _run(policy, transport)
+
+    assert response.http_response.headers["tag"] == "0"
+    assert policy.hedges_sent == 1
+    assert policy.hedges_won == 0
+    policy.close()
+
+
+def test_both_failing_returns_the_original_response():
+    policy = HedgingPolicy(hedge_delay=0.01)
+    transport = _Transport((500, 0.1), (503, 0))
+
+    response = _run(policy, transport)
+
+    assert response.http_response.status_code == 500
+    assert transport.responses[0].internal_response.close.call_count == 1
+    policy.close()
+
+
+def test_writes_arent_hedged():
+    policy = HedgingPolicy(hedge_delay=0)
+    transport = _Transport((201, 0.05))
+
+    _run(policy, transport, method="PUT")
+
+    assert len(transport.requests) == 1
+    policy.close()
+
+
+def test_hedges_are_capped_per_host():
+    policy = HedgingPolicy(hedge_delay=0.01, max_hedge_burst=1, hedge_ratio=0.5)
+    transport = _Transport((200, 0.1), (200, 0.1), (200, 0.1), (200, 0.1))
+
+    _run(policy, transport)  # hedged: the budget starts full
+    _run(policy, transport)  # budget at 0.5: not hedged
+    assert policy.hedges_sent == 1
+    assert policy.hedges_denied == 1
+
+    transport.release.set()
+    policy.close()
+
+
+def test_concurrent_requests_dont_wait_for_threads():
+    # more concurrent requests than idle threads kept: none should queue, so none looks slow enough to hedge
+    policy = HedgingPolicy(hedge_delay=0.5, max_idle_threads=4)
+    transport = _Transport(*[(200, 0.3)] * 16)
+    callers = [threading.Thread(target=_run, args=(policy, transport)) for _ in range(16)]
+
+    start = time.time()
+    for caller in callers:
+        caller.start()
+    for caller in callers:
+        caller.join()
+
+    assert time.time() - start < 0.5
+    assert len(transport.requests) == 16
+    assert policy.hedges_sent == 0
+    policy.close()
+    assert not [t for t in threading.enumerate() if t.name == "HedgingPolicy"]
+
+
+def test_percentile_delay():
+    policy = HedgingPolicy(hedge_delay=1, hedge_percentile=90)
+    stats = policy._host_stats(mock.Mock(http_request=HttpRequest("GET", "https://host/")))
+    # not enough samples yet
+    stats.latencies.extend([0.5] * 9)
+    assert policy._get_hedge_delay(stats) == 1
+
+    stats.latencies.clear()
+    stats.latencies.extend([i / 100.0 for i in range(1, 101)])
+    assert policy._get_hedge_delay(stats) == pytest.approx(0.9, abs=0.01)
@@ -0,0 +1,166 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See LICENSE.txt in the project root for
+# license information.
+# -------------------------------------------------------------------------
+import io
+import json
+
+import pytest
+import requests
+
+from azure.core.exceptions import DecodeError
+from azure.core.paging import ItemPaged
+from azure.core.pipeline import Pipeline
+from azure.core.pipeline.policies import ContentDecodePolicy
+from azure.core.pipeline.policies._json_stream import JsonItemStream
+from azure.core.pipeline.transport import HttpRequest, HttpTransport, RequestsTransportResponse
+
+BODY = {
+    "value": [{"id": i, "name": u"item-é-{}".format(i), "tags": [1.5, None, True]} for i in range(50)],
+    "nextLink": "https://vault.azure.net/keys?page=2",
+    "count": 50,
+}
+
+
+def _chunks(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("size", [1, 2, 7, 64, 100000])
+def test_items_and_members(size):
+    data = b"\xef\xbb\xbf" + json.dumps(BODY, indent=1, ensure_ascii=False).encode("utf-8")
+    stream = JsonItemStream(_chunks(data, size), "value")
+    assert list(stream) == BODY["value"]
+    assert stream.members == {"nextLink": BODY["nextLink"], "count": 50}
+
+
+def test_members_before_the_array_are_available_while_iterating():
+    stream = JsonItemStream([b'{"@nextLink": "next", "items": [1, 2, 3]}'], "items")
+    assert next(stream) == 1
+    assert stream.members == {"@nextLink": "next"}
+    assert list(stream) == [2, 3]
+
+
+def test_members_after_the_array_keep_remaining_items():
+    stream = JsonItemStream(_chunks(b'{"value": [10, 20, 30], "nextLink": null}', 3), "value")
+    assert next(stream) == 10
+    assert stream.members == {"nextLink": None}
+    assert list(stream) == [20, 30]
+
+
+def test_numbers_split_across_chunks():
+    stream = JsonItemStream([b'{"value": [12', b"34, 5", b"6]}"], "value")
+    assert list(stream) == [1234, 56]
+
+
+def test_body_split_at_every_offset():
+    data = (
+        u'{"odata.count":12.5,"value":[1.5,-0.25,1e5,2.5E-3,-7,120,0,"é",true,null,{"n":[3.0e+2]}],'
+        u'"total":-1.0E+10,"ok":false}'
+    ).encode("utf-8")
+    expected = json.loads(data.decode("utf-8"))
+    for offset in range(len(data) + 1):
+        stream = JsonItemStream([data[:offset], data[offset:]], "value")
+        assert list(stream) == expected["value"], offset
+        assert stream.members == {"odata.count": 12.5, "total": -1.0e10, "ok": False}, offset
+
+
+@pytest.mark.parametrize("data", [b"", b"{}", b'{"value": []}', b'{"value": null}'])
+def test_no_items(data):
+    assert list(JsonItemStream([data], "value")) == []
+
+
+@pytest.mark.parametrize("data", [
+    b'{"value": [1, 2',
+    b'{"value": [1 2]}',
+    b'{"value": [1], }',
+    b'[1, 2]',
+    b'{"value": [1]} extra',
+    b'{1: [1]}',
+])
+def test_invalid_json(data):
+    stream = JsonItemStream(_chunks(data, 4), "value")
+    with pytest.raises(DecodeError):
+        list(stream)
+        stream.members
+
+
+class _Transport(HttpTransport):
+    def __init__(self, status_code=200, content_type="application/json", data=None):
+        self.status_code = status_code
+        self.content_type = content_type
+        self.data = data if data is not None else json.dumps(BODY).encode("utf-8")
+        self.options = None
+
+    def __exit__(self, *args):
+        pass
+
+    def open(self):
+        pass
+
+    def close(self):
+        pass
+
+    def send(self, request, **kwargs):
+        self.options = kwargs
+        response = requests.Response()
+        response.status_code = self.status_code
+        response.headers["content-type"] = self.content_type
+        response.raw = io.BytesIO(self.data)
+        if not kwargs.get("stream"):
+            response._content = self.data
+        return RequestsTransportResponse(request, response, block_size=16)
+
+
+def _run(transport, **kwargs):
+    with Pipeline(transport, [ContentDecodePolicy()]) as pipeline:
+        response = pipeline.run(HttpRequest("GET", "https://vault.azure.net/keys"), **kwargs)
+    return response.context[ContentDecodePolicy.CONTEXT_NAME]
+
+
+def test_policy_streams_items():
+    transport = _Transport()
+    stream = _run(transport, stream=False, stream_items="value")
+    assert transport.options["stream"] is True
+    assert "stream_items" not in transport.options
+    assert isinstance(stream, JsonItemStream)
+    assert list(stream) == BODY["value"]
+    assert stream.members["nextLink"] == BODY["nextLink"]
+
+
+def test_policy_decodes_errors_at_once():
+    data = b'{"error": {"code": "NotFound"}}'
+    assert _run(_Transport(404, data=data), stream=False, stream_items="value") == json.loads(data.decode())
+    xml = _run(_Transport(content_type="application/xml", data=b"<groot/>"), stream=False, stream_items="value")
+    assert xml.tag == "groot"
+
+
+def test_policy_without_stream_items():
+    transport = _Transport()
+    assert _run(transport, stream=False) == BODY
+    assert transport.options["stream"] is False
+
+
+def test_paging_with_lazy_continuation_token():
+    pages = {
+        None: b'{"value": [1, 2], "nextLink": "page2"}',
+        "page2": b'{"value": [3], "nextLink": null}',
+    }
+
+    def get_next(continuation_token):
+        return JsonItemStream(_chunks(pages[continuation_token], 5), "value")
+
+    def extract_data(stream):
+        return lambda: stream.members.get("nextLink"), stream
+
+    assert list(ItemPaged(get_next, extract_data)) == [1, 2, 3]
+
+    page_iterator = ItemPaged(get_next, extract_data).by_page()
+    first_page = next(page_iterator)
+    assert page_iterator.continuation_token == "page2"
+    assert list(first_page) == [1, 2]
+    assert list(next(page_iterator)) == [3]
+    assert page_iterator.continuation_token is None
+    with pytest.raises(StopIteration):
+        next(page_iterator)
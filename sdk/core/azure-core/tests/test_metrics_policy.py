@@ -0,0 +1,181 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See LICENSE.txt in the project root for
+# license information.
+# -------------------------------------------------------------------------
+import threading
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+from azure.core.exceptions import ServiceRequestError
+from azure.core.pipeline import Pipeline
+from azure.core.pipeline.policies import (
+    HistogramMetricsSink,
+    MetricsKey,
+    MetricsPolicy,
+    MetricsSink,
+    OperationMetrics,
+    RetryPolicy,
+)
+from azure.core.pipeline.policies._metrics import _bucket, _Histogram
+from azure.core.pipeline.transport import HttpRequest, HttpResponse, HttpTransport
+
+import pytest
+
+
+class _Response(HttpResponse):
+    def __init__(self, request, status_code, content_length):
+        super(_Response, self).__init__(request, mock.Mock())
+        self.status_code = status_code
+        self.headers = {"Content-Length": str(content_length)}
+
+    def body(self):
+        return b""
+
+
+class _Transport(HttpTransport):
+    """Answers with the given status codes in turn, raising for None."""
+
+    def __init__(self, *status_codes):
+        self._status_codes = list(status_codes)
+        self.connection_stats = mock.Mock(opened=1, reused=3, discarded=0)
+
+    def __exit__(self, *args):
+        pass
+
+    def open(self):
+        pass
+
+    def close(self):
+        pass
+
+    def send(self, request, **kwargs):
+        status_code = self._status_codes.pop(0)
+        if status_code is None:
+            raise ServiceRequestError("connection failed")
+        return _Response(request, status_code, 10)
+
+
+def _run(pipeline, method="GET", data=None):
+    request = HttpRequest(method, "https://account.blob.core.windows.net/container/blob")
+    if data is not None:
+        request.set_bytes_body(data)
+    return pipeline.run(request)
+
+
+def test_records_by_service_operation_and_status_class():
+    policy = MetricsPolicy()
+    with Pipeline(_Transport(200, 201, 404), [policy]) as pipeline:
+        _run(pipeline)
+        _run(pipeline, "PUT", data=b"12345")
+        _run(pipeline)
+
+    metrics = policy.sink.snapshot()
+    assert set(metrics) == {
+        MetricsKey("account.blob.core.windows.net", "GET", "2xx"),
+        MetricsKey("account.blob.core.windows.net", "PUT", "2xx"),
+        MetricsKey("account.blob.core.windows.net", "GET", "4xx"),
+    }
+    put = metrics[MetricsKey("account.blob.core.windows.net", "PUT", "2xx")]
+    assert put.count == 1
+    assert put.bytes_sent == 5
+    assert put.bytes_received == 10
+    assert put.retries == 0
+    assert put.total_duration > 0
+
+
+def test_service_name_and_operation_namer():
+    policy = MetricsPolicy(
+        metrics_service_name="storage-blob", metrics_operation_namer=lambda request: "get_blob_properties"
+    )
+    with Pipeline(_Transport(200), [policy]) as pipeline:
+        _run(pipeline)
+
+    assert list(policy.sink.snapshot()) == [MetricsKey("storage-blob", "get_blob_properties", "2xx")]
+
+
+def test_retries_are_counted_in_one_request():
+    policy = MetricsPolicy()
+    retry_policy = RetryPolicy(retry_backoff_factor=0)
+    with Pipeline(_Transport(503, 503, 200), [policy, retry_policy]) as pipeline:
+        _run(pipeline)
+
+    metrics = policy.sink.snapshot()
+    assert len(metrics) == 1
+    get = metrics[MetricsKey("account.blob.core.windows.net", "GET", "2xx")]
+    assert get.count == 1
+    assert get.retries == 2
+
+
+def test_exception_is_recorded_as_error():
+    policy = MetricsPolicy()
+    with Pipeline(_Transport(None), [policy]) as pipeline:
+        with pytest.raises(ServiceRequestError):
+            _run(pipeline)
+
+    metrics = policy.sink.snapshot()
+    assert metrics[MetricsKey("account.blob.core.windows.net", "GET", "error")].count == 1
+
+
+def test_connection_stats():
+    policy = MetricsPolicy()
+    transport = _Transport(200, 200)
+    with Pipeline(transport, [policy]) as pipeline:
+        _run(pipeline)
+        _run(pipeline)
+
+    assert policy.sink.connection_stats == {"opened": 1, "reused": 3, "discarded": 0}
+
+
+def test_custom_sink():
+    sink = mock.Mock(spec=MetricsSink)
+    policy = MetricsPolicy(metrics_sink=sink)
+    with Pipeline(_Transport(500), [policy]) as pipeline:
+        _run(pipeline)
+
+    assert policy.sink is sink
+    assert sink.record.call_count == 1
+    args = sink.record.call_args[0]
+    assert args[:3] == ("account.blob.core.windows.net", "GET", "5xx")
+    assert args[4:] == (0, 10, 0)
+
+
+def test_threads_are_merged():
+    sink = HistogramMetricsSink()
+
+    def record():
+        for _ in range(1000):
+            sink.record("service", "operation", "2xx", 0.01, 1, 2, 0)
+
+    threads = [threading.Thread(target=record) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    metrics = sink.snapshot()[MetricsKey("service", "operation", "2xx")]
+    assert metrics.count == 4000
+    assert metrics.bytes_sent == 4000
+    assert metrics.bytes_received == 8000
+    assert metrics.mean_duration == pytest.approx(0.01)
+
+    sink.reset()
+    assert sink.snapshot() == {}
+
+
+def test_percentiles():
+    histogram = _Histogram()
+    for duration in [0.001] * 90 + [0.1] * 9 + [1.0]:
+        histogram.count += 1
+        index = _bucket(duration)
+        histogram.buckets[index] = histogram.buckets.get(index, 0) + 1
+    metrics = OperationMetrics()
+    metrics._merge(histogram)
+
+    assert 0.001 <= metrics.percentile(50) <= 0.001 * 1.1
+    assert 0.1 <= metrics.percentile(95) <= 0.1 * 1.1
+    assert 1.0 <= metrics.percentile(100) <= 1.0 * 1.1
+    assert OperationMetrics().percentile(50) == 0
@@ -47,6 +47,7 @@ import pytest
 from azure.core.configuration import Configuration
 from azure.core.pipeline import Pipeline
 from azure.core.pipeline.policies import (
+    HTTPPolicy,
     SansIOHTTPPolicy,
     UserAgentPolicy,
     RedirectPolicy
@@ -91,6 +92,103 @@ def test_sans_io_exception():
     with pytest.raises(NotImplementedError):
         pipeline.run(req)
 
+
+class _RecordingPolicy(SansIOHTTPPolicy):
+    def __init__(self, name, calls, fail_on=None):
+        self.name = name
+        self.calls = calls
+        self.fail_on = fail_on
+
+    def on_request(self, request):
+        self.calls.append((self.name, "request"))
+        if self.fail_on == "request":
+            raise ValueError(self.name)
+
+    def on_response(self, request, response):
+        self.calls.append((self.name, "response"))
+        if self.fail_on == "response":
+            raise ValueError(self.name)
+
+    def on_exception(self, request):
+        self.calls.append((self.name, "exception"))
+        return False
+
+
+class _RequestOnlyPolicy(SansIOHTTPPolicy):
+    def __init__(self, calls):
+        self.calls = calls
+
+    def on_request(self, request):
+        self.calls.append(("request only", "request"))
+
+
+class _RecordingHTTPPolicy(HTTPPolicy):
+    def __init__(self, calls):
+        super(_RecordingHTTPPolicy, self).__init__()
+        self.calls = calls
+
+    def send(self, request):
+        self.calls.append(("http", "request"))
+        try:
+            return self.next.send(request)
+        finally:
+            self.calls.append(("http", "response"))
+
+
+@pytest.mark.parametrize("fail_on", [None, "a", "c", "transport"])
+@pytest.mark.parametrize("hook", ["request", "response"])
+def test_compiled_pipeline_calls_hooks_like_nested_runners(fail_on, hook):
+    def run(compiled):
+        calls = []
+        transport = mock.MagicMock(spec=HttpTransport)
+        if fail_on == "transport":
+            transport.send.side_effect = ValueError("transport")
+        policies = [
+            _RecordingPolicy("a", calls, hook if fail_on == "a" else None),
+            _RequestOnlyPolicy(calls),
+            _RecordingPolicy("b", calls),
+            _RecordingHTTPPolicy(calls),
+            _RecordingPolicy("c", calls, hook if fail_on == "c" else None),
+        ]
+        pipeline = Pipeline(transport, policies, compiled=compiled)
+        try:
+            pipeline.run(HttpRequest("GET", "https://bing.com"))
+        except ValueError as ex:
+            calls.append(("raised", str(ex)))
+        return calls
+
+    assert run(compiled=True) == run(compiled=False)
+
+
+def test_compiled_pipeline_groups_sans_io_policies():
+    calls = []
+    policies = [_RequestOnlyPolicy(calls), SansIOHTTPPolicy(), _RecordingHTTPPolicy(calls), UserAgentPolicy()]
+    pipeline = Pipeline(mock.MagicMock(spec=HttpTransport), policies, compiled=True)
+
+    assert len(pipeline._impl_policies) == 3
+    first_group = pipeline._impl_policies[0]
+    # SansIOHTTPPolicy has no hooks of its own; _RequestOnlyPolicy only has on_request
+    assert len(first_group._on_request) == 1
+    assert first_group._on_response == first_group._on_exception == []
+    assert pipeline._impl_policies[1] is policies[2]
+
+
+def test_compiled_pipeline_on_exception_handling_hook_raises():
+    class SwapExec(SansIOHTTPPolicy):
+        def on_exception(self, request):
+            raise NotImplementedError()
+
+    calls = []
+    transport = mock.MagicMock(spec=HttpTransport)
+    transport.send.side_effect = ValueError("transport")
+    pipeline = Pipeline(transport, [_RecordingPolicy("a", calls), SwapExec()], compiled=True)
+
+    with pytest.raises(NotImplementedError):
+        pipeline.run(HttpRequest("GET", "https://bing.com"))
+    # the outer policy saw the exception raised by the inner hook
+    assert calls == [("a", "request"), ("a", "exception")]
+
+
 class TestRequestsTransport(unittest.TestCase):
 
     def test_basic_requests(self):
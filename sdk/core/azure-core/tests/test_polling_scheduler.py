@@ -0,0 +1,183 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See LICENSE.txt in the project root for
+# license information.
+# -------------------------------------------------------------------------
+import email.utils
+import threading
+import time
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+import pytest
+
+from azure.core.exceptions import AzureError, HttpResponseError
+from azure.core.polling import (
+    LROPoller,
+    NoPolling,
+    PollingScheduler,
+    StepPollingMethod,
+    as_completed,
+    wait_all,
+)
+from azure.core.polling._scheduler import get_retry_after
+
+
+class _Steps(StepPollingMethod):
+    """Finishes after the given number of status requests, with the given delay between them."""
+
+    in_flight = 0
+    max_in_flight = 0
+    lock = threading.Lock()
+
+    def __init__(self, steps, delay=0.01, error=None):
+        super(_Steps, self).__init__(polling_interval=delay)
+        self._steps = steps
+        self._error = error
+        self.requests = 0
+        self.threads = set()
+
+    def initialize(self, client, initial_response, deserialization_callback):
+        self.set_retry_after(initial_response)
+
+    def update_status(self):
+        with _Steps.lock:
+            _Steps.in_flight += 1
+            _Steps.max_in_flight = max(_Steps.max_in_flight, _Steps.in_flight)
+        try:
+            self.threads.add(threading.current_thread().name)
+            time.sleep(0.001)
+            self.requests += 1
+            if self._error and self.requests == self._steps:
+                raise self._error
+        finally:
+            with _Steps.lock:
+                _Steps.in_flight -= 1
+
+    def status(self):
+        return "succeeded" if self.finished() else "running"
+
+    def finished(self):
+        return self.requests >= self._steps
+
+    def resource(self):
+        return self.requests
+
+
+def _response(retry_after=None):
+    return mock.Mock(headers={} if retry_after is None else {"Retry-After": retry_after})
+
+
+def _poller(polling_method, scheduler, retry_after=None):
+    return LROPoller(None, _response(retry_after), lambda r: r, polling_method, polling_scheduler=scheduler)
+
+
+def test_get_retry_after():
+    assert get_retry_after(_response()) is None
+    assert get_retry_after(_response("2")) == 2
+    assert get_retry_after(_response("-1")) == 0
+    assert get_retry_after(_response("soon")) is None
+    http_date = email.utils.formatdate(time.time() + 10, usegmt=True)
+    assert 8 < get_retry_after(_response(http_date)) <= 10
+    assert get_retry_after(_response("Sun, 06 Nov 1994 08:49:37 GMT")) == 0
+
+
+def test_polling_delay():
+    method = _Steps(1, delay=5)
+    assert method.polling_delay() == 5
+    method.set_retry_after(_response("0.5"))
+    assert method.polling_delay() == 0.5
+    method.set_retry_after(_response())
+    assert method.polling_delay() == 5
+
+
+def test_many_operations_few_threads():
+    _Steps.max_in_flight = 0
+    with PollingScheduler(max_concurrency=3) as scheduler:
+        methods = [_Steps(3) for _ in range(50)]
+        pollers = [_poller(method, scheduler) for method in methods]
+        assert [poller.result() for poller in pollers] == [3] * 50
+        assert all(poller.done() for poller in pollers)
+        assert len(scheduler) == 0
+
+    threads = set.union(*(method.threads for method in methods))
+    assert len(threads) <= 3
+    assert all(name.startswith("PollingScheduler(") for name in threads)
+    assert _Steps.max_in_flight <= 3
+
+
+def test_retry_after_is_honored():
+    with PollingScheduler() as scheduler:
+        fast = _poller(_Steps(1, delay=0.01), scheduler)
+        slow = _poller(_Steps(1, delay=0.01), scheduler, retry_after="0.3")
+        fast.wait()
+        assert not slow.done()
+        slow.wait()
+        assert slow.done()
+
+
+def test_exception_is_raised_by_wait():
+    error = HttpResponseError("operation failed")
+    with PollingScheduler() as scheduler:
+        poller = _poller(_Steps(2, error=error), scheduler)
+        with pytest.raises(HttpResponseError):
+            poller.result()
+        assert poller.done()
+
+
+def test_done_callbacks():
+    called = threading.Event()
+    with PollingScheduler() as scheduler:
+        poller = _poller(_Steps(2, delay=0.05), scheduler)
+        poller.add_done_callback(lambda method: called.set())
+        assert called.wait(5)
+        assert poller.status() == "succeeded"
+
+
+def test_other_polling_methods_use_a_thread():
+    with PollingScheduler() as scheduler:
+        poller = _poller(NoPolling(), scheduler)
+        assert poller.done()
+        assert poller.result() is not None
+        assert len(scheduler) == 0
+
+
+def test_as_completed():
+    with PollingScheduler() as scheduler:
+        pollers = [_poller(_Steps(1, delay=delay), scheduler) for delay in (0.3, 0.01, 0.15)]
+        assert list(as_completed(pollers)) == [pollers[1], pollers[2], pollers[0]]
+
+
+def test_as_completed_timeout():
+    with PollingScheduler() as scheduler:
+        fast = _poller(_Steps(1, delay=0.01), scheduler)
+        slow = _poller(_Steps(1, delay=5), scheduler)
+        completed = as_completed([fast, slow], timeout=0.2)
+        assert next(completed) is fast
+        with pytest.raises(AzureError):
+            next(completed)
+
+
+def test_wait_all():
+    with PollingScheduler() as scheduler:
+        fast = [_poller(_Steps(2, delay=0.01), scheduler) for _ in range(5)]
+        slow = _poller(_Steps(1, delay=5), scheduler)
+        done, not_done = wait_all(fast + [slow], timeout=0.5)
+        assert done == set(fast)
+        assert not_done == {slow}
+
+        done, not_done = wait_all(fast)
+        assert done == set(fast)
+        assert not not_done
+
+
+def test_closed_scheduler():
+    scheduler = PollingScheduler()
+    scheduler.close()
+    with pytest.raises(ValueError):
+        _poller(_Steps(1), scheduler)
+    with pytest.raises(ValueError):
+        PollingScheduler(max_concurrency=0)
@@ -0,0 +1,138 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See LICENSE.txt in the project root for
+# license information.
+# -------------------------------------------------------------------------
+import sys
+import threading
+import time
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+import pytest
+from six.moves import queue
+
+from azure.core.pipeline.transport import HttpRequest, RequestsTransport
+from azure.core.pipeline.transport._requests_basic import ConnectionPoolStats, _HTTPConnectionPool
+
+pytestmark = pytest.mark.skipif(sys.version_info < (3, 5), reason="Uses the Python 3 http.server")
+
+
+@pytest.fixture
+def server():
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            time.sleep(float(self.path.strip("/") or 0))
+            self.send_response(200)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"ok")
+
+        def log_message(self, *args):
+            pass
+
+    class Server(ThreadingMixIn, HTTPServer):
+        daemon_threads = True
+
+    httpd = Server(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever)
+    thread.daemon = True
+    thread.start()
+    yield "http://127.0.0.1:{}".format(httpd.server_address[1])
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _send_concurrently(transport, url, count):
+    threads = [
+        threading.Thread(target=lambda: transport.send(HttpRequest("GET", url)).body())
+        for _ in range(count)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def test_sequential_requests_reuse_one_connection(server):
+    with RequestsTransport() as transport:
+        for _ in range(5):
+            assert transport.send(HttpRequest("GET", server)).body() == b"ok"
+        stats = transport.connection_stats
+        assert (stats.opened, stats.reused, stats.discarded) == (1, 4, 0)
+
+
+def test_pool_smaller_than_concurrency_discards(server):
+    with RequestsTransport(pool_maxsize=2) as transport:
+        _send_concurrently(transport, server + "/0.2", 6)
+        assert transport.connection_stats.opened == 6
+        assert transport.connection_stats.discarded == 4
+
+
+def test_connection_discarded_when_pool_full_isnt_put_back():
+    pool = _HTTPConnectionPool("127.0.0.1", maxsize=1)
+    pool.stats = ConnectionPoolStats()
+    pool.pool = mock.Mock(put=mock.Mock(side_effect=[queue.Full(), None]), qsize=mock.Mock(return_value=1))
+    conn = mock.Mock()
+
+    pool._put_conn(conn)
+
+    assert pool.pool.put.call_count == 1
+    assert conn.close.call_count == 1
+    assert pool.stats.discarded == 1
+
+
+def test_blocking_pool_waits_for_connections(server):
+    with RequestsTransport(pool_maxsize=2, pool_block=True) as transport:
+        _send_concurrently(transport, server + "/0.1", 6)
+        stats = transport.connection_stats
+        assert stats.opened == 2
+        assert stats.reused == 4
+        assert stats.discarded == 0
+
+
+def test_concurrent_first_requests_share_one_session(server):
+    transport = RequestsTransport(pool_maxsize=8)
+    sessions = []
+    init_session = transport._init_session
+
+    def slow_init_session(session):
+        sessions.append(session)
+        time.sleep(0.1)
+        init_session(session)
+    transport._init_session = slow_init_session
+
+    _send_concurrently(transport, server, 8)
+
+    assert len(sessions) == 1
+    assert transport.connection_stats.opened + transport.connection_stats.reused == 8
+    transport.close()
+
+
+def test_shared_transport_closes_after_last_user():
+    transport = RequestsTransport(shared=True)
+    with transport:
+        with transport:
+            session = transport.session
+        assert transport.session is session
+    assert transport.session is None
+
+    # an unshared transport closes when the first user exits, as before
+    transport = RequestsTransport()
+    with transport:
+        with transport:
+            pass
+        assert transport.session is None
+
+
+def test_invalid_pool_size():
+    with pytest.raises(ValueError):
+        RequestsTransport(pool_maxsize=0)
@@ -0,0 +1,158 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See LICENSE.txt in the project root for
+# license information.
+# -------------------------------------------------------------------------
+"""Tests for the retry policy's shared retry budget"""
+import time
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+import pytest
+
+from azure.core.exceptions import ServiceRequestError
+from azure.core.pipeline import Pipeline
+from azure.core.pipeline.policies import RetryBudget, RetryPolicy
+from azure.core.pipeline.transport import HttpRequest, HttpResponse, HttpTransport
+
+
+class _Response(HttpResponse):
+    def __init__(self, request, status_code, headers=None):
+        super(_Response, self).__init__(request, None)
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    def body(self):
+        return b""
+
+
+def _transport(*statuses):
+    """A transport answering with statuses in turn, and recording the sleeps it's asked for."""
+    transport = mock.MagicMock(spec=HttpTransport)
+    answers = iter(statuses)
+
+    def send(request, **kwargs):
+        answer = next(answers)
+        if isinstance(answer, Exception):
+            raise answer
+        if isinstance(answer, tuple):
+            return _Response(request, answer[0], answer[1])
+        return _Response(request, answer)
+
+    transport.send.side_effect = send
+    return transport
+
+
+def _run(budget, transport, url="https://account.blob.core.windows.net/container"):
+    policy = RetryPolicy(retry_budget=budget, retry_backoff_factor=0)
+    return Pipeline(transport, [policy]).run(HttpRequest("GET", url))
+
+
+def test_retries_spend_tokens_until_denied():
+    budget = RetryBudget(max_tokens=2)
+
+    response = _run(budget, _transport(500, 500, 500, 200))
+
+    # two retries allowed, the third denied: the caller gets the last failure
+    assert response.http_response.status_code == 500
+    assert budget.retries_spent == 2
+    assert budget.retries_denied == 1
+    assert budget.tokens == 0
+
+
+def test_successes_refill_the_budget():
+    budget = RetryBudget(max_tokens=1, token_ratio=0.5)
+    _run(budget, _transport(500, 500))
+    assert budget.tokens == 0
+
+    _run(budget, _transport(200))
+    _run(budget, _transport(200))
+    assert budget.tokens == 1
+
+    # refilling stops at max_tokens
+    _run(budget, _transport(200))
+    assert budget.tokens == 1
+    assert _run(budget, _transport(500, 200)).http_response.status_code == 200
+
+
+def test_connection_errors_spend_tokens():
+    budget = RetryBudget(max_tokens=1)
+
+    with pytest.raises(ServiceRequestError):
+        _run(budget, _transport(ServiceRequestError("1"), ServiceRequestError("2")))
+
+    assert budget.retries_spent == 1
+    assert budget.retries_denied == 1
+
+
+def test_policies_share_a_budget():
+    budget = RetryBudget(max_tokens=1)
+
+    assert _run(budget, _transport(500, 200)).http_response.status_code == 200
+    # the first policy spent the only token
+    assert _run(budget, _transport(500, 200)).http_response.status_code == 500
+    assert budget.retries_denied == 1
+
+
+def test_retry_after_holds_back_requests_to_the_host():
+    budget = RetryBudget()
+    clock = [1000.0]
+
+    def transport(*statuses):
+        transport = _transport(*statuses)
+        transport.sleep.side_effect = lambda seconds: clock.__setitem__(0, clock[0] + seconds)
+        return transport
+
+    with mock.patch("time.time", lambda: clock[0]):
+        throttled = transport((429, {"Retry-After": "30"}), 200)
+        assert _run(budget, throttled).http_response.status_code == 200
+        # the throttled request waited Retry-After itself, and only once
+        assert [c[0][0] for c in throttled.sleep.call_args_list] == [30]
+
+        clock[0] -= 20
+        # another request to the same host waits for what's left...
+        same_host = transport(200)
+        _run(budget, same_host)
+        assert [c[0][0] for c in same_host.sleep.call_args_list] == [20]
+        assert budget.requests_held_back == 1
+        assert budget.hold_back_time == 20
+
+        clock[0] -= 20
+        # ...but requests to other hosts don't
+        other_host = transport(200)
+        _run(budget, other_host, url="https://other.blob.core.windows.net/container")
+        assert other_host.sleep.call_count == 0
+
+
+def test_throttling_without_retry_after_backs_off_per_host():
+    budget = RetryBudget(throttle_backoff=1, throttle_backoff_max=3)
+    host = "account.blob.core.windows.net"
+    delays = []
+    with mock.patch("time.time", lambda: 0):
+        for _ in range(4):
+            budget._record_response(host, 503, None)
+            delays.append(budget._hold_back(host))
+    assert delays == [1, 2, 3, 3]
+
+    # a success resets the backoff, not the current hold back
+    with mock.patch("time.time", lambda: 0):
+        budget._record_response(host, 200, None)
+        assert budget._hold_back(host) == 3
+        budget._record_response(host, 503, None)
+        assert budget._hold_back(host) == 3
+    with mock.patch("time.time", lambda: 10):
+        assert budget._hold_back(host) == 0
+        budget._record_response(host, 200, None)
+        assert budget._hold_back(host) == 0
+    assert host not in budget._hosts
+
+
+def test_no_budget():
+    transport = _transport(500, 500, 200)
+    response = Pipeline(transport, [RetryPolicy(retry_backoff_factor=0)]).run(
+        HttpRequest("GET", "https://account.blob.core.windows.net/container")
+    )
+    assert response.http_response.status_code == 200
@@ -117,6 +117,14 @@ class TestPrioritizedSetting(object):
 
         del os.environ["AZURE_FOO"]
 
+    def test_version(self):
+        ps = m.PrioritizedSetting("foo", default=2)
+        assert ps.version == 0
+        ps.set_value(40)
+        assert ps.version == 1
+        ps.unset_value()
+        assert ps.version == 2
+
     def test___str__(self):
         ps = m.PrioritizedSetting("foo")
         assert str(ps) == "PrioritizedSetting(%r)" % "foo"
@@ -225,3 +233,59 @@ class TestStandardSettings(object):
         assert isinstance(val, tuple)
         assert val.log_level == 10
         del os.environ["AZURE_LOG_LEVEL"]
+
+
+class TestSettingSnapshot(object):
+    def test_cached(self):
+        calls = []
+
+        def convert(value):
+            calls.append(value)
+            return value
+
+        snapshot = m._SettingSnapshot(m.PrioritizedSetting("foo", convert=convert, default=10))
+        assert snapshot() == 10
+        assert snapshot() == 10
+        assert calls == [10]
+
+    def test_user_value_invalidates(self):
+        ps = m.PrioritizedSetting("foo", default=10)
+        snapshot = m._SettingSnapshot(ps)
+        assert snapshot() == 10
+        ps.set_value(40)
+        assert snapshot() == 40
+        ps.unset_value()
+        assert snapshot() == 10
+
+    def test_env_var_invalidates(self):
+        snapshot = m._SettingSnapshot(m.PrioritizedSetting("foo", env_var="AZURE_FOO", default="10"))
+        assert snapshot() == "10"
+        os.environ["AZURE_FOO"] = "30"
+        try:
+            assert snapshot() == "30"
+        finally:
+            del os.environ["AZURE_FOO"]
+        assert snapshot() == "10"
+
+    def test_import_invalidates(self):
+        snapshot = m._SettingSnapshot(
+            m.PrioritizedSetting("foo", convert=lambda _: "fake_module" in sys.modules, default=None)
+        )
+        assert snapshot() is False
+        sys.modules["fake_module"] = m
+        try:
+            assert snapshot() is True
+        finally:
+            del sys.modules["fake_module"]
+
+    def test_tracing_implementation(self):
+        class FakeSpan(object):
+            pass
+
+        assert m._tracing_implementation() is m.settings.tracing_implementation()
+        m.settings.tracing_implementation = FakeSpan
+        try:
+            assert m._tracing_implementation() is FakeSpan
+        finally:
+            m.settings.tracing_implementation.unset_value()
+        assert m._tracing_implementation() is m.settings.tracing_implementation()
@@ -0,0 +1,48 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See LICENSE.txt in the project root for
+# license information.
+# -------------------------------------------------------------------------
+import threading
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+from azure.core.pipeline.transport import HttpRequest, RequestsTransport
+from azure.core.pipeline.transport._base import _SSLContextCache
+
+
+def test_ssl_context_cache_reuses_contexts(tmpdir):
+    cache = _SSLContextCache()
+    with mock.patch.object(_SSLContextCache, "_create", side_effect=lambda *_: object()) as create:
+        first = cache.get(None, "ca.pem")
+        assert cache.get(None, "ca.pem") is first
+        assert cache.get(None, None) is not first
+        assert cache.get(["cert.pem", "key.pem"], "ca.pem") is cache.get(("cert.pem", "key.pem"), "ca.pem")
+    assert create.call_count == 3
+
+
+def test_requests_transport_loads_ca_bundle_once(tls_server):
+    url, ca_path = tls_server
+    create = mock.Mock(wraps=_SSLContextCache._create)
+    with mock.patch.object(_SSLContextCache, "_create", create):
+        with RequestsTransport(connection_verify=ca_path, pool_maxsize=4) as transport:
+            threads = [
+                threading.Thread(target=lambda: transport.send(HttpRequest("GET", url)).body())
+                for _ in range(4)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            assert transport.send(HttpRequest("GET", url)).body() == b"ok"
+
+            assert transport.connection_stats.opened > 1
+            create.assert_called_once_with(None, ca_path, False)
+
+            # the pool's connections can still be made without verification
+            transport.session.close()
+            response = transport.send(HttpRequest("GET", url), connection_verify=False)
+            assert response.body() == b"ok"
@@ -10,9 +10,19 @@
 # --------------------------------------------------------------------------
 
 from .event_grid_client import EventGridClient
+from .event_grid_parser import ReceivedEvent, deserialize_event_data, get_event_data_type, parse_events
+from .event_grid_publisher import EventGridPublisher, PublishBatchResult
 from .version import VERSION
 
-__all__ = ['EventGridClient']
+__all__ = [
+    'EventGridClient',
+    'EventGridPublisher',
+    'PublishBatchResult',
+    'ReceivedEvent',
+    'deserialize_event_data',
+    'get_event_data_type',
+    'parse_events',
+]
 
 __version__ = VERSION
 
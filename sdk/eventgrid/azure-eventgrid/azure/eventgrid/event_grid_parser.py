@@ -0,0 +1,182 @@
+# coding=utf-8
+# --------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import json
+
+from msrest import Deserializer
+
+from . import models
+
+# The data model of each system event type, by lowercased event type
+_SYSTEM_EVENT_DATA_TYPES = {event_type.lower(): data_type for event_type, data_type in [
+    ('Microsoft.AppConfiguration.KeyValueDeleted', models.AppConfigurationKeyValueDeletedEventData),
+    ('Microsoft.AppConfiguration.KeyValueModified', models.AppConfigurationKeyValueModifiedEventData),
+    ('Microsoft.ContainerRegistry.ChartDeleted', models.ContainerRegistryChartDeletedEventData),
+    ('Microsoft.ContainerRegistry.ChartPushed', models.ContainerRegistryChartPushedEventData),
+    ('Microsoft.ContainerRegistry.ImageDeleted', models.ContainerRegistryImageDeletedEventData),
+    ('Microsoft.ContainerRegistry.ImagePushed', models.ContainerRegistryImagePushedEventData),
+    ('Microsoft.Devices.DeviceConnected', models.IotHubDeviceConnectedEventData),
+    ('Microsoft.Devices.DeviceCreated', models.IotHubDeviceCreatedEventData),
+    ('Microsoft.Devices.DeviceDeleted', models.IotHubDeviceDeletedEventData),
+    ('Microsoft.Devices.DeviceDisconnected', models.IotHubDeviceDisconnectedEventData),
+    ('Microsoft.Devices.DeviceTelemetry', models.IotHubDeviceTelemetryEventData),
+    ('Microsoft.EventGrid.SubscriptionDeletedEvent', models.SubscriptionDeletedEventData),
+    ('Microsoft.EventGrid.SubscriptionValidationEvent', models.SubscriptionValidationEventData),
+    ('Microsoft.EventHub.CaptureFileCreated', models.EventHubCaptureFileCreatedEventData),
+    ('Microsoft.Maps.GeofenceEntered', models.MapsGeofenceEnteredEventData),
+    ('Microsoft.Maps.GeofenceExited', models.MapsGeofenceExitedEventData),
+    ('Microsoft.Maps.GeofenceResult', models.MapsGeofenceResultEventData),
+    ('Microsoft.Media.JobCanceled', models.MediaJobCanceledEventData),
+    ('Microsoft.Media.JobCanceling', models.MediaJobCancelingEventData),
+    ('Microsoft.Media.JobErrored', models.MediaJobErroredEventData),
+    ('Microsoft.Media.JobFinished', models.MediaJobFinishedEventData),
+    ('Microsoft.Media.JobOutputCanceled', models.MediaJobOutputCanceledEventData),
+    ('Microsoft.Media.JobOutputCanceling', models.MediaJobOutputCancelingEventData),
+    ('Microsoft.Media.JobOutputErrored', models.MediaJobOutputErroredEventData),
+    ('Microsoft.Media.JobOutputFinished', models.MediaJobOutputFinishedEventData),
+    ('Microsoft.Media.JobOutputProcessing', models.MediaJobOutputProcessingEventData),
+    ('Microsoft.Media.JobOutputProgress', models.MediaJobOutputProgressEventData),
+    ('Microsoft.Media.JobOutputScheduled', models.MediaJobOutputScheduledEventData),
+    ('Microsoft.Media.JobOutputStateChange', models.MediaJobOutputStateChangeEventData),
+    ('Microsoft.Media.JobProcessing', models.MediaJobProcessingEventData),
+    ('Microsoft.Media.JobScheduled', models.MediaJobScheduledEventData),
+    ('Microsoft.Media.JobStateChange', models.MediaJobStateChangeEventData),
+    ('Microsoft.Media.LiveEventConnectionRejected', models.MediaLiveEventConnectionRejectedEventData),
+    ('Microsoft.Media.LiveEventEncoderConnected', models.MediaLiveEventEncoderConnectedEventData),
+    ('Microsoft.Media.LiveEventEncoderDisconnected', models.MediaLiveEventEncoderDisconnectedEventData),
+    ('Microsoft.Media.LiveEventIncomingDataChunkDropped', models.MediaLiveEventIncomingDataChunkDroppedEventData),
+    ('Microsoft.Media.LiveEventIncomingStreamReceived', models.MediaLiveEventIncomingStreamReceivedEventData),
+    ('Microsoft.Media.LiveEventIncomingStreamsOutOfSync', models.MediaLiveEventIncomingStreamsOutOfSyncEventData),
+    ('Microsoft.Media.LiveEventIncomingVideoStreamsOutOfSync',
+     models.MediaLiveEventIncomingVideoStreamsOutOfSyncEventData),
+    ('Microsoft.Media.LiveEventIngestHeartbeat', models.MediaLiveEventIngestHeartbeatEventData),
+    ('Microsoft.Media.LiveEventTrackDiscontinuityDetected', models.MediaLiveEventTrackDiscontinuityDetectedEventData),
+    ('Microsoft.Resources.ResourceActionCancel', models.ResourceActionCancelData),
+    ('Microsoft.Resources.ResourceActionFailure', models.ResourceActionFailureData),
+    ('Microsoft.Resources.ResourceActionSuccess', models.ResourceActionSuccessData),
+    ('Microsoft.Resources.ResourceDeleteCancel', models.ResourceDeleteCancelData),
+    ('Microsoft.Resources.ResourceDeleteFailure', models.ResourceDeleteFailureData),
+    ('Microsoft.Resources.ResourceDeleteSuccess', models.ResourceDeleteSuccessData),
+    ('Microsoft.Resources.ResourceWriteCancel', models.ResourceWriteCancelData),
+    ('Microsoft.Resources.ResourceWriteFailure', models.ResourceWriteFailureData),
+    ('Microsoft.Resources.ResourceWriteSuccess', models.ResourceWriteSuccessData),
+    ('Microsoft.ServiceBus.ActiveMessagesAvailableWithNoListeners',
+     models.ServiceBusActiveMessagesAvailableWithNoListenersEventData),
+    ('Microsoft.ServiceBus.DeadletterMessagesAvailableWithNoListeners',
+     models.ServiceBusDeadletterMessagesAvailableWithNoListenersEventData),
+    ('Microsoft.SignalRService.ClientConnectionConnected', models.SignalRServiceClientConnectionConnectedEventData),
+    ('Microsoft.SignalRService.ClientConnectionDisconnected',
+     models.SignalRServiceClientConnectionDisconnectedEventData),
+    ('Microsoft.Storage.BlobCreated', models.StorageBlobCreatedEventData),
+    ('Microsoft.Storage.BlobDeleted', models.StorageBlobDeletedEventData),
+]}
+
+_deserializer = None
+
+
+def _deserialize(data_type, data):
+    global _deserializer  # pylint: disable=global-statement
+    if _deserializer is None:
+        _deserializer = Deserializer({k: v for k, v in models.__dict__.items() if isinstance(v, type)})
+    return _deserializer(data_type, data)
+
+
+def get_event_data_type(event_type):
+    """Gets the model of the data of a system event type.
+
+    :param str event_type: The event type, e.g. Microsoft.Storage.BlobCreated.
+     Event types are case insensitive.
+    :return: The model of the data, or None if the event type is not a known
+     system event type.
+    :rtype: type
+    """
+    return _SYSTEM_EVENT_DATA_TYPES.get((event_type or '').lower())
+
+
+def deserialize_event_data(event_type, data):
+    """Deserializes the data of an event into the model of its event type.
+
+    :param str event_type: The event type, e.g. Microsoft.Storage.BlobCreated.
+    :param data: The data of the event, as decoded from JSON.
+    :return: The data as a model from azure.eventgrid.models, or the data as
+     it was if the event type is not a known system event type.
+    :raises: :class:`DeserializationError<msrest.exceptions.DeserializationError>`
+    """
+    data_type = get_event_data_type(event_type)
+    if data_type is None or not isinstance(data, dict):
+        return data
+    return _deserialize(data_type, data)
+
+
+class ReceivedEvent(models.EventGridEvent):
+    """An event delivered by Event Grid, whose data is deserialized into the
+    model of its event type the first time it is read.
+
+    Events of other types than the system event types keep their data as
+    decoded from JSON.
+
+    :ivar raw_data: The data of the event as decoded from JSON.
+    """
+
+    def __init__(self, **kwargs):
+        self.raw_data = None
+        self._data = None
+        super(ReceivedEvent, self).__init__(**kwargs)
+
+    @property
+    def data(self):
+        """The data of the event, deserialized into a model from
+        azure.eventgrid.models for system event types.
+        """
+        if self._data is None and self.raw_data is not None:
+            self._data = deserialize_event_data(self.event_type, self.raw_data)
+        return self._data
+
+    @data.setter
+    def data(self, value):
+        self.raw_data = value
+        self._data = None
+
+
+def parse_events(body):
+    """Parses the events of an Event Grid delivery, e.g. the body of a
+    request to a webhook.
+
+    The delivery is decoded in one pass, and the envelope of each event is
+    built directly from it. The data of each event is only deserialized when
+    it is read.
+
+    :param body: The JSON of the delivery: an array of events, or a single
+     event.
+    :type body: bytes or str
+    :return: The events, in delivery order.
+    :rtype: list[~azure.eventgrid.ReceivedEvent]
+    :raises: ValueError if the body is not JSON, and
+     :class:`DeserializationError<msrest.exceptions.DeserializationError>` if
+     an event time is invalid.
+    """
+    if isinstance(body, bytes):
+        body = body.decode('utf-8-sig')
+    delivery = json.loads(body)
+    if isinstance(delivery, dict):
+        delivery = [delivery]
+
+    events = []
+    for event in delivery:
+        event_time = event.get('eventTime')
+        received = ReceivedEvent(
+            id=event.get('id'),
+            topic=event.get('topic'),
+            subject=event.get('subject'),
+            data=event.get('data'),
+            event_type=event.get('eventType'),
+            event_time=Deserializer.deserialize_iso(event_time) if event_time else None,
+            data_version=event.get('dataVersion'),
+        )
+        received.metadata_version = event.get('metadataVersion')
+        events.append(received)
+    return events
@@ -0,0 +1,151 @@
+# coding=utf-8
+# --------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import json
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from msrest.exceptions import ClientException, HttpOperationError
+
+#: The largest request body Event Grid accepts, in bytes.
+MAX_BATCH_SIZE = 1024 * 1024
+
+
+class PublishBatchResult(object):
+    """The outcome of publishing one batch of events.
+
+    :ivar events: The events of the batch, as they were given.
+    :vartype events: list
+    :ivar size: The size of the request body of the batch, in bytes.
+    :vartype size: int
+    :ivar error: Why the batch was not published, or None if it was.
+    :vartype error: Exception
+    """
+
+    def __init__(self, events, size, error=None):
+        self.events = events
+        self.size = size
+        self.error = error
+
+    @property
+    def succeeded(self):
+        """Whether the batch was published.
+
+        :rtype: bool
+        """
+        return self.error is None
+
+    def __repr__(self):
+        return "PublishBatchResult(events={}, size={}, error={!r})".format(len(self.events), self.size, self.error)
+
+
+class EventGridPublisher(object):
+    """Publishes any number of events to Event Grid topics, in batches that
+    fit the size limit of the service.
+
+    Events are serialized one by one as they are read, and added to the
+    current batch while its request body stays within max_batch_size bytes.
+    Full batches are published concurrently through the pipeline of the
+    client. A batch the service rejects as too large (413) is split in two,
+    and both halves are published again.
+
+    :param client: The client whose pipeline publishes the batches.
+    :type client: ~azure.eventgrid.EventGridClient
+    :param int max_batch_size: The largest request body of a batch, in
+     bytes. An event larger than this is published in a batch of its own.
+     Default value is 1 MB.
+    :param int max_concurrency: How many batches are published at the same
+     time. Default value is 4.
+    """
+
+    def __init__(self, client, max_batch_size=MAX_BATCH_SIZE, max_concurrency=4):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1.")
+        self._client = client
+        self.max_batch_size = max_batch_size
+        self.max_concurrency = max_concurrency
+
+    def publish(self, topic_hostname, events, custom_headers=None, **operation_config):
+        """Publishes events to an Azure Event Grid topic, in as many batches
+        as they need.
+
+        A batch that fails does not stop the others: its error is in its
+        result.
+
+        :param topic_hostname: The host name of the topic, e.g.
+         topic1.westus2-1.eventgrid.azure.net
+        :type topic_hostname: str
+        :param events: The events to publish. They are read as batches are
+         published, so this can be a generator.
+        :type events: iterable[~azure.eventgrid.models.EventGridEvent]
+        :param dict custom_headers: headers that will be added to the requests
+        :param operation_config: :ref:`Operation configuration
+         overrides<msrest:optionsforoperations>`.
+        :return: The result of each batch, in the order of the events.
+        :rtype: list[~azure.eventgrid.PublishBatchResult]
+        :raises: :class:`SerializationError<msrest.exceptions.SerializationError>`
+         or :class:`ValidationError<msrest.exceptions.ValidationError>` if an
+         event is invalid. The batches before it are published.
+        """
+        futures = []
+        in_flight = set()
+        with ThreadPoolExecutor(self.max_concurrency) as executor:
+            for batch in self._batches(events):
+                # Serialize ahead of the requests in flight, but not much further
+                while len(in_flight) >= 2 * self.max_concurrency:
+                    in_flight = wait(in_flight, return_when=FIRST_COMPLETED).not_done
+                future = executor.submit(self._publish, topic_hostname, batch, custom_headers, operation_config)
+                futures.append(future)
+                in_flight.add(future)
+        return [result for future in futures for result in future.result()]
+
+    def _batches(self, events):
+        serialize = self._client._serialize  # pylint: disable=protected-access
+        batch = []
+        size = 2  # the brackets of the array
+        for event in events:
+            encoded = json.dumps(serialize.body(event, 'EventGridEvent'), separators=(',', ':'))
+            if batch and size + 1 + len(encoded) > self.max_batch_size:
+                yield batch
+                batch = []
+                size = 2
+            size += len(encoded) + (1 if batch else 0)
+            batch.append((event, encoded))
+        if batch:
+            yield batch
+
+    def _publish(self, topic_hostname, batch, custom_headers, operation_config):
+        body = ('[' + ','.join(encoded for _, encoded in batch) + ']').encode('utf-8')
+        events = [event for event, _ in batch]
+        try:
+            response = self._send(topic_hostname, body, custom_headers, operation_config)
+        except ClientException as error:
+            return [PublishBatchResult(events, len(body), error)]
+
+        if response.status_code == 413 and len(batch) > 1:
+            middle = len(batch) // 2
+            return (self._publish(topic_hostname, batch[:middle], custom_headers, operation_config) +
+                    self._publish(topic_hostname, batch[middle:], custom_headers, operation_config))
+        if response.status_code not in [200]:
+            error = HttpOperationError(self._client._deserialize, response)  # pylint: disable=protected-access
+            return [PublishBatchResult(events, len(body), error)]
+        return [PublishBatchResult(events, len(body))]
+
+    def _send(self, topic_hostname, body, custom_headers, operation_config):
+        # pylint: disable=protected-access
+        client = self._client
+        url = client._client.format_url(
+            client.publish_events.metadata['url'],
+            topicHostname=client._serialize.url("topic_hostname", topic_hostname, 'str', skip_quote=True))
+        query_parameters = {'api-version': client._serialize.query("self.api_version", client.api_version, 'str')}
+        header_parameters = {'Content-Type': 'application/json; charset=utf-8'}
+        if custom_headers:
+            header_parameters.update(custom_headers)
+
+        request = client._client.post(url, query_parameters, header_parameters)
+        request.data = body
+        request.headers['Content-Length'] = str(len(body))
+        return client._client.send(request, stream=False, **operation_config)
@@ -82,6 +82,6 @@ setup(
         'azure-common~=1.1',
     ],
     extras_require={
-        ":python_version<'3.0'": ['azure-nspkg'],
+        ":python_version<'3.0'": ['azure-nspkg', 'futures'],
     }
 )
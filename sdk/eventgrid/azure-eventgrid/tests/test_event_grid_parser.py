@@ -0,0 +1,128 @@
+# coding=utf-8
+# --------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import json
+import re
+
+import pytest
+from msrest import Deserializer
+
+from azure.eventgrid import models, deserialize_event_data, get_event_data_type, parse_events
+from azure.eventgrid.event_grid_parser import _SYSTEM_EVENT_DATA_TYPES
+
+DELIVERY = [
+    {
+        "topic": "/subscriptions/id/resourceGroups/rg/providers/Microsoft.Storage/storageAccounts/account",
+        "subject": "/blobServices/default/containers/container/blobs/blob.txt",
+        "eventType": "Microsoft.Storage.BlobCreated",
+        "eventTime": "2019-12-05T01:02:03.1234567Z",
+        "id": "831e1650-001e-001b-66ab-eeb76e069631",
+        "data": {
+            "api": "PutBlockList",
+            "clientRequestId": "6d79dbfb-0e37-4fc4-981f-442c9ca65760",
+            "requestId": "831e1650-001e-001b-66ab-eeb76e000000",
+            "eTag": "0x8D4BCC2E4835CD0",
+            "contentType": "text/plain",
+            "contentLength": 524288,
+            "blobType": "BlockBlob",
+            "url": "https://account.blob.core.windows.net/container/blob.txt",
+            "sequencer": "00000000000004420000000000028963",
+            "storageDiagnostics": {"batchId": "b68529f3-68cd-4744-baa4-3c0498ec19f0"}
+        },
+        "dataVersion": "",
+        "metadataVersion": "1"
+    },
+    {
+        "topic": "/SUBSCRIPTIONS/id/RESOURCEGROUPS/rg/PROVIDERS/MICROSOFT.DEVICES/IOTHUBS/hub",
+        "subject": "devices/device-1",
+        "eventType": "microsoft.devices.devicetelemetry",
+        "eventTime": "2019-12-05T01:02:04Z",
+        "id": "9af86784-8d40-fe2g-8b2a-bab65e106785",
+        "data": {
+            "body": {"temperature": 21.5},
+            "properties": {"level": "info"},
+            "systemProperties": {"iothub-connection-device-id": "device-1"}
+        },
+        "dataVersion": "",
+        "metadataVersion": "1"
+    },
+    {
+        "subject": "orders/42",
+        "eventType": "Contoso.Orders.Created",
+        "eventTime": "2019-12-05T01:02:05Z",
+        "id": "42",
+        "data": {"orderId": 42},
+        "dataVersion": "1.0",
+        "metadataVersion": "1"
+    },
+]
+
+
+def test_parse_events():
+    blob, telemetry, custom = parse_events(json.dumps(DELIVERY).encode('utf-8'))
+
+    assert isinstance(blob, models.EventGridEvent)
+    assert blob.id == DELIVERY[0]['id']
+    assert blob.topic == DELIVERY[0]['topic']
+    assert blob.subject == DELIVERY[0]['subject']
+    assert blob.event_type == 'Microsoft.Storage.BlobCreated'
+    assert blob.event_time == Deserializer.deserialize_iso(DELIVERY[0]['eventTime'])
+    assert blob.metadata_version == '1'
+    assert blob.data_version == ''
+
+    assert isinstance(blob.data, models.StorageBlobCreatedEventData)
+    assert blob.data.content_length == 524288
+    assert blob.data.storage_diagnostics == DELIVERY[0]['data']['storageDiagnostics']
+    assert blob.raw_data == DELIVERY[0]['data']
+
+    assert isinstance(telemetry.data, models.IotHubDeviceTelemetryEventData)
+    assert telemetry.data.body == {'temperature': 21.5}
+
+    assert custom.data == {'orderId': 42}
+
+
+def test_data_is_deserialized_once_when_read():
+    event = parse_events(json.dumps(DELIVERY[:1]))[0]
+    assert event._data is None
+    assert event.data is event.data
+
+
+def test_single_event():
+    events = parse_events(json.dumps(DELIVERY[2]))
+    assert [event.id for event in events] == ['42']
+
+
+def test_setting_data():
+    event = parse_events(json.dumps(DELIVERY[:1]))[0]
+    event.data = {'api': 'CopyBlob'}
+    assert event.data.api == 'CopyBlob'
+
+
+def test_same_as_deserializer():
+    deserializer = Deserializer({k: v for k, v in models.__dict__.items() if isinstance(v, type)})
+    expected = deserializer('StorageBlobCreatedEventData', DELIVERY[0]['data'])
+    assert deserialize_event_data('Microsoft.Storage.BlobCreated', DELIVERY[0]['data']) == expected
+
+
+def test_unknown_types_and_data():
+    assert get_event_data_type('Contoso.Orders.Created') is None
+    assert get_event_data_type(None) is None
+    assert deserialize_event_data('Contoso.Orders.Created', {'orderId': 42}) == {'orderId': 42}
+    assert deserialize_event_data('Microsoft.Storage.BlobCreated', 'not an object') == 'not an object'
+
+
+def test_every_event_data_model_is_indexed():
+    event_data_models = {
+        cls for name, cls in vars(models).items()
+        if isinstance(cls, type) and re.search('(EventData|^Resource.*Data)$', name)
+        and cls not in (models.ContainerRegistryEventData, models.ContainerRegistryArtifactEventData)
+    }
+    assert set(_SYSTEM_EVENT_DATA_TYPES.values()) == event_data_models
+
+
+def test_invalid_json():
+    with pytest.raises(ValueError):
+        parse_events(b'[{"id": ')
@@ -0,0 +1,145 @@
+# coding=utf-8
+# --------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import json
+import threading
+from datetime import datetime
+
+import pytest
+import requests
+from msrest.authentication import TopicCredentials
+from msrest.exceptions import ClientRequestError, HttpOperationError, ValidationError
+
+from azure.eventgrid import EventGridClient, EventGridPublisher
+from azure.eventgrid.models import EventGridEvent
+
+TOPIC = "topic1.westus2-1.eventgrid.azure.net"
+
+
+def _event(i, data_size=10):
+    return {
+        'id': str(i),
+        'subject': 'subject',
+        'data': {'payload': 'x' * data_size},
+        'event_type': 'Test.Event',
+        'event_time': datetime(2019, 12, 5),
+        'data_version': '1.0',
+    }
+
+
+class _Sender(object):
+    """Stands in for the service: records the requests, and answers 413 to bodies above a limit."""
+
+    def __init__(self, limit=None, fail_with=None):
+        self.limit = limit
+        self.fail_with = fail_with
+        self.requests = []
+        self.concurrent = self.max_concurrent = 0
+        self._lock = threading.Lock()
+        self._released = threading.Event()
+
+    def __call__(self, request, **kwargs):
+        with self._lock:
+            self.requests.append(request)
+            self.concurrent += 1
+            self.max_concurrent = max(self.max_concurrent, self.concurrent)
+        self._released.wait(0.05)
+        with self._lock:
+            self.concurrent -= 1
+        if self.fail_with:
+            raise self.fail_with
+        response = requests.Response()
+        response.request = requests.Request('POST', request.url).prepare()
+        response.status_code = 200
+        if self.limit is not None and len(request.data) > self.limit:
+            response.status_code = 413
+            response._content = b'{"error": {"code": "RequestEntityTooLarge"}}'
+        return response
+
+
+def _publisher(sender, **kwargs):
+    client = EventGridClient(TopicCredentials('key'))
+    client._client.send = sender
+    return EventGridPublisher(client, **kwargs)
+
+
+def test_batches_fit_the_size_limit():
+    sender = _Sender()
+    results = _publisher(sender, max_batch_size=4096).publish(TOPIC, (_event(i) for i in range(100)))
+
+    published = [event['id'] for request in sender.requests for event in json.loads(request.data.decode('utf-8'))]
+    assert sorted(published, key=int) == [str(i) for i in range(100)]
+    assert len(sender.requests) > 1
+    for request in sender.requests:
+        assert len(request.data) <= 4096
+        assert int(request.headers['Content-Length']) == len(request.data)
+        assert request.url == 'https://{}/api/events?api-version=2018-01-01'.format(TOPIC)
+
+    assert all(result.succeeded for result in results)
+    assert [event['id'] for result in results for event in result.events] == [str(i) for i in range(100)]
+    assert sorted(result.size for result in results) == sorted(len(request.data) for request in sender.requests)
+
+
+def test_batches_are_close_to_the_size_limit():
+    sender = _Sender()
+    _publisher(sender, max_batch_size=4096).publish(TOPIC, [_event(i) for i in range(100)])
+    event_size = max(len(json.dumps(event)) for request in sender.requests
+                     for event in json.loads(request.data.decode('utf-8')))
+    assert all(len(request.data) > 4096 - event_size - 1 for request in sender.requests[:-1])
+
+
+def test_models_and_dicts():
+    sender = _Sender()
+    event = EventGridEvent(id='1', subject='s', data={}, event_type='t', event_time=datetime(2019, 1, 1),
+                           data_version='1')
+    results = _publisher(sender).publish(TOPIC, [event, _event(2)])
+    assert len(results) == 1
+    assert results[0].events == [event, _event(2)]
+    assert [e['id'] for e in json.loads(sender.requests[0].data.decode('utf-8'))] == ['1', '2']
+
+
+def test_publishes_batches_concurrently():
+    sender = _Sender()
+    _publisher(sender, max_batch_size=1024, max_concurrency=3).publish(TOPIC, [_event(i) for i in range(60)])
+    assert sender.max_concurrent == 3
+
+
+def test_too_large_batches_are_split():
+    sender = _Sender(limit=2000)
+    results = _publisher(sender, max_batch_size=8000).publish(TOPIC, [_event(i) for i in range(40)])
+    assert all(result.succeeded for result in results)
+    assert all(result.size <= 2000 for result in results)
+    assert [event['id'] for result in results for event in result.events] == [str(i) for i in range(40)]
+    assert any(len(request.data) > 2000 for request in sender.requests)
+
+
+def test_single_event_too_large():
+    sender = _Sender(limit=500)
+    results = _publisher(sender).publish(TOPIC, [_event(1), _event(2, data_size=1000), _event(3)])
+    assert [len(result.events) for result in results] == [1, 1, 1]
+    assert [result.succeeded for result in results] == [True, False, True]
+    assert isinstance(results[1].error, HttpOperationError)
+    assert results[1].error.response.status_code == 413
+
+
+def test_connection_errors_are_results():
+    error = ClientRequestError("connection reset")
+    results = _publisher(_Sender(fail_with=error)).publish(TOPIC, [_event(1)])
+    assert results[0].error is error
+    assert not results[0].succeeded
+
+
+def test_invalid_event():
+    event = _event(1)
+    del event['subject']
+    with pytest.raises(ValidationError):
+        _publisher(_Sender()).publish(TOPIC, [event])
+
+
+def test_no_events():
+    sender = _Sender()
+    assert _publisher(sender).publish(TOPIC, iter([])) == []
+    assert sender.requests == []
@@ -214,7 +214,8 @@ class EventHubProducer(ConsumerProducerMixin):  # pylint: disable=too-many-insta
             if partition_key:
                 event_data._set_partition_key(partition_key)  # pylint: disable=protected-access
             wrapper_event_data = event_data
-            wrapper_event_data._trace_message(child)  # pylint: disable=protected-access
+            if child is not None:
+                wrapper_event_data._trace_message(child)  # pylint: disable=protected-access
         else:
             if isinstance(event_data, EventDataBatch):
                 if partition_key and partition_key != event_data._partition_key:  # pylint: disable=protected-access
@@ -223,7 +224,8 @@ class EventHubProducer(ConsumerProducerMixin):  # pylint: disable=too-many-insta
             else:
                 if partition_key:
                     event_data = _set_partition_key(event_data, partition_key)
-                event_data = _set_trace_message(event_data, child)
+                if child is not None:
+                    event_data = _set_trace_message(event_data, child)
                 wrapper_event_data = EventDataBatch._from_batch(event_data, partition_key)  # pylint: disable=protected-access
 
         wrapper_event_data.message.on_send_complete = self._on_outcome
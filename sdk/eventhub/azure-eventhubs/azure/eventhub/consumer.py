@@ -13,6 +13,7 @@ from distutils.version import StrictVersion
 import uamqp  # type: ignore
 from uamqp import types, errors, utils  # type: ignore
 from uamqp import ReceiveClient, Source  # type: ignore
+from azure.core.settings import settings
 
 from azure.eventhub.common import EventData, EventPosition
 from azure.eventhub.error import _error_handler
@@ -172,10 +173,13 @@ class EventHubConsumer(ConsumerProducerMixin):  # pylint:disable=too-many-instan
         message_batch = self._handler.receive_message_batch(
             max_batch_size=max_batch_size,
             timeout=remaining_time_ms)
+        # looked up once per batch rather than per event
+        tracing = settings.tracing_implementation() is not None
         for message in message_batch:
             event_data = EventData._from_message(message)  # pylint:disable=protected-access
             data_batch.append(event_data)
-            event_data._trace_link_message()  # pylint:disable=protected-access
+            if tracing:
+                event_data._trace_link_message()  # pylint:disable=protected-access
 
         if data_batch:
             self._offset = EventPosition(data_batch[-1].offset)
@@ -2,33 +2,41 @@
 # Copyright (c) Microsoft Corporation.
 # Licensed under the MIT License.
 # ------------------------------------
+import asyncio
+from typing import Any, Dict
+
 from azure.core.pipeline import PipelineRequest
 from azure.core.pipeline.policies import AsyncHTTPPolicy
-from azure.core.pipeline.transport import HttpRequest, HttpResponse
+from azure.core.pipeline.transport import HttpResponse
 
 from . import ChallengeAuthPolicyBase, HttpChallenge, HttpChallengeCache
+from .http_challenge_cache import _get_cache_key
 
 
 class AsyncChallengeAuthPolicy(ChallengeAuthPolicyBase, AsyncHTTPPolicy):
     """policy for handling HTTP authentication challenges"""
 
+    def __init__(self, credential: Any, **kwargs: Any) -> None:
+        super(AsyncChallengeAuthPolicy, self).__init__(credential, **kwargs)
+        # asyncio locks are created on first use, in the event loop running the pipeline
+        self._token_lock = None
+        self._discovery_locks = {}  # type: Dict[str, asyncio.Lock]
+
     async def send(self, request: PipelineRequest) -> HttpResponse:
         challenge = HttpChallengeCache.get_challenge_for_url(request.http_request.url)
         if not challenge:
-            # provoke a challenge with an unauthorized, bodiless request
-            no_body = HttpRequest(
-                request.http_request.method, request.http_request.url, headers=request.http_request.headers
-            )
-            if request.http_request.body:
-                # no_body was created with request's headers -> if request has a body, no_body's content-length is wrong
-                no_body.headers["Content-Length"] = "0"
-
-            challenger = await self.next.send(PipelineRequest(http_request=no_body, context=request.context))
-            try:
-                challenge = self._update_challenge(request, challenger)
-            except ValueError:
-                # didn't receive the expected challenge -> nothing more this policy can do
-                return challenger
+            # only one request per vault provokes the challenge; the others wait for it to be cached
+            key = _get_cache_key(request.http_request.url)
+            discovery_lock = self._discovery_locks.setdefault(key, asyncio.Lock())
+            async with discovery_lock:
+                challenge = HttpChallengeCache.get_challenge_for_url(request.http_request.url)
+                if not challenge:
+                    challenger = await self.next.send(self._get_challenge_request(request))
+                    try:
+                        challenge = self._update_challenge(request, challenger)
+                    except ValueError:
+                        # didn't receive the expected challenge -> nothing more this policy can do
+                        return challenger
 
         await self._handle_challenge(request, challenge)
         response = await self.next.send(request)
@@ -41,17 +49,26 @@ class AsyncChallengeAuthPolicy(ChallengeAuthPolicyBase, AsyncHTTPPolicy):
                 # 401 with no legible challenge -> nothing more this policy can do
                 return response
 
-            await self._handle_challenge(request, challenge)
+            # the cached token was rejected, so don't reuse it
+            await self._handle_challenge(request, challenge, force_refresh=True)
             response = await self.next.send(request)
 
         return response
 
-    async def _handle_challenge(self, request: PipelineRequest, challenge: HttpChallenge) -> None:
+    async def _handle_challenge(
+        self, request: PipelineRequest, challenge: HttpChallenge, force_refresh: bool = False
+    ) -> None:
         """authenticate according to challenge, add Authorization header to request"""
 
-        scope = challenge.get_resource()
-        if not scope.endswith("/.default"):
-            scope += "/.default"
-
-        access_token = await self._credential.get_token(scope)
+        scope = self._get_scope(challenge)
+        access_token = None if force_refresh else self._get_cached_token(scope)
+        if not access_token:
+            if not self._token_lock:
+                self._token_lock = asyncio.Lock()
+            async with self._token_lock:
+                # another request may have refreshed the token while this one waited for the lock
+                access_token = None if force_refresh else self._get_cached_token(scope)
+                if not access_token:
+                    access_token = await self._credential.get_token(scope)
+                    self._tokens[scope] = access_token
         self._update_headers(request.http_request.headers, access_token.token)
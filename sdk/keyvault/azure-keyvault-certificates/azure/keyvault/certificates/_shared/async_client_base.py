@@ -93,6 +93,9 @@ class AsyncKeyVaultClientBase:
             DistributedTracingPolicy(**kwargs),
             logging_policy,
         ]
+        if kwargs.get("metrics_sink"):
+            from azure.core.pipeline.policies import MetricsPolicy  # added in azure-core 1.1.0
+            policies.insert(policies.index(config.retry_policy), MetricsPolicy(**kwargs))
 
         if transport is None:
             from azure.core.pipeline.transport import AioHttpTransport
@@ -2,6 +2,9 @@
 # Copyright (c) Microsoft Corporation.
 # Licensed under the MIT License.
 # ------------------------------------
+import threading
+import time
+
 from azure.core.pipeline import PipelineRequest
 from azure.core.pipeline.policies import HTTPPolicy
 from azure.core.pipeline.policies._authentication import _BearerTokenCredentialPolicyBase
@@ -17,15 +20,17 @@ except ImportError:
 
 if TYPE_CHECKING:
     # pylint:disable=unused-import
+    from typing import Any, Dict, Optional
+    from azure.core.credentials import AccessToken
     from azure.core.pipeline.transport import HttpResponse
 
 
 class ChallengeAuthPolicyBase(_BearerTokenCredentialPolicyBase):
     """Sans I/O base for challenge authentication policies"""
 
-    # pylint:disable=useless-super-delegation
     def __init__(self, credential, **kwargs):
         super(ChallengeAuthPolicyBase, self).__init__(credential, **kwargs)
+        self._tokens = {}  # type: Dict[str, AccessToken]
 
     @staticmethod
     def _update_challenge(request, challenger):
@@ -40,29 +45,60 @@ class ChallengeAuthPolicyBase(_BearerTokenCredentialPolicyBase):
         ChallengeCache.set_challenge_for_url(request.http_request.url, challenge)
         return challenge
 
+    @staticmethod
+    def _get_scope(challenge):
+        # type: (HttpChallenge) -> str
+        scope = challenge.get_resource()
+        if not scope.endswith("/.default"):
+            scope += "/.default"
+        return scope
+
+    @staticmethod
+    def _get_challenge_request(request):
+        # type: (PipelineRequest) -> PipelineRequest
+        """an unauthorized, bodiless copy of request, sent to provoke a challenge"""
+
+        no_body = HttpRequest(
+            request.http_request.method, request.http_request.url, headers=request.http_request.headers
+        )
+        if request.http_request.body:
+            # no_body was created with request's headers -> if request has a body, no_body's content-length is wrong
+            no_body.headers["Content-Length"] = "0"
+        return PipelineRequest(http_request=no_body, context=request.context)
+
+    def _get_cached_token(self, scope):
+        # type: (str) -> Optional[AccessToken]
+        """the cached token for scope, unless it's missing or about to expire"""
+
+        token = self._tokens.get(scope)
+        if not token or token.expires_on - time.time() < 300:
+            return None
+        return token
+
 
 class ChallengeAuthPolicy(ChallengeAuthPolicyBase, HTTPPolicy):
     """policy for handling HTTP authentication challenges"""
 
+    def __init__(self, credential, **kwargs):
+        # type: (Any, **Any) -> None
+        super(ChallengeAuthPolicy, self).__init__(credential, **kwargs)
+        self._token_lock = threading.Lock()
+
     def send(self, request):
         # type: (PipelineRequest) -> HttpResponse
 
         challenge = ChallengeCache.get_challenge_for_url(request.http_request.url)
         if not challenge:
-            # provoke a challenge with an unauthorized, bodiless request
-            no_body = HttpRequest(
-                request.http_request.method, request.http_request.url, headers=request.http_request.headers
-            )
-            if request.http_request.body:
-                # no_body was created with request's headers -> if request has a body, no_body's content-length is wrong
-                no_body.headers["Content-Length"] = "0"
-
-            challenger = self.next.send(PipelineRequest(http_request=no_body, context=request.context))
-            try:
-                challenge = self._update_challenge(request, challenger)
-            except ValueError:
-                # didn't receive the expected challenge -> nothing more this policy can do
-                return challenger
+            # only one request per vault provokes the challenge; the others wait for it to be cached
+            with ChallengeCache.get_discovery_lock_for_url(request.http_request.url):
+                challenge = ChallengeCache.get_challenge_for_url(request.http_request.url)
+                if not challenge:
+                    challenger = self.next.send(self._get_challenge_request(request))
+                    try:
+                        challenge = self._update_challenge(request, challenger)
+                    except ValueError:
+                        # didn't receive the expected challenge -> nothing more this policy can do
+                        return challenger
 
         self._handle_challenge(request, challenge)
         response = self.next.send(request)
@@ -75,18 +111,23 @@ class ChallengeAuthPolicy(ChallengeAuthPolicyBase, HTTPPolicy):
                 # 401 with no legible challenge -> nothing more this policy can do
                 return response
 
-            self._handle_challenge(request, challenge)
+            # the cached token was rejected, so don't reuse it
+            self._handle_challenge(request, challenge, force_refresh=True)
             response = self.next.send(request)
 
         return response
 
-    def _handle_challenge(self, request, challenge):
-        # type: (PipelineRequest, HttpChallenge) -> None
+    def _handle_challenge(self, request, challenge, force_refresh=False):
+        # type: (PipelineRequest, HttpChallenge, bool) -> None
         """authenticate according to challenge, add Authorization header to request"""
 
-        scope = challenge.get_resource()
-        if not scope.endswith("/.default"):
-            scope += "/.default"
-
-        access_token = self._credential.get_token(scope)
+        scope = self._get_scope(challenge)
+        access_token = None if force_refresh else self._get_cached_token(scope)
+        if not access_token:
+            with self._token_lock:
+                # another thread may have refreshed the token while this one waited for the lock
+                access_token = None if force_refresh else self._get_cached_token(scope)
+                if not access_token:
+                    access_token = self._credential.get_token(scope)
+                    self._tokens[scope] = access_token
         self._update_headers(request.http_request.headers, access_token.token)
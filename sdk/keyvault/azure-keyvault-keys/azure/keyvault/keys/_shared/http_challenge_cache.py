@@ -21,6 +21,7 @@ if TYPE_CHECKING:
 
 
 _cache = {}  # type: Dict[str, HttpChallenge]
+_discovery_locks = {}  # type: Dict[str, threading.Lock]
 _lock = threading.Lock()
 
 
@@ -38,6 +39,21 @@ def get_challenge_for_url(url):
         return _cache.get(key)
 
 
+def get_discovery_lock_for_url(url):
+    """ Gets the lock held while discovering the challenge for the URL's host, so that
+    concurrent requests to a vault send a single challenge request between them.
+    :param url: the URL the challenge will be cached for.
+    :rtype: threading.Lock """
+
+    if not url:
+        raise ValueError("URL cannot be None")
+
+    key = _get_cache_key(url)
+
+    with _lock:
+        return _discovery_locks.setdefault(key, threading.Lock())
+
+
 def _get_cache_key(url):
     """Use the URL's netloc as cache key except when the URL specifies the default port for its scheme. In that case
     use the netloc without the port. That is to say, https://foo.bar and https://foo.bar:443 are considered equivalent.
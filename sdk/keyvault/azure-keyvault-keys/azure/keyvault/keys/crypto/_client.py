@@ -2,8 +2,11 @@
 # Copyright (c) Microsoft Corporation.
 # Licensed under the MIT License.
 # ------------------------------------
+from concurrent import futures
+
 import six
 from azure.core.exceptions import AzureError, HttpResponseError
+from azure.core.tracing.common import with_current_context
 from azure.core.tracing.decorator import distributed_trace
 
 from . import DecryptResult, EncryptResult, SignResult, VerifyResult, UnwrapResult, WrapResult
@@ -18,11 +21,43 @@ except ImportError:
 
 if TYPE_CHECKING:
     # pylint:disable=unused-import
-    from typing import Any, Optional, Union
+    from typing import Any, Callable, Iterable, List, Optional, Sequence, Tuple, TypeVar, Union
     from azure.core.credentials import TokenCredential
     from . import EncryptionAlgorithm, KeyWrapAlgorithm, SignatureAlgorithm
     from ._internal import Key as _Key
 
+    T = TypeVar("T")
+    R = TypeVar("R")
+
+_DEFAULT_MAX_CONCURRENCY = 4
+
+
+def _split(items, count):
+    # type: (Sequence[T], int) -> List[Sequence[T]]
+    """split items into at most count contiguous chunks of similar size"""
+    size = -(-len(items) // count)
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+def _map_concurrently(function, items, max_concurrency):
+    # type: (Callable[[T], R], Iterable[T], int) -> List[R]
+    """apply function to items on up to max_concurrency threads, returning the results in order
+
+    Each thread processes a contiguous chunk of items, so the cost of scheduling work is paid once per thread rather
+    than once per item. The cryptography library releases the GIL while OpenSSL works, so local operations on large
+    batches benefit from threads as well as remote ones.
+    """
+    if max_concurrency < 1:
+        raise ValueError("'max_concurrency' must be at least 1")
+    items = list(items)
+    if max_concurrency == 1 or len(items) < 2:
+        return [function(item) for item in items]
+
+    chunks = _split(items, max_concurrency)
+    process = with_current_context(lambda chunk: [function(item) for item in chunk])
+    with futures.ThreadPoolExecutor(len(chunks)) as executor:
+        return [result for results in executor.map(process, chunks) for result in results]
+
 
 class CryptographyClient(KeyVaultClientBase):
     """
@@ -384,3 +419,166 @@ class CryptographyClient(KeyVaultClientBase):
                 **kwargs
             ).value
         return VerifyResult(key_id=self.key_id, algorithm=algorithm, is_valid=result)
+
+    @distributed_trace
+    def encrypt_many(self, algorithm, plaintexts, **kwargs):
+        # type: (EncryptionAlgorithm, Iterable[bytes], **Any) -> List[EncryptResult]
+        """
+        Encrypt many values using the client's key. Requires the keys/encrypt permission.
+
+        The key is resolved and the permission checked once for the whole batch. When the key is available locally, the
+        values are encrypted on a pool of threads; otherwise the encrypt requests are sent to Key Vault concurrently.
+
+        :param algorithm: encryption algorithm to use
+        :type algorithm: :class:`~azure.keyvault.keys.crypto.enums.EncryptionAlgorithm`
+        :param plaintexts: values to encrypt, each a single block of data
+        :type plaintexts: Iterable[bytes]
+        :keyword int max_concurrency: maximum number of threads to use. Defaults to 4.
+        :returns: a result for each value, in the order of ``plaintexts``
+        :rtype: list[:class:`~azure.keyvault.keys.crypto.EncryptResult`]
+
+        Example:
+
+        .. code-block:: python
+
+            from azure.keyvault.keys.crypto import EncryptionAlgorithm
+
+            results = client.encrypt_many(EncryptionAlgorithm.rsa_oaep, [b"first", b"second"])
+            ciphertexts = [result.ciphertext for result in results]
+
+        """
+        max_concurrency = kwargs.pop("max_concurrency", _DEFAULT_MAX_CONCURRENCY)
+        local_key = self._get_local_key(**kwargs)
+        if local_key:
+            if "encrypt" not in self._allowed_ops:
+                raise AzureError("This client doesn't have 'keys/encrypt' permission")
+
+            def encrypt(plaintext):
+                return local_key.encrypt(plaintext, algorithm=algorithm.value)
+
+        else:
+
+            def encrypt(plaintext):
+                return self._client.encrypt(
+                    vault_base_url=self._key_id.vault_url,
+                    key_name=self._key_id.name,
+                    key_version=self._key_id.version,
+                    algorithm=algorithm,
+                    value=plaintext,
+                    **kwargs
+                ).result
+
+        return [
+            EncryptResult(key_id=self.key_id, algorithm=algorithm, ciphertext=ciphertext)
+            for ciphertext in _map_concurrently(encrypt, plaintexts, max_concurrency)
+        ]
+
+    @distributed_trace
+    def wrap_keys(self, algorithm, keys, **kwargs):
+        # type: (KeyWrapAlgorithm, Iterable[bytes], **Any) -> List[WrapResult]
+        """
+        Wrap many keys with the client's key. Requires the keys/wrapKey permission.
+
+        The key is resolved and the permission checked once for the whole batch. When the key is available locally, the
+        keys are wrapped on a pool of threads; otherwise the wrap requests are sent to Key Vault concurrently.
+
+        :param algorithm: wrapping algorithm to use
+        :type algorithm: :class:`~azure.keyvault.keys.crypto.enums.KeyWrapAlgorithm`
+        :param keys: keys to wrap
+        :type keys: Iterable[bytes]
+        :keyword int max_concurrency: maximum number of threads to use. Defaults to 4.
+        :returns: a result for each key, in the order of ``keys``
+        :rtype: list[:class:`~azure.keyvault.keys.crypto.WrapResult`]
+
+        Example:
+
+        .. code-block:: python
+
+            import os
+            from azure.keyvault.keys.crypto import KeyWrapAlgorithm
+
+            # wrap a data encryption key for each record
+            data_keys = [os.urandom(32) for _ in range(1000)]
+            results = client.wrap_keys(KeyWrapAlgorithm.rsa_oaep, data_keys)
+            encrypted_keys = [result.encrypted_key for result in results]
+
+        """
+        max_concurrency = kwargs.pop("max_concurrency", _DEFAULT_MAX_CONCURRENCY)
+        local_key = self._get_local_key(**kwargs)
+        if local_key:
+            if "wrapKey" not in self._allowed_ops:
+                raise AzureError("This client doesn't have 'keys/wrapKey' permission")
+
+            def wrap(key):
+                return local_key.wrap_key(key, algorithm=algorithm.value)
+
+        else:
+
+            def wrap(key):
+                return self._client.wrap_key(
+                    self._key_id.vault_url,
+                    self._key_id.name,
+                    self._key_id.version,
+                    algorithm=algorithm,
+                    value=key,
+                    **kwargs
+                ).result
+
+        return [
+            WrapResult(key_id=self.key_id, algorithm=algorithm, encrypted_key=encrypted_key)
+            for encrypted_key in _map_concurrently(wrap, keys, max_concurrency)
+        ]
+
+    @distributed_trace
+    def verify_many(self, algorithm, signatures, **kwargs):
+        # type: (SignatureAlgorithm, Iterable[Tuple[bytes, bytes]], **Any) -> List[VerifyResult]
+        """
+        Verify many signatures using the client's key. Requires the keys/verify permission.
+
+        The key is resolved and the permission checked once for the whole batch. When the key is available locally, the
+        signatures are verified on a pool of threads; otherwise the verify requests are sent to Key Vault concurrently.
+
+        :param algorithm: verification algorithm
+        :type algorithm: :class:`~azure.keyvault.keys.crypto.enums.SignatureAlgorithm`
+        :param signatures: (digest, signature) pairs to verify
+        :type signatures: Iterable[tuple[bytes, bytes]]
+        :keyword int max_concurrency: maximum number of threads to use. Defaults to 4.
+        :returns: a result for each pair, in the order of ``signatures``
+        :rtype: list[:class:`~azure.keyvault.keys.crypto.VerifyResult`]
+
+        Example:
+
+        .. code-block:: python
+
+            from azure.keyvault.keys.crypto import SignatureAlgorithm
+
+            results = client.verify_many(SignatureAlgorithm.rs256, zip(digests, signatures))
+            assert all(result.is_valid for result in results)
+
+        """
+        max_concurrency = kwargs.pop("max_concurrency", _DEFAULT_MAX_CONCURRENCY)
+        local_key = self._get_local_key(**kwargs)
+        if local_key:
+            if "verify" not in self._allowed_ops:
+                raise AzureError("This client doesn't have 'keys/verify' permission")
+
+            def verify(pair):
+                return local_key.verify(pair[0], pair[1], algorithm=algorithm.value)
+
+        else:
+
+            def verify(pair):
+                return self._client.verify(
+                    vault_base_url=self._key_id.vault_url,
+                    key_name=self._key_id.name,
+                    key_version=self._key_id.version,
+                    algorithm=algorithm,
+                    digest=pair[0],
+                    signature=pair[1],
+                    **kwargs
+                ).value
+
+        return [
+            VerifyResult(key_id=self.key_id, algorithm=algorithm, is_valid=is_valid)
+            for is_valid in _map_concurrently(verify, signatures, max_concurrency)
+        ]
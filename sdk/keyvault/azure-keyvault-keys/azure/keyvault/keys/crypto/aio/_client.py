@@ -2,11 +2,14 @@
 # Copyright (c) Microsoft Corporation.
 # Licensed under the MIT License.
 # ------------------------------------
+import asyncio
+
 from azure.core.exceptions import AzureError, HttpResponseError
 from azure.core.tracing.decorator_async import distributed_trace_async
 from azure.keyvault.keys._shared import AsyncKeyVaultClientBase, parse_vault_id
 
 from .. import DecryptResult, EncryptResult, SignResult, VerifyResult, UnwrapResult, WrapResult
+from .._client import _DEFAULT_MAX_CONCURRENCY, _split
 from .._internal import EllipticCurveKey, RsaKey, SymmetricKey
 from ..._models import KeyVaultKey
 
@@ -17,11 +20,50 @@ except ImportError:
 
 if TYPE_CHECKING:
     # pylint:disable=unused-import
-    from typing import Any, Optional, Union
+    from typing import Any, Awaitable, Callable, Iterable, List, Optional, Tuple, TypeVar, Union
     from azure.core.credentials import TokenCredential
     from .. import EncryptionAlgorithm, KeyWrapAlgorithm, SignatureAlgorithm
     from .._internal import Key as _Key
 
+    T = TypeVar("T")
+    R = TypeVar("R")
+
+
+async def _map_locally(function: "Callable[[T], R]", items: "Iterable[T]", max_concurrency: int) -> "List[R]":
+    """apply function to items on up to max_concurrency threads of the loop's default executor, in order"""
+    if max_concurrency < 1:
+        raise ValueError("'max_concurrency' must be at least 1")
+    items = list(items)
+    if not items:
+        return []
+
+    def process(chunk):
+        return [function(item) for item in chunk]
+
+    loop = asyncio.get_event_loop()
+    chunk_results = await asyncio.gather(
+        *[loop.run_in_executor(None, process, chunk) for chunk in _split(items, max_concurrency)]
+    )
+    return [result for results in chunk_results for result in results]
+
+
+async def _map_remotely(
+    function: "Callable[[T], Awaitable[R]]", items: "Iterable[T]", max_concurrency: int
+) -> "List[R]":
+    """await function for each item with up to max_concurrency calls in flight, returning the results in order"""
+    if max_concurrency < 1:
+        raise ValueError("'max_concurrency' must be at least 1")
+    items = list(items)
+    results = [None] * len(items)  # type: List[Any]
+    slots = asyncio.Semaphore(max_concurrency)
+
+    async def process(index, item):
+        async with slots:
+            results[index] = await function(item)
+
+    await asyncio.gather(*[process(i, item) for i, item in enumerate(items)])
+    return results
+
 
 class CryptographyClient(AsyncKeyVaultClientBase):
     """
@@ -371,3 +413,161 @@ class CryptographyClient(AsyncKeyVaultClientBase):
                 **kwargs
             ).value
         return VerifyResult(key_id=self.key_id, algorithm=algorithm, is_valid=result)
+
+    @distributed_trace_async
+    async def encrypt_many(
+        self, algorithm: "EncryptionAlgorithm", plaintexts: "Iterable[bytes]", **kwargs: "Any"
+    ) -> "List[EncryptResult]":
+        """
+        Encrypt many values using the client's key. Requires the keys/encrypt permission.
+
+        The key is resolved and the permission checked once for the whole batch. When the key is available locally, the
+        values are encrypted on the event loop's default executor; otherwise the encrypt requests are sent to Key Vault
+        concurrently.
+
+        :param algorithm: encryption algorithm to use
+        :type algorithm: :class:`~azure.keyvault.keys.crypto.enums.EncryptionAlgorithm`
+        :param plaintexts: values to encrypt, each a single block of data
+        :type plaintexts: Iterable[bytes]
+        :keyword int max_concurrency: maximum number of threads, or requests in flight, to use. Defaults to 4.
+        :returns: a result for each value, in the order of ``plaintexts``
+        :rtype: list[:class:`~azure.keyvault.keys.crypto.EncryptResult`]
+
+        Example:
+
+        .. code-block:: python
+
+            from azure.keyvault.keys.crypto import EncryptionAlgorithm
+
+            results = await client.encrypt_many(EncryptionAlgorithm.rsa_oaep, [b"first", b"second"])
+            ciphertexts = [result.ciphertext for result in results]
+
+        """
+        max_concurrency = kwargs.pop("max_concurrency", _DEFAULT_MAX_CONCURRENCY)
+        local_key = await self._get_local_key(**kwargs)
+        if local_key:
+            if "encrypt" not in self._allowed_ops:
+                raise AzureError("This client doesn't have 'keys/encrypt' permission")
+            ciphertexts = await _map_locally(
+                lambda plaintext: local_key.encrypt(plaintext, algorithm=algorithm.value), plaintexts, max_concurrency
+            )
+        else:
+
+            async def encrypt(plaintext):
+                operation = await self._client.encrypt(
+                    self._key_id.vault_url, self._key_id.name, self._key_id.version, algorithm, plaintext, **kwargs
+                )
+                return operation.result
+
+            ciphertexts = await _map_remotely(encrypt, plaintexts, max_concurrency)
+        return [
+            EncryptResult(key_id=self.key_id, algorithm=algorithm, ciphertext=ciphertext) for ciphertext in ciphertexts
+        ]
+
+    @distributed_trace_async
+    async def wrap_keys(
+        self, algorithm: "KeyWrapAlgorithm", keys: "Iterable[bytes]", **kwargs: "Any"
+    ) -> "List[WrapResult]":
+        """
+        Wrap many keys with the client's key. Requires the keys/wrapKey permission.
+
+        The key is resolved and the permission checked once for the whole batch. When the key is available locally, the
+        keys are wrapped on the event loop's default executor; otherwise the wrap requests are sent to Key Vault
+        concurrently.
+
+        :param algorithm: wrapping algorithm to use
+        :type algorithm: :class:`~azure.keyvault.keys.crypto.enums.KeyWrapAlgorithm`
+        :param keys: keys to wrap
+        :type keys: Iterable[bytes]
+        :keyword int max_concurrency: maximum number of threads, or requests in flight, to use. Defaults to 4.
+        :returns: a result for each key, in the order of ``keys``
+        :rtype: list[:class:`~azure.keyvault.keys.crypto.WrapResult`]
+
+        Example:
+
+        .. code-block:: python
+
+            import os
+            from azure.keyvault.keys.crypto import KeyWrapAlgorithm
+
+            # wrap a data encryption key for each record
+            data_keys = [os.urandom(32) for _ in range(1000)]
+            results = await client.wrap_keys(KeyWrapAlgorithm.rsa_oaep, data_keys)
+            encrypted_keys = [result.encrypted_key for result in results]
+
+        """
+        max_concurrency = kwargs.pop("max_concurrency", _DEFAULT_MAX_CONCURRENCY)
+        local_key = await self._get_local_key(**kwargs)
+        if local_key:
+            if "wrapKey" not in self._allowed_ops:
+                raise AzureError("This client doesn't have 'keys/wrapKey' permission")
+            encrypted_keys = await _map_locally(
+                lambda key: local_key.wrap_key(key, algorithm=algorithm.value), keys, max_concurrency
+            )
+        else:
+
+            async def wrap(key):
+                operation = await self._client.wrap_key(
+                    self._key_id.vault_url, self._key_id.name, self._key_id.version, algorithm, key, **kwargs
+                )
+                return operation.result
+
+            encrypted_keys = await _map_remotely(wrap, keys, max_concurrency)
+        return [
+            WrapResult(key_id=self.key_id, algorithm=algorithm, encrypted_key=encrypted_key)
+            for encrypted_key in encrypted_keys
+        ]
+
+    @distributed_trace_async
+    async def verify_many(
+        self, algorithm: "SignatureAlgorithm", signatures: "Iterable[Tuple[bytes, bytes]]", **kwargs: "Any"
+    ) -> "List[VerifyResult]":
+        """
+        Verify many signatures using the client's key. Requires the keys/verify permission.
+
+        The key is resolved and the permission checked once for the whole batch. When the key is available locally, the
+        signatures are verified on the event loop's default executor; otherwise the verify requests are sent to Key
+        Vault concurrently.
+
+        :param algorithm: verification algorithm
+        :type algorithm: :class:`~azure.keyvault.keys.crypto.enums.SignatureAlgorithm`
+        :param signatures: (digest, signature) pairs to verify
+        :type signatures: Iterable[tuple[bytes, bytes]]
+        :keyword int max_concurrency: maximum number of threads, or requests in flight, to use. Defaults to 4.
+        :returns: a result for each pair, in the order of ``signatures``
+        :rtype: list[:class:`~azure.keyvault.keys.crypto.VerifyResult`]
+
+        Example:
+
+        .. code-block:: python
+
+            from azure.keyvault.keys.crypto import SignatureAlgorithm
+
+            results = await client.verify_many(SignatureAlgorithm.rs256, zip(digests, signatures))
+            assert all(result.is_valid for result in results)
+
+        """
+        max_concurrency = kwargs.pop("max_concurrency", _DEFAULT_MAX_CONCURRENCY)
+        local_key = await self._get_local_key(**kwargs)
+        if local_key:
+            if "verify" not in self._allowed_ops:
+                raise AzureError("This client doesn't have 'keys/verify' permission")
+            results = await _map_locally(
+                lambda pair: local_key.verify(pair[0], pair[1], algorithm=algorithm.value), signatures, max_concurrency
+            )
+        else:
+
+            async def verify(pair):
+                operation = await self._client.verify(
+                    vault_base_url=self._key_id.vault_url,
+                    key_name=self._key_id.name,
+                    key_version=self._key_id.version,
+                    algorithm=algorithm,
+                    digest=pair[0],
+                    signature=pair[1],
+                    **kwargs
+                )
+                return operation.value
+
+            results = await _map_remotely(verify, signatures, max_concurrency)
+        return [VerifyResult(key_id=self.key_id, algorithm=algorithm, is_valid=is_valid) for is_valid in results]
@@ -7,6 +7,9 @@ Tests for the HTTP challenge authentication implementation. These tests aren't p
 the challenge cache is global to the process.
 """
 
+import threading
+import time
+
 try:
     from unittest.mock import Mock
 except ImportError:  # python < 3.3
@@ -144,3 +147,89 @@ def test_policy_updates_cache():
 
     # The next request will receive a challenge. The policy should handle it and update the cache entry.
     pipeline.run(HttpRequest("GET", url))
+
+
+def test_policy_caches_token():
+    """The policy should request a token once and reuse it until it's close to expiring."""
+
+    # ensure the test starts with an empty cache
+    HttpChallengeCache.clear()
+
+    url = "https://azure.service/path"
+    challenge_fmt = 'Bearer authorization="https://login.authority.net/tenant", resource={}'
+    transport = validating_transport(
+        requests=[Request(url)] + [Request(url, required_headers={"Authorization": "Bearer token"})] * 3,
+        responses=[mock_response(status_code=401, headers={"WWW-Authenticate": challenge_fmt.format("scope")})]
+        + [mock_response(status_code=200)] * 3,
+    )
+    credential = Mock(get_token=Mock(return_value=AccessToken("token", time.time() + 3600)))
+    pipeline = Pipeline(policies=[ChallengeAuthPolicy(credential=credential)], transport=transport)
+
+    for _ in range(3):
+        pipeline.run(HttpRequest("GET", url))
+
+    assert credential.get_token.call_count == 1
+    credential.get_token.assert_called_once_with("scope/.default")
+
+
+def test_policy_refreshes_expiring_token():
+    # ensure the test starts with an empty cache
+    HttpChallengeCache.clear()
+
+    url = "https://azure.service/path"
+    challenge = HttpChallenge(url, 'Bearer authorization="https://login.authority.net/tenant", resource=scope')
+    HttpChallengeCache.set_challenge_for_url(url, challenge)
+
+    # the first token expires within the refresh window, so the second request must get a new one
+    tokens = iter([AccessToken("first", time.time() + 60), AccessToken("second", time.time() + 3600)])
+    credential = Mock(get_token=Mock(side_effect=lambda _: next(tokens)))
+    transport = validating_transport(
+        requests=[
+            Request(url, required_headers={"Authorization": "Bearer first"}),
+            Request(url, required_headers={"Authorization": "Bearer second"}),
+            Request(url, required_headers={"Authorization": "Bearer second"}),
+        ],
+        responses=[mock_response(status_code=200)] * 3,
+    )
+    pipeline = Pipeline(policies=[ChallengeAuthPolicy(credential=credential)], transport=transport)
+
+    for _ in range(3):
+        pipeline.run(HttpRequest("GET", url))
+
+    assert credential.get_token.call_count == 2
+
+
+def test_concurrent_requests_share_challenge_discovery():
+    """When the challenge cache is empty, concurrent requests to a vault should send a single challenge request."""
+
+    # ensure the test starts with an empty cache
+    HttpChallengeCache.clear()
+
+    url = "https://azure.service/path"
+    challenge_header = 'Bearer authorization="https://login.authority.net/tenant", resource=scope'
+    lock = threading.Lock()
+    challenge_requests = []
+    release_challenge = threading.Event()
+
+    def send(request, **kwargs):
+        if "Authorization" not in request.headers:
+            with lock:
+                challenge_requests.append(request)
+            # hold the challenge response until every thread has reached the policy
+            release_challenge.wait(5)
+            return mock_response(status_code=401, headers={"WWW-Authenticate": challenge_header})
+        return mock_response(status_code=200)
+
+    credential = Mock(get_token=Mock(return_value=AccessToken("token", time.time() + 3600)))
+    pipeline = Pipeline(policies=[ChallengeAuthPolicy(credential=credential)], transport=Mock(send=send))
+
+    threads = [threading.Thread(target=pipeline.run, args=(HttpRequest("GET", url),)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.1)
+    release_challenge.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(challenge_requests) == 1
+    assert credential.get_token.call_count == 1
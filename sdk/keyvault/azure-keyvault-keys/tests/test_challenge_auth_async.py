@@ -7,6 +7,7 @@ Tests for the HTTP challenge authentication implementation. These tests aren't p
 the challenge cache is global to the process.
 """
 import asyncio
+import time
 
 try:
     from unittest.mock import Mock
@@ -114,3 +115,40 @@ async def test_policy_updates_cache():
 
     # The next request will receive a challenge. The policy should handle it and update the cache entry.
     await pipeline.run(HttpRequest("GET", url))
+
+
+@pytest.mark.asyncio
+async def test_policy_caches_token_and_shares_challenge_discovery():
+    """Concurrent requests should send a single challenge request and share one cached token."""
+
+    # ensure the test starts with an empty cache
+    HttpChallengeCache.clear()
+
+    url = "https://azure.service/path"
+    challenge_header = 'Bearer authorization="https://login.authority.net/tenant", resource=scope'
+    challenge_requests = []
+
+    async def send(request, **kwargs):
+        await asyncio.sleep(0)
+        if "Authorization" not in request.headers:
+            challenge_requests.append(request)
+            await asyncio.sleep(0.01)
+            return mock_response(status_code=401, headers={"WWW-Authenticate": challenge_header})
+        assert request.headers["Authorization"] == "Bearer token"
+        return mock_response(status_code=200)
+
+    get_token_calls = []
+
+    async def get_token(*scopes):
+        get_token_calls.append(scopes)
+        await asyncio.sleep(0.01)
+        return AccessToken("token", time.time() + 3600)
+
+    credential = Mock(get_token=get_token)
+    pipeline = AsyncPipeline(policies=[AsyncChallengeAuthPolicy(credential=credential)], transport=Mock(send=send))
+
+    await asyncio.gather(*[pipeline.run(HttpRequest("GET", url)) for _ in range(8)])
+    await pipeline.run(HttpRequest("GET", url))
+
+    assert len(challenge_requests) == 1
+    assert get_token_calls == [("scope/.default",)]
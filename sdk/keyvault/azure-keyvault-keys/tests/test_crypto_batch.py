@@ -0,0 +1,124 @@
+# ------------------------------------
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+# ------------------------------------
+"""Tests for CryptographyClient's batch operations, which don't require a vault"""
+import hashlib
+import os
+
+try:
+    from unittest.mock import Mock
+except ImportError:  # python < 3.3
+    from mock import Mock
+
+from azure.core.exceptions import AzureError
+from azure.keyvault.keys import KeyVaultKey
+from azure.keyvault.keys.crypto import CryptographyClient, EncryptionAlgorithm, KeyWrapAlgorithm, SignatureAlgorithm
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import padding, rsa, utils
+import pytest
+
+KEY_ID = "https://fake.vault.azure.net/keys/key/version"
+RSA_OPS = ("encrypt", "decrypt", "sign", "verify", "wrapKey", "unwrapKey")
+
+
+def _int_to_bytes(i):
+    return i.to_bytes((i.bit_length() + 7) // 8, "big")
+
+
+def rsa_key(key_ops=RSA_OPS):
+    """a KeyVaultKey with only public key material, as returned by get_key, and the matching private key"""
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048, backend=default_backend())
+    public_numbers = private_key.public_key().public_numbers()
+    jwk = {"kty": "RSA", "key_ops": key_ops, "n": _int_to_bytes(public_numbers.n), "e": _int_to_bytes(public_numbers.e)}
+    return KeyVaultKey(key_id=KEY_ID, jwk=jwk), private_key
+
+
+OAEP = padding.OAEP(mgf=padding.MGF1(algorithm=hashes.SHA1()), algorithm=hashes.SHA1(), label=None)
+
+
+def rs256(private_key, digest):
+    return private_key.sign(digest, padding.PKCS1v15(), utils.Prehashed(hashes.SHA256()))
+
+
+def remote_client():
+    """a client that can't get its key, so sends every operation to the (mock) vault"""
+    client = CryptographyClient(KEY_ID, credential=Mock())
+    client._keys_get_forbidden = True
+    client._client = Mock(
+        encrypt=Mock(side_effect=lambda *_, **kwargs: Mock(result=kwargs["value"][::-1])),
+        wrap_key=Mock(side_effect=lambda *_, **kwargs: Mock(result=kwargs["value"] * 2)),
+        verify=Mock(side_effect=lambda *_, **kwargs: Mock(value=kwargs["digest"] == kwargs["signature"])),
+    )
+    return client
+
+
+@pytest.mark.parametrize("max_concurrency", (1, 3, 8))
+def test_encrypt_many_local(max_concurrency):
+    key, private_key = rsa_key()
+    client = CryptographyClient(key, credential=Mock())
+    plaintexts = [os.urandom(32) for _ in range(10)]
+
+    results = client.encrypt_many(EncryptionAlgorithm.rsa_oaep, plaintexts, max_concurrency=max_concurrency)
+
+    assert len(results) == len(plaintexts)
+    for plaintext, result in zip(plaintexts, results):
+        assert result.key_id == KEY_ID
+        assert result.algorithm == EncryptionAlgorithm.rsa_oaep
+        assert private_key.decrypt(result.ciphertext, OAEP) == plaintext
+
+
+def test_wrap_keys_local():
+    jwk = {"k": os.urandom(32), "kty": "oct", "key_ops": ("unwrapKey", "wrapKey")}
+    client = CryptographyClient(KeyVaultKey(key_id=KEY_ID, jwk=jwk), credential=Mock())
+    keys = [os.urandom(32) for _ in range(10)]
+
+    results = client.wrap_keys(KeyWrapAlgorithm.aes_256, keys)
+
+    assert [client.unwrap_key(r.algorithm, r.encrypted_key).key for r in results] == keys
+
+
+def test_verify_many_local():
+    key, private_key = rsa_key()
+    client = CryptographyClient(key, credential=Mock())
+    digests = [hashlib.sha256(os.urandom(8)).digest() for _ in range(6)]
+    signatures = [rs256(private_key, digest) for digest in digests]
+    signatures[2] = signatures[3]
+
+    results = client.verify_many(SignatureAlgorithm.rs256, zip(digests, signatures))
+
+    assert [result.is_valid for result in results] == [True, True, False, True, True, True]
+
+
+def test_batch_permissions_checked():
+    key, _ = rsa_key(key_ops=("decrypt",))
+    client = CryptographyClient(key, credential=Mock())
+    for operation, algorithm in (
+        (client.encrypt_many, EncryptionAlgorithm.rsa_oaep),
+        (client.wrap_keys, KeyWrapAlgorithm.rsa_oaep),
+        (client.verify_many, SignatureAlgorithm.rs256),
+    ):
+        with pytest.raises(AzureError):
+            operation(algorithm, [])
+
+
+def test_batch_remote():
+    client = remote_client()
+    values = [os.urandom(8) for _ in range(9)]
+
+    encrypted = client.encrypt_many(EncryptionAlgorithm.rsa_oaep, values, max_concurrency=3)
+    assert [result.ciphertext for result in encrypted] == [value[::-1] for value in values]
+    assert client._client.encrypt.call_count == len(values)
+
+    wrapped = client.wrap_keys(KeyWrapAlgorithm.rsa_oaep, values)
+    assert [result.encrypted_key for result in wrapped] == [value * 2 for value in values]
+
+    verified = client.verify_many(SignatureAlgorithm.rs256, [(b"a", b"a"), (b"a", b"b")])
+    assert [result.is_valid for result in verified] == [True, False]
+
+
+def test_invalid_max_concurrency():
+    client = remote_client()
+    with pytest.raises(ValueError):
+        client.encrypt_many(EncryptionAlgorithm.rsa_oaep, [b"a"], max_concurrency=0)
@@ -0,0 +1,76 @@
+# ------------------------------------
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+# ------------------------------------
+"""Tests for the async CryptographyClient's batch operations, which don't require a vault"""
+import asyncio
+import hashlib
+import os
+
+try:
+    from unittest.mock import Mock
+except ImportError:  # python < 3.3
+    from mock import Mock
+
+from azure.keyvault.keys import KeyVaultKey
+from azure.keyvault.keys.crypto import EncryptionAlgorithm, KeyWrapAlgorithm, SignatureAlgorithm
+from azure.keyvault.keys.crypto.aio import CryptographyClient
+import pytest
+
+from test_crypto_batch import KEY_ID, OAEP, rs256, rsa_key
+
+
+@pytest.mark.asyncio
+async def test_encrypt_many_local():
+    key, private_key = rsa_key()
+    client = CryptographyClient(key, credential=Mock())
+    plaintexts = [os.urandom(32) for _ in range(10)]
+
+    results = await client.encrypt_many(EncryptionAlgorithm.rsa_oaep, plaintexts, max_concurrency=3)
+
+    assert [private_key.decrypt(result.ciphertext, OAEP) for result in results] == plaintexts
+
+
+@pytest.mark.asyncio
+async def test_wrap_keys_and_verify_many_local():
+    jwk = {"k": os.urandom(32), "kty": "oct", "key_ops": ("unwrapKey", "wrapKey")}
+    client = CryptographyClient(KeyVaultKey(key_id=KEY_ID, jwk=jwk), credential=Mock())
+    keys = [os.urandom(32) for _ in range(5)]
+    results = await client.wrap_keys(KeyWrapAlgorithm.aes_256, keys)
+    assert [(await client.unwrap_key(r.algorithm, r.encrypted_key)).key for r in results] == keys
+
+    key, private_key = rsa_key()
+    client = CryptographyClient(key, credential=Mock())
+    digests = [hashlib.sha256(os.urandom(8)).digest() for _ in range(4)]
+    signatures = [rs256(private_key, digest) for digest in digests]
+    signatures[0] = signatures[1]
+    results = await client.verify_many(SignatureAlgorithm.rs256, zip(digests, signatures))
+    assert [result.is_valid for result in results] == [False, True, True, True]
+
+
+@pytest.mark.asyncio
+async def test_batch_remote_concurrency():
+    in_flight = []
+    peak = []
+
+    async def encrypt(*args, **kwargs):
+        in_flight.append(None)
+        peak.append(len(in_flight))
+        await asyncio.sleep(0.01)
+        in_flight.pop()
+        return Mock(result=args[4][::-1])
+
+    async def verify(**kwargs):
+        return Mock(value=kwargs["digest"] == kwargs["signature"])
+
+    client = CryptographyClient(KEY_ID, credential=Mock())
+    client._keys_get_forbidden = True
+    client._client = Mock(encrypt=encrypt, verify=verify)
+
+    values = [os.urandom(8) for _ in range(10)]
+    results = await client.encrypt_many(EncryptionAlgorithm.rsa_oaep, values, max_concurrency=3)
+    assert [result.ciphertext for result in results] == [value[::-1] for value in values]
+    assert max(peak) == 3
+
+    results = await client.verify_many(SignatureAlgorithm.rs256, [(b"a", b"b"), (b"a", b"a")])
+    assert [result.is_valid for result in results] == [False, True]
@@ -0,0 +1,52 @@
+# ------------------------------------
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+# ------------------------------------
+"""Tests for the metrics_sink keyword argument, which don't require a vault"""
+import json
+import time
+
+try:
+    from unittest.mock import Mock
+except ImportError:  # python < 3.3
+    from mock import Mock
+
+from azure.core.credentials import AccessToken
+from azure.core.exceptions import ResourceNotFoundError
+from azure.core.pipeline.policies import MetricsSink
+from azure.keyvault.keys import KeyClient
+from azure.keyvault.keys._shared import HttpChallengeCache
+import pytest
+
+from keys_helpers import mock_response, Request, validating_transport
+
+
+def test_metrics_sink():
+    HttpChallengeCache.clear()
+
+    url = "https://vault.vault.azure.net/keys/key/"
+    not_found = json.dumps({"error": {"code": "KeyNotFound", "message": "no key"}})
+    challenge = 'Bearer authorization="https://login.authority.net/tenant", resource=https://vault.azure.net'
+    transport = validating_transport(
+        requests=[Request(url), Request(url, required_headers={"Authorization": "Bearer token"})],
+        responses=[
+            mock_response(status_code=401, headers={"WWW-Authenticate": challenge}),
+            Mock(status_code=404, headers={}, content_type="application/json", text=lambda encoding=None: not_found),
+        ],
+    )
+    credential = Mock(get_token=Mock(return_value=AccessToken("token", time.time() + 3600)))
+    sink = Mock(spec=MetricsSink)
+    client = KeyClient("https://vault.vault.azure.net", credential, transport=transport, metrics_sink=sink)
+
+    with pytest.raises(ResourceNotFoundError):
+        client.get_key("key")
+
+    # the policy comes before the challenge authentication policy, which sends the request twice
+    assert sink.record.call_count == 1
+    assert sink.record.call_args[0][:3] == ("vault.vault.azure.net", "GET", "4xx")
+
+
+def test_no_metrics_by_default():
+    client = KeyClient("https://vault.vault.azure.net", Mock())
+    policies = client._client._client._pipeline._impl_policies
+    assert not any(type(getattr(policy, "_policy", policy)).__name__ == "MetricsPolicy" for policy in policies)
@@ -3,6 +3,7 @@
 # Licensed under the MIT License.
 # ------------------------------------
 from ._models import DeletedSecret, KeyVaultSecret, SecretProperties
+from ._cache import SecretCache, SecretCacheMetrics
 from ._client import SecretClient
 
-__all__ = ["SecretClient", "KeyVaultSecret", "SecretProperties", "DeletedSecret"]
+__all__ = ["SecretClient", "KeyVaultSecret", "SecretProperties", "DeletedSecret", "SecretCache", "SecretCacheMetrics"]
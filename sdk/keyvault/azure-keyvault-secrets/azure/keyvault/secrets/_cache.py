@@ -0,0 +1,353 @@
+# ------------------------------------
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+# ------------------------------------
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent import futures
+
+from azure.core.exceptions import ResourceNotFoundError
+from azure.core.tracing.common import with_current_context
+
+try:
+    from typing import TYPE_CHECKING
+except ImportError:
+    TYPE_CHECKING = False
+
+if TYPE_CHECKING:
+    # pylint:disable=unused-import
+    from typing import Any, Dict, Optional, Tuple
+    from ._client import SecretClient
+    from ._models import KeyVaultSecret
+
+_LOGGER = logging.getLogger(__name__)
+
+# how long to wait before contacting the vault again after a failed refresh, when it doesn't send Retry-After
+_DEFAULT_RETRY_AFTER = 10
+
+
+def _retry_after(error):
+    # type: (Exception) -> float
+    try:
+        return max(float(error.response.headers["Retry-After"]), 0)  # type: ignore
+    except (AttributeError, KeyError, TypeError, ValueError):
+        return _DEFAULT_RETRY_AFTER
+
+
+class _CacheEntry(object):
+    __slots__ = ("secret", "expires_at", "refresh_at", "throttled_until")
+
+    def __init__(self, secret, expires_at, refresh_at):
+        # type: (KeyVaultSecret, float, float) -> None
+        self.secret = secret
+        self.expires_at = expires_at
+        self.refresh_at = refresh_at
+        self.throttled_until = 0.0
+
+
+class SecretCacheMetrics(object):
+    """Counters and latencies collected by a :class:`~azure.keyvault.secrets.SecretCache`.
+
+    :ivar int hits: Reads answered from the cache without waiting for the vault.
+    :ivar int misses: Reads that waited for the vault.
+    :ivar int stale_served: Reads answered with an expired value because the vault was throttling requests.
+    :ivar int evictions: Entries removed to keep the cache within its maximum size.
+    :ivar int refreshes: Background refreshes that completed successfully.
+    :ivar int refresh_errors: Background refreshes that failed.
+    :ivar float max_refresh_latency: The slowest successful background refresh, in seconds.
+    :ivar float max_load_latency: The slowest successful read from the vault on a miss, in seconds.
+    """
+
+    def __init__(self):
+        # type: () -> None
+        self.hits = 0
+        self.misses = 0
+        self.stale_served = 0
+        self.evictions = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+        self.max_refresh_latency = 0.0
+        self.max_load_latency = 0.0
+        self._refresh_latency_total = 0.0
+        self._loads = 0
+        self._load_latency_total = 0.0
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        # type: () -> str
+        return "<SecretCacheMetrics hits={} misses={} hit_ratio={:.3f}>".format(self.hits, self.misses, self.hit_ratio)
+
+    @property
+    def hit_ratio(self):
+        # type: () -> float
+        """The fraction of reads answered from the cache
+
+        :rtype: float
+        """
+        reads = self.hits + self.misses
+        return self.hits / float(reads) if reads else 0.0
+
+    @property
+    def average_refresh_latency(self):
+        # type: () -> float
+        """The mean duration of successful background refreshes, in seconds
+
+        :rtype: float
+        """
+        return self._refresh_latency_total / self.refreshes if self.refreshes else 0.0
+
+    @property
+    def average_load_latency(self):
+        # type: () -> float
+        """The mean duration of successful reads from the vault on a miss, in seconds
+
+        :rtype: float
+        """
+        return self._load_latency_total / self._loads if self._loads else 0.0
+
+    def _increment(self, counter):
+        # type: (str) -> None
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _record_refresh(self, elapsed):
+        # type: (float) -> None
+        with self._lock:
+            self.refreshes += 1
+            self._refresh_latency_total += elapsed
+            self.max_refresh_latency = max(self.max_refresh_latency, elapsed)
+
+    def _record_load(self, elapsed):
+        # type: (float) -> None
+        with self._lock:
+            self._loads += 1
+            self._load_latency_total += elapsed
+            self.max_load_latency = max(self.max_load_latency, elapsed)
+
+
+class SecretCache(object):
+    """A read-through cache of secret values in front of a :class:`~azure.keyvault.secrets.SecretClient`.
+
+    Entries are keyed by secret name and version, expire ``ttl`` seconds after they were read from the vault, and are
+    evicted least recently used first once the cache holds ``max_size`` entries. Reading the latest version of a secret
+    within ``refresh_ahead`` seconds of its expiry returns the cached value and refreshes it in the background, so hot
+    secrets don't expire while in use. Specific versions can't change, so they're never refreshed in the background.
+    When the vault throttles a read with status 429, the cache serves the last value it read and doesn't contact the
+    vault again for that secret until the period given by the response's Retry-After header has elapsed.
+
+    The cache doesn't close the client; close it separately when it's no longer needed.
+
+    :param client: the client the cache reads secrets through
+    :type client: ~azure.keyvault.secrets.SecretClient
+    :keyword float ttl: how long, in seconds, a value is served before it's read again. Defaults to 300.
+    :keyword int max_size: the maximum number of entries the cache holds. Defaults to 1024.
+    :keyword float refresh_ahead: how long, in seconds, before expiry a read of the latest version of a secret starts
+        a background refresh. Must be less than ``ttl``. Defaults to a fifth of ``ttl``.
+    :keyword int max_concurrent_refreshes: the maximum number of background refreshes in flight. Defaults to 4.
+
+    Example:
+        .. literalinclude:: ../tests/test_samples_secrets.py
+            :start-after: [START secret_cache]
+            :end-before: [END secret_cache]
+            :language: python
+            :caption: Cache secret values
+            :dedent: 4
+    """
+
+    def __init__(self, client, **kwargs):
+        # type: (SecretClient, **Any) -> None
+        self._client = client
+        self._ttl = kwargs.pop("ttl", 300)
+        self._max_size = kwargs.pop("max_size", 1024)
+        self._refresh_ahead = kwargs.pop("refresh_ahead", self._ttl / 5.0)
+        self._max_concurrent_refreshes = kwargs.pop("max_concurrent_refreshes", 4)
+        if self._ttl <= 0:
+            raise ValueError("ttl must be greater than 0")
+        if self._max_size < 1 or self._max_concurrent_refreshes < 1:
+            raise ValueError("max_size and max_concurrent_refreshes must be at least 1")
+        if not 0 <= self._refresh_ahead < self._ttl:
+            raise ValueError("refresh_ahead must be at least 0 and less than ttl")
+
+        self.metrics = SecretCacheMetrics()
+        self._entries = OrderedDict()  # type: OrderedDict[Tuple[str, str], _CacheEntry]
+        self._pending = {}  # type: Dict[Tuple[str, str], Any]
+        self._lock = threading.Lock()
+        self._closed = False
+        self._executor = None  # type: Optional[futures.ThreadPoolExecutor]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        # type: () -> int
+        return len(self._entries)
+
+    def close(self):
+        # type: () -> None
+        """Wait for background refreshes to finish and stop scheduling new ones."""
+        self._closed = True
+        if self._executor:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def get_secret(self, name, version=None, **kwargs):
+        # type: (str, Optional[str], **Any) -> KeyVaultSecret
+        """Get a secret from the cache, reading it from the vault when it isn't cached or has expired.
+
+        Requires the secrets/get permission.
+
+        :param str name: The name of the secret
+        :param str version: (optional) Version of the secret to get. If unspecified, gets the latest version.
+        :rtype: ~azure.keyvault.secrets.KeyVaultSecret
+        :raises:
+            :class:`~azure.core.exceptions.ResourceNotFoundError` if the secret doesn't exist,
+            :class:`~azure.core.exceptions.HttpResponseError` for other errors
+        """
+        key = (name, version or "")
+        while True:
+            secret, future, owner = self._lookup(key, time.time())
+            if secret is not None:
+                if owner:
+                    with self._lock:
+                        if not self._executor:
+                            self._executor = futures.ThreadPoolExecutor(self._max_concurrent_refreshes)
+                    self._executor.submit(with_current_context(self._refresh), key, future, kwargs)
+                return secret
+            if owner:
+                return self._load(key, future, **kwargs)
+            try:
+                return future.result()
+            except futures.CancelledError:
+                if self._closed:
+                    raise
+                # the caller reading the secret was interrupted; read it again
+
+    def invalidate(self, name=None):
+        # type: (Optional[str]) -> None
+        """Remove every cached version of a secret, or every entry when no name is given.
+
+        :param str name: (optional) name of the secret to remove
+        """
+        with self._lock:
+            if name is None:
+                self._entries.clear()
+                return
+            for key in [key for key in self._entries if key[0] == name]:
+                del self._entries[key]
+
+    def _new_future(self):
+        return futures.Future()
+
+    def _lookup(self, key, now):
+        # type: (Tuple[str, str], float) -> Tuple[Optional[KeyVaultSecret], Any, bool]
+        """Returns a cached secret, or a future for it, and whether the caller must complete that future.
+
+        A cached secret comes with a future only when the caller should refresh it in the background.
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._entries[key] = entry  # most recently used
+                if now < entry.expires_at or now < entry.throttled_until:
+                    self.metrics._increment("hits")  # pylint:disable=protected-access
+                    if now >= entry.expires_at:
+                        self.metrics._increment("stale_served")  # pylint:disable=protected-access
+                    elif not key[1] and now >= entry.refresh_at and key not in self._pending and not self._closed:
+                        future = self._pending[key] = self._new_future()
+                        return entry.secret, future, True
+                    return entry.secret, None, False
+
+            self.metrics._increment("misses")  # pylint:disable=protected-access
+            future = self._pending.get(key)
+            if future is not None:
+                # another caller is already reading this secret from the vault
+                return None, future, False
+            future = self._pending[key] = self._new_future()
+            return None, future, True
+
+    def _refresh(self, key, future, kwargs):
+        # type: (Tuple[str, str], futures.Future, Dict[str, Any]) -> None
+        try:
+            self._load(key, future, background=True, **kwargs)
+        except Exception as ex:  # pylint:disable=broad-except
+            _LOGGER.warning("Background refresh of secret '%s' failed: %s", key[0], ex)
+
+    def _load(self, key, future, background=False, **kwargs):
+        # type: (Tuple[str, str], futures.Future, bool, **Any) -> KeyVaultSecret
+        start = time.time()
+        try:
+            secret = self._client.get_secret(key[0], key[1] or None, **kwargs)
+        except Exception as ex:  # pylint:disable=broad-except
+            stale = self._on_error(key, ex, time.time(), background)
+            if stale is None:
+                future.set_exception(ex)
+                raise
+            future.set_result(stale)
+            return stale
+        except BaseException:
+            self._abandon(key, future)
+            raise
+        self._on_success(key, secret, start, time.time(), background)
+        future.set_result(secret)
+        return secret
+
+    def _abandon(self, key, future):
+        # type: (Tuple[str, str], Any) -> None
+        """Forgets a read that was interrupted, cancelling its future so callers waiting for it read again."""
+        with self._lock:
+            if self._pending.get(key) is future:
+                del self._pending[key]
+        future.cancel()
+
+    def _on_success(self, key, secret, start, now, background):
+        # type: (Tuple[str, str], KeyVaultSecret, float, float, bool) -> None
+        # pylint:disable=protected-access
+        if background:
+            self.metrics._record_refresh(now - start)
+        else:
+            self.metrics._record_load(now - start)
+        with self._lock:
+            self._pending.pop(key, None)
+            self._store(key, secret, now)
+            if not key[1] and secret.properties.version:
+                # the latest version is also that specific version
+                self._store((key[0], secret.properties.version), secret, now)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+                self.metrics._increment("evictions")
+
+    def _store(self, key, secret, now):
+        # type: (Tuple[str, str], KeyVaultSecret, float) -> None
+        self._entries.pop(key, None)
+        expires_at = now + self._ttl
+        self._entries[key] = _CacheEntry(secret, expires_at, expires_at - self._refresh_ahead)
+
+    def _on_error(self, key, error, now, background):
+        # type: (Tuple[str, str], Exception, float, bool) -> Optional[KeyVaultSecret]
+        """Returns the cached value to serve in place of the vault's response, if any."""
+        # pylint:disable=protected-access
+        if background:
+            self.metrics._increment("refresh_errors")
+        with self._lock:
+            self._pending.pop(key, None)
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if isinstance(error, ResourceNotFoundError):
+                # the secret was deleted or disabled; stop serving it
+                del self._entries[key]
+                return None
+            retry_after = _retry_after(error)
+            entry.refresh_at = now + retry_after
+            if getattr(error, "status_code", None) == 429:
+                entry.throttled_until = now + retry_after
+            elif now >= entry.expires_at:
+                return None
+            if now >= entry.expires_at:
+                self.metrics._increment("stale_served")
+            return entry.secret
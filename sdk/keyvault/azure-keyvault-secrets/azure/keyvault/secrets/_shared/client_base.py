@@ -94,6 +94,9 @@ class KeyVaultClientBase(object):
             DistributedTracingPolicy(**kwargs),
             logging_policy,
         ]
+        if kwargs.get("metrics_sink"):
+            from azure.core.pipeline.policies import MetricsPolicy  # added in azure-core 1.1.0
+            policies.insert(policies.index(config.retry_policy), MetricsPolicy(**kwargs))
 
         if transport is None:
             transport = RequestsTransport(**kwargs)
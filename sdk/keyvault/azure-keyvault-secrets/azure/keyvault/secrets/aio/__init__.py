@@ -2,6 +2,7 @@
 # Copyright (c) Microsoft Corporation.
 # Licensed under the MIT License.
 # ------------------------------------
+from ._cache import SecretCache
 from ._client import SecretClient
 
-__all__ = ["SecretClient"]
+__all__ = ["SecretClient", "SecretCache"]
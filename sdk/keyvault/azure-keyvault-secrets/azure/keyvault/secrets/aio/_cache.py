@@ -0,0 +1,150 @@
+# ------------------------------------
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+# ------------------------------------
+import asyncio
+import time
+from typing import Any, Dict, Optional, Set, Tuple, TYPE_CHECKING
+
+from .._cache import SecretCache as _SyncSecretCache, _LOGGER
+
+if TYPE_CHECKING:
+    # pylint:disable=unused-import
+    from ._client import SecretClient
+    from .._models import KeyVaultSecret
+
+
+def _retrieve_exception(future: "asyncio.Future") -> None:
+    # a load's future may fail with no other caller waiting for it; retrieving its exception keeps asyncio quiet
+    if not future.cancelled():
+        future.exception()
+
+
+class SecretCache(_SyncSecretCache):
+    """A read-through cache of secret values in front of a :class:`~azure.keyvault.secrets.aio.SecretClient`.
+
+    Entries are keyed by secret name and version, expire ``ttl`` seconds after they were read from the vault, and are
+    evicted least recently used first once the cache holds ``max_size`` entries. Reading the latest version of a secret
+    within ``refresh_ahead`` seconds of its expiry returns the cached value and refreshes it in a background task, so
+    hot secrets don't expire while in use. Specific versions can't change, so they're never refreshed in the
+    background. When the vault throttles a read with status 429, the cache serves the last value it read and doesn't
+    contact the vault again for that secret until the period given by the response's Retry-After header has elapsed.
+
+    The cache doesn't close the client; close it separately when it's no longer needed.
+
+    :param client: the client the cache reads secrets through
+    :type client: ~azure.keyvault.secrets.aio.SecretClient
+    :keyword float ttl: how long, in seconds, a value is served before it's read again. Defaults to 300.
+    :keyword int max_size: the maximum number of entries the cache holds. Defaults to 1024.
+    :keyword float refresh_ahead: how long, in seconds, before expiry a read of the latest version of a secret starts
+        a background refresh. Must be less than ``ttl``. Defaults to a fifth of ``ttl``.
+    :keyword int max_concurrent_refreshes: the maximum number of background refreshes in flight. Defaults to 4.
+
+    Example:
+        .. literalinclude:: ../tests/test_samples_secrets_async.py
+            :start-after: [START secret_cache]
+            :end-before: [END secret_cache]
+            :language: python
+            :caption: Cache secret values
+            :dedent: 4
+    """
+
+    # pylint:disable=invalid-overridden-method,protected-access
+
+    def __init__(self, client: "SecretClient", **kwargs: "Any") -> None:
+        super().__init__(client, **kwargs)
+        self._refreshes = set()  # type: Set[asyncio.Future]
+        self._refresh_slots = None  # type: Optional[asyncio.Semaphore]
+
+    async def __aenter__(self) -> "SecretCache":
+        return self
+
+    async def __aexit__(self, *args: "Any") -> None:
+        await self.close()
+
+    def __enter__(self):
+        raise TypeError("Use 'async with' with the async secret cache.")
+
+    def __exit__(self, *args):
+        pass
+
+    async def close(self) -> None:
+        """Cancel background refreshes and stop scheduling new ones."""
+        self._closed = True
+        for task in self._refreshes:
+            task.cancel()
+        if self._refreshes:
+            await asyncio.wait(self._refreshes)
+        # a cancelled refresh leaves its future pending; release anything waiting for it
+        for future in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+
+    async def get_secret(self, name: str, version: "Optional[str]" = None, **kwargs: "Any") -> "KeyVaultSecret":
+        """Get a secret from the cache, reading it from the vault when it isn't cached or has expired.
+
+        Requires the secrets/get permission.
+
+        :param str name: The name of the secret
+        :param str version: (optional) Version of the secret to get. If unspecified, gets the latest version.
+        :rtype: ~azure.keyvault.secrets.KeyVaultSecret
+        :raises:
+            :class:`~azure.core.exceptions.ResourceNotFoundError` if the secret doesn't exist,
+            :class:`~azure.core.exceptions.HttpResponseError` for other errors
+        """
+        key = (name, version or "")
+        while True:
+            secret, future, owner = self._lookup(key, time.time())
+            if secret is not None:
+                if owner:
+                    task = asyncio.ensure_future(self._refresh(key, future, kwargs))
+                    self._refreshes.add(task)
+                    task.add_done_callback(self._refreshes.discard)
+                return secret
+            if owner:
+                return await self._load(key, future, **kwargs)
+            try:
+                # shielded so that one cancelled caller doesn't cancel the read for the others
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled() or self._closed:
+                    raise
+                # the caller reading the secret was cancelled; read it again
+
+    def _new_future(self) -> "asyncio.Future":
+        future = asyncio.Future()  # type: asyncio.Future
+        future.add_done_callback(_retrieve_exception)
+        return future
+
+    async def _refresh(self, key: "Tuple[str, str]", future: "asyncio.Future", kwargs: "Dict[str, Any]") -> None:
+        if not self._refresh_slots:
+            self._refresh_slots = asyncio.Semaphore(self._max_concurrent_refreshes)
+        async with self._refresh_slots:
+            try:
+                await self._load(key, future, background=True, **kwargs)
+            except Exception as ex:  # pylint:disable=broad-except
+                _LOGGER.warning("Background refresh of secret '%s' failed: %s", key[0], ex)
+
+    async def _load(
+        self, key: "Tuple[str, str]", future: "asyncio.Future", background: bool = False, **kwargs: "Any"
+    ) -> "KeyVaultSecret":
+        start = time.time()
+        try:
+            secret = await self._client.get_secret(key[0], key[1] or None, **kwargs)
+        except asyncio.CancelledError:
+            # an Exception before Python 3.8
+            self._abandon(key, future)
+            raise
+        except Exception as ex:  # pylint:disable=broad-except
+            stale = self._on_error(key, ex, time.time(), background)
+            if stale is None:
+                future.set_exception(ex)
+                raise
+            future.set_result(stale)
+            return stale
+        except BaseException:
+            self._abandon(key, future)
+            raise
+        self._on_success(key, secret, start, time.time(), background)
+        future.set_result(secret)
+        return secret
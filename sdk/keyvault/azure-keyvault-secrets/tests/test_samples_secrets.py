@@ -32,6 +32,24 @@ def test_create_secret_client():
     # [END create_secret_client]
 
 
+def test_create_secret_cache():
+    vault_url = "vault_url"
+    # pylint:disable=unused-variable
+    # [START secret_cache]
+
+    from azure.identity import DefaultAzureCredential
+    from azure.keyvault.secrets import SecretCache, SecretClient
+
+    # Cache values for five minutes, refreshing hot secrets in the background during the last minute
+    secret_client = SecretClient(vault_url, DefaultAzureCredential())
+    secret_cache = SecretCache(secret_client, ttl=300, refresh_ahead=60, max_size=512)
+
+    # secret = secret_cache.get_secret("secret-name")
+    # print(secret_cache.metrics.hit_ratio)
+
+    # [END secret_cache]
+
+
 class TestExamplesKeyVault(KeyVaultTestCase):
 
     # incorporate md5 hashing of run identifier into resource group name for uniqueness
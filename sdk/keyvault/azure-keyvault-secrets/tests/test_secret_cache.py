@@ -0,0 +1,268 @@
+# ------------------------------------
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+# ------------------------------------
+"""Tests for SecretCache, which run against an in-memory fake of SecretClient"""
+from concurrent import futures
+import threading
+import time
+
+try:
+    from unittest.mock import Mock, patch
+except ImportError:  # python < 3.3
+    from mock import Mock, patch
+
+from azure.core.exceptions import HttpResponseError, ResourceNotFoundError
+from azure.keyvault.secrets import SecretCache
+import pytest
+
+
+def make_secret(name, version, value):
+    return Mock(value=value, properties=Mock(version=version), id="https://vault/secrets/{}/{}".format(name, version))
+
+
+def throttled():
+    return HttpResponseError(response=Mock(status_code=429, headers={"Retry-After": "30"}, reason="Too Many Requests"))
+
+
+class FakeSecretClient(object):
+    def __init__(self, delay=0):
+        self.versions = {}
+        self.calls = []
+        self.error = None
+        self.delay = delay
+        self._lock = threading.Lock()
+
+    def set(self, name, value):
+        versions = self.versions.setdefault(name, [])
+        versions.append(make_secret(name, "v{}".format(len(versions) + 1), value))
+
+    def get_secret(self, name, version=None, **kwargs):
+        with self._lock:
+            self.calls.append((name, version))
+        time.sleep(self.delay)
+        return self._read(name, version)
+
+    def _read(self, name, version):
+        if self.error:
+            raise self.error
+        if name not in self.versions:
+            raise ResourceNotFoundError("secret not found")
+        if version is None:
+            return self.versions[name][-1]
+        for secret in self.versions[name]:
+            if secret.properties.version == version:
+                return secret
+        raise ResourceNotFoundError("version not found")
+
+
+def test_cache_hits_and_version_awareness():
+    client = FakeSecretClient()
+    client.set("a", "one")
+    client.set("a", "two")
+    cache = SecretCache(client, ttl=60)
+
+    assert cache.get_secret("a").value == "two"
+    assert cache.get_secret("a").value == "two"
+    # reading the latest version also caches that specific version
+    assert cache.get_secret("a", "v2").value == "two"
+    assert cache.get_secret("a", "v1").value == "one"
+    assert client.calls == [("a", None), ("a", "v1")]
+    assert cache.metrics.hits == 2
+    assert cache.metrics.misses == 2
+    assert cache.metrics.hit_ratio == 0.5
+    assert cache.metrics.average_load_latency >= 0
+
+
+def test_cache_expiry_and_invalidate():
+    client = FakeSecretClient()
+    client.set("a", "one")
+    cache = SecretCache(client, ttl=60, refresh_ahead=0)
+
+    cache.get_secret("a")
+    client.set("a", "two")
+    assert cache.get_secret("a").value == "one"
+
+    for entry in cache._entries.values():
+        entry.expires_at = time.time() - 1
+    assert cache.get_secret("a").value == "two"
+
+    client.set("a", "three")
+    cache.invalidate("a")
+    assert len(cache) == 0
+    assert cache.get_secret("a").value == "three"
+
+
+def test_lru_eviction():
+    client = FakeSecretClient()
+    for name in "abc":
+        client.set(name, name)
+    cache = SecretCache(client, ttl=60, max_size=4)
+
+    cache.get_secret("a")  # caches ("a", "") and ("a", "v1")
+    cache.get_secret("b")
+    cache.get_secret("a")  # "a" is now more recently used than "b"
+    cache.get_secret("c")
+
+    assert len(cache) == 4
+    assert cache.metrics.evictions == 2
+    assert ("b", "") not in cache._entries
+    assert ("a", "") in cache._entries
+
+
+def test_background_refresh():
+    client = FakeSecretClient()
+    client.set("a", "one")
+    with SecretCache(client, ttl=60, refresh_ahead=30) as cache:
+        cache.get_secret("a")
+        client.set("a", "two")
+        cache._entries[("a", "")].refresh_at = time.time() - 1
+
+        # the value about to expire is served while the refresh runs
+        assert cache.get_secret("a").value == "one"
+    assert cache.get_secret("a").value == "two"
+    assert cache.metrics.refreshes == 1
+    assert cache.metrics.max_refresh_latency >= cache.metrics.average_refresh_latency >= 0
+    assert len(client.calls) == 2
+
+
+def test_stale_value_served_while_throttled():
+    client = FakeSecretClient()
+    client.set("a", "one")
+    cache = SecretCache(client, ttl=60)
+    cache.get_secret("a")
+    cache._entries[("a", "")].expires_at = time.time() - 1
+
+    client.error = throttled()
+    assert cache.get_secret("a").value == "one"
+    # the vault isn't contacted again until Retry-After has elapsed
+    assert cache.get_secret("a").value == "one"
+    assert len(client.calls) == 2
+    assert cache.metrics.stale_served == 2
+
+    # other errors aren't hidden
+    cache._entries[("a", "")].throttled_until = 0
+    client.error = HttpResponseError(response=Mock(status_code=500, headers={}, reason="Internal Server Error"))
+    with pytest.raises(HttpResponseError):
+        cache.get_secret("a")
+
+
+def test_deleted_secret_is_dropped():
+    client = FakeSecretClient()
+    client.set("a", "one")
+    cache = SecretCache(client, ttl=60)
+    cache.get_secret("a")
+    cache._entries[("a", "")].expires_at = time.time() - 1
+    del client.versions["a"]
+
+    with pytest.raises(ResourceNotFoundError):
+        cache.get_secret("a")
+    assert ("a", "") not in cache._entries
+
+
+def test_concurrent_misses_share_one_read():
+    client = FakeSecretClient(delay=0.2)
+    client.set("a", "one")
+    cache = SecretCache(client, ttl=60)
+    results = []
+
+    def read():
+        results.append(cache.get_secret("a").value)
+
+    threads = [threading.Thread(target=read) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["one"] * 8
+    assert len(client.calls) == 1
+
+
+class Interrupted(BaseException):
+    pass
+
+
+def test_interrupted_read_releases_waiters():
+    client = FakeSecretClient(delay=0.2)
+    client.set("a", "one")
+    cache = SecretCache(client, ttl=60)
+    get_secret = client.get_secret
+    interrupted = []
+
+    def interrupt_first_read(name, version=None, **kwargs):
+        secret = get_secret(name, version, **kwargs)
+        if not interrupted:
+            interrupted.append(name)
+            raise Interrupted()
+        return secret
+
+    client.get_secret = interrupt_first_read
+    results = []
+
+    def owner():
+        try:
+            cache.get_secret("a")
+        except Interrupted:
+            results.append("interrupted")
+
+    def waiter():
+        # waits for the first read, then reads the secret itself once that read is interrupted
+        results.append(cache.get_secret("a").value)
+
+    thread = threading.Thread(target=owner)
+    thread.start()
+    time.sleep(0.05)
+    waiting = threading.Thread(target=waiter)
+    waiting.daemon = True
+    waiting.start()
+    thread.join()
+    waiting.join(2)
+
+    assert sorted(results) == ["interrupted", "one"]
+    assert not cache._pending
+
+
+def test_refresh_executor_created_once():
+    client = FakeSecretClient()
+    names = [str(i) for i in range(16)]
+    for name in names:
+        client.set(name, "one")
+    cache = SecretCache(client, ttl=60, refresh_ahead=30)
+    for name in names:
+        cache.get_secret(name)
+        cache._entries[(name, "")].refresh_at = time.time() - 1
+    created = []
+    executor_type = futures.ThreadPoolExecutor
+
+    def create_executor(*args):
+        created.append(args)
+        time.sleep(0.01)
+        return executor_type(*args)
+
+    start = threading.Event()
+
+    def refresh(name):
+        start.wait()
+        cache.get_secret(name)
+
+    with patch("azure.keyvault.secrets._cache.futures.ThreadPoolExecutor", create_executor):
+        threads = [threading.Thread(target=refresh, args=(name,)) for name in names]
+        for thread in threads:
+            thread.start()
+        start.set()
+        for thread in threads:
+            thread.join()
+    cache.close()
+
+    assert len(created) == 1
+    assert cache.metrics.refreshes == len(names)
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        SecretCache(FakeSecretClient(), ttl=0)
+    with pytest.raises(ValueError):
+        SecretCache(FakeSecretClient(), ttl=10, refresh_ahead=10)
+    with pytest.raises(ValueError):
+        SecretCache(FakeSecretClient(), max_size=0)
@@ -0,0 +1,106 @@
+# ------------------------------------
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+# ------------------------------------
+"""Tests for the async SecretCache, which run against an in-memory fake of SecretClient"""
+import asyncio
+import time
+
+from azure.core.exceptions import ResourceNotFoundError
+from azure.keyvault.secrets.aio import SecretCache
+import pytest
+
+from test_secret_cache import FakeSecretClient, throttled
+
+
+class AsyncFakeSecretClient(FakeSecretClient):
+    async def get_secret(self, name, version=None, **kwargs):
+        self.calls.append((name, version))
+        await asyncio.sleep(self.delay)
+        return self._read(name, version)
+
+
+@pytest.mark.asyncio
+async def test_cache_hits_and_version_awareness():
+    client = AsyncFakeSecretClient()
+    client.set("a", "one")
+    client.set("a", "two")
+    cache = SecretCache(client, ttl=60)
+
+    assert (await cache.get_secret("a")).value == "two"
+    assert (await cache.get_secret("a", "v2")).value == "two"
+    assert (await cache.get_secret("a", "v1")).value == "one"
+    assert client.calls == [("a", None), ("a", "v1")]
+    assert cache.metrics.hit_ratio == 1 / 3
+
+
+@pytest.mark.asyncio
+async def test_background_refresh():
+    client = AsyncFakeSecretClient()
+    client.set("a", "one")
+    async with SecretCache(client, ttl=60, refresh_ahead=30) as cache:
+        await cache.get_secret("a")
+        client.set("a", "two")
+        cache._entries[("a", "")].refresh_at = time.time() - 1
+
+        assert (await cache.get_secret("a")).value == "one"
+        await asyncio.wait(cache._refreshes)
+        assert (await cache.get_secret("a")).value == "two"
+    assert cache.metrics.refreshes == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_value_served_while_throttled():
+    client = AsyncFakeSecretClient()
+    client.set("a", "one")
+    cache = SecretCache(client, ttl=60)
+    await cache.get_secret("a")
+    cache._entries[("a", "")].expires_at = time.time() - 1
+
+    client.error = throttled()
+    assert (await cache.get_secret("a")).value == "one"
+    assert (await cache.get_secret("a")).value == "one"
+    assert len(client.calls) == 2
+    assert cache.metrics.stale_served == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_read():
+    client = AsyncFakeSecretClient(delay=0.1)
+    client.set("a", "one")
+    cache = SecretCache(client, ttl=60)
+
+    secrets = await asyncio.gather(*[cache.get_secret("a") for _ in range(8)])
+
+    assert [secret.value for secret in secrets] == ["one"] * 8
+    assert len(client.calls) == 1
+
+    client.error = ResourceNotFoundError("secret not found")
+    with pytest.raises(ResourceNotFoundError):
+        await asyncio.gather(*[cache.get_secret("b") for _ in range(4)])
+
+
+@pytest.mark.asyncio
+async def test_cancelled_read_releases_waiters():
+    client = AsyncFakeSecretClient(delay=0.2)
+    client.set("a", "one")
+    cache = SecretCache(client, ttl=60)
+
+    owner = asyncio.ensure_future(cache.get_secret("a"))
+    await asyncio.sleep(0.05)
+    waiter = asyncio.ensure_future(cache.get_secret("a"))
+    await asyncio.sleep(0.05)
+    owner.cancel()
+
+    # the waiter reads the secret itself instead of waiting for the cancelled read
+    assert (await asyncio.wait_for(waiter, 1)).value == "one"
+    assert owner.cancelled()
+    assert len(client.calls) == 2
+    assert not cache._pending
+
+    # a timeout around the read doesn't leave it pending either
+    cache.invalidate()
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(cache.get_secret("a"), 0.05)
+    assert not cache._pending
+    assert (await asyncio.wait_for(cache.get_secret("a"), 1)).value == "one"
@@ -10,7 +10,10 @@ __version__ = '0.50.1'
 from azure.servicebus.common.message import Message, BatchMessage, PeekMessage, DeferredMessage
 from azure.servicebus.servicebus_client import ServiceBusClient, QueueClient, TopicClient, SubscriptionClient
 from azure.servicebus.common.constants import ReceiveSettleMode, NEXT_AVAILABLE
-from azure.servicebus.common.utils import AutoLockRenew
+from azure.servicebus.common.utils import AutoLockRenew, LockRenewScheduler
+from azure.servicebus.common.settlement import SettlementResult, SettlementAccumulator
+from azure.servicebus.session_processor import SessionProcessor
+from azure.servicebus.message_pump import MessagePump, MessagePumpMetrics
 from azure.servicebus.common.errors import (
     ServiceBusError,
     ServiceBusResourceNotFound,
@@ -32,6 +35,12 @@ __all__ = [
     'BatchMessage',
     'PeekMessage',
     'AutoLockRenew',
+    'LockRenewScheduler',
+    'SessionProcessor',
+    'SettlementResult',
+    'SettlementAccumulator',
+    'MessagePump',
+    'MessagePumpMetrics',
     'DeferredMessage',
     'ServiceBusClient',
     'QueueClient',
@@ -20,14 +20,24 @@ from azure.servicebus.common.errors import (
     AutoLockRenewTimeout)
 from azure.servicebus.common.constants import ReceiveSettleMode, NEXT_AVAILABLE
 from azure.servicebus.common.message import BatchMessage, PeekMessage
+from azure.servicebus.common.settlement import SettlementResult
 from .async_message import Message, DeferredMessage
 from .async_client import ServiceBusClient, QueueClient, TopicClient, SubscriptionClient
-from .async_utils import AutoLockRenew
+from .async_utils import AutoLockRenew, LockRenewScheduler
+from .async_session_processor import SessionProcessor
+from .async_settlement import SettlementAccumulator
+from .async_message_pump import MessagePump, MessagePumpMetrics
 
 
 __all__ = [
     'Message',
     'AutoLockRenew',
+    'LockRenewScheduler',
+    'SessionProcessor',
+    'SettlementResult',
+    'SettlementAccumulator',
+    'MessagePump',
+    'MessagePumpMetrics',
     'BatchMessage',
     'PeekMessage',
     'DeferredMessage',
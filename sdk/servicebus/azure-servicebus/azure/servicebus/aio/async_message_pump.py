@@ -0,0 +1,202 @@
+# ------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# -------------------------------------------------------------------------
+
+import asyncio
+import logging
+import time
+from collections import deque
+
+from azure.servicebus.message_pump import MessagePumpMetrics
+from azure.servicebus.common.constants import ReceiveSettleMode
+from azure.servicebus.aio.async_utils import LockRenewScheduler
+from azure.servicebus.aio.async_settlement import settle_messages
+
+
+_log = logging.getLogger(__name__)
+
+
+class MessagePump:  # pylint: disable=too-many-instance-attributes
+    """Receive messages on a dedicated loop, and handle them on a pool of tasks.
+
+    The receive loop runs in the task calling `run()`. It keeps a bounded buffer of
+    received messages filled while the handlers run, so the link is serviced while
+    handlers wait. Up to `max_concurrent_calls` handlers run at once, each in its own task.
+    Handlers report how each message went back to the receive loop, which completes or
+    abandons the messages in batches.
+    While a message waits in the buffer or is being handled, its lock is renewed by a
+    `LockRenewScheduler`. For a session receiver the session lock is renewed instead.
+    The MessagePump should be accessed from a `Receiver` using the `get_message_pump()` method.
+
+    .. note:: Messages are handled concurrently, so they may finish out of order. Use a
+     `max_concurrent_calls` of 1 to handle them in the order they were received.
+
+    :param receiver: The receiver to pump messages from. It is opened if needed, and closed
+     when the pump stops.
+    :type receiver: ~azure.servicebus.aio.async_receive_handler.Receiver
+    :param max_concurrent_calls: The maximum number of handlers running at once. Default value is 1.
+    :type max_concurrent_calls: int
+    :param buffer_size: The maximum number of received messages waiting for a handler. The
+     default is twice `max_concurrent_calls`.
+    :type buffer_size: int
+    :param auto_complete: Whether to complete a message once it has been handled without
+     error, if the handler did not settle it itself. A message the handler raises an error for
+     is abandoned. Default is `True`.
+    :type auto_complete: bool
+    :param auto_lock_renew: Whether to renew the locks of messages until they are settled.
+     Default is `True`.
+    :type auto_lock_renew: bool
+    """
+
+    def __init__(
+            self, receiver, *, max_concurrent_calls=1, buffer_size=None,
+            auto_complete=True, auto_lock_renew=True):
+        if int(max_concurrent_calls) < 1:
+            raise ValueError("max_concurrent_calls must be 1 or greater.")
+        if buffer_size is not None and int(buffer_size) < 1:
+            raise ValueError("buffer_size must be 1 or greater.")
+        self.receiver = receiver
+        self.loop = receiver.loop
+        self.max_concurrent_calls = max_concurrent_calls
+        self.buffer_size = buffer_size or 2 * max_concurrent_calls
+        self.auto_complete = auto_complete
+        self.auto_lock_renew = auto_lock_renew and receiver.mode == ReceiveSettleMode.PeekLock
+        self.receive_timeout = 1
+        self.metrics = MessagePumpMetrics()
+        self._is_session = hasattr(receiver, 'session_id')
+        self._buffer = None
+        self._to_settle = deque()
+        self._stopped = asyncio.Event()
+        self._lock_renewer = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        self.stop()
+
+    async def _handle(self, message, message_handler, error_handler):
+        start = time.time()
+        try:
+            await message_handler(message)
+        except Exception as e:  # pylint: disable=broad-except
+            self.metrics.failed += 1
+            self.metrics._record_processing_time(time.time() - start)  # pylint: disable=protected-access
+            self._to_settle.append(('abandon', message))
+            if error_handler:
+                try:
+                    await error_handler(e, message)
+                except Exception as handler_error:  # pylint: disable=broad-except
+                    _log.warning("Message pump error handler failed: %r", handler_error)
+            else:
+                _log.warning("Message handler failed: %r", e)
+            return
+        self.metrics.handled += 1
+        self.metrics._record_processing_time(time.time() - start)  # pylint: disable=protected-access
+        if self.auto_complete:
+            self._to_settle.append(('complete', message))
+        elif self._lock_renewer:
+            self._lock_renewer.unregister(message)
+
+    async def _worker(self, message_handler, error_handler):
+        while True:
+            message = await self._buffer.get()
+            if message is None:
+                return
+            await self._handle(message, message_handler, error_handler)
+
+    async def _settle(self):
+        batches = {}
+        while self._to_settle:
+            action, message = self._to_settle.popleft()
+            if self._lock_renewer:
+                self._lock_renewer.unregister(message)
+            if message.settled:
+                continue
+            batches.setdefault(action, []).append(message)
+        for action, messages in batches.items():
+            for result in await settle_messages(action, messages, loop=self.loop):
+                if not result.succeeded:
+                    _log.info("Message pump failed to %s a message: %r", action, result.error)
+                    self.metrics.settle_failed += 1
+
+    def _update_queue_depth(self):
+        self.metrics.queue_depth = self._buffer.qsize()
+        self.metrics.max_queue_depth = max(self.metrics.max_queue_depth, self.metrics.queue_depth)
+
+    async def _receive(self):
+        while not self._stopped.is_set():
+            await self._settle()
+            space = self.buffer_size - self._buffer.qsize()
+            if space <= 0:
+                self._update_queue_depth()
+                await asyncio.sleep(0.01)
+                continue
+            batch = await self.receiver.fetch_next(max_batch_size=space, timeout=self.receive_timeout)
+            self.metrics.received += len(batch)
+            for message in batch:
+                if self._lock_renewer and not self._is_session:
+                    self._lock_renewer.register(message)
+                # Only this loop adds to the buffer, and it never fetches more than the space left
+                self._buffer.put_nowait(message)
+            self._update_queue_depth()
+
+    def _drain(self):
+        # Messages still in the buffer are given back to the entity straight away
+        while not self._buffer.empty():
+            self._to_settle.append(('abandon', self._buffer.get_nowait()))
+        self._update_queue_depth()
+
+    async def run(self, message_handler, error_handler=None, timeout=None):
+        """Receive and handle messages until the pump is stopped or the receiver closes.
+
+        :param message_handler: A coroutine function taking a message.
+        :type message_handler: callable[[~azure.servicebus.aio.async_message.Message], Awaitable[None]]
+        :param error_handler: A coroutine function taking an error raised by `message_handler`
+         and the message it was raised for. If not given, the errors are logged.
+        :type error_handler: callable[[Exception, ~azure.servicebus.aio.async_message.Message],
+         Awaitable[None]]
+        :param timeout: The time in seconds after which to stop. By default the pump runs
+         until `stop()` is called, or the receiver closes.
+        :type timeout: float
+        :raises: ~azure.servicebus.common.errors.ServiceBusError if the receiver fails.
+        """
+        timer = self.loop.call_later(timeout, self.stop) if timeout else None
+        self._stopped.clear()
+        self._buffer = asyncio.Queue(self.buffer_size)
+        if self.auto_lock_renew:
+            self._lock_renewer = LockRenewScheduler(loop=self.loop)
+        try:
+            await self.receiver.open()
+            if self._lock_renewer and self._is_session:
+                self._lock_renewer.register(self.receiver)
+            workers = [
+                asyncio.ensure_future(self._worker(message_handler, error_handler), loop=self.loop)
+                for _ in range(self.max_concurrent_calls)]
+            try:
+                await self._receive()
+            finally:
+                self._stopped.set()
+                self._drain()
+                for _ in workers:
+                    await self._buffer.put(None)
+                await asyncio.wait(workers)
+            await self._settle()
+        finally:
+            if timer:
+                timer.cancel()
+            if self._lock_renewer:
+                await self._lock_renewer.shutdown()
+                self._lock_renewer = None
+            await self.receiver.close()
+
+    def stop(self):
+        """Stop receiving.
+
+        Messages waiting in the buffer are abandoned, and `run()` returns once the handlers
+        running have finished, and their messages are settled.
+        This method can be called from a message handler, or from any other task.
+        """
+        self._stopped.set()
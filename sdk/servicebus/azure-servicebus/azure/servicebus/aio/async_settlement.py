@@ -0,0 +1,176 @@
+# ------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# -------------------------------------------------------------------------
+
+import functools
+import time
+from collections import OrderedDict
+
+from azure.servicebus.common.errors import MessageSettleFailed
+from azure.servicebus.common.utils import get_running_loop
+from azure.servicebus.common.settlement import (
+    _DISPOSITION_STATUS,
+    dead_letter_details,
+    group_settlements,
+    lock_token_chunks,
+    settle_on_links)
+from azure.servicebus.aio.async_message import DeferredMessage
+
+
+async def settle_messages(action, messages, description=None, *, loop=None):
+    """Settle a batch of received messages.
+
+    Messages received on a link are settled on their link together in a single
+    executor call, and deferred messages are settled with a single management request
+    per receiver.
+
+    :param action: One of 'complete', 'abandon', 'defer' or 'dead_letter'.
+    :type action: str
+    :param messages: The messages to settle.
+    :type messages: list[~azure.servicebus.aio.async_message.Message]
+    :param description: The reason for dead-lettering the messages.
+    :type description: str
+    :param loop: An async event loop.
+    :type loop: ~asyncio.EventLoop
+    :rtype: list[~azure.servicebus.common.settlement.SettlementResult]
+    """
+    results, on_link, deferred = group_settlements(action, messages, deferred_type=DeferredMessage)
+    if on_link:
+        loop = loop or get_running_loop()
+        await loop.run_in_executor(None, functools.partial(settle_on_links, on_link, action, description))
+    details = dead_letter_details(description) if action == 'dead_letter' else None
+    for receiver, pending in deferred.items():
+        for chunk, lock_tokens in lock_token_chunks(pending):
+            try:
+                await receiver._settle_deferred(  # pylint: disable=protected-access
+                    _DISPOSITION_STATUS[action], lock_tokens, dead_letter_details=details)
+            except Exception as e:  # pylint: disable=broad-except
+                error = MessageSettleFailed(action, e)
+                for result in chunk:
+                    result.error = error
+            else:
+                for result in chunk:
+                    result.message._settled = True  # pylint: disable=protected-access
+    return results
+
+
+class SettlementAccumulator:
+    """Collect message settlements, and settle them in batches.
+
+    Settlements are held until `max_batch_size` of them are pending, or until one is
+    added once the first of them has been pending for `max_delay` seconds, and are then
+    settled together with `settle_messages`. There is no timer: `max_delay` is only checked
+    when a settlement is added, so settlements stay pending for as long as no more are
+    added. Call `flush()` when no more messages are coming, for example when a receive
+    returns none, or the messages will keep their locks until they expire and will be
+    redelivered. Any pending settlements are settled when leaving an `async with` block.
+    Messages hold their locks while their settlement is pending, so `max_delay` should
+    be kept well below the lock duration of the entity.
+    The SettlementAccumulator should be accessed from a `Receiver` using the
+    `get_settlement_accumulator()` method.
+
+    :param max_batch_size: The number of pending settlements at which they are settled.
+     Default value is 100.
+    :type max_batch_size: int
+    :param max_delay: The time in seconds after which adding a settlement settles those
+     pending, even if fewer than `max_batch_size`. Default value is 1.
+    :type max_delay: float
+    :param on_settled: A coroutine function taking the results of each batch of settlements.
+    :type on_settled: callable[[list[~azure.servicebus.common.settlement.SettlementResult]], Awaitable[None]]
+    :param loop: An async event loop.
+    :type loop: ~asyncio.EventLoop
+    """
+
+    def __init__(self, max_batch_size=100, max_delay=1, on_settled=None, *, loop=None):
+        if int(max_batch_size) < 1:
+            raise ValueError("max_batch_size must be 1 or greater.")
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.on_settled = on_settled
+        self.loop = loop or get_running_loop()
+        self._pending = OrderedDict()
+        self._count = 0
+        self._first_pending = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.flush()
+
+    async def _add(self, action, message, description=None):
+        self._pending.setdefault((action, description), []).append(message)
+        self._count += 1
+        if self._first_pending is None:
+            self._first_pending = time.time()
+        if self._count >= self.max_batch_size or time.time() - self._first_pending >= self.max_delay:
+            return await self.flush()
+        return []
+
+    @property
+    def pending(self):
+        """The number of settlements not yet settled.
+
+        :rtype: int
+        """
+        return self._count
+
+    async def complete(self, message):
+        """Complete the message with the next batch.
+
+        :param message: A received message.
+        :type message: ~azure.servicebus.aio.async_message.Message
+        :returns: The results of the batch, if this settled one.
+        :rtype: list[~azure.servicebus.common.settlement.SettlementResult]
+        """
+        return await self._add('complete', message)
+
+    async def abandon(self, message):
+        """Abandon the message with the next batch.
+
+        :param message: A received message.
+        :type message: ~azure.servicebus.aio.async_message.Message
+        :returns: The results of the batch, if this settled one.
+        :rtype: list[~azure.servicebus.common.settlement.SettlementResult]
+        """
+        return await self._add('abandon', message)
+
+    async def defer(self, message):
+        """Defer the message with the next batch.
+
+        :param message: A received message.
+        :type message: ~azure.servicebus.aio.async_message.Message
+        :returns: The results of the batch, if this settled one.
+        :rtype: list[~azure.servicebus.common.settlement.SettlementResult]
+        """
+        return await self._add('defer', message)
+
+    async def dead_letter(self, message, description=None):
+        """Dead-letter the message with the next batch.
+
+        :param message: A received message.
+        :type message: ~azure.servicebus.aio.async_message.Message
+        :param description: The reason for dead-lettering the message.
+        :type description: str
+        :returns: The results of the batch, if this settled one.
+        :rtype: list[~azure.servicebus.common.settlement.SettlementResult]
+        """
+        return await self._add('dead_letter', message, description)
+
+    async def flush(self):
+        """Settle all pending settlements now.
+
+        :returns: The result of each settlement, grouped by settlement action.
+        :rtype: list[~azure.servicebus.common.settlement.SettlementResult]
+        """
+        pending, self._pending = self._pending, OrderedDict()
+        self._count = 0
+        self._first_pending = None
+        results = []
+        for (action, description), messages in pending.items():
+            results.extend(await settle_messages(action, messages, description, loop=self.loop))
+        if results and self.on_settled:
+            await self.on_settled(results)
+        return results
@@ -5,6 +5,8 @@
 # -------------------------------------------------------------------------
 
 import asyncio
+import heapq
+import itertools
 import logging
 import datetime
 
@@ -101,3 +103,114 @@ class AutoLockRenew:
         """Cancel remaining open lock renewal futures."""
         self._shutdown.set()
         await asyncio.wait(self._futures)
+
+
+class LockRenewScheduler:
+    """Renew the locks of many messages and sessions from a single background task.
+
+    Unlike `AutoLockRenew`, which polls each renewable from its own future, the
+    scheduler keeps the renewables ordered by when their locks are next due for
+    renewal, and only wakes up when the earliest of them is due. Locks are renewed
+    for as long as the renewable is registered, and until it is settled or expires.
+
+    :param renew_period: How many seconds before a lock expires it is renewed.
+     Default value is 10.
+    :type renew_period: int
+    :param loop: An async event loop.
+    :type loop: ~asyncio.EventLoop
+    """
+
+    def __init__(self, renew_period=10, *, loop=None):
+        self.loop = loop or get_running_loop()
+        self.renew_period = renew_period
+        self._wakeup = asyncio.Event()
+        self._due = []
+        self._registered = {}
+        self._counter = itertools.count()
+        self._shutdown = False
+        self._task = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.shutdown()
+
+    def _schedule(self, renewable, token, earliest=None):
+        due = renewable.locked_until or datetime.datetime.now()
+        due -= datetime.timedelta(seconds=self.renew_period)
+        if earliest and due < earliest:
+            due = earliest
+        heapq.heappush(self._due, (due, token, renewable))
+        self._wakeup.set()
+
+    async def _renew(self, renewable):
+        if getattr(renewable, 'settled', False) or renewable.expired:
+            return False
+        try:
+            await renewable.renew_lock()
+        except Exception as e:  # pylint: disable=broad-except
+            _log.debug("Failed to auto-renew lock: %r.", e)
+            renewable.auto_renew_error = AutoLockRenewFailed(
+                "Failed to auto-renew lock",
+                inner_exception=e)
+            return False
+        return True
+
+    async def _run(self):
+        while not self._shutdown:
+            self._wakeup.clear()
+            if not self._due:
+                await self._wakeup.wait()
+                continue
+            due, token, renewable = self._due[0]
+            wait = (due - datetime.datetime.now()).total_seconds()
+            if wait > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            heapq.heappop(self._due)
+            if self._registered.get(renewable) != token:
+                continue
+            renewed = await self._renew(renewable)
+            if self._registered.get(renewable) != token:
+                continue
+            if renewed:
+                # Never come back to the same lock sooner than a second later.
+                self._schedule(renewable, token, datetime.datetime.now() + datetime.timedelta(seconds=1))
+            else:
+                del self._registered[renewable]
+
+    def register(self, renewable):
+        """Register a locked message or session for lock renewal.
+
+        :param renewable: A locked entity that needs to be renewed.
+        :type renewable: ~azure.servicebus.aio.async_message.Message or
+         ~azure.servicebus.aio.async_receive_handler.SessionReceiver
+        """
+        if self._shutdown:
+            raise ValueError("The lock renew scheduler has been shut down.")
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run(), loop=self.loop)
+        token = next(self._counter)
+        self._registered[renewable] = token
+        self._schedule(renewable, token)
+
+    def unregister(self, renewable):
+        """Stop renewing the lock of a message or session.
+
+        :param renewable: A registered message or session.
+        :type renewable: ~azure.servicebus.aio.async_message.Message or
+         ~azure.servicebus.aio.async_receive_handler.SessionReceiver
+        """
+        self._registered.pop(renewable, None)
+
+    async def shutdown(self):
+        """Stop renewing locks and wait for the background task to exit."""
+        self._shutdown = True
+        self._registered.clear()
+        self._wakeup.set()
+        if self._task:
+            await self._task
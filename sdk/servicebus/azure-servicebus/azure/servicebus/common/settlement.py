@@ -0,0 +1,263 @@
+# ------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# -------------------------------------------------------------------------
+
+import functools
+import time
+from collections import OrderedDict
+
+from azure.servicebus.common.message import Message, PeekMessage, DeferredMessage
+from azure.servicebus.common.errors import ServiceBusError, MessageSettleFailed
+
+
+SETTLEMENT_ACTIONS = ('complete', 'abandon', 'defer', 'dead_letter')
+
+# The disposition status of each action for the update-disposition management operation
+_DISPOSITION_STATUS = {
+    'complete': 'completed',
+    'abandon': 'abandoned',
+    'dead_letter': 'suspended'}
+
+# The most lock tokens sent in a single update-disposition request
+MAX_LOCK_TOKENS = 1000
+
+
+class SettlementResult(object):
+    """The outcome of settling one message of a batch.
+
+    :ivar message: The message.
+    :vartype message: ~azure.servicebus.common.message.Message
+    :ivar error: Why the message was not settled, or None if it was.
+    :vartype error: Exception
+    """
+
+    def __init__(self, message, error=None):
+        self.message = message
+        self.error = error
+
+    @property
+    def succeeded(self):
+        """Whether the message was settled.
+
+        :rtype: bool
+        """
+        return self.error is None
+
+    def __repr__(self):
+        return "SettlementResult(message={}, error={!r})".format(self.message, self.error)
+
+
+def dead_letter_details(description):
+    return {
+        'deadletter-reason': str(description) if description else "",
+        'deadletter-description': str(description) if description else ""}
+
+
+def group_settlements(action, messages, deferred_type=DeferredMessage):
+    """Split the messages of a batch by how they are settled.
+
+    Messages received on a link are settled with a disposition on their link.
+    Deferred messages have no delivery on a link, and are settled through the
+    management link of their receiver instead, with one request for many lock tokens.
+    Messages that cannot be settled have their error set straight away.
+
+    :returns: The result of each message, the results of the messages to settle on
+     their link, and the results of the deferred messages by receiver.
+    """
+    if action not in SETTLEMENT_ACTIONS:
+        raise ValueError("Unknown settlement action: {}".format(action))
+    results = [SettlementResult(m) for m in messages]
+    on_link = []
+    deferred = OrderedDict()
+    for result in results:
+        message = result.message
+        if not isinstance(message, deferred_type):
+            on_link.append(result)
+            continue
+        try:
+            if action == 'defer':
+                raise ValueError("Message is already deferred.")
+            message._is_live(action)  # pylint: disable=protected-access
+        except (ServiceBusError, ValueError) as e:
+            result.error = e
+            continue
+        deferred.setdefault(message._receiver, []).append(result)  # pylint: disable=protected-access
+    return results, on_link, deferred
+
+
+def settle_on_links(results, action, description=None):
+    """Settle received messages with a disposition on their link, one after the other.
+
+    This does not wait on the service, so it can be run in a single executor call for many messages.
+    """
+    for result in results:
+        message = result.message
+        if isinstance(message, PeekMessage):
+            settle = getattr(message, action)
+        else:
+            # The synchronous settlement of the base class, as async messages override it
+            settle = functools.partial(getattr(Message, action), message)
+        try:
+            if action == 'dead_letter':
+                settle(description=description)
+            else:
+                settle()
+        except (ServiceBusError, TypeError, ValueError) as e:
+            result.error = e
+
+
+def lock_token_chunks(results):
+    for start in range(0, len(results), MAX_LOCK_TOKENS):
+        chunk = results[start:start + MAX_LOCK_TOKENS]
+        yield chunk, [r.message.lock_token for r in chunk]
+
+
+def settle_messages(action, messages, description=None):
+    """Settle a batch of received messages.
+
+    Messages received on a link are settled on their link, and deferred messages
+    are settled with a single management request per receiver.
+
+    :param action: One of 'complete', 'abandon', 'defer' or 'dead_letter'.
+    :type action: str
+    :param messages: The messages to settle.
+    :type messages: list[~azure.servicebus.common.message.Message]
+    :param description: The reason for dead-lettering the messages.
+    :type description: str
+    :rtype: list[~azure.servicebus.common.settlement.SettlementResult]
+    """
+    results, on_link, deferred = group_settlements(action, messages)
+    settle_on_links(on_link, action, description)
+    details = dead_letter_details(description) if action == 'dead_letter' else None
+    for receiver, pending in deferred.items():
+        for chunk, lock_tokens in lock_token_chunks(pending):
+            try:
+                receiver._settle_deferred(  # pylint: disable=protected-access
+                    _DISPOSITION_STATUS[action], lock_tokens, dead_letter_details=details)
+            except Exception as e:  # pylint: disable=broad-except
+                error = MessageSettleFailed(action, e)
+                for result in chunk:
+                    result.error = error
+            else:
+                for result in chunk:
+                    result.message._settled = True  # pylint: disable=protected-access
+    return results
+
+
+class SettlementAccumulator(object):
+    """Collect message settlements, and settle them in batches.
+
+    Settlements are held until `max_batch_size` of them are pending, or until one is
+    added once the first of them has been pending for `max_delay` seconds, and are then
+    settled together with `settle_messages`. There is no timer: `max_delay` is only checked
+    when a settlement is added, so settlements stay pending for as long as no more are
+    added. Call `flush()` when no more messages are coming, for example when a receive
+    returns none, or the messages will keep their locks until they expire and will be
+    redelivered. Any pending settlements are settled when leaving a `with` block.
+    Messages hold their locks while their settlement is pending, so `max_delay` should
+    be kept well below the lock duration of the entity.
+    The SettlementAccumulator should be accessed from a `Receiver` using the
+    `get_settlement_accumulator()` method.
+
+    :param max_batch_size: The number of pending settlements at which they are settled.
+     Default value is 100.
+    :type max_batch_size: int
+    :param max_delay: The time in seconds after which adding a settlement settles those
+     pending, even if fewer than `max_batch_size`. Default value is 1.
+    :type max_delay: float
+    :param on_settled: A callable taking the results of each batch of settlements.
+    :type on_settled: callable[[list[~azure.servicebus.common.settlement.SettlementResult]], None]
+    """
+
+    def __init__(self, max_batch_size=100, max_delay=1, on_settled=None):
+        if int(max_batch_size) < 1:
+            raise ValueError("max_batch_size must be 1 or greater.")
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.on_settled = on_settled
+        self._pending = OrderedDict()
+        self._count = 0
+        self._first_pending = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.flush()
+
+    def _add(self, action, message, description=None):
+        self._pending.setdefault((action, description), []).append(message)
+        self._count += 1
+        if self._first_pending is None:
+            self._first_pending = time.time()
+        if self._count >= self.max_batch_size or time.time() - self._first_pending >= self.max_delay:
+            return self.flush()
+        return []
+
+    @property
+    def pending(self):
+        """The number of settlements not yet settled.
+
+        :rtype: int
+        """
+        return self._count
+
+    def complete(self, message):
+        """Complete the message with the next batch.
+
+        :param message: A received message.
+        :type message: ~azure.servicebus.common.message.Message
+        :returns: The results of the batch, if this settled one.
+        :rtype: list[~azure.servicebus.common.settlement.SettlementResult]
+        """
+        return self._add('complete', message)
+
+    def abandon(self, message):
+        """Abandon the message with the next batch.
+
+        :param message: A received message.
+        :type message: ~azure.servicebus.common.message.Message
+        :returns: The results of the batch, if this settled one.
+        :rtype: list[~azure.servicebus.common.settlement.SettlementResult]
+        """
+        return self._add('abandon', message)
+
+    def defer(self, message):
+        """Defer the message with the next batch.
+
+        :param message: A received message.
+        :type message: ~azure.servicebus.common.message.Message
+        :returns: The results of the batch, if this settled one.
+        :rtype: list[~azure.servicebus.common.settlement.SettlementResult]
+        """
+        return self._add('defer', message)
+
+    def dead_letter(self, message, description=None):
+        """Dead-letter the message with the next batch.
+
+        :param message: A received message.
+        :type message: ~azure.servicebus.common.message.Message
+        :param description: The reason for dead-lettering the message.
+        :type description: str
+        :returns: The results of the batch, if this settled one.
+        :rtype: list[~azure.servicebus.common.settlement.SettlementResult]
+        """
+        return self._add('dead_letter', message, description)
+
+    def flush(self):
+        """Settle all pending settlements now.
+
+        :returns: The result of each settlement, grouped by settlement action.
+        :rtype: list[~azure.servicebus.common.settlement.SettlementResult]
+        """
+        pending, self._pending = self._pending, OrderedDict()
+        self._count = 0
+        self._first_pending = None
+        results = []
+        for (action, description), messages in pending.items():
+            results.extend(settle_messages(action, messages, description))
+        if results and self.on_settled:
+            self.on_settled(results)
+        return results
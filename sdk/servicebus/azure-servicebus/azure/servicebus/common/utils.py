@@ -6,6 +6,8 @@
 
 import sys
 import datetime
+import heapq
+import itertools
 import logging
 import threading
 import time
@@ -171,3 +173,117 @@ class AutoLockRenew(object):
         :type wait: bool
         """
         self.executor.shutdown(wait=wait)
+
+
+class LockRenewScheduler(object):
+    """Renew the locks of many messages and sessions from a single background thread.
+
+    Unlike `AutoLockRenew`, which polls each renewable from its own thread, the
+    scheduler keeps the renewables ordered by when their locks are next due for
+    renewal, and only wakes up when the earliest of them is due. Locks are renewed
+    for as long as the renewable is registered, and until it is settled or expires.
+
+    :param renew_period: How many seconds before a lock expires it is renewed.
+     Default value is 10.
+    :type renew_period: int
+    """
+
+    def __init__(self, renew_period=10):
+        self.renew_period = renew_period
+        self._condition = threading.Condition()
+        self._due = []
+        self._registered = {}
+        self._counter = itertools.count()
+        self._shutdown = False
+        self._thread = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown()
+
+    def _schedule(self, renewable, token, earliest=None):
+        due = renewable.locked_until or datetime.datetime.now()
+        due -= datetime.timedelta(seconds=self.renew_period)
+        if earliest and due < earliest:
+            due = earliest
+        heapq.heappush(self._due, (due, token, renewable))
+        self._condition.notify()
+
+    def _renew(self, renewable):
+        if getattr(renewable, 'settled', False) or renewable.expired:
+            return False
+        try:
+            renewable.renew_lock()
+        except Exception as e:  # pylint: disable=broad-except
+            _log.debug("Failed to auto-renew lock: %r.", e)
+            renewable.auto_renew_error = AutoLockRenewFailed(
+                "Failed to auto-renew lock",
+                inner_exception=e)
+            return False
+        return True
+
+    def _run(self):
+        with self._condition:
+            while not self._shutdown:
+                if not self._due:
+                    self._condition.wait()
+                    continue
+                due, token, renewable = self._due[0]
+                wait = (due - datetime.datetime.now()).total_seconds()
+                if wait > 0:
+                    self._condition.wait(wait)
+                    continue
+                heapq.heappop(self._due)
+                if self._registered.get(renewable) != token:
+                    continue
+                self._condition.release()
+                try:
+                    renewed = self._renew(renewable)
+                finally:
+                    self._condition.acquire()
+                if self._registered.get(renewable) != token:
+                    continue
+                if renewed:
+                    # Never come back to the same lock sooner than a second later.
+                    self._schedule(renewable, token, datetime.datetime.now() + datetime.timedelta(seconds=1))
+                else:
+                    del self._registered[renewable]
+
+    def register(self, renewable):
+        """Register a locked message or session for lock renewal.
+
+        :param renewable: A locked entity that needs to be renewed.
+        :type renewable: ~azure.servicebus.common.message.Message or
+         ~azure.servicebus.receive_handler.SessionReceiver
+        """
+        with self._condition:
+            if self._shutdown:
+                raise ValueError("The lock renew scheduler has been shut down.")
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="LockRenewScheduler")
+                self._thread.daemon = True
+                self._thread.start()
+            token = next(self._counter)
+            self._registered[renewable] = token
+            self._schedule(renewable, token)
+
+    def unregister(self, renewable):
+        """Stop renewing the lock of a message or session.
+
+        :param renewable: A registered message or session.
+        :type renewable: ~azure.servicebus.common.message.Message or
+         ~azure.servicebus.receive_handler.SessionReceiver
+        """
+        with self._condition:
+            self._registered.pop(renewable, None)
+
+    def shutdown(self):
+        """Stop renewing locks and wait for the background thread to exit."""
+        with self._condition:
+            self._shutdown = True
+            self._registered.clear()
+            self._condition.notify()
+        if self._thread:
+            self._thread.join()
@@ -0,0 +1,330 @@
+# ------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# -------------------------------------------------------------------------
+
+import logging
+import threading
+import time
+try:
+    import Queue as queue
+except ImportError:
+    import queue
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from azure.servicebus.common.utils import LockRenewScheduler
+from azure.servicebus.common.settlement import settle_messages
+from azure.servicebus.common.constants import ReceiveSettleMode
+
+
+_log = logging.getLogger(__name__)
+
+
+class MessagePumpMetrics(object):
+    """Counters of a message pump.
+
+    :ivar received: The number of messages received.
+    :vartype received: int
+    :ivar handled: The number of messages the handler returned from without error.
+    :vartype handled: int
+    :ivar failed: The number of messages the handler raised an error for.
+    :vartype failed: int
+    :ivar settle_failed: The number of messages the pump failed to settle.
+    :vartype settle_failed: int
+    :ivar total_processing_time: The time in seconds spent in the handler, across all messages.
+    :vartype total_processing_time: float
+    :ivar max_processing_time: The longest time in seconds spent in the handler for a message.
+    :vartype max_processing_time: float
+    :ivar queue_depth: The number of received messages waiting for a handler.
+    :vartype queue_depth: int
+    :ivar max_queue_depth: The largest number of received messages that waited for a handler.
+    :vartype max_queue_depth: int
+    """
+
+    def __init__(self):
+        self.received = 0
+        self.handled = 0
+        self.failed = 0
+        self.settle_failed = 0
+        self.total_processing_time = 0.0
+        self.max_processing_time = 0.0
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+
+    def _record_processing_time(self, processing_time):
+        self.total_processing_time += processing_time
+        if processing_time > self.max_processing_time:
+            self.max_processing_time = processing_time
+
+    @property
+    def average_processing_time(self):
+        """The average time in seconds spent in the handler for a message.
+
+        :rtype: float
+        """
+        processed = self.handled + self.failed
+        return self.total_processing_time / processed if processed else 0.0
+
+    def __repr__(self):
+        return (
+            "MessagePumpMetrics(received={}, handled={}, failed={}, average_processing_time={:.3f}, "
+            "queue_depth={})".format(
+                self.received, self.handled, self.failed, self.average_processing_time, self.queue_depth))
+
+
+class MessagePump(object):  # pylint: disable=too-many-instance-attributes
+    """Receive messages on a dedicated loop, and handle them on a pool of threads.
+
+    The receive loop runs on the thread calling `run()`. It keeps a bounded buffer of
+    received messages filled, and it is the only thread using the receiver, so the link is
+    serviced while handlers run. Up to `max_concurrent_calls` handlers run at once, each on
+    its own thread. Handlers report how each message went back to the receive loop,
+    which completes or abandons the messages in batches.
+    Handlers must not settle messages with their own methods, such as `message.complete()`:
+    the receiver's link is not thread-safe, and handlers run on other threads. To settle a
+    message differently, a handler calls the pump's `complete()`, `abandon()`, `defer()` or
+    `dead_letter()`, which have the receive loop settle it.
+    While a message waits in the buffer or is being handled, its lock is renewed by a
+    `LockRenewScheduler`. For a session receiver the session lock is renewed instead.
+    The MessagePump should be accessed from a `Receiver` using the `get_message_pump()` method.
+
+    .. note:: Messages are handled concurrently, so they may finish out of order. Use a
+     `max_concurrent_calls` of 1 to handle them in the order they were received.
+
+    :param receiver: The receiver to pump messages from. It is opened if needed, and closed
+     when the pump stops.
+    :type receiver: ~azure.servicebus.receive_handler.Receiver
+    :param max_concurrent_calls: The maximum number of handlers running at once. Default value is 1.
+    :type max_concurrent_calls: int
+    :param buffer_size: The maximum number of received messages waiting for a handler. The
+     default is twice `max_concurrent_calls`.
+    :type buffer_size: int
+    :param auto_complete: Whether to complete a message once it has been handled without
+     error, unless the handler settled it through the pump. A message the handler raises an
+     error for is abandoned, unless the handler settled it through the pump. Default is `True`.
+    :type auto_complete: bool
+    :param auto_lock_renew: Whether to renew the locks of messages until they are settled.
+     Default is `True`.
+    :type auto_lock_renew: bool
+    """
+
+    def __init__(
+            self, receiver, max_concurrent_calls=1, buffer_size=None,
+            auto_complete=True, auto_lock_renew=True):
+        if int(max_concurrent_calls) < 1:
+            raise ValueError("max_concurrent_calls must be 1 or greater.")
+        if buffer_size is not None and int(buffer_size) < 1:
+            raise ValueError("buffer_size must be 1 or greater.")
+        self.receiver = receiver
+        self.max_concurrent_calls = max_concurrent_calls
+        self.buffer_size = buffer_size or 2 * max_concurrent_calls
+        self.auto_complete = auto_complete
+        self.auto_lock_renew = auto_lock_renew and receiver.mode == ReceiveSettleMode.PeekLock
+        self.receive_timeout = 1
+        self.metrics = MessagePumpMetrics()
+        self._is_session = hasattr(receiver, 'session_id')
+        self._buffer = queue.Queue(self.buffer_size)
+        self._to_settle = deque()
+        self._stopped = threading.Event()
+        self._metrics_lock = threading.Lock()
+        self._lock_renewer = None
+        # The message each worker thread is handling, and whether the handler settled it
+        self._handling = threading.local()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def _queue_settlement(self, action, message, description=None):
+        if getattr(self._handling, 'message', None) is message:
+            self._handling.settled = True
+        self._to_settle.append((action, message, description))
+
+    def complete(self, message):
+        """Have the receive loop complete a message, from a message handler.
+
+        :param message: The message.
+        :type message: ~azure.servicebus.common.message.Message
+        """
+        self._queue_settlement('complete', message)
+
+    def abandon(self, message):
+        """Have the receive loop abandon a message, from a message handler.
+
+        :param message: The message.
+        :type message: ~azure.servicebus.common.message.Message
+        """
+        self._queue_settlement('abandon', message)
+
+    def defer(self, message):
+        """Have the receive loop defer a message, from a message handler.
+
+        :param message: The message.
+        :type message: ~azure.servicebus.common.message.Message
+        """
+        self._queue_settlement('defer', message)
+
+    def dead_letter(self, message, description=None):
+        """Have the receive loop move a message to the Dead Letter queue, from a message handler.
+
+        :param message: The message.
+        :type message: ~azure.servicebus.common.message.Message
+        :param description: The reason for dead-lettering the message.
+        :type description: str
+        """
+        self._queue_settlement('dead_letter', message, description)
+
+    def _handle(self, message, message_handler, error_handler):
+        self._handling.message = message
+        self._handling.settled = False
+        try:
+            self._handle_message(message, message_handler, error_handler)
+        finally:
+            self._handling.message = None
+
+    def _handle_message(self, message, message_handler, error_handler):
+        start = time.time()
+        try:
+            message_handler(message)
+        except Exception as e:  # pylint: disable=broad-except
+            processing_time = time.time() - start
+            with self._metrics_lock:
+                self.metrics.failed += 1
+                self.metrics._record_processing_time(processing_time)  # pylint: disable=protected-access
+            if error_handler:
+                try:
+                    error_handler(e, message)
+                except Exception as handler_error:  # pylint: disable=broad-except
+                    _log.warning("Message pump error handler failed: %r", handler_error)
+            else:
+                _log.warning("Message handler failed: %r", e)
+            if not self._handling.settled:
+                self._queue_settlement('abandon', message)
+            return
+        processing_time = time.time() - start
+        with self._metrics_lock:
+            self.metrics.handled += 1
+            self.metrics._record_processing_time(processing_time)  # pylint: disable=protected-access
+        if self._handling.settled:
+            return
+        if self.auto_complete:
+            self._queue_settlement('complete', message)
+        elif self._lock_renewer:
+            self._lock_renewer.unregister(message)
+
+    def _worker(self, message_handler, error_handler):
+        while True:
+            message = self._buffer.get()
+            if message is None:
+                return
+            self._handle(message, message_handler, error_handler)
+
+    def _settle(self):
+        batches = {}
+        while self._to_settle:
+            action, message, description = self._to_settle.popleft()
+            if self._lock_renewer:
+                self._lock_renewer.unregister(message)
+            if message.settled:
+                continue
+            batches.setdefault((action, description), []).append(message)
+        for (action, description), messages in batches.items():
+            for result in settle_messages(action, messages, description):
+                if not result.succeeded:
+                    _log.info("Message pump failed to %s a message: %r", action, result.error)
+                    with self._metrics_lock:
+                        self.metrics.settle_failed += 1
+
+    def _update_queue_depth(self):
+        depth = self._buffer.qsize()
+        with self._metrics_lock:
+            self.metrics.queue_depth = depth
+            if depth > self.metrics.max_queue_depth:
+                self.metrics.max_queue_depth = depth
+
+    def _receive(self):
+        while not self._stopped.is_set():
+            self._settle()
+            space = self.buffer_size - self._buffer.qsize()
+            if space <= 0:
+                self._update_queue_depth()
+                time.sleep(0.01)
+                continue
+            batch = self.receiver.fetch_next(max_batch_size=space, timeout=self.receive_timeout)
+            with self._metrics_lock:
+                self.metrics.received += len(batch)
+            for message in batch:
+                if self._lock_renewer and not self._is_session:
+                    self._lock_renewer.register(message)
+                # Only this loop adds to the buffer, and it never fetches more than the space left
+                self._buffer.put_nowait(message)
+            self._update_queue_depth()
+
+    def _drain(self):
+        # Messages still in the buffer are given back to the entity straight away
+        while True:
+            try:
+                message = self._buffer.get_nowait()
+            except queue.Empty:
+                break
+            self._queue_settlement('abandon', message)
+        self._update_queue_depth()
+
+    def run(self, message_handler, error_handler=None, timeout=None):
+        """Receive and handle messages until the pump is stopped or the receiver closes.
+
+        :param message_handler: A callable taking a message. It runs on a worker thread, so it
+         settles messages through the pump's `complete()`, `abandon()`, `defer()` and `dead_letter()`,
+         not their own methods.
+        :type message_handler: callable[[~azure.servicebus.common.message.Message], None]
+        :param error_handler: A callable taking an error raised by `message_handler` and
+         the message it was raised for. If not given, the errors are logged. The message is
+         abandoned after it returns, unless it or `message_handler` settled it through the pump.
+        :type error_handler: callable[[Exception, ~azure.servicebus.common.message.Message], None]
+        :param timeout: The time in seconds after which to stop. By default the pump runs
+         until `stop()` is called, or the receiver closes.
+        :type timeout: float
+        :raises: ~azure.servicebus.common.errors.ServiceBusError if the receiver fails.
+        """
+        if timeout:
+            timer = threading.Timer(timeout, self.stop)
+            timer.daemon = True
+            timer.start()
+        self._stopped.clear()
+        if self.auto_lock_renew:
+            self._lock_renewer = LockRenewScheduler()
+        try:
+            self.receiver.open()
+            if self._lock_renewer and self._is_session:
+                self._lock_renewer.register(self.receiver)
+            with ThreadPoolExecutor(max_workers=self.max_concurrent_calls) as executor:
+                for _ in range(self.max_concurrent_calls):
+                    executor.submit(self._worker, message_handler, error_handler)
+                try:
+                    self._receive()
+                finally:
+                    self._stopped.set()
+                    self._drain()
+                    for _ in range(self.max_concurrent_calls):
+                        self._buffer.put(None)
+            self._settle()
+        finally:
+            if timeout:
+                timer.cancel()
+            if self._lock_renewer:
+                self._lock_renewer.shutdown()
+                self._lock_renewer = None
+            self.receiver.close()
+
+    def stop(self):
+        """Stop receiving.
+
+        Messages waiting in the buffer are abandoned, and `run()` returns once the handlers
+        running have finished, and their messages are settled.
+        This method can be called from a message handler, or from any other thread.
+        """
+        self._stopped.set()
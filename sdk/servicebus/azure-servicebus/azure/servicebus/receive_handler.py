@@ -17,6 +17,8 @@ from uamqp import authentication
 from uamqp import constants, types, errors
 
 from azure.servicebus.common.message import Message
+from azure.servicebus.common.settlement import SettlementAccumulator, settle_messages
+from azure.servicebus.message_pump import MessagePump
 from azure.servicebus.common import mgmt_handlers, mixins
 from azure.servicebus.base_handler import BaseHandler
 from azure.servicebus.common.errors import (
@@ -396,6 +398,105 @@ class Receiver(BaseHandler):  # pylint: disable=too-many-instance-attributes
             self._handle_exception(e)
         return wrapped_batch
 
+    def complete_messages(self, messages):
+        """Complete a batch of received messages.
+
+        Messages received by this receiver are settled on its link, and deferred messages
+        are settled with a single management request. A message that cannot be settled
+        does not stop the others: its error is in its result.
+
+        :param messages: The messages to settle.
+        :type messages: list[~azure.servicebus.common.message.Message]
+        :returns: The result of each message, in order.
+        :rtype: list[~azure.servicebus.common.settlement.SettlementResult]
+        """
+        return settle_messages('complete', messages)
+
+    def abandon_messages(self, messages):
+        """Abandon a batch of received messages.
+
+        Messages received by this receiver are settled on its link, and deferred messages
+        are settled with a single management request. A message that cannot be settled
+        does not stop the others: its error is in its result.
+
+        :param messages: The messages to settle.
+        :type messages: list[~azure.servicebus.common.message.Message]
+        :returns: The result of each message, in order.
+        :rtype: list[~azure.servicebus.common.settlement.SettlementResult]
+        """
+        return settle_messages('abandon', messages)
+
+    def defer_messages(self, messages):
+        """Defer a batch of received messages.
+
+        Messages received by this receiver are settled on its link, and deferred messages
+        are settled with a single management request. A message that cannot be settled
+        does not stop the others: its error is in its result.
+
+        :param messages: The messages to settle.
+        :type messages: list[~azure.servicebus.common.message.Message]
+        :returns: The result of each message, in order.
+        :rtype: list[~azure.servicebus.common.settlement.SettlementResult]
+        """
+        return settle_messages('defer', messages)
+
+    def dead_letter_messages(self, messages, description=None):
+        """Dead-letter a batch of received messages.
+
+        Messages received by this receiver are settled on its link, and deferred messages
+        are settled with a single management request. A message that cannot be settled
+        does not stop the others: its error is in its result.
+
+        :param messages: The messages to settle.
+        :type messages: list[~azure.servicebus.common.message.Message]
+        :param description: The reason for dead-lettering the messages.
+        :type description: str
+        :returns: The result of each message, in order.
+        :rtype: list[~azure.servicebus.common.settlement.SettlementResult]
+        """
+        return settle_messages('dead_letter', messages, description)
+
+    def get_settlement_accumulator(self, max_batch_size=100, max_delay=1, on_settled=None):
+        """Get a SettlementAccumulator to settle received messages in batches.
+
+        :param max_batch_size: The number of pending settlements at which they are settled.
+         Default value is 100.
+        :type max_batch_size: int
+        :param max_delay: The time in seconds after which adding a settlement settles those
+         pending, even if fewer than `max_batch_size`. It is only checked when a settlement is
+         added: call `flush()` on the accumulator when no more messages are coming.
+         Default value is 1.
+        :type max_delay: float
+        :param on_settled: A callable taking the results of each batch of settlements.
+        :type on_settled: callable
+        :rtype: ~azure.servicebus.common.settlement.SettlementAccumulator
+        """
+        return SettlementAccumulator(
+            max_batch_size=max_batch_size, max_delay=max_delay, on_settled=on_settled)
+
+
+    def get_message_pump(self, max_concurrent_calls=1, buffer_size=None, auto_complete=True, auto_lock_renew=True):
+        """Get a MessagePump to receive messages on a dedicated loop and handle them concurrently.
+
+        :param max_concurrent_calls: The maximum number of handlers running at once. Default value is 1.
+        :type max_concurrent_calls: int
+        :param buffer_size: The maximum number of received messages waiting for a handler. The
+         default is twice `max_concurrent_calls`.
+        :type buffer_size: int
+        :param auto_complete: Whether to complete a message once it has been handled without
+         error, unless the handler settled it through the pump. Default is `True`.
+        :type auto_complete: bool
+        :param auto_lock_renew: Whether to renew the locks of messages until they are settled.
+         Default is `True`.
+        :type auto_lock_renew: bool
+        :rtype: ~azure.servicebus.message_pump.MessagePump
+        """
+        return MessagePump(
+            self,
+            max_concurrent_calls=max_concurrent_calls,
+            buffer_size=buffer_size,
+            auto_complete=auto_complete,
+            auto_lock_renew=auto_lock_renew)
 
 class SessionReceiver(Receiver, mixins.SessionMixin):
     """A session message receiver.
@@ -29,6 +29,7 @@ from azure.servicebus.control_client import ServiceBusService, SERVICE_BUS_HOST_
 from azure.servicebus.control_client.models import AzureServiceBusResourceNotFound
 from azure.servicebus.send_handler import Sender, SessionSender
 from azure.servicebus.receive_handler import Receiver, SessionReceiver
+from azure.servicebus.session_processor import SessionProcessor
 from azure.servicebus.base_handler import BaseHandler
 
 
@@ -613,6 +614,50 @@ class ReceiveClientMixin(object):
             mode=mode,
             **kwargs)
 
+    def get_session_processor(
+            self, max_sessions=8, max_concurrent_calls=None, session_idle_timeout=5,
+            prefetch=0, mode=ReceiveSettleMode.PeekLock, auto_complete=True, **kwargs):
+        """Get a SessionProcessor to handle messages from many sessions of the entity at once.
+
+        Up to `max_sessions` sessions are held at once over a single connection, each
+        handled in order, and new sessions are accepted as others go idle or are lost.
+
+        :param max_sessions: The maximum number of sessions held at once. Default value is 8.
+        :type max_sessions: int
+        :param max_concurrent_calls: The maximum number of messages handled at once across
+         all sessions. The default is one per session.
+        :type max_concurrent_calls: int
+        :param session_idle_timeout: The time in seconds to wait for the next message of a
+         session before releasing it. Default value is 5.
+        :type session_idle_timeout: float
+        :param prefetch: The maximum number of messages to cache for each session.
+         The default value is 0.
+        :type prefetch: int
+        :param mode: The mode with which messages will be retrieved from the entity. The two options
+         are PeekLock and ReceiveAndDelete. The default mode is PeekLock.
+        :type mode: ~azure.servicebus.common.constants.ReceiveSettleMode
+        :param auto_complete: Whether to complete a message once it has been handled without
+         error, if the handler did not settle it itself. Default is `True`.
+        :type auto_complete: bool
+        :returns: A SessionProcessor that is not yet running.
+        :rtype: ~azure.servicebus.session_processor.SessionProcessor
+        :raises: If the current Service Bus entity does not require sessions, a ValueError will
+         be raised.
+        """
+        if self.entity and not self.requires_session:
+            raise ValueError("This is not a sessionful entity.")
+        if int(prefetch) < 0 or int(prefetch) > 50000:
+            raise ValueError("Prefetch must be an integer between 0 and 50000 inclusive.")
+        return SessionProcessor(
+            self,
+            max_sessions=max_sessions,
+            max_concurrent_calls=max_concurrent_calls,
+            session_idle_timeout=session_idle_timeout,
+            prefetch=prefetch,
+            mode=mode,
+            auto_complete=auto_complete,
+            **kwargs)
+
     def get_deadletter_receiver(
             self, transfer_deadletter=False, prefetch=0,
             mode=ReceiveSettleMode.PeekLock, idle_timeout=0, **kwargs):
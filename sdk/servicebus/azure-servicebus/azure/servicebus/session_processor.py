@@ -0,0 +1,225 @@
+# ------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# -------------------------------------------------------------------------
+
+import logging
+import threading
+import uuid
+try:
+    from urlparse import urlparse
+except ImportError:
+    from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
+
+from uamqp import Connection
+from uamqp import authentication
+
+from azure.servicebus.common.utils import LockRenewScheduler, create_properties
+from azure.servicebus.common.errors import NoActiveSession, ServiceBusError
+from azure.servicebus.common.constants import NEXT_AVAILABLE, ReceiveSettleMode
+
+
+_log = logging.getLogger(__name__)
+
+
+class SessionProcessor(object):  # pylint: disable=too-many-instance-attributes
+    """Process messages from many sessions of a sessionful entity at once.
+
+    The processor holds up to `max_sessions` sessions at a time. Each session is
+    received by its own worker, so the messages of a session are handled one at a time
+    and in order, while different sessions are handled concurrently. When a session has
+    no message for `session_idle_timeout` seconds, or its lock is lost, it is released
+    and the worker accepts the next available session.
+    All the session receivers share a single AMQP connection, and their session locks
+    are renewed by a single background scheduler for as long as they are held.
+    The SessionProcessor should not be instantiated directly, and should be accessed from
+    a `QueueClient` or `SubscriptionClient` using the `get_session_processor()` method.
+
+    :param client: The client of the sessionful entity.
+    :type client: ~azure.servicebus.servicebus_client.QueueClient or
+     ~azure.servicebus.servicebus_client.SubscriptionClient
+    :param max_sessions: The maximum number of sessions held at once. Default value is 8.
+    :type max_sessions: int
+    :param max_concurrent_calls: The maximum number of messages handled at once across
+     all sessions. The default is one per session.
+    :type max_concurrent_calls: int
+    :param session_idle_timeout: The time in seconds to wait for the next message of a
+     session before releasing it. Default value is 5.
+    :type session_idle_timeout: float
+    :param prefetch: The maximum number of messages to cache for each session.
+    :type prefetch: int
+    :param mode: The receive connection mode. Value must be either PeekLock or ReceiveAndDelete.
+    :type mode: ~azure.servicebus.common.constants.ReceiveSettleMode
+    :param auto_complete: Whether to complete a message once it has been handled without
+     error, if the handler did not settle it itself. Default is `True`.
+    :type auto_complete: bool
+    """
+
+    def __init__(
+            self, client, max_sessions=8, max_concurrent_calls=None, session_idle_timeout=5,
+            prefetch=0, mode=ReceiveSettleMode.PeekLock, auto_complete=True, **kwargs):
+        if int(max_sessions) < 1:
+            raise ValueError("max_sessions must be 1 or greater.")
+        if max_concurrent_calls is not None and int(max_concurrent_calls) < 1:
+            raise ValueError("max_concurrent_calls must be 1 or greater.")
+        if not session_idle_timeout or session_idle_timeout < 0:
+            raise ValueError("session_idle_timeout must be greater than 0.")
+        self.client = client
+        self.max_sessions = max_sessions
+        self.max_concurrent_calls = max_concurrent_calls or max_sessions
+        self.session_idle_timeout = session_idle_timeout
+        self.prefetch = prefetch
+        self.mode = mode
+        self.auto_complete = auto_complete
+        self.error_backoff = 1
+        self.receiver_kwargs = kwargs
+        self._connection = None
+        self._lock_renewer = None
+        self._calls = None
+        self._stopped = threading.Event()
+        self._receivers = set()
+        self._receivers_lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def _open_connection(self):
+        auth_config = self.client.auth_config
+        hostname = urlparse(self.client.entity_uri).hostname
+        auth = authentication.SASLPlain(hostname, auth_config['key_name'], auth_config['shared_access_key'])
+        return Connection(
+            hostname,
+            auth,
+            container_id="SBSessionProcessor-{}".format(uuid.uuid4()),
+            properties=create_properties(),
+            debug=self.client.debug)
+
+    def _on_error(self, error_handler, error, session):
+        if error_handler:
+            try:
+                error_handler(error, session)
+                return
+            except Exception as e:  # pylint: disable=broad-except
+                _log.warning("Session processor error handler failed: %r", e)
+        _log.warning("Session processor error on session %r: %r", session, error)
+
+    def _handle_message(self, session, message, message_handler, error_handler):
+        with self._calls:
+            try:
+                message_handler(session, message)
+            except Exception as e:  # pylint: disable=broad-except
+                if not message.settled:
+                    message.abandon()
+                self._on_error(error_handler, e, session.session_id)
+                return
+            if self.auto_complete and not message.settled:
+                message.complete()
+
+    def _process_session(self, session, message_handler, error_handler):
+        while not self._stopped.is_set():
+            batch = session.fetch_next(timeout=self.session_idle_timeout)
+            if not batch:
+                _log.debug("Session %r idle. Releasing.", session.session_id)
+                return
+            for message in batch:
+                if self._stopped.is_set():
+                    return
+                self._handle_message(session, message, message_handler, error_handler)
+
+    def _session_worker(self, message_handler, error_handler):
+        while not self._stopped.is_set():
+            session = self.client.get_receiver(
+                session=NEXT_AVAILABLE,
+                prefetch=self.prefetch,
+                mode=self.mode,
+                connection=self._connection,
+                **self.receiver_kwargs)
+            with self._receivers_lock:
+                self._receivers.add(session)
+            try:
+                session.open()
+                _log.debug("Accepted session %r.", session.session_id)
+                self._lock_renewer.register(session)
+                self._process_session(session, message_handler, error_handler)
+            except NoActiveSession:
+                _log.debug("No session available.")
+            except ServiceBusError as e:
+                self._on_error(error_handler, e, session.session_id)
+                self._stopped.wait(self.error_backoff)
+            finally:
+                self._lock_renewer.unregister(session)
+                with self._receivers_lock:
+                    self._receivers.discard(session)
+                session.close()
+
+    def _on_worker_done(self, worker):
+        if worker.exception():
+            _log.info("Session processor worker failed (%r). Stopping.", worker.exception())
+            self._stopped.set()
+
+    def run(self, message_handler, error_handler=None, timeout=None):
+        """Receive and handle messages until the processor is stopped.
+
+        Each message is passed to `message_handler` along with the session receiver it
+        was received from, which can be used to get or set the session state. A message
+        the handler fails on is abandoned. Errors are passed to `error_handler` along
+        with the ID of the session they happened in, or logged if no `error_handler`
+        is given. Sessions that fail are released, and processing carries on.
+
+        :param message_handler: A callable taking the session receiver and a message.
+        :type message_handler: callable[[~azure.servicebus.receive_handler.SessionReceiver,
+         ~azure.servicebus.common.message.Message], None]
+        :param error_handler: A callable taking an error and the ID of the session it
+         happened in, if any.
+        :type error_handler: callable[[Exception, str], None]
+        :param timeout: The time in seconds after which to stop. By default the processor
+         runs until `stop()` is called.
+        :type timeout: float
+        :raises: Any unexpected error that stopped the processor.
+        """
+        if self._connection:
+            raise ValueError("The session processor is already running.")
+        self._stopped.clear()
+        self._calls = threading.BoundedSemaphore(self.max_concurrent_calls)
+        self._connection = self._open_connection()
+        self._lock_renewer = LockRenewScheduler()
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_sessions) as executor:
+                workers = [
+                    executor.submit(self._session_worker, message_handler, error_handler)
+                    for _ in range(self.max_sessions)]
+                for worker in workers:
+                    worker.add_done_callback(self._on_worker_done)
+                self._stopped.wait(timeout)
+                self._stopped.set()
+            for worker in workers:
+                worker.result()
+        finally:
+            self._stopped.set()
+            self._lock_renewer.shutdown()
+            self._connection.destroy()
+            self._connection = None
+
+    def stop(self):
+        """Stop receiving.
+
+        The sessions being handled are released once the message being handled in each
+        of them is done. Sessions still waiting to be accepted are released once the
+        service times out the wait.
+        This method can be called from a message handler, or from any other thread.
+        """
+        self._stopped.set()
+
+    @property
+    def sessions(self):
+        """The IDs of the sessions currently held.
+
+        :rtype: list[str]
+        """
+        with self._receivers_lock:
+            return [r.session_id for r in self._receivers if r.session_id]
@@ -1052,3 +1052,82 @@ async def test_async_queue_cancel_scheduled_messages(live_servicebus_config, sta
 
         messages = await receiver.fetch_next(timeout=120)
         assert len(messages) == 0
+
+
+@pytest.mark.liveTest
+@pytest.mark.asyncio
+async def test_async_queue_by_servicebus_client_settle_messages_in_batches(live_servicebus_config, standard_queue):
+    client = ServiceBusClient(
+        service_namespace=live_servicebus_config['hostname'],
+        shared_access_key_name=live_servicebus_config['key_name'],
+        shared_access_key_value=live_servicebus_config['access_key'],
+        debug=False)
+
+    queue_client = client.get_queue(standard_queue)
+    async with queue_client.get_sender() as sender:
+        for i in range(20):
+            await sender.send(Message("Batch settled message no. {}".format(i)))
+
+    async with queue_client.get_receiver(idle_timeout=5, prefetch=20) as receiver:
+        received = []
+        while len(received) < 20:
+            batch = await receiver.fetch_next(timeout=10)
+            assert batch
+            received.extend(batch)
+
+        results = await receiver.defer_messages(received[:10])
+        assert all(result.succeeded for result in results)
+        results = await receiver.complete_messages(received)
+        assert [result.succeeded for result in results] == [False] * 10 + [True] * 10
+        assert all(isinstance(result.error, MessageAlreadySettled) for result in results[:10])
+
+        deferred = await receiver.receive_deferred_messages([m.sequence_number for m in received[:10]])
+        assert len(deferred) == 10
+        settled = []
+
+        async def on_settled(results):
+            settled.extend(results)
+
+        async with receiver.get_settlement_accumulator(max_batch_size=4, on_settled=on_settled) as accumulator:
+            for message in deferred:
+                await accumulator.complete(message)
+        assert len(settled) == 10
+        assert all(result.succeeded for result in settled)
+        assert all(message.settled for message in deferred)
+
+
+@pytest.mark.liveTest
+@pytest.mark.asyncio
+async def test_async_queue_by_servicebus_client_message_pump(live_servicebus_config, standard_queue):
+    client = ServiceBusClient(
+        service_namespace=live_servicebus_config['hostname'],
+        shared_access_key_name=live_servicebus_config['key_name'],
+        shared_access_key_value=live_servicebus_config['access_key'],
+        debug=False)
+
+    queue_client = client.get_queue(standard_queue)
+    async with queue_client.get_sender() as sender:
+        for i in range(20):
+            await sender.send(Message("Pumped message no. {}".format(i)))
+
+    handled = []
+
+    async def message_handler(message):
+        await asyncio.sleep(0.1)
+        handled.append(message)
+        if len(handled) == 20:
+            pump.stop()
+
+    receiver = queue_client.get_receiver(prefetch=10)
+    pump = receiver.get_message_pump(max_concurrent_calls=4)
+    await pump.run(message_handler, timeout=60)
+
+    assert len(handled) == 20
+    assert all(message.settled for message in handled)
+    assert pump.metrics.handled == 20
+    assert pump.metrics.failed == 0
+    assert pump.metrics.max_queue_depth <= 8
+    assert pump.metrics.average_processing_time >= 0.1
+
+    async with queue_client.get_receiver(idle_timeout=5) as receiver:
+        assert not await receiver.fetch_next(timeout=5)
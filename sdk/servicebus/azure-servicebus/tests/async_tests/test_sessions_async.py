@@ -813,4 +813,39 @@ async def test_async_session_by_servicebus_client_session_pool(live_servicebus_c
     await asyncio.gather(*receive_sessions, return_exceptions=True)
 
     assert not errors
-    assert len(messages) == 100
\ No newline at end of file
+    assert len(messages) == 100
+
+@pytest.mark.liveTest
+@pytest.mark.asyncio
+async def test_async_session_by_servicebus_client_session_processor(live_servicebus_config, session_queue):
+    client = ServiceBusClient(
+        service_namespace=live_servicebus_config['hostname'],
+        shared_access_key_name=live_servicebus_config['key_name'],
+        shared_access_key_value=live_servicebus_config['access_key'],
+        debug=False)
+
+    queue_client = client.get_queue(session_queue)
+    sessions = [str(uuid.uuid4()) for i in range(10)]
+    for session_id in sessions:
+        async with queue_client.get_sender(session=session_id) as sender:
+            for i in range(10):
+                await sender.send(Message("{}".format(i)))
+
+    received = {}
+    errors = []
+
+    async def message_handler(session, message):
+        received.setdefault(message.session_id, []).append(int(str(message)))
+        assert message.session_id == session.session_id
+        if sum(len(messages) for messages in received.values()) == 100:
+            processor.stop()
+
+    async def error_handler(error, session_id):
+        errors.append(error)
+
+    processor = queue_client.get_session_processor(max_sessions=4, session_idle_timeout=2)
+    await processor.run(message_handler, error_handler, timeout=120)
+
+    assert not errors
+    assert sorted(received) == sorted(sessions)
+    assert all(messages == list(range(10)) for messages in received.values())
@@ -9,6 +9,7 @@ import sys
 import os
 import pytest
 import time
+import threading
 from datetime import datetime, timedelta
 
 from azure.servicebus import ServiceBusClient, QueueClient, AutoLockRenew
@@ -1019,3 +1020,126 @@ def test_queue_cancel_scheduled_messages(live_servicebus_config, standard_queue)
                 print(str(m))
                 m.complete()
             raise
+
+
+@pytest.mark.liveTest
+def test_queue_by_servicebus_client_settle_messages_in_batches(live_servicebus_config, standard_queue):
+    client = ServiceBusClient(
+        service_namespace=live_servicebus_config['hostname'],
+        shared_access_key_name=live_servicebus_config['key_name'],
+        shared_access_key_value=live_servicebus_config['access_key'],
+        debug=False)
+
+    queue_client = client.get_queue(standard_queue)
+    with queue_client.get_sender() as sender:
+        for i in range(20):
+            sender.send(Message("Batch settled message no. {}".format(i)))
+
+    with queue_client.get_receiver(idle_timeout=5, prefetch=20) as receiver:
+        received = []
+        while len(received) < 20:
+            batch = receiver.fetch_next(timeout=10)
+            assert batch
+            received.extend(batch)
+
+        results = receiver.defer_messages(received[:10])
+        assert all(result.succeeded for result in results)
+        results = receiver.complete_messages(received)
+        assert [result.succeeded for result in results] == [False] * 10 + [True] * 10
+        assert all(isinstance(result.error, MessageAlreadySettled) for result in results[:10])
+
+        deferred = receiver.receive_deferred_messages([m.sequence_number for m in received[:10]])
+        assert len(deferred) == 10
+        settled = []
+        with receiver.get_settlement_accumulator(max_batch_size=4, on_settled=settled.extend) as accumulator:
+            for message in deferred:
+                accumulator.complete(message)
+        assert len(settled) == 10
+        assert all(result.succeeded for result in settled)
+        assert all(message.settled for message in deferred)
+
+
+@pytest.mark.liveTest
+def test_queue_by_servicebus_client_message_pump(live_servicebus_config, standard_queue):
+    client = ServiceBusClient(
+        service_namespace=live_servicebus_config['hostname'],
+        shared_access_key_name=live_servicebus_config['key_name'],
+        shared_access_key_value=live_servicebus_config['access_key'],
+        debug=False)
+
+    queue_client = client.get_queue(standard_queue)
+    with queue_client.get_sender() as sender:
+        for i in range(20):
+            sender.send(Message("Pumped message no. {}".format(i)))
+
+    handled = []
+    handled_lock = threading.Lock()
+
+    def message_handler(message):
+        time.sleep(0.1)
+        with handled_lock:
+            handled.append(message)
+            if len(handled) == 20:
+                pump.stop()
+
+    receiver = queue_client.get_receiver(prefetch=10)
+    pump = receiver.get_message_pump(max_concurrent_calls=4)
+    pump.run(message_handler, timeout=60)
+
+    assert len(handled) == 20
+    assert all(message.settled for message in handled)
+    assert pump.metrics.handled == 20
+    assert pump.metrics.failed == 0
+    assert pump.metrics.max_queue_depth <= 8
+    assert pump.metrics.average_processing_time >= 0.1
+
+    with queue_client.get_receiver(idle_timeout=5) as receiver:
+        assert not receiver.fetch_next(timeout=5)
+
+
+@pytest.mark.liveTest
+def test_queue_by_servicebus_client_message_pump_handler_settles(live_servicebus_config, standard_queue):
+    client = ServiceBusClient(
+        service_namespace=live_servicebus_config['hostname'],
+        shared_access_key_name=live_servicebus_config['key_name'],
+        shared_access_key_value=live_servicebus_config['access_key'],
+        debug=False)
+
+    queue_client = client.get_queue(standard_queue)
+    with queue_client.get_sender() as sender:
+        for i in range(10):
+            sender.send(Message("Pumped message no. {}".format(i)))
+
+    handled = []
+    handled_lock = threading.Lock()
+
+    def message_handler(message):
+        with handled_lock:
+            handled.append(message)
+            count = len(handled)
+            if count == 10:
+                pump.stop()
+        if count % 2:
+            pump.dead_letter(message, description="Odd message")
+        else:
+            raise ValueError("Even message")
+
+    def error_handler(error, message):
+        pump.complete(message)
+
+    receiver = queue_client.get_receiver()
+    pump = receiver.get_message_pump(max_concurrent_calls=4)
+    pump.run(message_handler, error_handler, timeout=60)
+
+    assert len(handled) == 10
+    assert all(message.settled for message in handled)
+    assert pump.metrics.failed == 5
+    assert pump.metrics.settle_failed == 0
+
+    with queue_client.get_receiver(idle_timeout=5) as receiver:
+        assert not receiver.fetch_next(timeout=5)
+    with queue_client.get_deadletter_receiver(idle_timeout=5, mode=ReceiveSettleMode.PeekLock) as receiver:
+        dead_lettered = receiver.fetch_next(timeout=5)
+        assert len(dead_lettered) == 5
+        for message in dead_lettered:
+            message.complete()
@@ -23,7 +23,7 @@ from ._shared.models import LocationMode
 from ._shared.base_client import StorageAccountHostsMixin, TransportWrapper, parse_connection_str, parse_query
 from ._shared.parser import _to_utc_datetime
 from ._shared.response_handlers import return_response_headers, process_storage_error, \
-    parse_to_internal_user_delegation_key
+    parse_to_internal_user_delegation_key, use_header_deserializer
 from ._generated import AzureBlobStorage
 from ._generated.models import StorageErrorException, StorageServiceProperties, KeyInfo
 from ._container_client import ContainerClient
@@ -120,7 +120,7 @@ class BlobServiceClient(StorageAccountHostsMixin):
         _, sas_token = parse_query(parsed_url.query)
         self._query_str, credential = self._format_query_string(sas_token, credential)
         super(BlobServiceClient, self).__init__(parsed_url, service='blob', credential=credential, **kwargs)
-        self._client = AzureBlobStorage(self.url, pipeline=self._pipeline)
+        self._client = use_header_deserializer(AzureBlobStorage(self.url, pipeline=self._pipeline))
 
     def _format_url(self, hostname):
         """Format the endpoint URL according to the current location
@@ -29,12 +29,14 @@ from ._shared.request_handlers import add_metadata_headers, serialize_iso
 from ._shared.response_handlers import (
     process_storage_error,
     return_response_headers,
-    return_headers_and_deserialized)
+    return_headers_and_deserialized,
+    use_header_deserializer)
 from ._generated import AzureBlobStorage
 from ._generated.models import (
     StorageErrorException,
     SignedIdentifier)
 from ._deserialize import deserialize_container_properties
+from ._list_blobs_helper import list_blob_flat_segment
 from ._serialize import get_modify_conditions
 from ._models import ( # pylint: disable=unused-import
     ContainerProperties,
@@ -141,7 +143,7 @@ class ContainerClient(StorageAccountHostsMixin):
         self.container_name = container_name
         self._query_str, credential = self._format_query_string(sas_token, credential)
         super(ContainerClient, self).__init__(parsed_url, service='blob', credential=credential, **kwargs)
-        self._client = AzureBlobStorage(self.url, pipeline=self._pipeline)
+        self._client = use_header_deserializer(AzureBlobStorage(self.url, pipeline=self._pipeline))
 
     def _format_url(self, hostname):
         container_name = self.container_name
@@ -640,7 +642,8 @@ class ContainerClient(StorageAccountHostsMixin):
         results_per_page = kwargs.pop('results_per_page', None)
         timeout = kwargs.pop('timeout', None)
         command = functools.partial(
-            self._client.container.list_blob_flat_segment,
+            list_blob_flat_segment,
+            self._client.container,
             include=include,
             timeout=timeout,
             **kwargs)
@@ -0,0 +1,269 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+"""Lists blobs without building generated models.
+
+The XML of a page is parsed element by element, and each blob's BlobProperties is built directly from its
+elements, rather than from a generated BlobItem that msrest deserialized first. The result has the same
+attributes and values as BlobProperties._from_generated gives.
+"""
+import datetime
+from base64 import b64decode
+from io import BytesIO
+import xml.etree.ElementTree as ET
+
+from typing import Any, Callable, Dict, Optional, TYPE_CHECKING  # pylint: disable=unused-import
+
+from azure.core.exceptions import map_error
+from msrest.serialization import Deserializer, TZ_UTC
+
+from ._generated.models import (
+    BlobFlatListSegment,
+    CopyStatusType,
+    LeaseDurationType,
+    LeaseStateType,
+    LeaseStatusType,
+    ListBlobsFlatSegmentResponse,
+    StorageErrorException,
+)
+from ._models import BlobProperties, BlobType, ContentSettings, CopyProperties, LeaseProperties
+
+if TYPE_CHECKING:
+    from azure.core.pipeline.transport import HttpRequest  # pylint: disable=unused-import
+    from ._generated.operations import ContainerOperations  # pylint: disable=unused-import
+
+
+_MONTHS = {
+    'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
+    'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12
+}
+_BLOB_TYPES = {blob_type.value: blob_type for blob_type in BlobType}
+
+
+def _enum_values(enum_type):
+    return {member.value.lower(): member.value for member in enum_type}
+
+
+_LEASE_STATUSES = _enum_values(LeaseStatusType)
+_LEASE_STATES = _enum_values(LeaseStateType)
+_LEASE_DURATIONS = _enum_values(LeaseDurationType)
+_COPY_STATUSES = _enum_values(CopyStatusType)
+
+# The attributes of the model objects, in the order their constructors set them
+_BLOB_PROPERTIES = BlobProperties().__dict__
+_CONTENT_SETTINGS = ContentSettings().__dict__
+_LEASE_PROPERTIES = LeaseProperties().__dict__
+_COPY_PROPERTIES = CopyProperties().__dict__
+
+
+def _new(cls, template, **values):
+    instance = cls.__new__(cls)
+    instance.__dict__ = dict(template, **values)
+    return instance
+
+
+def _enum(values, text):
+    if not text:
+        return None
+    return values.get(text.lower(), text)
+
+
+def _bool(text):
+    if not text:
+        return None
+    text = text.lower()
+    if text in ('true', '1'):
+        return True
+    if text in ('false', '0'):
+        return False
+    raise TypeError("Invalid boolean value: {}".format(text))
+
+
+def _int(text):
+    return int(text) if text else None
+
+
+def _rfc_1123(text):
+    """Parse the dates of listings, like 'Wed, 04 Dec 2019 21:04:54 GMT', without the email.utils detour."""
+    if not text:
+        return None
+    try:
+        _, day, month, year, time, zone = text.split(' ')
+        hour, minute, second = time.split(':')
+        if zone == 'GMT':
+            return datetime.datetime(
+                int(year), _MONTHS[month], int(day), int(hour), int(minute), int(second), tzinfo=TZ_UTC)
+    except (KeyError, ValueError):
+        pass
+    return Deserializer.deserialize_rfc(text)
+
+
+def _build_blob(element):
+    # type: (ET.Element) -> BlobProperties
+    name = deleted = snapshot = encrypted_metadata = None
+    properties = {}  # type: Dict[str, Optional[str]]
+    metadata = {}  # type: Optional[Dict[str, Optional[str]]]
+    for child in element:
+        tag = child.tag
+        if tag == 'Properties':
+            # msrest deserializes empty strings as '', and other empty values as None
+            properties = {prop.tag: prop.text or '' for prop in child}
+        elif tag == 'Name':
+            name = child.text or ''
+        elif tag == 'Metadata':
+            metadata = {item.tag: item.text for item in child} or None
+            encrypted_metadata = child.get('Encrypted')
+        elif tag == 'Snapshot':
+            snapshot = child.text or ''
+        elif tag == 'Deleted':
+            deleted = _bool(child.text)
+
+    get = properties.get
+    content_md5 = get('Content-MD5')
+    blob_type = get('BlobType')
+    return _new(
+        BlobProperties, _BLOB_PROPERTIES,
+        name=name,
+        snapshot=snapshot,
+        blob_type=_BLOB_TYPES[blob_type] if blob_type else None,
+        metadata=metadata,
+        encrypted_metadata=encrypted_metadata,
+        last_modified=_rfc_1123(get('Last-Modified')),
+        etag=get('Etag'),
+        size=_int(get('Content-Length')),
+        page_blob_sequence_number=_int(get('x-ms-blob-sequence-number')),
+        server_encrypted=_bool(get('ServerEncrypted')),
+        copy=_new(
+            CopyProperties, _COPY_PROPERTIES,
+            id=get('CopyId') or None,
+            source=get('CopySource') or None,
+            status=_enum(_COPY_STATUSES, get('CopyStatus')),
+            progress=get('CopyProgress') or None,
+            completion_time=_rfc_1123(get('CopyCompletionTime')),
+            status_description=get('CopyStatusDescription') or None,
+            incremental_copy=_bool(get('IncrementalCopy')) or None,
+            destination_snapshot=get('DestinationSnapshot') or None,
+        ),
+        content_settings=_new(
+            ContentSettings, _CONTENT_SETTINGS,
+            content_type=get('Content-Type') or None,
+            content_encoding=get('Content-Encoding') or None,
+            content_language=get('Content-Language') or None,
+            content_md5=(bytearray(b64decode(content_md5)) or None) if content_md5 else None,
+            content_disposition=get('Content-Disposition') or None,
+            cache_control=get('Cache-Control') or None,
+        ),
+        lease=_new(
+            LeaseProperties, _LEASE_PROPERTIES,
+            status=_enum(_LEASE_STATUSES, get('LeaseStatus')),
+            state=_enum(_LEASE_STATES, get('LeaseState')),
+            duration=_enum(_LEASE_DURATIONS, get('LeaseDuration')),
+        ),
+        blob_tier=get('AccessTier'),
+        blob_tier_change_time=_rfc_1123(get('AccessTierChangeTime')),
+        blob_tier_inferred=_bool(get('AccessTierInferred')),
+        deleted=deleted,
+        deleted_time=_rfc_1123(get('DeletedTime')),
+        remaining_retention_days=_int(get('RemainingRetentionDays')),
+        creation_time=_rfc_1123(get('Creation-Time')),
+        archive_status=get('ArchiveStatus'),
+    )
+
+
+def deserialize_blob_list(body):
+    # type: (bytes) -> ListBlobsFlatSegmentResponse
+    """Parse a List Blobs response, with BlobProperties rather than generated BlobItems as blob items.
+
+    Blob elements are released once parsed.
+
+    :param bytes body: The XML body of the response
+    :rtype: ~azure.storage.blob._generated.models.ListBlobsFlatSegmentResponse
+    """
+    blob_items = []
+    root = None
+    for _, element in ET.iterparse(BytesIO(body)):
+        # metadata can be named Blob too, but never has child elements
+        if element.tag == 'Blob' and len(element):
+            blob_items.append(_build_blob(element))
+            element.clear()
+        root = element
+
+    container = root.get('ContainerName')  # type: ignore
+    for blob in blob_items:
+        blob.container = container
+
+    def text(tag):
+        child = root.find(tag)  # type: ignore
+        return None if child is None else child.text or ''
+
+    return ListBlobsFlatSegmentResponse(
+        service_endpoint=root.get('ServiceEndpoint'),  # type: ignore
+        container_name=container,
+        prefix=text('Prefix'),
+        marker=text('Marker'),
+        max_results=_int(text('MaxResults')),
+        segment=BlobFlatListSegment(blob_items=blob_items),
+        next_marker=text('NextMarker'),
+    )
+
+
+def build_list_blobs_request(operations, prefix=None, marker=None, maxresults=None, include=None, timeout=None,
+                             request_id=None):
+    # type: (ContainerOperations, Optional[str], Optional[str], Optional[int], Any, Optional[int], Optional[str]) -> HttpRequest
+    """The request of ContainerOperations.list_blob_flat_segment."""
+    # pylint: disable=protected-access
+    serialize = operations._serialize
+    url = operations._client.format_url(
+        operations.list_blob_flat_segment.metadata['url'],
+        url=serialize.url("self._config.url", operations._config.url, 'str', skip_quote=True))
+
+    query_parameters = {}
+    if prefix is not None:
+        query_parameters['prefix'] = serialize.query("prefix", prefix, 'str')
+    if marker is not None:
+        query_parameters['marker'] = serialize.query("marker", marker, 'str')
+    if maxresults is not None:
+        query_parameters['maxresults'] = serialize.query("maxresults", maxresults, 'int', minimum=1)
+    if include is not None:
+        query_parameters['include'] = serialize.query("include", include, '[ListBlobsIncludeItem]', div=',')
+    if timeout is not None:
+        query_parameters['timeout'] = serialize.query("timeout", timeout, 'int', minimum=0)
+    query_parameters['restype'] = serialize.query("restype", "container", 'str')
+    query_parameters['comp'] = serialize.query("comp", "list", 'str')
+
+    header_parameters = {}
+    header_parameters['Accept'] = 'application/xml'
+    header_parameters['x-ms-version'] = serialize.header("self._config.version", operations._config.version, 'str')
+    if request_id is not None:
+        header_parameters['x-ms-client-request-id'] = serialize.header("request_id", request_id, 'str')
+    return operations._client.get(url, query_parameters, header_parameters)
+
+
+def process_list_blobs_response(operations, pipeline_response, cls=None, error_map=None):
+    # type: (ContainerOperations, Any, Optional[Callable], Optional[Dict]) -> Any
+    """Deserialize a List Blobs response whose body is loaded, like ContainerOperations.list_blob_flat_segment."""
+    response = pipeline_response.http_response
+    if response.status_code not in [200]:
+        map_error(status_code=response.status_code, response=response, error_map=error_map)
+        raise StorageErrorException(response, operations._deserialize)  # pylint: disable=protected-access
+
+    deserialized = deserialize_blob_list(response.body())
+    if cls:
+        return cls(response, deserialized, {})
+    return deserialized
+
+
+def list_blob_flat_segment(operations, prefix=None, marker=None, maxresults=None, include=None, timeout=None,
+                           request_id=None, cls=None, **kwargs):
+    # type: (ContainerOperations, Optional[str], Optional[str], Optional[int], Any, Optional[int], Optional[str], Optional[Callable], **Any) -> Any
+    """List a page of blobs like ContainerOperations.list_blob_flat_segment, with BlobProperties as blob items.
+
+    The response is requested as a stream, so that the pipeline leaves parsing it to deserialize_blob_list.
+    """
+    error_map = kwargs.pop('error_map', None)
+    request = build_list_blobs_request(operations, prefix, marker, maxresults, include, timeout, request_id)
+    pipeline_response = operations._client._pipeline.run(  # pylint: disable=protected-access
+        request, stream=True, **kwargs)
+    return process_list_blobs_response(operations, pipeline_response, cls=cls, error_map=error_map)
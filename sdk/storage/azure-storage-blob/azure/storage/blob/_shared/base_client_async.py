@@ -96,6 +96,9 @@ class AsyncStorageAccountHostsMixin(object):
             DistributedTracingPolicy(**kwargs),
             HttpLoggingPolicy(**kwargs),
         ]
+        if kwargs.get("metrics_sink"):
+            from azure.core.pipeline.policies import MetricsPolicy  # added in azure-core 1.1.0
+            policies.insert(policies.index(config.retry_policy), MetricsPolicy(**kwargs))
         return config, AsyncPipeline(config.transport, policies=policies)
 
     async def _batch_send(
@@ -14,7 +14,7 @@ from azure.core.tracing.decorator_async import distributed_trace_async
 
 from .._shared.base_client_async import AsyncStorageAccountHostsMixin
 from .._shared.policies_async import ExponentialRetry
-from .._shared.response_handlers import return_response_headers, process_storage_error
+from .._shared.response_handlers import return_response_headers, process_storage_error, use_header_deserializer
 from .._deserialize import get_page_ranges_result
 from .._serialize import get_modify_conditions
 from .._generated.aio import AzureBlobStorage
@@ -112,7 +112,7 @@ class BlobClient(AsyncStorageAccountHostsMixin, BlobClientBase):  # pylint: disa
             snapshot=snapshot,
             credential=credential,
             **kwargs)
-        self._client = AzureBlobStorage(url=self.url, pipeline=self._pipeline)
+        self._client = use_header_deserializer(AzureBlobStorage(url=self.url, pipeline=self._pipeline))
         self._loop = kwargs.get('loop', None)
 
     @distributed_trace_async
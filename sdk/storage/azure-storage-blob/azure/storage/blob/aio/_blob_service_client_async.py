@@ -18,7 +18,7 @@ from azure.core.async_paging import AsyncItemPaged
 from .._shared.models import LocationMode
 from .._shared.policies_async import ExponentialRetry
 from .._shared.base_client_async import AsyncStorageAccountHostsMixin, AsyncTransportWrapper
-from .._shared.response_handlers import return_response_headers, process_storage_error
+from .._shared.response_handlers import return_response_headers, process_storage_error, use_header_deserializer
 from .._shared.parser import _to_utc_datetime
 from .._shared.response_handlers import parse_to_internal_user_delegation_key
 from .._generated.aio import AzureBlobStorage
@@ -111,7 +111,7 @@ class BlobServiceClient(AsyncStorageAccountHostsMixin, BlobServiceClientBase):
             account_url,
             credential=credential,
             **kwargs)
-        self._client = AzureBlobStorage(url=self.url, pipeline=self._pipeline)
+        self._client = use_header_deserializer(AzureBlobStorage(url=self.url, pipeline=self._pipeline))
         self._loop = kwargs.get('loop', None)
 
     @distributed_trace_async
@@ -23,7 +23,8 @@ from .._shared.request_handlers import add_metadata_headers, serialize_iso
 from .._shared.response_handlers import (
     process_storage_error,
     return_response_headers,
-    return_headers_and_deserialized)
+    return_headers_and_deserialized,
+    use_header_deserializer)
 from .._generated.aio import AzureBlobStorage
 from .._generated.models import (
     StorageErrorException,
@@ -34,6 +35,7 @@ from .._container_client import ContainerClient as ContainerClientBase, _get_blo
 from .._lease import get_access_conditions
 from .._models import ContainerProperties, BlobProperties, BlobType  # pylint: disable=unused-import
 from ._models import BlobPropertiesPaged, BlobPrefix
+from ._list_blobs_helper import list_blob_flat_segment
 from ._lease_async import BlobLeaseClient
 from ._blob_client_async import BlobClient
 
@@ -112,7 +114,7 @@ class ContainerClient(AsyncStorageAccountHostsMixin, ContainerClientBase):
             container_name=container_name,
             credential=credential,
             **kwargs)
-        self._client = AzureBlobStorage(url=self.url, pipeline=self._pipeline)
+        self._client = use_header_deserializer(AzureBlobStorage(url=self.url, pipeline=self._pipeline))
         self._loop = kwargs.get('loop', None)
 
     @distributed_trace_async
@@ -523,7 +525,8 @@ class ContainerClient(AsyncStorageAccountHostsMixin, ContainerClientBase):
         results_per_page = kwargs.pop('results_per_page', None)
         timeout = kwargs.pop('timeout', None)
         command = functools.partial(
-            self._client.container.list_blob_flat_segment,
+            list_blob_flat_segment,
+            self._client.container,
             include=include,
             timeout=timeout,
             **kwargs)
@@ -0,0 +1,27 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+from typing import Any, Callable, Optional, TYPE_CHECKING  # pylint: disable=unused-import
+
+from .._list_blobs_helper import build_list_blobs_request, process_list_blobs_response
+
+if TYPE_CHECKING:
+    from .._generated.aio.operations_async import ContainerOperations  # pylint: disable=unused-import
+
+
+async def list_blob_flat_segment(operations, prefix=None, marker=None, maxresults=None, include=None, timeout=None,
+                                 request_id=None, cls=None, **kwargs):
+    # type: (ContainerOperations, Optional[str], Optional[str], Optional[int], Any, Optional[int], Optional[str], Optional[Callable], **Any) -> Any
+    """List a page of blobs like ContainerOperations.list_blob_flat_segment, with BlobProperties as blob items.
+
+    The response is requested as a stream, so that the pipeline leaves parsing it to deserialize_blob_list.
+    """
+    error_map = kwargs.pop('error_map', None)
+    request = build_list_blobs_request(operations, prefix, marker, maxresults, include, timeout, request_id)
+    pipeline_response = await operations._client._pipeline.run(  # pylint: disable=protected-access
+        request, stream=True, **kwargs)
+    await pipeline_response.http_response.load_body()
+    return process_list_blobs_response(operations, pipeline_response, cls=cls, error_map=error_map)
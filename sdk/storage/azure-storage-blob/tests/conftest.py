@@ -23,12 +23,19 @@
 # IN THE SOFTWARE.
 #
 # --------------------------------------------------------------------------
+import sys
+
 from devtools_testutils import ResourceGroupPreparer, StorageAccountPreparer, AzureMgmtTestCase
 from azure_devtools.scenario_tests import create_random_name
 from testcase import StorageTestCase
 
 import pytest
 
+# Ignore collection of performance tests for Python 2
+collect_ignore = []
+if sys.version_info < (3, 5):
+    collect_ignore.append("perfstress_tests")
+
 
 @pytest.fixture(scope="session")
 def storage_account():
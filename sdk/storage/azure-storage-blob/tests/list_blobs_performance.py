@@ -0,0 +1,76 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+"""Compares the CPU time of deserializing List Blobs pages with generated models and with deserialize_blob_list.
+
+Runs offline, on a generated page of --items blobs with metadata.
+
+Usage:
+    python tests/list_blobs_performance.py [--items 5000] [--pages 5]
+"""
+import argparse
+import time
+
+from msrest import Deserializer
+from azure.core.pipeline.policies import ContentDecodePolicy
+
+from azure.storage.blob import BlobProperties
+from azure.storage.blob._generated import models
+from azure.storage.blob._list_blobs_helper import deserialize_blob_list
+
+BLOB = u'''<Blob><Name>inventory/2019/12/{index:08d}.json</Name><Properties>\
+<Creation-Time>Wed, 04 Dec 2019 21:04:54 GMT</Creation-Time><Last-Modified>Thu, 05 Dec 2019 01:02:03 GMT</Last-Modified>\
+<Etag>0x8D778FDF7F9E{index:04X}</Etag><Content-Length>{index}</Content-Length>\
+<Content-Type>application/json</Content-Type><Content-Encoding /><Content-Language />\
+<Content-MD5>CY9rzUYh03PK3k6DJie09g==</Content-MD5><Cache-Control /><Content-Disposition />\
+<BlobType>BlockBlob</BlobType><AccessTier>Hot</AccessTier><AccessTierInferred>true</AccessTierInferred>\
+<LeaseStatus>unlocked</LeaseStatus><LeaseState>available</LeaseState><ServerEncrypted>true</ServerEncrypted>\
+</Properties><Metadata><source>collector-{index}</source><team>inventory</team></Metadata></Blob>'''
+
+
+def _page(items):
+    return (
+        u'<?xml version="1.0" encoding="utf-8"?><EnumerationResults '
+        u'ServiceEndpoint="https://account.blob.core.windows.net/" ContainerName="container">'
+        u'<MaxResults>{}</MaxResults><Blobs>{}</Blobs><NextMarker>next</NextMarker></EnumerationResults>'
+    ).format(items, u''.join(BLOB.format(index=index) for index in range(items))).encode('utf-8')
+
+
+def _with_generated_models(body):
+    deserialize = Deserializer({k: v for k, v in models.__dict__.items() if isinstance(v, type)})
+    response = deserialize(
+        'ListBlobsFlatSegmentResponse', ContentDecodePolicy.deserialize_from_text(body, 'application/xml'))
+    blobs = []
+    for item in response.segment.blob_items:
+        blob = BlobProperties._from_generated(item)  # pylint: disable=protected-access
+        blob.container = response.container_name
+        blobs.append(blob)
+    return blobs
+
+
+def _with_blob_list_parser(body):
+    return deserialize_blob_list(body).segment.blob_items
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--items', type=int, default=5000)
+    parser.add_argument('--pages', type=int, default=5)
+    args = parser.parse_args()
+
+    body = _page(args.items)
+    print('{} blobs per page, {:.1f} MiB'.format(args.items, len(body) / 1048576.0))
+    for name, deserialize in (('generated models', _with_generated_models), ('blob list parser', _with_blob_list_parser)):
+        start = time.process_time() if hasattr(time, 'process_time') else time.clock()
+        for _ in range(args.pages):
+            blobs = deserialize(body)
+        elapsed = (time.process_time() if hasattr(time, 'process_time') else time.clock()) - start
+        assert len(blobs) == args.items
+        print('{:<20} {:>8.1f} ms/page {:>8.1f} us/blob'.format(
+            name, elapsed / args.pages * 1000, elapsed / args.pages / args.items * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+"""Downloads a blob from a transport answering in memory, to measure the client without the service.
+
+Usage, from the root of this package, with azure-devtools installed:
+    perfstress DownloadTest --size 1048576 --parallel 4 --mode asyncio
+"""
+import os
+import re
+
+from azure_devtools.perfstress_tests import PerfStressTest
+from azure_devtools.perfstress_tests.mock_transport import AsyncMockTransport, MockTransport
+
+from azure.storage.blob import BlobClient
+from azure.storage.blob.aio import BlobClient as AsyncBlobClient
+
+ACCOUNT_URL = "https://account.blob.core.windows.net"
+CREDENTIAL = {"account_name": "account", "account_key": "cGVyZnN0cmVzcw=="}
+
+
+class _BlobResponder(object):  # pylint: disable=too-few-public-methods
+    def __init__(self, size):
+        self.content = os.urandom(size)
+
+    def __call__(self, request):
+        size = len(self.content)
+        start, end = 0, size - 1
+        requested = re.match(r"bytes=(\d+)-(\d*)", request.headers.get("x-ms-range", ""))
+        if requested:
+            start = int(requested.group(1))
+            end = min(end, int(requested.group(2) or end))
+        headers = {
+            "Content-Length": str(end - start + 1),
+            "Content-Range": "bytes {}-{}/{}".format(start, end, size),
+            "Content-Type": "application/octet-stream",
+            "ETag": '"0x8D7D1C1A7C0A3F4"',
+            "Last-Modified": "Mon, 30 Mar 2020 22:00:00 GMT",
+            "x-ms-blob-type": "BlockBlob",
+            "x-ms-request-id": "778fdc83-801e-0000-62ff-0334671e284f",
+        }
+        return 206, headers, self.content[start:end + 1]
+
+
+class DownloadTest(PerfStressTest):
+    def __init__(self, arguments):
+        super(DownloadTest, self).__init__(arguments)
+        responder = _BlobResponder(arguments.size)
+        self.client = BlobClient(
+            ACCOUNT_URL, "container", "blob", credential=CREDENTIAL, transport=MockTransport(responder),
+            max_single_get_size=arguments.max_single_get_size, max_chunk_get_size=arguments.max_chunk_get_size)
+        self.async_client = AsyncBlobClient(
+            ACCOUNT_URL, "container", "blob", credential=CREDENTIAL, transport=AsyncMockTransport(responder),
+            max_single_get_size=arguments.max_single_get_size, max_chunk_get_size=arguments.max_chunk_get_size)
+
+    def run_sync(self):
+        self.client.download_blob(max_concurrency=self.args.max_concurrency).readall()
+
+    async def run_async(self):
+        stream = await self.async_client.download_blob(max_concurrency=self.args.max_concurrency)
+        await stream.readall()
+
+    @staticmethod
+    def add_arguments(parser):
+        parser.add_argument("--size", type=int, default=10240, help="Bytes in the blob. Default 10240.")
+        parser.add_argument("--max-concurrency", type=int, default=1,
+                            help="Chunks downloaded at once, for blobs larger than --max-single-get-size.")
+        parser.add_argument("--max-single-get-size", type=int, default=32 * 1024 * 1024,
+                            help="Bytes downloaded by the first request.")
+        parser.add_argument("--max-chunk-get-size", type=int, default=4 * 1024 * 1024,
+                            help="Bytes downloaded by each of the following requests.")
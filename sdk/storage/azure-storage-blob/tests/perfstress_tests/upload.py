@@ -0,0 +1,59 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+"""Uploads a blob to a transport answering in memory, to measure the client without the service.
+
+Usage, from the root of this package, with azure-devtools installed:
+    perfstress UploadTest --size 1048576 --parallel 4 --mode asyncio
+"""
+import os
+
+from azure_devtools.perfstress_tests import PerfStressTest
+from azure_devtools.perfstress_tests.mock_transport import AsyncMockTransport, MockTransport
+
+from azure.storage.blob import BlobClient
+from azure.storage.blob.aio import BlobClient as AsyncBlobClient
+
+ACCOUNT_URL = "https://account.blob.core.windows.net"
+CREDENTIAL = {"account_name": "account", "account_key": "cGVyZnN0cmVzcw=="}
+
+
+def _respond(request):  # pylint: disable=unused-argument
+    headers = {
+        "Content-Length": "0",
+        "ETag": '"0x8D7D1C1A7C0A3F4"',
+        "Last-Modified": "Mon, 30 Mar 2020 22:00:00 GMT",
+        "x-ms-request-id": "778fdc83-801e-0000-62ff-0334671e284f",
+        "x-ms-request-server-encrypted": "true",
+    }
+    return 201, headers, b""
+
+
+class UploadTest(PerfStressTest):
+    def __init__(self, arguments):
+        super(UploadTest, self).__init__(arguments)
+        self.data = os.urandom(arguments.size)
+        self.client = BlobClient(
+            ACCOUNT_URL, "container", "blob", credential=CREDENTIAL, transport=MockTransport(_respond),
+            max_single_put_size=arguments.max_single_put_size, max_block_size=arguments.max_block_size)
+        self.async_client = AsyncBlobClient(
+            ACCOUNT_URL, "container", "blob", credential=CREDENTIAL, transport=AsyncMockTransport(_respond),
+            max_single_put_size=arguments.max_single_put_size, max_block_size=arguments.max_block_size)
+
+    def run_sync(self):
+        self.client.upload_blob(self.data, overwrite=True, max_concurrency=self.args.max_concurrency)
+
+    async def run_async(self):
+        await self.async_client.upload_blob(self.data, overwrite=True, max_concurrency=self.args.max_concurrency)
+
+    @staticmethod
+    def add_arguments(parser):
+        parser.add_argument("--size", type=int, default=10240, help="Bytes in the blob. Default 10240.")
+        parser.add_argument("--max-concurrency", type=int, default=1,
+                            help="Blocks uploaded at once, for blobs larger than --max-single-put-size.")
+        parser.add_argument("--max-single-put-size", type=int, default=64 * 1024 * 1024,
+                            help="The largest blob uploaded in one request.")
+        parser.add_argument("--max-block-size", type=int, default=4 * 1024 * 1024,
+                            help="Bytes in each block of larger blobs.")
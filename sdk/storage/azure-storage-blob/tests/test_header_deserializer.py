@@ -0,0 +1,71 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import pytest
+from msrest import Deserializer
+from msrest.exceptions import DeserializationError
+
+from azure.storage.blob import BlobServiceClient
+from azure.storage.blob._generated import models
+from azure.storage.blob._shared import response_handlers
+from azure.storage.blob._shared.response_handlers import HeaderDeserializer
+
+CLASSES = {k: v for k, v in models.__dict__.items() if isinstance(v, type)}
+
+HEADERS = [
+    ('str', 'a-request-id'),
+    ('str', ''),
+    ('str', None),
+    ('bool', 'true'),
+    ('bool', 'False'),
+    ('bool', '1'),
+    ('int', '12'),
+    ('long', '1099511627776'),
+    ('bytearray', 'CY9rzUYh03PK3k6DJie09g=='),
+    ('rfc-1123', 'Wed, 04 Dec 2019 21:04:54 GMT'),
+    ('{str}', None),
+    (models.BlobType, 'PageBlob'),
+    (models.LeaseStatusType, 'Unlocked'),
+    (models.CopyStatusType, 'not-a-status'),
+]
+
+
+@pytest.mark.parametrize("target,value", HEADERS)
+def test_same_as_msrest(target, value):
+    expected = Deserializer(CLASSES)(target, value)
+    deserialized = HeaderDeserializer(CLASSES)(target, value)
+    assert deserialized == expected
+    assert type(deserialized) is type(expected)
+
+
+@pytest.mark.parametrize("target,value", [
+    ('bool', 'maybe'),
+    ('int', '1.5'),
+    ('bytearray', 'abc'),
+    ('rfc-1123', '2019-12-04T21:04:54Z'),
+])
+def test_errors_are_msrest_errors(target, value):
+    with pytest.raises(DeserializationError):
+        HeaderDeserializer(CLASSES)(target, value)
+
+
+def test_dates_are_cached():
+    date = 'Thu, 05 Dec 2019 01:02:03 GMT'
+    deserializer = HeaderDeserializer(CLASSES)
+    assert deserializer('rfc-1123', date) is deserializer('rfc-1123', date)
+    assert date in response_handlers._rfc_1123_cache
+
+    for second in range(response_handlers._RFC_1123_CACHE_SIZE):
+        deserializer('rfc-1123', 'Fri, 06 Dec 2019 00:{:02}:{:02} GMT'.format(second // 60, second % 60))
+    assert date not in response_handlers._rfc_1123_cache
+    assert len(response_handlers._rfc_1123_cache) == response_handlers._RFC_1123_CACHE_SIZE
+
+
+def test_clients_use_header_deserializer():
+    client = BlobServiceClient('https://account.blob.core.windows.net', credential='sas')
+    generated = client._client
+    assert isinstance(generated._deserialize, HeaderDeserializer)
+    for operations in (generated.service, generated.container, generated.blob, generated.block_blob):
+        assert operations._deserialize is generated._deserialize
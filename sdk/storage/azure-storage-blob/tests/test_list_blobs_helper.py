@@ -0,0 +1,158 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+from datetime import datetime
+
+import pytest
+from msrest import Deserializer
+from azure.core.pipeline.policies import ContentDecodePolicy
+
+from azure.storage.blob import BlobProperties, BlobType
+from azure.storage.blob._generated import models
+from azure.storage.blob._list_blobs_helper import deserialize_blob_list
+from azure.storage.blob._models import BlobPropertiesPaged
+
+LIST_BLOBS_PAGE = b'''\xef\xbb\xbf<?xml version="1.0" encoding="utf-8"?>
+<EnumerationResults ServiceEndpoint="https://account.blob.core.windows.net/" ContainerName="container">
+  <Prefix>blob</Prefix>
+  <Marker />
+  <MaxResults>3</MaxResults>
+  <Blobs>
+    <Blob>
+      <Name>blob1</Name>
+      <Properties>
+        <Creation-Time>Wed, 04 Dec 2019 21:04:54 GMT</Creation-Time>
+        <Last-Modified>Thu, 05 Dec 2019 01:02:03 GMT</Last-Modified>
+        <Etag>0x8D778FDF7F9E3A1</Etag>
+        <Content-Length>1024</Content-Length>
+        <Content-Type>application/octet-stream</Content-Type>
+        <Content-Encoding />
+        <Content-Language>en-US</Content-Language>
+        <Content-MD5>CY9rzUYh03PK3k6DJie09g==</Content-MD5>
+        <Cache-Control />
+        <Content-Disposition />
+        <BlobType>BlockBlob</BlobType>
+        <AccessTier>Hot</AccessTier>
+        <AccessTierInferred>true</AccessTierInferred>
+        <LeaseStatus>unlocked</LeaseStatus>
+        <LeaseState>available</LeaseState>
+        <ServerEncrypted>true</ServerEncrypted>
+      </Properties>
+      <Metadata Encrypted="true">
+        <hello>world</hello>
+        <number>42</number>
+        <Blob>named like a blob</Blob>
+        <Prefix />
+      </Metadata>
+    </Blob>
+    <Blob>
+      <Name>blob2</Name>
+      <Snapshot>2019-12-05T01:02:03.1234567Z</Snapshot>
+      <Properties>
+        <Creation-Time>Wed, 04 Dec 2019 21:04:54 GMT</Creation-Time>
+        <Last-Modified>Wed, 04 Dec 2019 21:04:54 GMT</Last-Modified>
+        <Etag>0x8D778FDF7F9E3A2</Etag>
+        <Content-Length>512</Content-Length>
+        <Content-Type />
+        <x-ms-blob-sequence-number>7</x-ms-blob-sequence-number>
+        <BlobType>PageBlob</BlobType>
+        <LeaseStatus>locked</LeaseStatus>
+        <LeaseState>leased</LeaseState>
+        <LeaseDuration>infinite</LeaseDuration>
+        <CopyId>2a1e6bd1-1f52-4a73-b5b4-6d6a4b7a2e0f</CopyId>
+        <CopyStatus>success</CopyStatus>
+        <CopySource>https://other.blob.core.windows.net/container/source</CopySource>
+        <CopyProgress>512/512</CopyProgress>
+        <CopyCompletionTime>Wed, 04 Dec 2019 21:05:00 GMT</CopyCompletionTime>
+        <IncrementalCopy>true</IncrementalCopy>
+        <DestinationSnapshot>2019-12-04T21:05:00.0000000Z</DestinationSnapshot>
+        <ServerEncrypted>false</ServerEncrypted>
+      </Properties>
+      <Metadata />
+    </Blob>
+    <Blob>
+      <Name>blob3</Name>
+      <Deleted>true</Deleted>
+      <Properties>
+        <Creation-Time>Wed, 04 Dec 2019 21:04:54 GMT</Creation-Time>
+        <Last-Modified>Wed, 04 Dec 2019 21:04:54 GMT</Last-Modified>
+        <Etag>0x8D778FDF7F9E3A3</Etag>
+        <Content-Length>0</Content-Length>
+        <BlobType>AppendBlob</BlobType>
+        <AccessTier>Archive</AccessTier>
+        <AccessTierChangeTime>Wed, 04 Dec 2019 22:00:00 GMT</AccessTierChangeTime>
+        <ArchiveStatus>rehydrate-pending-to-hot</ArchiveStatus>
+        <DeletedTime>Thu, 05 Dec 2019 09:00:00 GMT</DeletedTime>
+        <RemainingRetentionDays>6</RemainingRetentionDays>
+        <LeaseStatus>Unlocked</LeaseStatus>
+        <LeaseState>expired</LeaseState>
+        <CopyStatus>failed</CopyStatus>
+        <CopyStatusDescription>500 InternalError</CopyStatusDescription>
+      </Properties>
+    </Blob>
+  </Blobs>
+  <NextMarker>2!80!MDAwMDE0IWJsb2IzITAwMDAyOCE5OTk5LTEyLTMxVDIzOjU5OjU5Ljk5OTk5OTlaIQ--</NextMarker>
+</EnumerationResults>'''
+
+
+def _deserialize_with_models(body):
+    deserialize = Deserializer({k: v for k, v in models.__dict__.items() if isinstance(v, type)})
+    return deserialize(
+        'ListBlobsFlatSegmentResponse', ContentDecodePolicy.deserialize_from_text(body, 'application/xml'))
+
+
+def test_same_page_as_generated_models():
+    expected = _deserialize_with_models(LIST_BLOBS_PAGE)
+    page = deserialize_blob_list(LIST_BLOBS_PAGE)
+
+    for attribute in ('service_endpoint', 'container_name', 'prefix', 'marker', 'max_results', 'next_marker'):
+        assert getattr(page, attribute) == getattr(expected, attribute)
+    assert len(page.segment.blob_items) == 3
+    for blob, item in zip(page.segment.blob_items, expected.segment.blob_items):
+        expected_blob = BlobProperties._from_generated(item)  # pylint: disable=protected-access
+        expected_blob.container = expected.container_name
+        assert blob == expected_blob
+        assert blob.keys() == expected_blob.keys()
+
+
+def test_blob_properties():
+    blob1, blob2, blob3 = deserialize_blob_list(LIST_BLOBS_PAGE).segment.blob_items
+
+    assert blob1.name == 'blob1'
+    assert blob1.container == 'container'
+    assert blob1.blob_type == BlobType.BlockBlob
+    assert blob1.metadata == {'hello': 'world', 'number': '42', 'Blob': 'named like a blob', 'Prefix': None}
+    assert blob1.encrypted_metadata == 'true'
+    assert blob1.last_modified == datetime(2019, 12, 5, 1, 2, 3, tzinfo=blob1.last_modified.tzinfo)
+    assert blob1.last_modified.utcoffset().total_seconds() == 0
+    assert blob1.content_settings.content_md5 == bytearray(b'\t\x8fk\xcdF!\xd3s\xca\xdeN\x83&\'\xb4\xf6')
+    assert blob1.content_settings['content_language'] == 'en-US'
+    assert blob1.lease.status == 'unlocked'
+    assert blob1.copy.id is None
+
+    assert blob2.snapshot == '2019-12-05T01:02:03.1234567Z'
+    assert blob2.page_blob_sequence_number == 7
+    assert blob2.copy.status == 'success'
+    assert blob2.copy.incremental_copy is True
+    assert blob2.lease.duration == 'infinite'
+
+    assert blob3.deleted is True
+    assert blob3.remaining_retention_days == 6
+    assert blob3.lease.status == 'unlocked'
+    assert blob3.copy.status_description == '500 InternalError'
+
+
+def test_paged_passes_blob_properties_through():
+    page = deserialize_blob_list(LIST_BLOBS_PAGE)
+    pager = BlobPropertiesPaged(lambda **kwargs: ('primary', page))
+    blobs = list(next(pager))
+    assert [blob.name for blob in blobs] == ['blob1', 'blob2', 'blob3']
+    assert pager.container == 'container'
+    assert pager.continuation_token == page.next_marker
+
+
+def test_invalid_boolean():
+    with pytest.raises(TypeError):
+        deserialize_blob_list(LIST_BLOBS_PAGE.replace(b'<Deleted>true</Deleted>', b'<Deleted>maybe</Deleted>'))
@@ -28,7 +28,8 @@ from ._models import (
     FileSasPermissions,
     ShareSasPermissions,
     ContentSettings,
-    NTFSAttributes)
+    NTFSAttributes,
+    DirectoryTransferResult)
 from ._generated.models import (
     HandleItem
 )
@@ -59,6 +60,7 @@ __all__ = [
     'ContentSettings',
     'Handle',
     'NTFSAttributes',
+    'DirectoryTransferResult',
     'HandleItem',
     'generate_account_sas',
     'generate_share_sas',
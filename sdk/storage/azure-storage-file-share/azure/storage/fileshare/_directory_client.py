@@ -26,16 +26,17 @@ from ._generated.version import VERSION
 from ._generated.models import StorageErrorException
 from ._shared.base_client import StorageAccountHostsMixin, TransportWrapper, parse_connection_str, parse_query
 from ._shared.request_handlers import add_metadata_headers
-from ._shared.response_handlers import return_response_headers, process_storage_error
+from ._shared.response_handlers import return_response_headers, process_storage_error, use_header_deserializer
 from ._shared.parser import _str
 from ._parser import _get_file_permission, _datetime_to_str
 from ._deserialize import deserialize_directory_properties
 from ._file_client import ShareFileClient
+from ._transfer import DirectoryUpload, DirectoryDownload
 from ._models import DirectoryPropertiesPaged, HandlesPaged, NTFSAttributes  # pylint: disable=unused-import
 
 if TYPE_CHECKING:
     from datetime import datetime
-    from ._models import ShareProperties, DirectoryProperties, ContentSettings
+    from ._models import ShareProperties, DirectoryProperties, ContentSettings, DirectoryTransferResult
     from ._generated.models import HandleItem
 
 
@@ -105,7 +106,7 @@ class ShareDirectoryClient(StorageAccountHostsMixin):
         self._query_str, credential = self._format_query_string(
             sas_token, credential, share_snapshot=self.snapshot)
         super(ShareDirectoryClient, self).__init__(parsed_url, service='file-share', credential=credential, **kwargs)
-        self._client = AzureFileStorage(version=VERSION, url=self.url, pipeline=self._pipeline)
+        self._client = use_header_deserializer(AzureFileStorage(version=VERSION, url=self.url, pipeline=self._pipeline))
 
     @classmethod
     def from_directory_url(cls, directory_url,  # type: str
@@ -239,7 +240,9 @@ class ShareDirectoryClient(StorageAccountHostsMixin):
                 :dedent: 12
                 :caption: Gets the subdirectory client.
         """
-        directory_path = self.directory_path.rstrip('/') + "/" + directory_name
+        directory_path = directory_name
+        if self.directory_path:
+            directory_path = self.directory_path.rstrip('/') + "/" + directory_name
 
         _pipeline = Pipeline(
             transport=TransportWrapper(self._pipeline._transport), # pylint: disable = protected-access
@@ -685,3 +688,86 @@ class ShareDirectoryClient(StorageAccountHostsMixin):
         """
         file_client = self.get_file_client(file_name)
         file_client.delete_file(**kwargs)
+
+    @distributed_trace
+    def upload_directory(self, source, **kwargs):
+        # type: (str, Any) -> DirectoryTransferResult
+        """Uploads a local directory tree into this directory.
+
+        Directories are created one level at a time and files are uploaded by a
+        bounded pool of workers. Each uploaded file has its last write time set to
+        the local modification time, so that later uploads can skip unchanged files.
+
+        :param str source:
+            The path of the local directory to upload.
+        :keyword int max_concurrency:
+            The number of directories or files transferred at the same time. Default is 16.
+        :keyword bool skip_unchanged:
+            Whether to skip files that already exist in the share with the same size and
+            last write time. When enabled, the remote tree is listed before uploading. Default is False.
+        :keyword callable progress_hook:
+            Called with the running :class:`~azure.storage.fileshare.DirectoryTransferResult`
+            after each directory or file.
+        :keyword int timeout:
+            The timeout parameter is expressed in seconds.
+        :returns: A summary of the transfer. Paths that failed to upload are listed in its `failures`.
+        :rtype: ~azure.storage.fileshare.DirectoryTransferResult
+
+        .. admonition:: Example:
+
+            .. literalinclude:: ../samples/file_samples_directory.py
+                :start-after: [START upload_directory]
+                :end-before: [END upload_directory]
+                :language: python
+                :dedent: 12
+                :caption: Upload a local directory tree.
+        """
+        return DirectoryUpload(
+            self,
+            source,
+            max_concurrency=kwargs.pop('max_concurrency', 16),
+            skip_unchanged=kwargs.pop('skip_unchanged', False),
+            progress_hook=kwargs.pop('progress_hook', None),
+            **kwargs).run()
+
+    @distributed_trace
+    def download_directory(self, destination, **kwargs):
+        # type: (str, Any) -> DirectoryTransferResult
+        """Downloads this directory and all of its subdirectories to a local path.
+
+        Subdirectories are listed concurrently and files are downloaded by a bounded
+        pool of workers as soon as their directory has been listed. Each downloaded
+        file has its modification time set to the last write time in the share.
+
+        :param str destination:
+            The path of the local directory to download into. It is created if it does not exist.
+        :keyword int max_concurrency:
+            The number of directories listed, and the number of files downloaded, at the same time.
+            Default is 16.
+        :keyword bool skip_unchanged:
+            Whether to skip files that already exist locally with the same size and
+            modification time. Default is False.
+        :keyword callable progress_hook:
+            Called with the running :class:`~azure.storage.fileshare.DirectoryTransferResult`
+            after each directory or file.
+        :keyword int timeout:
+            The timeout parameter is expressed in seconds.
+        :returns: A summary of the transfer. Paths that failed to download are listed in its `failures`.
+        :rtype: ~azure.storage.fileshare.DirectoryTransferResult
+
+        .. admonition:: Example:
+
+            .. literalinclude:: ../samples/file_samples_directory.py
+                :start-after: [START download_directory]
+                :end-before: [END download_directory]
+                :language: python
+                :dedent: 12
+                :caption: Download a directory tree.
+        """
+        return DirectoryDownload(
+            self,
+            destination,
+            max_concurrency=kwargs.pop('max_concurrency', 16),
+            skip_unchanged=kwargs.pop('skip_unchanged', False),
+            progress_hook=kwargs.pop('progress_hook', None),
+            **kwargs).run()
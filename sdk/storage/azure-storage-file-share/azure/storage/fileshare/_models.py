@@ -860,6 +860,40 @@ class NTFSAttributes(object):
         return parsed
 
 
+class DirectoryTransferResult(DictMixin):
+    """The outcome of a recursive directory upload or download.
+
+    :ivar int files_transferred: The number of files uploaded or downloaded.
+    :ivar int files_skipped: The number of files skipped because they were unchanged.
+    :ivar int directories_created: The number of directories created at the destination.
+    :ivar int bytes_transferred: The total size of the transferred files, in bytes.
+    :ivar float elapsed: The time taken by the transfer, in seconds.
+    :ivar dict(str, Exception) failures:
+        The relative paths of the files or directories that could not be transferred,
+        mapped to the error that was raised.
+    """
+
+    def __init__(self, **kwargs):
+        self.files_transferred = kwargs.get('files_transferred', 0)
+        self.files_skipped = kwargs.get('files_skipped', 0)
+        self.directories_created = kwargs.get('directories_created', 0)
+        self.bytes_transferred = kwargs.get('bytes_transferred', 0)
+        self.elapsed = kwargs.get('elapsed', 0.0)
+        self.failures = kwargs.get('failures') or {}
+
+    @property
+    def throughput(self):
+        # type: () -> float
+        """The number of bytes transferred per second."""
+        return self.bytes_transferred / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def files_per_second(self):
+        # type: () -> float
+        """The number of files transferred or skipped per second."""
+        return (self.files_transferred + self.files_skipped) / self.elapsed if self.elapsed else 0.0
+
+
 def service_properties_deserialize(generated):
     """Deserialize a ServiceProperties objects into a dict.
     """
@@ -21,7 +21,8 @@ from ._shared.request_handlers import add_metadata_headers, serialize_iso
 from ._shared.response_handlers import (
     return_response_headers,
     process_storage_error,
-    return_headers_and_deserialized)
+    return_headers_and_deserialized,
+    use_header_deserializer)
 from ._generated import AzureFileStorage
 from ._generated.version import VERSION
 from ._generated.models import (
@@ -98,7 +99,7 @@ class ShareClient(StorageAccountHostsMixin):
         self._query_str, credential = self._format_query_string(
             sas_token, credential, share_snapshot=self.snapshot)
         super(ShareClient, self).__init__(parsed_url, service='file-share', credential=credential, **kwargs)
-        self._client = AzureFileStorage(version=VERSION, url=self.url, pipeline=self._pipeline)
+        self._client = use_header_deserializer(AzureFileStorage(version=VERSION, url=self.url, pipeline=self._pipeline))
 
     @classmethod
     def from_share_url(cls, share_url,  # type: str
@@ -0,0 +1,269 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+# pylint: disable=no-self-use
+
+import errno
+import os
+import threading
+import time
+from concurrent import futures
+from datetime import datetime, timedelta
+from itertools import islice
+
+from azure.core.exceptions import AzureError, ResourceExistsError, ResourceNotFoundError
+from azure.core.tracing.common import with_current_context
+
+from ._models import DirectoryTransferResult
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _to_microseconds(datetime_obj):
+    delta = datetime_obj - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+
+
+def _last_write_time_str(microseconds):
+    # The service keeps 100ns precision; the trailing zero pads microseconds to 7 digits.
+    return (_EPOCH + timedelta(microseconds=microseconds)).strftime('%Y-%m-%dT%H:%M:%S.%f') + '0Z'
+
+
+def _local_mtime(stat_result):
+    try:
+        return stat_result.st_mtime_ns // 1000
+    except AttributeError:
+        return int(round(stat_result.st_mtime * 1000000))
+
+
+def _set_local_mtime(path, microseconds):
+    try:
+        os.utime(path, ns=(microseconds * 1000, microseconds * 1000))
+    except TypeError:
+        os.utime(path, (microseconds / 1000000.0, microseconds / 1000000.0))
+
+
+def _makedirs(path):
+    try:
+        os.makedirs(path)
+        return True
+    except OSError as error:
+        if error.errno != errno.EEXIST or not os.path.isdir(path):
+            raise
+        return False
+
+
+def _join(parent, name):
+    return parent + "/" + name if parent else name
+
+
+def _walk_local(source):
+    """Yields the relative paths of the directories under source, and the relative path,
+    size and last write time of every file, parents first.
+    """
+    for root, _, files in os.walk(source):
+        relative = os.path.relpath(root, source).replace(os.sep, "/")
+        relative = "" if relative == "." else relative
+        entries = []
+        for name in files:
+            stat_result = os.stat(os.path.join(root, name))
+            entries.append((_join(relative, name), stat_result.st_size, _local_mtime(stat_result)))
+        yield relative, entries
+
+
+class _DirectoryTransfer(object):
+    """Shared state of a recursive transfer: the worker pool and the running result."""
+
+    def __init__(self, directory_client, max_concurrency, skip_unchanged, progress_hook, **kwargs):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency should be at least 1")
+        self.client = directory_client
+        self.max_concurrency = max_concurrency
+        self.skip_unchanged = skip_unchanged
+        self.progress_hook = progress_hook
+        self.request_kwargs = kwargs
+        self.result = DirectoryTransferResult()
+        self._lock = threading.Lock()
+        self._start = time.time()
+
+    def directory_client(self, relative_path):
+        if not relative_path:
+            return self.client
+        return self.client.get_subdirectory_client(relative_path)
+
+    def file_client(self, relative_path):
+        return self.client.get_file_client(relative_path)
+
+    def record(self, transferred=0, skipped=0, created=0, size=0, failed_path=None, error=None):
+        with self._lock:
+            self.result.files_transferred += transferred
+            self.result.files_skipped += skipped
+            self.result.directories_created += created
+            self.result.bytes_transferred += size
+            if failed_path is not None:
+                self.result.failures[failed_path] = error
+            self.result.elapsed = time.time() - self._start
+            if self.progress_hook:
+                self.progress_hook(self.result)
+
+    def transfer_item(self, func, relative_path, *args):
+        """Runs func for one path, recording any error it raises as that path's failure."""
+        try:
+            func(relative_path, *args)
+        except Exception as error:  # pylint: disable=broad-except
+            self.record(failed_path=relative_path, error=error)
+
+    def run_bounded(self, executor, func, items):
+        """Runs func over items with no more than 2 * max_concurrency calls queued."""
+        items = iter(items)
+        transfer = with_current_context(self.transfer_item)
+        running = set(executor.submit(transfer, func, *i) for i in islice(items, self.max_concurrency * 2))
+        while running:
+            done, running = futures.wait(running, return_when=futures.FIRST_COMPLETED)
+            for future in done:
+                future.result()
+            for i in islice(items, len(done)):
+                running.add(executor.submit(transfer, func, *i))
+
+    def list_directory(self, relative_path):
+        directories, files = [], []
+        for item in self.directory_client(relative_path).list_directories_and_files(**self.request_kwargs):
+            if item['is_directory']:
+                directories.append(_join(relative_path, item['name']))
+            else:
+                files.append((_join(relative_path, item['name']), item['size']))
+        return relative_path, directories, files
+
+    def walk_remote(self, executor):
+        """Lists the remote tree, with one listing call in flight per worker.
+
+        Yields the relative path of each directory with the relative path and size of its files.
+        """
+        running = set([executor.submit(with_current_context(self.list_directory), "")])
+        while running:
+            done, running = futures.wait(running, return_when=futures.FIRST_COMPLETED)
+            for future in done:
+                relative_path, directories, files = future.result()
+                for directory in directories:
+                    running.add(executor.submit(with_current_context(self.list_directory), directory))
+                yield relative_path, files
+
+    def remote_last_write_time(self, relative_path):
+        properties = self.file_client(relative_path).get_file_properties(**self.request_kwargs)
+        if properties.last_write_time is None:
+            return None
+        return _to_microseconds(properties.last_write_time)
+
+    def finish(self):
+        self.result.elapsed = time.time() - self._start
+        return self.result
+
+
+class DirectoryUpload(_DirectoryTransfer):
+
+    def __init__(self, directory_client, source, **kwargs):
+        self.source = source
+        super(DirectoryUpload, self).__init__(directory_client, **kwargs)
+
+    def create_directory(self, relative_path):
+        try:
+            self.directory_client(relative_path).create_directory(**self.request_kwargs)
+            self.record(created=1)
+        except ResourceExistsError:
+            pass
+        except AzureError as error:
+            self.record(failed_path=relative_path, error=error)
+
+    def upload_file(self, relative_path, size, mtime, remote_size):
+        try:
+            if self.skip_unchanged and remote_size == size and \
+                    self.remote_last_write_time(relative_path) == mtime:
+                self.record(skipped=1)
+                return
+            local_path = os.path.join(self.source, *relative_path.split("/"))
+            with open(local_path, 'rb') as data:
+                self.file_client(relative_path).upload_file(
+                    data,
+                    length=size,
+                    file_last_write_time=_last_write_time_str(mtime),
+                    **self.request_kwargs)
+            self.record(transferred=1, size=size)
+        except (AzureError, IOError, OSError) as error:
+            self.record(failed_path=relative_path, error=error)
+
+    def run(self):
+        local_tree = list(_walk_local(self.source))
+        with futures.ThreadPoolExecutor(self.max_concurrency) as executor:
+            remote_files = {}
+            remote_directories = set()
+            if self.skip_unchanged:
+                try:
+                    for relative_path, files in self.walk_remote(executor):
+                        remote_directories.add(relative_path)
+                        remote_files.update(files)
+                except ResourceNotFoundError:
+                    pass
+
+            # Parents must exist before their children, so create one depth at a time.
+            by_depth = {}
+            for relative_path, _ in local_tree:
+                if relative_path not in remote_directories:
+                    depth = relative_path.count("/") + 1 if relative_path else 0
+                    by_depth.setdefault(depth, []).append((relative_path,))
+            for depth in sorted(by_depth):
+                self.run_bounded(executor, self.create_directory, by_depth[depth])
+
+            uploads = (
+                (relative_path, size, mtime, remote_files.get(relative_path))
+                for _, files in local_tree for relative_path, size, mtime in files)
+            self.run_bounded(executor, self.upload_file, uploads)
+        return self.finish()
+
+
+class DirectoryDownload(_DirectoryTransfer):
+
+    def __init__(self, directory_client, destination, **kwargs):
+        self.destination = destination
+        super(DirectoryDownload, self).__init__(directory_client, **kwargs)
+
+    def local_path(self, relative_path):
+        if not relative_path:
+            return self.destination
+        return os.path.join(self.destination, *relative_path.split("/"))
+
+    def download_file(self, relative_path, size):
+        local_path = self.local_path(relative_path)
+        try:
+            if self.skip_unchanged and os.path.isfile(local_path):
+                stat_result = os.stat(local_path)
+                if stat_result.st_size == size and \
+                        self.remote_last_write_time(relative_path) == _local_mtime(stat_result):
+                    self.record(skipped=1)
+                    return
+            downloader = self.file_client(relative_path).download_file(**self.request_kwargs)
+            with open(local_path, 'wb') as stream:
+                downloader.readinto(stream)
+            if downloader.properties.last_write_time is not None:
+                _set_local_mtime(local_path, _to_microseconds(downloader.properties.last_write_time))
+            self.record(transferred=1, size=size)
+        except (AzureError, IOError, OSError) as error:
+            self.record(failed_path=relative_path, error=error)
+
+    def run(self):
+        with futures.ThreadPoolExecutor(self.max_concurrency) as executor:
+            if _makedirs(self.destination):
+                self.record(created=1)
+
+            def downloads():
+                # Directories are yielded before their files, so each file's parent already exists.
+                for relative_path, files in self.walk_remote(executor):
+                    if relative_path and _makedirs(self.local_path(relative_path)):
+                        self.record(created=1)
+                    for file_path, size in files:
+                        yield file_path, size
+
+            with futures.ThreadPoolExecutor(self.max_concurrency) as download_executor:
+                self.run_bounded(download_executor, self.download_file, downloads())
+        return self.finish()
@@ -23,15 +23,17 @@ from .._generated.models import StorageErrorException
 from .._shared.base_client_async import AsyncStorageAccountHostsMixin, AsyncTransportWrapper
 from .._shared.policies_async import ExponentialRetry
 from .._shared.request_handlers import add_metadata_headers
-from .._shared.response_handlers import return_response_headers, process_storage_error
+from .._shared.response_handlers import return_response_headers, process_storage_error, use_header_deserializer
 from .._deserialize import deserialize_directory_properties
 from .._directory_client import ShareDirectoryClient as ShareDirectoryClientBase
 from ._file_client_async import ShareFileClient
 from ._models import DirectoryPropertiesPaged, HandlesPaged
+from ._transfer_async import DirectoryUpload, DirectoryDownload
 
 if TYPE_CHECKING:
     from datetime import datetime
     from .._models import ShareProperties, DirectoryProperties, ContentSettings, NTFSAttributes
+    from .._models import DirectoryTransferResult
     from .._generated.models import HandleItem
 
 
@@ -82,7 +84,8 @@ class ShareDirectoryClient(AsyncStorageAccountHostsMixin, ShareDirectoryClientBa
             credential=credential,
             loop=loop,
             **kwargs)
-        self._client = AzureFileStorage(version=VERSION, url=self.url, pipeline=self._pipeline, loop=loop)
+        self._client = use_header_deserializer(
+            AzureFileStorage(version=VERSION, url=self.url, pipeline=self._pipeline, loop=loop))
         self._loop = loop
 
     def get_file_client(self, file_name, **kwargs):
@@ -128,7 +131,9 @@ class ShareDirectoryClient(AsyncStorageAccountHostsMixin, ShareDirectoryClientBa
                 :dedent: 16
                 :caption: Gets the subdirectory client.
         """
-        directory_path = self.directory_path.rstrip('/') + "/" + directory_name
+        directory_path = directory_name
+        if self.directory_path:
+            directory_path = self.directory_path.rstrip('/') + "/" + directory_name
 
         _pipeline = AsyncPipeline(
             transport=AsyncTransportWrapper(self._pipeline._transport), # pylint: disable = protected-access
@@ -575,3 +580,86 @@ class ShareDirectoryClient(AsyncStorageAccountHostsMixin, ShareDirectoryClientBa
         """
         file_client = self.get_file_client(file_name)
         await file_client.delete_file(**kwargs)
+
+    @distributed_trace_async
+    async def upload_directory(self, source, **kwargs):
+        # type: (str, Any) -> DirectoryTransferResult
+        """Uploads a local directory tree into this directory.
+
+        Directories are created one level at a time and files are uploaded by a
+        bounded number of concurrent tasks. Each uploaded file has its last write time
+        set to the local modification time, so that later uploads can skip unchanged files.
+
+        :param str source:
+            The path of the local directory to upload.
+        :keyword int max_concurrency:
+            The number of directories or files transferred at the same time. Default is 16.
+        :keyword bool skip_unchanged:
+            Whether to skip files that already exist in the share with the same size and
+            last write time. When enabled, the remote tree is listed before uploading. Default is False.
+        :keyword callable progress_hook:
+            Called with the running :class:`~azure.storage.fileshare.DirectoryTransferResult`
+            after each directory or file.
+        :keyword int timeout:
+            The timeout parameter is expressed in seconds.
+        :returns: A summary of the transfer. Paths that failed to upload are listed in its `failures`.
+        :rtype: ~azure.storage.fileshare.DirectoryTransferResult
+
+        .. admonition:: Example:
+
+            .. literalinclude:: ../samples/file_samples_directory_async.py
+                :start-after: [START upload_directory]
+                :end-before: [END upload_directory]
+                :language: python
+                :dedent: 16
+                :caption: Upload a local directory tree.
+        """
+        return await DirectoryUpload(
+            self,
+            source,
+            max_concurrency=kwargs.pop('max_concurrency', 16),
+            skip_unchanged=kwargs.pop('skip_unchanged', False),
+            progress_hook=kwargs.pop('progress_hook', None),
+            **kwargs).run()
+
+    @distributed_trace_async
+    async def download_directory(self, destination, **kwargs):
+        # type: (str, Any) -> DirectoryTransferResult
+        """Downloads this directory and all of its subdirectories to a local path.
+
+        Subdirectories are listed concurrently and files are downloaded by a bounded
+        number of tasks as soon as their directory has been listed. Each downloaded
+        file has its modification time set to the last write time in the share.
+
+        :param str destination:
+            The path of the local directory to download into. It is created if it does not exist.
+        :keyword int max_concurrency:
+            The number of directories listed, and the number of files downloaded, at the same time.
+            Default is 16.
+        :keyword bool skip_unchanged:
+            Whether to skip files that already exist locally with the same size and
+            modification time. Default is False.
+        :keyword callable progress_hook:
+            Called with the running :class:`~azure.storage.fileshare.DirectoryTransferResult`
+            after each directory or file.
+        :keyword int timeout:
+            The timeout parameter is expressed in seconds.
+        :returns: A summary of the transfer. Paths that failed to download are listed in its `failures`.
+        :rtype: ~azure.storage.fileshare.DirectoryTransferResult
+
+        .. admonition:: Example:
+
+            .. literalinclude:: ../samples/file_samples_directory_async.py
+                :start-after: [START download_directory]
+                :end-before: [END download_directory]
+                :language: python
+                :dedent: 16
+                :caption: Download a directory tree.
+        """
+        return await DirectoryDownload(
+            self,
+            destination,
+            max_concurrency=kwargs.pop('max_concurrency', 16),
+            skip_unchanged=kwargs.pop('skip_unchanged', False),
+            progress_hook=kwargs.pop('progress_hook', None),
+            **kwargs).run()
@@ -24,7 +24,7 @@ from .._shared.policies_async import ExponentialRetry
 from .._shared.uploads_async import upload_data_chunks, FileChunkUploader, IterStreamer
 from .._shared.base_client_async import AsyncStorageAccountHostsMixin
 from .._shared.request_handlers import add_metadata_headers, get_length
-from .._shared.response_handlers import return_response_headers, process_storage_error
+from .._shared.response_handlers import return_response_headers, process_storage_error, use_header_deserializer
 from .._deserialize import deserialize_file_properties, deserialize_file_stream
 from .._file_client import ShareFileClient as ShareFileClientBase
 from ._models import HandlesPaged
@@ -127,7 +127,8 @@ class ShareFileClient(AsyncStorageAccountHostsMixin, ShareFileClientBase):
             account_url, share_name=share_name, file_path=file_path, snapshot=snapshot,
             credential=credential, loop=loop, **kwargs
         )
-        self._client = AzureFileStorage(version=VERSION, url=self.url, pipeline=self._pipeline, loop=loop)
+        self._client = use_header_deserializer(
+            AzureFileStorage(version=VERSION, url=self.url, pipeline=self._pipeline, loop=loop))
         self._loop = loop
 
     @distributed_trace_async
@@ -17,7 +17,8 @@ from .._shared.request_handlers import add_metadata_headers, serialize_iso
 from .._shared.response_handlers import (
     return_response_headers,
     process_storage_error,
-    return_headers_and_deserialized)
+    return_headers_and_deserialized,
+    use_header_deserializer)
 from .._generated.aio import AzureFileStorage
 from .._generated.version import VERSION
 from .._generated.models import (
@@ -75,7 +76,8 @@ class ShareClient(AsyncStorageAccountHostsMixin, ShareClientBase):
             credential=credential,
             loop=loop,
             **kwargs)
-        self._client = AzureFileStorage(version=VERSION, url=self.url, pipeline=self._pipeline, loop=loop)
+        self._client = use_header_deserializer(
+            AzureFileStorage(version=VERSION, url=self.url, pipeline=self._pipeline, loop=loop))
         self._loop = loop
 
     def get_directory_client(self, directory_path=None):
@@ -16,7 +16,7 @@ from azure.core.pipeline import AsyncPipeline
 from azure.core.tracing.decorator_async import distributed_trace_async
 
 from .._shared.base_client_async import AsyncStorageAccountHostsMixin, AsyncTransportWrapper
-from .._shared.response_handlers import process_storage_error
+from .._shared.response_handlers import process_storage_error, use_header_deserializer
 from .._shared.policies_async import ExponentialRetry
 from .._generated.aio import AzureFileStorage
 from .._generated.models import StorageErrorException, StorageServiceProperties
@@ -80,7 +80,8 @@ class ShareServiceClient(AsyncStorageAccountHostsMixin, ShareServiceClientBase):
             credential=credential,
             loop=loop,
             **kwargs)
-        self._client = AzureFileStorage(version=VERSION, url=self.url, pipeline=self._pipeline, loop=loop)
+        self._client = use_header_deserializer(
+            AzureFileStorage(version=VERSION, url=self.url, pipeline=self._pipeline, loop=loop))
         self._loop = loop
 
     @distributed_trace_async
@@ -0,0 +1,192 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+# pylint: disable=invalid-overridden-method
+
+import asyncio
+import os
+
+from azure.core.exceptions import AzureError, ResourceExistsError, ResourceNotFoundError
+
+from .._transfer import (
+    DirectoryUpload as DirectoryUploadBase,
+    DirectoryDownload as DirectoryDownloadBase,
+    _join,
+    _last_write_time_str,
+    _local_mtime,
+    _makedirs,
+    _set_local_mtime,
+    _to_microseconds,
+    _walk_local,
+)
+
+
+class _AsyncTransferMixin(object):
+
+    def __init__(self, *args, **kwargs):
+        super(_AsyncTransferMixin, self).__init__(*args, **kwargs)
+        self._listing_slots = None
+
+    async def transfer_item(self, func, relative_path, *args):
+        """Runs func for one path, recording any error it raises as that path's failure."""
+        try:
+            await func(relative_path, *args)
+        except Exception as error:  # pylint: disable=broad-except
+            self.record(failed_path=relative_path, error=error)
+
+    async def run_workers(self, func, produce):
+        """Runs func in max_concurrency tasks over the items that produce puts on a bounded queue."""
+        pending = asyncio.Queue(self.max_concurrency * 2)
+
+        async def worker():
+            while True:
+                item = await pending.get()
+                if item is None:
+                    return
+                # a worker ending early would leave produce blocked on a full queue
+                await self.transfer_item(func, *item)
+
+        workers = [asyncio.ensure_future(worker()) for _ in range(self.max_concurrency)]
+        try:
+            await produce(pending.put)
+        finally:
+            for _ in workers:
+                await pending.put(None)
+            await asyncio.gather(*workers)
+
+    async def list_directory(self, relative_path):
+        directories, files = [], []
+        async with self._listing_slots:
+            async for item in self.directory_client(relative_path).list_directories_and_files(
+                    **self.request_kwargs):
+                if item['is_directory']:
+                    directories.append(_join(relative_path, item['name']))
+                else:
+                    files.append((_join(relative_path, item['name']), item['size']))
+        return relative_path, directories, files
+
+    async def walk_remote(self, on_directory):
+        """Lists the remote tree with up to max_concurrency listing calls in flight.
+
+        Awaits on_directory with the relative path of each directory and the relative
+        path and size of its files.
+        """
+        if not self._listing_slots:
+            self._listing_slots = asyncio.Semaphore(self.max_concurrency)
+        running = set([asyncio.ensure_future(self.list_directory(""))])
+        try:
+            while running:
+                done, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    relative_path, directories, files = task.result()
+                    for directory in directories:
+                        running.add(asyncio.ensure_future(self.list_directory(directory)))
+                    await on_directory(relative_path, files)
+        finally:
+            for task in running:
+                task.cancel()
+
+    async def remote_last_write_time(self, relative_path):
+        properties = await self.file_client(relative_path).get_file_properties(**self.request_kwargs)
+        if properties.last_write_time is None:
+            return None
+        return _to_microseconds(properties.last_write_time)
+
+
+class DirectoryUpload(_AsyncTransferMixin, DirectoryUploadBase):
+
+    async def create_directory(self, relative_path):
+        try:
+            await self.directory_client(relative_path).create_directory(**self.request_kwargs)
+            self.record(created=1)
+        except ResourceExistsError:
+            pass
+        except AzureError as error:
+            self.record(failed_path=relative_path, error=error)
+
+    async def upload_file(self, relative_path, size, mtime, remote_size):
+        try:
+            if self.skip_unchanged and remote_size == size and \
+                    await self.remote_last_write_time(relative_path) == mtime:
+                self.record(skipped=1)
+                return
+            local_path = os.path.join(self.source, *relative_path.split("/"))
+            with open(local_path, 'rb') as data:
+                await self.file_client(relative_path).upload_file(
+                    data,
+                    length=size,
+                    file_last_write_time=_last_write_time_str(mtime),
+                    **self.request_kwargs)
+            self.record(transferred=1, size=size)
+        except (AzureError, IOError, OSError) as error:
+            self.record(failed_path=relative_path, error=error)
+
+    async def run(self):
+        local_tree = list(_walk_local(self.source))
+        remote_files = {}
+        remote_directories = set()
+        if self.skip_unchanged:
+            async def on_directory(relative_path, files):
+                remote_directories.add(relative_path)
+                remote_files.update(files)
+            try:
+                await self.walk_remote(on_directory)
+            except ResourceNotFoundError:
+                pass
+
+        # Parents must exist before their children, so create one depth at a time.
+        by_depth = {}
+        for relative_path, _ in local_tree:
+            if relative_path not in remote_directories:
+                depth = relative_path.count("/") + 1 if relative_path else 0
+                by_depth.setdefault(depth, []).append(relative_path)
+        for depth in sorted(by_depth):
+            async def produce_directories(put, paths=by_depth[depth]):
+                for relative_path in paths:
+                    await put((relative_path,))
+            await self.run_workers(self.create_directory, produce_directories)
+
+        async def produce_files(put):
+            for _, files in local_tree:
+                for relative_path, size, mtime in files:
+                    await put((relative_path, size, mtime, remote_files.get(relative_path)))
+        await self.run_workers(self.upload_file, produce_files)
+        return self.finish()
+
+
+class DirectoryDownload(_AsyncTransferMixin, DirectoryDownloadBase):
+
+    async def download_file(self, relative_path, size):
+        local_path = self.local_path(relative_path)
+        try:
+            if self.skip_unchanged and os.path.isfile(local_path):
+                stat_result = os.stat(local_path)
+                if stat_result.st_size == size and \
+                        await self.remote_last_write_time(relative_path) == _local_mtime(stat_result):
+                    self.record(skipped=1)
+                    return
+            downloader = await self.file_client(relative_path).download_file(**self.request_kwargs)
+            with open(local_path, 'wb') as stream:
+                await downloader.readinto(stream)
+            if downloader.properties.last_write_time is not None:
+                _set_local_mtime(local_path, _to_microseconds(downloader.properties.last_write_time))
+            self.record(transferred=1, size=size)
+        except (AzureError, IOError, OSError) as error:
+            self.record(failed_path=relative_path, error=error)
+
+    async def run(self):
+        if _makedirs(self.destination):
+            self.record(created=1)
+
+        async def produce_files(put):
+            # Directories are reported before their files, so each file's parent already exists.
+            async def on_directory(relative_path, files):
+                if relative_path and _makedirs(self.local_path(relative_path)):
+                    self.record(created=1)
+                for file_path, size in files:
+                    await put((file_path, size))
+            await self.walk_remote(on_directory)
+        await self.run_workers(self.download_file, produce_files)
+        return self.finish()
@@ -129,9 +129,35 @@ class DirectorySamples(object):
             # Delete the share
             share.delete_share()
 
+    def transfer_directory_tree(self):
+        # Instantiate the ShareClient from a connection string
+        from azure.storage.fileshare import ShareClient
+        share = ShareClient.from_connection_string(self.connection_string, "directorysamples4")
+
+        # Create the share
+        share.create_share()
+
+        try:
+            # [START upload_directory]
+            # Mirror a local tree into "mirror", skipping files that are already up to date
+            directory = share.get_directory_client("mirror")
+            result = directory.upload_directory(".", max_concurrency=32, skip_unchanged=True)
+            print(result.files_transferred, result.files_skipped, result.throughput)
+            # [END upload_directory]
+
+            # [START download_directory]
+            # Download the whole tree back to a local folder
+            result = directory.download_directory("mirror_copy", max_concurrency=32)
+            print(result.files_transferred, result.bytes_transferred, result.failures)
+            # [END download_directory]
+        finally:
+            # Delete the share
+            share.delete_share()
+
 
 if __name__ == '__main__':
     sample = DirectorySamples()
     sample.create_directory_and_file()
     sample.create_subdirectory_and_file()
     sample.get_subdirectory_client()
+    sample.transfer_directory_tree()
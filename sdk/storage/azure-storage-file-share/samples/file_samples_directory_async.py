@@ -135,12 +135,39 @@ class DirectorySamplesAsync(object):
                 # Delete the share
                 await share.delete_share()
 
+    async def transfer_directory_tree_async(self):
+        # Instantiate the ShareClient from a connection string
+        from azure.storage.fileshare.aio import ShareClient
+        share = ShareClient.from_connection_string(self.connection_string, "directorysamples4")
+
+        # Create the share
+        async with share:
+            await share.create_share()
+
+            try:
+                # [START upload_directory]
+                # Mirror a local tree into "mirror", skipping files that are already up to date
+                directory = share.get_directory_client("mirror")
+                result = await directory.upload_directory(".", max_concurrency=32, skip_unchanged=True)
+                print(result.files_transferred, result.files_skipped, result.throughput)
+                # [END upload_directory]
+
+                # [START download_directory]
+                # Download the whole tree back to a local folder
+                result = await directory.download_directory("mirror_copy", max_concurrency=32)
+                print(result.files_transferred, result.bytes_transferred, result.failures)
+                # [END download_directory]
+            finally:
+                # Delete the share
+                await share.delete_share()
+
 
 async def main():
     sample = DirectorySamplesAsync()
     await sample.create_directory_and_file_async()
     await sample.create_subdirectory_and_file_async()
     await sample.get_subdirectory_client_async()
+    await sample.transfer_directory_tree_async()
 
 loop = asyncio.get_event_loop()
 loop.run_until_complete(main())
@@ -0,0 +1,217 @@
+# coding: utf-8
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from datetime import datetime
+
+from azure.core.exceptions import ResourceExistsError, ResourceNotFoundError
+from azure.storage.fileshare import FileProperties
+from azure.storage.fileshare._transfer import DirectoryUpload, DirectoryDownload
+
+
+# ------------------------------------------------------------------------------
+
+class FakeShare(object):
+    """In-memory share tree: directory paths and file path -> (content, last write time)."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.directories = set([""])
+        self.files = {}
+        self.calls = []
+        # paths whose upload raises an error the transfer doesn't expect
+        self.broken = set()
+
+    def parent(self, path):
+        return path.rpartition("/")[0]
+
+
+class FakeDownloader(object):
+    def __init__(self, content, last_write_time):
+        self._content = content
+        self.properties = FileProperties()
+        self.properties.last_write_time = last_write_time
+
+    def readinto(self, stream):
+        stream.write(self._content)
+        return len(self._content)
+
+
+class FakeFileClient(object):
+    def __init__(self, share, path):
+        self.share = share
+        self.path = path
+
+    def upload_file(self, data, length=None, file_last_write_time=None, **kwargs):
+        with self.share.lock:
+            self.share.calls.append(('upload', self.path))
+            if self.path in self.share.broken:
+                raise ValueError("broken")
+            if self.share.parent(self.path) not in self.share.directories:
+                raise ResourceNotFoundError("parent missing")
+        written = datetime.strptime(file_last_write_time[:-2], "%Y-%m-%dT%H:%M:%S.%f")
+        self.share.files[self.path] = (data.read(length), written)
+
+    def get_file_properties(self, **kwargs):
+        self.share.calls.append(('properties', self.path))
+        properties = FileProperties()
+        properties.last_write_time = self.share.files[self.path][1]
+        return properties
+
+    def download_file(self, **kwargs):
+        self.share.calls.append(('download', self.path))
+        return FakeDownloader(*self.share.files[self.path])
+
+
+class FakeDirectoryClient(object):
+    def __init__(self, share, path=""):
+        self.share = share
+        self.path = path
+
+    def _child(self, name):
+        return self.path + "/" + name if self.path else name
+
+    def get_subdirectory_client(self, name):
+        return FakeDirectoryClient(self.share, self._child(name))
+
+    def get_file_client(self, name):
+        return FakeFileClient(self.share, self._child(name))
+
+    def create_directory(self, **kwargs):
+        with self.share.lock:
+            if self.path in self.share.directories:
+                raise ResourceExistsError("exists")
+            if self.share.parent(self.path) not in self.share.directories:
+                raise ResourceNotFoundError("parent missing")
+            self.share.directories.add(self.path)
+
+    def list_directories_and_files(self, **kwargs):
+        if self.path not in self.share.directories:
+            raise ResourceNotFoundError("missing")
+        items = [{'name': d.rpartition("/")[2], 'is_directory': True}
+                 for d in self.share.directories if d and self.share.parent(d) == self.path]
+        items.extend({'name': f.rpartition("/")[2], 'size': len(c), 'is_directory': False}
+                     for f, (c, _) in self.share.files.items() if self.share.parent(f) == self.path)
+        return iter(items)
+
+
+def _write(path, content):
+    if not os.path.isdir(os.path.dirname(path)):
+        os.makedirs(os.path.dirname(path))
+    with open(path, 'wb') as stream:
+        stream.write(content)
+
+
+class StorageDirectoryTransferTest(unittest.TestCase):
+
+    def setUp(self):
+        self.local = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.local)
+        self.source = os.path.join(self.local, 'source')
+        for i in range(20):
+            _write(os.path.join(self.source, 'a', 'b{}'.format(i % 3), 'file{}.txt'.format(i)), b'x' * i)
+        _write(os.path.join(self.source, 'top.txt'), b'top')
+        os.makedirs(os.path.join(self.source, 'empty'))
+
+    def _upload(self, share, **kwargs):
+        kwargs.setdefault('max_concurrency', 4)
+        kwargs.setdefault('skip_unchanged', False)
+        kwargs.setdefault('progress_hook', None)
+        return DirectoryUpload(FakeDirectoryClient(share, 'mirror'), self.source, **kwargs).run()
+
+    def _download(self, share, destination, **kwargs):
+        kwargs.setdefault('max_concurrency', 4)
+        kwargs.setdefault('skip_unchanged', False)
+        kwargs.setdefault('progress_hook', None)
+        return DirectoryDownload(FakeDirectoryClient(share, 'mirror'), destination, **kwargs).run()
+
+    def test_upload_directory_creates_tree(self):
+        share = FakeShare()
+        result = self._upload(share)
+
+        self.assertEqual(result.failures, {})
+        self.assertEqual(result.files_transferred, 21)
+        self.assertEqual(result.directories_created, 6)
+        self.assertEqual(result.bytes_transferred, sum(range(20)) + 3)
+        self.assertTrue(result.elapsed > 0)
+        self.assertIn('mirror/a/b2/file5.txt', share.files)
+        self.assertIn('mirror/empty', share.directories)
+        self.assertEqual(share.files['mirror/top.txt'][0], b'top')
+
+    def test_upload_directory_skips_unchanged(self):
+        share = FakeShare()
+        self._upload(share)
+        os.utime(os.path.join(self.source, 'top.txt'), (0, 0))
+        share.calls = []
+
+        progress = []
+        result = self._upload(share, skip_unchanged=True, progress_hook=lambda r: progress.append(r.files_skipped))
+
+        self.assertEqual(result.files_skipped, 20)
+        self.assertEqual(result.files_transferred, 1)
+        self.assertEqual(result.directories_created, 0)
+        self.assertEqual([c for c in share.calls if c[0] == 'upload'], [('upload', 'mirror/top.txt')])
+        self.assertEqual(len(progress), 21)
+
+    def test_download_directory_round_trip(self):
+        share = FakeShare()
+        self._upload(share)
+        destination = os.path.join(self.local, 'copy')
+
+        result = self._download(share, destination)
+
+        self.assertEqual(result.failures, {})
+        self.assertEqual(result.files_transferred, 21)
+        with open(os.path.join(destination, 'a', 'b1', 'file7.txt'), 'rb') as stream:
+            self.assertEqual(stream.read(), b'x' * 7)
+        self.assertTrue(os.path.isdir(os.path.join(destination, 'empty')))
+        self.assertEqual(
+            os.stat(os.path.join(destination, 'top.txt')).st_mtime_ns // 1000,
+            os.stat(os.path.join(self.source, 'top.txt')).st_mtime_ns // 1000)
+
+        # A second download finds every file up to date.
+        share.calls = []
+        result = self._download(share, destination, skip_unchanged=True)
+        self.assertEqual(result.files_transferred, 0)
+        self.assertEqual(result.files_skipped, 21)
+        self.assertFalse([c for c in share.calls if c[0] == 'download'])
+
+    def test_download_directory_reports_failures(self):
+        share = FakeShare()
+        self._upload(share)
+        destination = os.path.join(self.local, 'copy')
+        _write(os.path.join(destination, 'top.txt'), b'')
+        os.chmod(os.path.join(destination, 'top.txt'), 0o400)
+        if os.access(os.path.join(destination, 'top.txt'), os.W_OK):
+            self.skipTest("File permissions are not enforced for this user.")
+
+        result = self._download(share, destination)
+
+        self.assertEqual(result.files_transferred, 20)
+        self.assertEqual(list(result.failures), ['top.txt'])
+
+    def test_upload_directory_records_unexpected_errors(self):
+        share = FakeShare()
+        share.broken.update('mirror/a/b0/file{}.txt'.format(i) for i in range(0, 20, 3))
+
+        result = self._upload(share, max_concurrency=2)
+
+        self.assertEqual(result.files_transferred, 14)
+        self.assertEqual(sorted(result.failures), sorted(p[len('mirror/'):] for p in share.broken))
+        self.assertTrue(all(isinstance(e, ValueError) for e in result.failures.values()))
+
+    def test_transfer_invalid_concurrency(self):
+        with self.assertRaises(ValueError):
+            self._upload(FakeShare(), max_concurrency=0)
+
+
+# ------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+# coding: utf-8
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import asyncio
+import os
+import shutil
+import tempfile
+import unittest
+
+from azure.core.async_paging import AsyncList
+from azure.storage.fileshare.aio._transfer_async import DirectoryUpload, DirectoryDownload
+
+from test_directory_transfer import (
+    FakeShare,
+    FakeDirectoryClient,
+    FakeFileClient,
+    FakeDownloader,
+    _write,
+)
+
+
+# ------------------------------------------------------------------------------
+
+class AsyncFakeDownloader(FakeDownloader):
+    async def readinto(self, stream):
+        return super(AsyncFakeDownloader, self).readinto(stream)
+
+
+class AsyncFakeFileClient(FakeFileClient):
+    async def upload_file(self, *args, **kwargs):
+        await asyncio.sleep(0)
+        return super(AsyncFakeFileClient, self).upload_file(*args, **kwargs)
+
+    async def get_file_properties(self, **kwargs):
+        return super(AsyncFakeFileClient, self).get_file_properties(**kwargs)
+
+    async def download_file(self, **kwargs):
+        await asyncio.sleep(0)
+        downloader = super(AsyncFakeFileClient, self).download_file(**kwargs)
+        return AsyncFakeDownloader(downloader._content, downloader.properties.last_write_time)
+
+
+class AsyncFakeDirectoryClient(FakeDirectoryClient):
+    def get_subdirectory_client(self, name):
+        return AsyncFakeDirectoryClient(self.share, self._child(name))
+
+    def get_file_client(self, name):
+        return AsyncFakeFileClient(self.share, self._child(name))
+
+    async def create_directory(self, **kwargs):
+        await asyncio.sleep(0)
+        return super(AsyncFakeDirectoryClient, self).create_directory(**kwargs)
+
+    def list_directories_and_files(self, **kwargs):
+        return AsyncList(super(AsyncFakeDirectoryClient, self).list_directories_and_files(**kwargs))
+
+
+class StorageDirectoryTransferTestAsync(unittest.TestCase):
+
+    def setUp(self):
+        self.local = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.local)
+        self.source = os.path.join(self.local, 'source')
+        for i in range(20):
+            _write(os.path.join(self.source, 'a', 'b{}'.format(i % 3), 'file{}.txt'.format(i)), b'x' * i)
+        _write(os.path.join(self.source, 'top.txt'), b'top')
+
+    def _run(self, transfer, **kwargs):
+        kwargs.setdefault('max_concurrency', 4)
+        kwargs.setdefault('skip_unchanged', False)
+        kwargs.setdefault('progress_hook', None)
+        loop = asyncio.new_event_loop()
+        try:
+            task = loop.create_task(transfer(**kwargs).run())
+            # bounded, so a transfer that stalls fails the test rather than hanging it
+            done, _ = loop.run_until_complete(asyncio.wait([task], timeout=10))
+            self.assertTrue(done, "the transfer stalled")
+            return task.result()
+        finally:
+            loop.close()
+
+    def test_upload_and_download_directory(self):
+        share = FakeShare()
+        client = AsyncFakeDirectoryClient(share, 'mirror')
+        result = self._run(lambda **kw: DirectoryUpload(client, self.source, **kw))
+
+        self.assertEqual(result.failures, {})
+        self.assertEqual(result.files_transferred, 21)
+        self.assertEqual(result.directories_created, 5)
+
+        result = self._run(lambda **kw: DirectoryUpload(client, self.source, **kw), skip_unchanged=True)
+        self.assertEqual(result.files_skipped, 21)
+        self.assertEqual(result.files_transferred, 0)
+
+        destination = os.path.join(self.local, 'copy')
+        result = self._run(lambda **kw: DirectoryDownload(client, destination, **kw))
+        self.assertEqual(result.failures, {})
+        self.assertEqual(result.files_transferred, 21)
+        self.assertEqual(result.bytes_transferred, sum(range(20)) + 3)
+        with open(os.path.join(destination, 'a', 'b2', 'file8.txt'), 'rb') as stream:
+            self.assertEqual(stream.read(), b'x' * 8)
+
+        result = self._run(lambda **kw: DirectoryDownload(client, destination, **kw), skip_unchanged=True)
+        self.assertEqual(result.files_skipped, 21)
+
+    def test_upload_directory_records_unexpected_errors(self):
+        share = FakeShare()
+        share.broken.update('mirror/a/b0/file{}.txt'.format(i) for i in range(0, 20, 3))
+        client = AsyncFakeDirectoryClient(share, 'mirror')
+
+        result = self._run(lambda **kw: DirectoryUpload(client, self.source, **kw), max_concurrency=2)
+
+        self.assertEqual(result.files_transferred, 14)
+        self.assertEqual(sorted(result.failures), sorted(p[len('mirror/'):] for p in share.broken))
+        self.assertTrue(all(isinstance(e, ValueError) for e in result.failures.values()))
+
+
+# ------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
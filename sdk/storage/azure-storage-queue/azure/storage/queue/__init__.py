@@ -7,6 +7,7 @@
 from ._version import VERSION
 from ._queue_client import QueueClient
 from ._queue_service_client import QueueServiceClient
+from ._message_pump import QueueMessagePump, MessagePumpMetrics, StageLatency
 from ._shared_access_signature import generate_account_sas, generate_queue_sas
 from ._shared.policies import ExponentialRetry, LinearRetry
 from ._shared.models import(
@@ -37,6 +38,9 @@ __version__ = VERSION
 __all__ = [
     'QueueClient',
     'QueueServiceClient',
+    'QueueMessagePump',
+    'MessagePumpMetrics',
+    'StageLatency',
     'ExponentialRetry',
     'LinearRetry',
     'LocationMode',
@@ -0,0 +1,329 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+# pylint: disable=too-many-instance-attributes
+
+import logging
+import threading
+import time
+from concurrent import futures
+from typing import (  # pylint: disable=unused-import
+    Any, Callable, List, Optional, TYPE_CHECKING
+)
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue  # type: ignore
+
+from azure.core.exceptions import AzureError
+from azure.core.tracing.common import with_current_context
+
+from ._shared.models import DictMixin
+
+if TYPE_CHECKING:
+    from ._models import QueueMessage
+    from ._queue_client import QueueClient
+
+
+_LOGGER = logging.getLogger(__name__)
+
+_MIN_IDLE_WAIT = 0.05
+
+
+class StageLatency(DictMixin):
+    """Latency statistics for one stage of a message pump.
+
+    :ivar int count: The number of completed operations.
+    :ivar float total: The total time spent in the stage, in seconds.
+    :ivar float max: The slowest operation observed, in seconds.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    @property
+    def average(self):
+        # type: () -> float
+        """The mean latency of the stage, in seconds."""
+        return self.total / self.count if self.count else 0.0
+
+    def _record(self, elapsed):
+        self.count += 1
+        self.total += elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+
+
+class MessagePumpMetrics(DictMixin):
+    """Counters and per-stage latencies collected by a message pump.
+
+    :ivar int received: Messages dequeued from the service.
+    :ivar int handled: Messages for which the handler returned successfully.
+    :ivar int failed: Messages for which the handler raised an exception.
+    :ivar int deleted: Messages deleted after being handled.
+    :ivar int released: Failed messages whose visibility timeout was updated.
+    :ivar int settle_errors: Delete or update requests that failed.
+    :ivar int receive_errors: Dequeue requests that failed.
+    :ivar int buffered: Messages currently waiting for a handler.
+    :ivar ~azure.storage.queue.StageLatency receive_latency: Time spent in dequeue requests.
+    :ivar ~azure.storage.queue.StageLatency handle_latency: Time spent in the handler.
+    :ivar ~azure.storage.queue.StageLatency settle_latency: Time spent deleting or updating handled messages.
+    """
+
+    def __init__(self):
+        self.received = 0
+        self.handled = 0
+        self.failed = 0
+        self.deleted = 0
+        self.released = 0
+        self.settle_errors = 0
+        self.receive_errors = 0
+        self.buffered = 0
+        self.receive_latency = StageLatency()
+        self.handle_latency = StageLatency()
+        self.settle_latency = StageLatency()
+        self._lock = threading.Lock()
+
+    def _increment(self, counter, value=1):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + value)
+
+    def _record(self, stage, elapsed):
+        with self._lock:
+            getattr(self, stage)._record(elapsed)  # pylint: disable=protected-access
+
+
+class QueueMessagePump(object):
+    """Receives, handles and deletes queue messages concurrently.
+
+    The pump keeps several dequeue requests in flight, buffers the received
+    messages up to a fixed bound and dispatches them to a pool of handler
+    threads. Once the handler returns, the message is deleted on a separate
+    pool so that settlement does not hold up handling. When the buffer is full
+    the receivers stop dequeuing until handlers catch up.
+
+    :param queue_client: The client for the queue to process.
+    :type queue_client: ~azure.storage.queue.QueueClient
+    :param callable handler:
+        Called with each received :class:`~azure.storage.queue.QueueMessage`.
+        If the handler returns, the message is deleted. If it raises, the message
+        is left on the queue to become visible again.
+    :keyword int max_concurrent_receives:
+        The number of dequeue requests kept in flight. Default is 4.
+    :keyword int max_concurrent_calls:
+        The number of handler threads. Default is 16.
+    :keyword int max_concurrent_settlements:
+        The number of delete or update requests kept in flight. Default is 8.
+    :keyword int messages_per_page:
+        The number of messages requested by each dequeue call, up to 32. Default is 32.
+    :keyword int visibility_timeout:
+        The visibility timeout, in seconds, applied to received messages.
+    :keyword int max_buffered_messages:
+        The maximum number of received messages waiting for a handler.
+        Defaults to `max_concurrent_receives * messages_per_page`.
+    :keyword int error_visibility_timeout:
+        If set, a message whose handler raised is updated to become visible again
+        after this many seconds instead of waiting for its visibility timeout to expire.
+    :keyword float max_idle_wait:
+        The longest time, in seconds, a receiver waits before polling an empty queue again.
+        Default is 1.
+    :keyword callable error_handler:
+        Called with the message and the exception when the handler raises, and with None
+        and the exception when a receive request fails. Errors it raises are logged.
+    :keyword int timeout:
+        The server timeout, expressed in seconds, for each request.
+
+    .. admonition:: Example:
+
+        .. literalinclude:: ../samples/queue_samples_message.py
+            :start-after: [START message_pump]
+            :end-before: [END message_pump]
+            :language: python
+            :dedent: 12
+            :caption: Process messages with a message pump.
+    """
+
+    def __init__(self, queue_client, handler, **kwargs):
+        # type: (QueueClient, Callable[[QueueMessage], Any], Any) -> None
+        self._client = queue_client
+        self._handler = handler
+        self._max_concurrent_receives = kwargs.pop('max_concurrent_receives', 4)
+        self._max_concurrent_calls = kwargs.pop('max_concurrent_calls', 16)
+        self._max_concurrent_settlements = kwargs.pop('max_concurrent_settlements', 8)
+        self._messages_per_page = kwargs.pop('messages_per_page', 32)
+        self._visibility_timeout = kwargs.pop('visibility_timeout', None)
+        self._error_visibility_timeout = kwargs.pop('error_visibility_timeout', None)
+        self._max_idle_wait = kwargs.pop('max_idle_wait', 1)
+        self._error_handler = kwargs.pop('error_handler', None)
+        self._timeout = kwargs.pop('timeout', None)
+        if not 1 <= self._messages_per_page <= 32:
+            raise ValueError("messages_per_page should be between 1 and 32")
+        if self._max_concurrent_receives < 1 or self._max_concurrent_calls < 1:
+            raise ValueError("max_concurrent_receives and max_concurrent_calls should be at least 1")
+        self._max_buffered = kwargs.pop('max_buffered_messages', None) or \
+            self._max_concurrent_receives * self._messages_per_page
+        self._request_kwargs = kwargs
+
+        self.metrics = MessagePumpMetrics()
+        self._buffer = None  # type: Optional[queue.Queue]
+        self._stopping = threading.Event()
+        self._receivers = []  # type: List[threading.Thread]
+        self._handlers = []  # type: List[threading.Thread]
+        self._settler = None  # type: Optional[futures.ThreadPoolExecutor]
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    @property
+    def running(self):
+        # type: () -> bool
+        """Whether the pump has been started and not yet stopped."""
+        return bool(self._receivers) and not self._stopping.is_set()
+
+    def start(self):
+        # type: () -> None
+        """Start the receiver and handler threads."""
+        if self._receivers:
+            raise ValueError("The message pump has already been started.")
+        self._stopping.clear()
+        self._buffer = queue.Queue(self._max_buffered)
+        self._settler = futures.ThreadPoolExecutor(self._max_concurrent_settlements)
+        self._handlers = [
+            threading.Thread(target=with_current_context(self._handle_loop))
+            for _ in range(self._max_concurrent_calls)]
+        self._receivers = [
+            threading.Thread(target=with_current_context(self._receive_loop))
+            for _ in range(self._max_concurrent_receives)]
+        for thread in self._handlers + self._receivers:
+            thread.daemon = True
+            thread.start()
+
+    def stop(self, timeout=None):
+        # type: (Optional[float]) -> None
+        """Stop receiving and wait for buffered messages to be handled and settled.
+
+        :param float timeout: The maximum time, in seconds, to wait for each thread.
+        """
+        if not self._receivers:
+            return
+        self._stopping.set()
+        for thread in self._receivers:
+            thread.join(timeout)
+        for _ in self._handlers:
+            self._buffer.put(None)
+        for thread in self._handlers:
+            thread.join(timeout)
+        self._settler.shutdown(wait=True)
+        self._receivers = []
+        self._handlers = []
+        self._settler = None
+
+    def run(self, duration):
+        # type: (float) -> MessagePumpMetrics
+        """Run the pump for a fixed time and return the collected metrics.
+
+        :param float duration: The number of seconds to process messages for.
+        :rtype: ~azure.storage.queue.MessagePumpMetrics
+        """
+        self.start()
+        try:
+            self._stopping.wait(duration)
+        finally:
+            self.stop()
+        return self.metrics
+
+    def _report_error(self, message, error):
+        if not self._error_handler:
+            return
+        try:
+            self._error_handler(message, error)
+        except Exception as handler_error:  # pylint: disable=broad-except
+            _LOGGER.warning("Message pump error handler failed: %r", handler_error)
+
+    def _receive(self):
+        # type: () -> List[QueueMessage]
+        pages = self._client.receive_messages(
+            messages_per_page=self._messages_per_page,
+            visibility_timeout=self._visibility_timeout,
+            timeout=self._timeout,
+            **self._request_kwargs).by_page()
+        return list(next(pages, []))
+
+    def _receive_loop(self):
+        idle_wait = 0
+        while not self._stopping.is_set():
+            start = time.time()
+            try:
+                messages = self._receive()
+            except Exception as error:  # pylint: disable=broad-except
+                self.metrics._increment('receive_errors')  # pylint: disable=protected-access
+                _LOGGER.warning("Failed to receive queue messages: %r", error)
+                self._report_error(None, error)
+                self._stopping.wait(self._max_idle_wait)
+                continue
+            self.metrics._record('receive_latency', time.time() - start)  # pylint: disable=protected-access
+            if not messages:
+                idle_wait = min(max(idle_wait * 2, _MIN_IDLE_WAIT), self._max_idle_wait)
+                self._stopping.wait(idle_wait)
+                continue
+            idle_wait = 0
+            self.metrics._increment('received', len(messages))  # pylint: disable=protected-access
+            for message in messages:
+                self.metrics._increment('buffered')  # pylint: disable=protected-access
+                self._buffer.put(message)
+
+    def _handle_loop(self):
+        while True:
+            message = self._buffer.get()
+            if message is None:
+                return
+            self.metrics._increment('buffered', -1)  # pylint: disable=protected-access
+            start = time.time()
+            try:
+                self._handler(message)
+            except Exception as error:  # pylint: disable=broad-except
+                self.metrics._record('handle_latency', time.time() - start)  # pylint: disable=protected-access
+                self.metrics._increment('failed')  # pylint: disable=protected-access
+                _LOGGER.warning("Handler failed for queue message %s: %r", message.id, error)
+                self._report_error(message, error)
+                if self._error_visibility_timeout is not None:
+                    self._settler.submit(with_current_context(self._release), message)
+                continue
+            self.metrics._record('handle_latency', time.time() - start)  # pylint: disable=protected-access
+            self.metrics._increment('handled')  # pylint: disable=protected-access
+            self._settler.submit(with_current_context(self._delete), message)
+
+    def _delete(self, message):
+        start = time.time()
+        try:
+            self._client.delete_message(message, timeout=self._timeout, **self._request_kwargs)
+        except AzureError as error:
+            self.metrics._increment('settle_errors')  # pylint: disable=protected-access
+            _LOGGER.warning("Failed to delete queue message %s: %r", message.id, error)
+            return
+        self.metrics._record('settle_latency', time.time() - start)  # pylint: disable=protected-access
+        self.metrics._increment('deleted')  # pylint: disable=protected-access
+
+    def _release(self, message):
+        start = time.time()
+        try:
+            self._client.update_message(
+                message,
+                visibility_timeout=self._error_visibility_timeout,
+                timeout=self._timeout,
+                **self._request_kwargs)
+        except AzureError as error:
+            self.metrics._increment('settle_errors')  # pylint: disable=protected-access
+            _LOGGER.warning("Failed to update queue message %s: %r", message.id, error)
+            return
+        self.metrics._record('settle_latency', time.time() - start)  # pylint: disable=protected-access
+        self.metrics._increment('released')  # pylint: disable=protected-access
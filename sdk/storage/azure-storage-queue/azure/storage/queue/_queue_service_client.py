@@ -18,7 +18,7 @@ from azure.core.pipeline import Pipeline
 from azure.core.tracing.decorator import distributed_trace
 from ._shared.models import LocationMode
 from ._shared.base_client import StorageAccountHostsMixin, TransportWrapper, parse_connection_str, parse_query
-from ._shared.response_handlers import process_storage_error
+from ._shared.response_handlers import process_storage_error, use_header_deserializer
 from ._generated import AzureQueueStorage
 from ._generated.models import StorageServiceProperties, StorageErrorException
 
@@ -98,7 +98,7 @@ class QueueServiceClient(StorageAccountHostsMixin):
             raise ValueError("You need to provide either a SAS token or an account shared key to authenticate.")
         self._query_str, credential = self._format_query_string(sas_token, credential)
         super(QueueServiceClient, self).__init__(parsed_url, service='queue', credential=credential, **kwargs)
-        self._client = AzureQueueStorage(self.url, pipeline=self._pipeline)
+        self._client = use_header_deserializer(AzureQueueStorage(self.url, pipeline=self._pipeline))
 
     def _format_url(self, hostname):
         """Format the endpoint URL according to the current location
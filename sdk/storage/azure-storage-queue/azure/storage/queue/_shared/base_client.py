@@ -230,6 +230,9 @@ class StorageAccountHostsMixin(object):  # pylint: disable=too-many-instance-att
             DistributedTracingPolicy(**kwargs),
             HttpLoggingPolicy(**kwargs)
         ]
+        if kwargs.get("metrics_sink"):
+            from azure.core.pipeline.policies import MetricsPolicy  # added in azure-core 1.1.0
+            policies.insert(policies.index(config.retry_policy), MetricsPolicy(**kwargs))
         return config, Pipeline(config.transport, policies=policies)
 
     def _batch_send(
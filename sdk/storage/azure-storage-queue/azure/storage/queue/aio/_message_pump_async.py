@@ -0,0 +1,245 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+# pylint: disable=invalid-overridden-method
+
+import asyncio
+import logging
+import time
+from typing import (  # pylint: disable=unused-import
+    Any, Awaitable, Callable, List, Optional, TYPE_CHECKING
+)
+
+from azure.core.exceptions import AzureError
+
+from .._message_pump import QueueMessagePump as QueueMessagePumpBase, MessagePumpMetrics, _MIN_IDLE_WAIT
+
+if TYPE_CHECKING:
+    from .._models import QueueMessage
+    from ._queue_client_async import QueueClient
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class QueueMessagePump(QueueMessagePumpBase):
+    """Receives, handles and deletes queue messages concurrently.
+
+    The pump keeps several dequeue requests in flight, buffers the received
+    messages up to a fixed bound and dispatches them to a fixed number of handler
+    tasks. Once the handler returns, the message is deleted in a separate task so
+    that settlement does not hold up handling. When the buffer is full the
+    receivers stop dequeuing until handlers catch up.
+
+    :param queue_client: The client for the queue to process.
+    :type queue_client: ~azure.storage.queue.aio.QueueClient
+    :param handler:
+        A coroutine function called with each received :class:`~azure.storage.queue.QueueMessage`.
+        If the handler returns, the message is deleted. If it raises, the message
+        is left on the queue to become visible again.
+    :type handler: Callable[[~azure.storage.queue.QueueMessage], Awaitable[Any]]
+    :keyword int max_concurrent_receives:
+        The number of dequeue requests kept in flight. Default is 4.
+    :keyword int max_concurrent_calls:
+        The number of handler tasks. Default is 16.
+    :keyword int max_concurrent_settlements:
+        The number of delete or update requests kept in flight. Default is 8.
+    :keyword int messages_per_page:
+        The number of messages requested by each dequeue call, up to 32. Default is 32.
+    :keyword int visibility_timeout:
+        The visibility timeout, in seconds, applied to received messages.
+    :keyword int max_buffered_messages:
+        The maximum number of received messages waiting for a handler.
+        Defaults to `max_concurrent_receives * messages_per_page`.
+    :keyword int error_visibility_timeout:
+        If set, a message whose handler raised is updated to become visible again
+        after this many seconds instead of waiting for its visibility timeout to expire.
+    :keyword float max_idle_wait:
+        The longest time, in seconds, a receiver waits before polling an empty queue again.
+        Default is 1.
+    :keyword callable error_handler:
+        Called with the message and the exception when the handler raises, and with None
+        and the exception when a receive request fails. Errors it raises are logged.
+    :keyword int timeout:
+        The server timeout, expressed in seconds, for each request.
+
+    .. admonition:: Example:
+
+        .. literalinclude:: ../samples/queue_samples_message_async.py
+            :start-after: [START async_message_pump]
+            :end-before: [END async_message_pump]
+            :language: python
+            :dedent: 12
+            :caption: Process messages with a message pump.
+    """
+
+    def __init__(self, queue_client, handler, **kwargs):
+        # type: (QueueClient, Callable[[QueueMessage], Awaitable[Any]], Any) -> None
+        super(QueueMessagePump, self).__init__(queue_client, handler, **kwargs)
+        self._stopping = None  # type: Optional[asyncio.Event]
+        self._receivers = []  # type: List[asyncio.Future]
+        self._handlers = []  # type: List[asyncio.Future]
+        self._settlements = None  # type: Optional[asyncio.Semaphore]
+        self._pending_settlements = set()  # type: set
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args):
+        await self.stop()
+
+    def __enter__(self):
+        raise TypeError("Use 'async with' with the async message pump.")
+
+    def __exit__(self, *args):
+        pass
+
+    async def start(self):
+        # type: () -> None
+        """Start the receiver and handler tasks."""
+        if self._receivers:
+            raise ValueError("The message pump has already been started.")
+        self._stopping = asyncio.Event()
+        self._buffer = asyncio.Queue(self._max_buffered)
+        self._settlements = asyncio.Semaphore(self._max_concurrent_settlements)
+        self._handlers = [
+            asyncio.ensure_future(self._handle_loop())
+            for _ in range(self._max_concurrent_calls)]
+        self._receivers = [
+            asyncio.ensure_future(self._receive_loop())
+            for _ in range(self._max_concurrent_receives)]
+
+    async def stop(self, timeout=None):
+        # type: (Optional[float]) -> None
+        """Stop receiving and wait for buffered messages to be handled and settled.
+
+        :param float timeout: The maximum time, in seconds, to wait for each stage.
+        """
+        if not self._receivers:
+            return
+        self._stopping.set()
+        await asyncio.wait(self._receivers, timeout=timeout)
+        for _ in self._handlers:
+            await self._buffer.put(None)
+        await asyncio.wait(self._handlers, timeout=timeout)
+        if self._pending_settlements:
+            await asyncio.wait(self._pending_settlements, timeout=timeout)
+        self._receivers = []
+        self._handlers = []
+
+    async def run(self, duration):
+        # type: (float) -> MessagePumpMetrics
+        """Run the pump for a fixed time and return the collected metrics.
+
+        :param float duration: The number of seconds to process messages for.
+        :rtype: ~azure.storage.queue.MessagePumpMetrics
+        """
+        await self.start()
+        try:
+            await self._wait_stopping(duration)
+        finally:
+            await self.stop()
+        return self.metrics
+
+    async def _wait_stopping(self, delay):
+        try:
+            await asyncio.wait_for(self._stopping.wait(), delay)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _receive(self):
+        # type: () -> List[QueueMessage]
+        pages = self._client.receive_messages(
+            messages_per_page=self._messages_per_page,
+            visibility_timeout=self._visibility_timeout,
+            timeout=self._timeout,
+            **self._request_kwargs).by_page()
+        try:
+            page = await pages.__anext__()
+        except StopAsyncIteration:
+            return []
+        return [message async for message in page]
+
+    async def _receive_loop(self):
+        idle_wait = 0
+        while not self._stopping.is_set():
+            start = time.time()
+            try:
+                messages = await self._receive()
+            except Exception as error:  # pylint: disable=broad-except
+                self.metrics._increment('receive_errors')  # pylint: disable=protected-access
+                _LOGGER.warning("Failed to receive queue messages: %r", error)
+                self._report_error(None, error)
+                await self._wait_stopping(self._max_idle_wait)
+                continue
+            self.metrics._record('receive_latency', time.time() - start)  # pylint: disable=protected-access
+            if not messages:
+                idle_wait = min(max(idle_wait * 2, _MIN_IDLE_WAIT), self._max_idle_wait)
+                await self._wait_stopping(idle_wait)
+                continue
+            idle_wait = 0
+            self.metrics._increment('received', len(messages))  # pylint: disable=protected-access
+            for message in messages:
+                self.metrics._increment('buffered')  # pylint: disable=protected-access
+                await self._buffer.put(message)
+
+    async def _handle_loop(self):
+        while True:
+            message = await self._buffer.get()
+            if message is None:
+                return
+            self.metrics._increment('buffered', -1)  # pylint: disable=protected-access
+            start = time.time()
+            try:
+                await self._handler(message)
+            except Exception as error:  # pylint: disable=broad-except
+                self.metrics._record('handle_latency', time.time() - start)  # pylint: disable=protected-access
+                self.metrics._increment('failed')  # pylint: disable=protected-access
+                _LOGGER.warning("Handler failed for queue message %s: %r", message.id, error)
+                self._report_error(message, error)
+                if self._error_visibility_timeout is not None:
+                    await self._settle(self._release(message))
+                continue
+            self.metrics._record('handle_latency', time.time() - start)  # pylint: disable=protected-access
+            self.metrics._increment('handled')  # pylint: disable=protected-access
+            await self._settle(self._delete(message))
+
+    async def _settle(self, operation):
+        # Wait for a free settlement slot so that handlers slow down with the service.
+        await self._settlements.acquire()
+        task = asyncio.ensure_future(operation)
+        self._pending_settlements.add(task)
+
+        def _done(finished):
+            self._pending_settlements.discard(finished)
+            self._settlements.release()
+        task.add_done_callback(_done)
+
+    async def _delete(self, message):
+        start = time.time()
+        try:
+            await self._client.delete_message(message, timeout=self._timeout, **self._request_kwargs)
+        except AzureError as error:
+            self.metrics._increment('settle_errors')  # pylint: disable=protected-access
+            _LOGGER.warning("Failed to delete queue message %s: %r", message.id, error)
+            return
+        self.metrics._record('settle_latency', time.time() - start)  # pylint: disable=protected-access
+        self.metrics._increment('deleted')  # pylint: disable=protected-access
+
+    async def _release(self, message):
+        start = time.time()
+        try:
+            await self._client.update_message(
+                message,
+                visibility_timeout=self._error_visibility_timeout,
+                timeout=self._timeout,
+                **self._request_kwargs)
+        except AzureError as error:
+            self.metrics._increment('settle_errors')  # pylint: disable=protected-access
+            _LOGGER.warning("Failed to update queue message %s: %r", message.id, error)
+            return
+        self.metrics._record('settle_latency', time.time() - start)  # pylint: disable=protected-access
+        self.metrics._increment('released')  # pylint: disable=protected-access
@@ -35,6 +35,7 @@ from .._shared.response_handlers import (
     return_response_headers,
     process_storage_error,
     return_headers_and_deserialized,
+    use_header_deserializer,
 )
 from .._deserialize import deserialize_queue_properties, deserialize_queue_creation
 from .._generated.aio import AzureQueueStorage
@@ -104,7 +105,8 @@ class QueueClient(AsyncStorageAccountHostsMixin, QueueClientBase):
         super(QueueClient, self).__init__(
             account_url, queue_name=queue_name, credential=credential, loop=loop, **kwargs
         )
-        self._client = AzureQueueStorage(self.url, pipeline=self._pipeline, loop=loop)  # type: ignore
+        self._client = use_header_deserializer(
+            AzureQueueStorage(self.url, pipeline=self._pipeline, loop=loop))  # type: ignore
         self._loop = loop
 
     @distributed_trace_async
@@ -22,7 +22,7 @@ from .._shared.policies_async import ExponentialRetry
 from .._queue_service_client import QueueServiceClient as QueueServiceClientBase
 from .._shared.models import LocationMode
 from .._shared.base_client_async import AsyncStorageAccountHostsMixin, AsyncTransportWrapper
-from .._shared.response_handlers import process_storage_error
+from .._shared.response_handlers import process_storage_error, use_header_deserializer
 from .._generated.aio import AzureQueueStorage
 from .._generated.models import StorageServiceProperties, StorageErrorException
 
@@ -94,7 +94,8 @@ class QueueServiceClient(AsyncStorageAccountHostsMixin, QueueServiceClientBase):
             credential=credential,
             loop=loop,
             **kwargs)
-        self._client = AzureQueueStorage(url=self.url, pipeline=self._pipeline, loop=loop) # type: ignore
+        self._client = use_header_deserializer(
+            AzureQueueStorage(url=self.url, pipeline=self._pipeline, loop=loop)) # type: ignore
         self._loop = loop
 
     @distributed_trace_async
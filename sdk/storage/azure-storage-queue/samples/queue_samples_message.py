@@ -220,3 +220,32 @@ class QueueMessageSamples(object):
         finally:
             # Delete the queue
             queue.delete_queue()
+
+    def message_pump(self):
+        # Instantiate a queue client
+        from azure.storage.queue import QueueClient
+        queue = QueueClient.from_connection_string(self.connection_string, "my_queue")
+
+        # Create the queue
+        queue.create_queue()
+
+        try:
+            # Send messages
+            for i in range(100):
+                queue.send_message(u"message {}".format(i))
+
+            # [START message_pump]
+            from azure.storage.queue import QueueMessagePump
+
+            def handler(message):
+                print(message.content)
+
+            # Keep 4 dequeue requests in flight and handle messages on 16 threads
+            pump = QueueMessagePump(queue, handler, max_concurrent_receives=4, max_concurrent_calls=16)
+            metrics = pump.run(duration=10)
+            print(metrics.deleted, metrics.handle_latency.average)
+            # [END message_pump]
+
+        finally:
+            # Delete the queue
+            queue.delete_queue()
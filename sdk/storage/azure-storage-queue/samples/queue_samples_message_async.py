@@ -227,3 +227,31 @@ class QueueMessageSamplesAsync(object):
         finally:
             # Delete the queue
             await queue.delete_queue()
+
+    async def message_pump(self):
+        # Instantiate a queue client
+        from azure.storage.queue.aio import QueueClient
+        queue = QueueClient.from_connection_string(self.connection_string, "my_queue")
+
+        # Create the queue
+        await queue.create_queue()
+
+        try:
+            # Send messages
+            await asyncio.gather(*[queue.send_message(u"message {}".format(i)) for i in range(100)])
+
+            # [START async_message_pump]
+            from azure.storage.queue.aio import QueueMessagePump
+
+            async def handler(message):
+                print(message.content)
+
+            # Keep 4 dequeue requests in flight and run up to 16 handlers at once
+            pump = QueueMessagePump(queue, handler, max_concurrent_receives=4, max_concurrent_calls=16)
+            metrics = await pump.run(duration=10)
+            print(metrics.deleted, metrics.handle_latency.average)
+            # [END async_message_pump]
+
+        finally:
+            # Delete the queue
+            await queue.delete_queue()
@@ -0,0 +1,180 @@
+# coding: utf-8
+
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import threading
+import unittest
+
+from azure.core.exceptions import ResourceNotFoundError
+from azure.core.paging import ItemPaged
+from azure.storage.queue import QueueMessagePump, QueueMessage
+
+
+# ------------------------------------------------------------------------------
+
+class FakeQueueClient(object):
+    """In-memory stand-in for the parts of QueueClient used by the pump."""
+
+    def __init__(self, count):
+        self._lock = threading.Lock()
+        self.visible = []
+        for i in range(count):
+            message = QueueMessage(content=u"message {}".format(i))
+            message.id = str(i)
+            message.pop_receipt = u"receipt"
+            self.visible.append(message)
+        self.deleted = []
+        self.updated = []
+        self.receive_calls = 0
+
+    def _dequeue(self, count):
+        with self._lock:
+            self.receive_calls += 1
+            batch, self.visible = self.visible[:count], self.visible[count:]
+        return batch
+
+    def receive_messages(self, messages_per_page=None, **kwargs):
+        def extract_data(messages):
+            if not messages:
+                raise StopIteration("End of paging")
+            return "TOKEN_IGNORED", messages
+        return ItemPaged(lambda _: self._dequeue(messages_per_page), extract_data)
+
+    def delete_message(self, message, **kwargs):
+        if message.id == "missing":
+            raise ResourceNotFoundError("gone")
+        with self._lock:
+            self.deleted.append(message.id)
+
+    def update_message(self, message, visibility_timeout=None, **kwargs):
+        with self._lock:
+            self.updated.append((message.id, visibility_timeout))
+
+
+class StorageQueueMessagePumpTest(unittest.TestCase):
+
+    def test_pump_handles_and_deletes_all_messages(self):
+        client = FakeQueueClient(200)
+        handled = []
+        lock = threading.Lock()
+
+        def handler(message):
+            with lock:
+                handled.append(message.id)
+
+        pump = QueueMessagePump(client, handler, max_concurrent_receives=3, max_concurrent_calls=4,
+                                messages_per_page=16, max_idle_wait=0.05)
+        with pump:
+            while len(client.deleted) < 200:
+                threading.Event().wait(0.01)
+
+        self.assertFalse(pump.running)
+        self.assertEqual(sorted(handled, key=int), [str(i) for i in range(200)])
+        self.assertEqual(sorted(client.deleted, key=int), [str(i) for i in range(200)])
+        self.assertEqual(pump.metrics.received, 200)
+        self.assertEqual(pump.metrics.handled, 200)
+        self.assertEqual(pump.metrics.deleted, 200)
+        self.assertEqual(pump.metrics.buffered, 0)
+        self.assertEqual(pump.metrics.handle_latency.count, 200)
+        self.assertEqual(pump.metrics.settle_latency.count, 200)
+        self.assertTrue(pump.metrics.receive_latency.count >= 13)
+
+    def test_pump_failed_handler_releases_message(self):
+        client = FakeQueueClient(10)
+        errors = []
+
+        def handler(message):
+            if int(message.id) % 2:
+                raise ValueError("bad message")
+
+        pump = QueueMessagePump(client, handler, max_concurrent_calls=2, error_visibility_timeout=5,
+                                error_handler=lambda m, e: errors.append(m.id), max_idle_wait=0.05)
+        metrics = pump.run(duration=0.5)
+
+        self.assertEqual(metrics.handled, 5)
+        self.assertEqual(metrics.failed, 5)
+        self.assertEqual(metrics.released, 5)
+        self.assertEqual(sorted(client.deleted), ['0', '2', '4', '6', '8'])
+        self.assertEqual(sorted(client.updated), [(i, 5) for i in ['1', '3', '5', '7', '9']])
+        self.assertEqual(sorted(errors), ['1', '3', '5', '7', '9'])
+
+    def test_pump_survives_failing_error_handler(self):
+        client = FakeQueueClient(20)
+
+        def handler(message):
+            raise ValueError("bad message")
+
+        def error_handler(message, error):
+            raise RuntimeError("error handler failed")
+
+        pump = QueueMessagePump(client, handler, max_concurrent_calls=2, max_buffered_messages=2,
+                                error_handler=error_handler, max_idle_wait=0.05)
+        stopped = threading.Event()
+
+        def run():
+            pump.run(duration=0.3)
+            stopped.set()
+
+        runner = threading.Thread(target=run)
+        runner.daemon = True
+        runner.start()
+        self.assertTrue(stopped.wait(5))
+        self.assertEqual(pump.metrics.failed, 20)
+
+    def test_pump_reports_unexpected_receive_errors(self):
+        client = FakeQueueClient(5)
+        errors = []
+        dequeue = client._dequeue
+        calls = []
+
+        def flaky_dequeue(count):
+            calls.append(count)
+            if len(calls) == 1:
+                raise TypeError("unexpected")
+            return dequeue(count)
+
+        client._dequeue = flaky_dequeue
+        pump = QueueMessagePump(client, lambda m: None, max_concurrent_receives=1,
+                                error_handler=lambda m, e: errors.append((m, e)), max_idle_wait=0.05)
+        metrics = pump.run(duration=0.3)
+
+        self.assertEqual(metrics.receive_errors, 1)
+        self.assertEqual(metrics.handled, 5)
+        self.assertEqual(len(errors), 1)
+        self.assertIsNone(errors[0][0])
+        self.assertIsInstance(errors[0][1], TypeError)
+
+    def test_pump_counts_settlement_errors(self):
+        client = FakeQueueClient(1)
+        client.visible[0].id = "missing"
+        pump = QueueMessagePump(client, lambda m: None, max_idle_wait=0.05)
+        metrics = pump.run(duration=0.3)
+
+        self.assertEqual(metrics.handled, 1)
+        self.assertEqual(metrics.deleted, 0)
+        self.assertEqual(metrics.settle_errors, 1)
+
+    def test_pump_invalid_arguments(self):
+        client = FakeQueueClient(0)
+        with self.assertRaises(ValueError):
+            QueueMessagePump(client, lambda m: None, messages_per_page=33)
+        with self.assertRaises(ValueError):
+            QueueMessagePump(client, lambda m: None, max_concurrent_calls=0)
+
+    def test_pump_cannot_start_twice(self):
+        client = FakeQueueClient(0)
+        pump = QueueMessagePump(client, lambda m: None, max_idle_wait=0.05)
+        pump.start()
+        try:
+            with self.assertRaises(ValueError):
+                pump.start()
+        finally:
+            pump.stop()
+
+
+# ------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
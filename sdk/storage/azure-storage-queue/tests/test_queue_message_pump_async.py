@@ -0,0 +1,177 @@
+# coding: utf-8
+
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import asyncio
+import unittest
+
+from azure.core.async_paging import AsyncItemPaged
+from azure.core.exceptions import ResourceNotFoundError
+from azure.storage.queue import QueueMessage
+from azure.storage.queue.aio import QueueMessagePump
+
+
+# ------------------------------------------------------------------------------
+
+class FakeQueueClient(object):
+    """In-memory stand-in for the parts of the async QueueClient used by the pump."""
+
+    def __init__(self, count):
+        self.visible = []
+        for i in range(count):
+            message = QueueMessage(content=u"message {}".format(i))
+            message.id = str(i)
+            message.pop_receipt = u"receipt"
+            self.visible.append(message)
+        self.deleted = []
+        self.updated = []
+
+    def receive_messages(self, messages_per_page=None, **kwargs):
+        async def get_next(_):
+            await asyncio.sleep(0)
+            batch, self.visible = self.visible[:messages_per_page], self.visible[messages_per_page:]
+            return batch
+
+        async def extract_data(messages):
+            if not messages:
+                raise StopAsyncIteration("End of paging")
+            return "TOKEN_IGNORED", messages
+        return AsyncItemPaged(get_next, extract_data)
+
+    async def delete_message(self, message, **kwargs):
+        await asyncio.sleep(0)
+        if message.id == "missing":
+            raise ResourceNotFoundError("gone")
+        self.deleted.append(message.id)
+
+    async def update_message(self, message, visibility_timeout=None, **kwargs):
+        await asyncio.sleep(0)
+        self.updated.append((message.id, visibility_timeout))
+
+
+class StorageQueueMessagePumpTestAsync(unittest.TestCase):
+
+    def _run(self, coro):
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(coro)
+        finally:
+            loop.close()
+
+    async def _test_pump_handles_and_deletes_all_messages(self):
+        client = FakeQueueClient(200)
+        handled = []
+
+        async def handler(message):
+            await asyncio.sleep(0)
+            handled.append(message.id)
+
+        pump = QueueMessagePump(client, handler, max_concurrent_receives=3, max_concurrent_calls=4,
+                                messages_per_page=16, max_idle_wait=0.05)
+        async with pump:
+            while len(client.deleted) < 200:
+                await asyncio.sleep(0.01)
+
+        self.assertFalse(pump.running)
+        self.assertEqual(sorted(handled, key=int), [str(i) for i in range(200)])
+        self.assertEqual(sorted(client.deleted, key=int), [str(i) for i in range(200)])
+        self.assertEqual(pump.metrics.received, 200)
+        self.assertEqual(pump.metrics.handled, 200)
+        self.assertEqual(pump.metrics.deleted, 200)
+        self.assertEqual(pump.metrics.buffered, 0)
+        self.assertEqual(pump.metrics.settle_latency.count, 200)
+
+    def test_pump_handles_and_deletes_all_messages(self):
+        self._run(self._test_pump_handles_and_deletes_all_messages())
+
+    async def _test_pump_failed_handler_releases_message(self):
+        client = FakeQueueClient(10)
+
+        async def handler(message):
+            if int(message.id) % 2:
+                raise ValueError("bad message")
+
+        pump = QueueMessagePump(client, handler, max_concurrent_calls=2, error_visibility_timeout=5,
+                                max_idle_wait=0.05)
+        metrics = await pump.run(duration=0.3)
+
+        self.assertEqual(metrics.handled, 5)
+        self.assertEqual(metrics.failed, 5)
+        self.assertEqual(metrics.released, 5)
+        self.assertEqual(sorted(client.deleted), ['0', '2', '4', '6', '8'])
+        self.assertEqual(sorted(client.updated), [(i, 5) for i in ['1', '3', '5', '7', '9']])
+
+    def test_pump_failed_handler_releases_message(self):
+        self._run(self._test_pump_failed_handler_releases_message())
+
+    async def _test_pump_survives_failing_error_handler(self):
+        client = FakeQueueClient(20)
+
+        async def handler(message):
+            raise ValueError("bad message")
+
+        def error_handler(message, error):
+            raise RuntimeError("error handler failed")
+
+        pump = QueueMessagePump(client, handler, max_concurrent_calls=2, max_buffered_messages=2,
+                                error_handler=error_handler, max_idle_wait=0.05)
+        metrics = await asyncio.wait_for(pump.run(duration=0.3), 5)
+
+        self.assertEqual(metrics.failed, 20)
+
+    def test_pump_survives_failing_error_handler(self):
+        self._run(self._test_pump_survives_failing_error_handler())
+
+    async def _test_pump_reports_unexpected_receive_errors(self):
+        client = FakeQueueClient(5)
+        errors = []
+        receive_messages = client.receive_messages
+        calls = []
+
+        def flaky_receive_messages(**kwargs):
+            calls.append(kwargs)
+            if len(calls) == 1:
+                raise TypeError("unexpected")
+            return receive_messages(**kwargs)
+
+        client.receive_messages = flaky_receive_messages
+
+        async def handler(message):
+            pass
+
+        pump = QueueMessagePump(client, handler, max_concurrent_receives=1,
+                                error_handler=lambda m, e: errors.append((m, e)), max_idle_wait=0.05)
+        metrics = await pump.run(duration=0.3)
+
+        self.assertEqual(metrics.receive_errors, 1)
+        self.assertEqual(metrics.handled, 5)
+        self.assertEqual(len(errors), 1)
+        self.assertIsNone(errors[0][0])
+        self.assertIsInstance(errors[0][1], TypeError)
+
+    def test_pump_reports_unexpected_receive_errors(self):
+        self._run(self._test_pump_reports_unexpected_receive_errors())
+
+    async def _test_pump_counts_settlement_errors(self):
+        client = FakeQueueClient(1)
+        client.visible[0].id = "missing"
+
+        async def handler(message):
+            pass
+
+        metrics = await QueueMessagePump(client, handler, max_idle_wait=0.05).run(duration=0.2)
+
+        self.assertEqual(metrics.handled, 1)
+        self.assertEqual(metrics.deleted, 0)
+        self.assertEqual(metrics.settle_errors, 1)
+
+    def test_pump_counts_settlement_errors(self):
+        self._run(self._test_pump_counts_settlement_errors())
+
+
+# ------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
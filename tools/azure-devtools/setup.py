@@ -50,6 +50,7 @@ setup(
         'azure_devtools',
         'azure_devtools.scenario_tests',
         'azure_devtools.ci_tools',
+        'azure_devtools.perfstress_tests',
     ],
     extras_require={
         'ci_tools':[
@@ -60,4 +61,9 @@ setup(
     },
     package_dir={'': 'src'},
     install_requires=DEPENDENCIES,
+    entry_points={
+        'console_scripts': [
+            'perfstress = azure_devtools.perfstress_tests:run_perfstress_cmd',
+        ],
+    },
 )
@@ -0,0 +1,10 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+import sys
+
+# Ignore collection of the performance test runner and its tests for Python 2, it requires Python 3.5
+collect_ignore = []
+if sys.version_info < (3, 5):
+    collect_ignore.append("perfstress_tests")
@@ -0,0 +1,14 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import sys
+
+if sys.version_info < (3, 5):
+    raise ImportError("azure_devtools.perfstress_tests requires Python 3.5 or later.")
+
+from .perf_stress_test import PerfStressTest  # pylint: disable=wrong-import-position
+from .perf_stress_runner import PerfStressRunner, discover_tests, run_perfstress_cmd  # pylint: disable=wrong-import-position
+
+__all__ = ['PerfStressTest', 'PerfStressRunner', 'discover_tests', 'run_perfstress_cmd']
@@ -0,0 +1,138 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+"""Transports answering the requests of an azure-core pipeline in memory, for tests to measure
+the clients and pipeline without a service or the network.
+
+This module requires azure-core, which azure-devtools does not depend on.
+"""
+
+import asyncio
+
+from azure.core.pipeline.transport import AsyncHttpResponse, AsyncHttpTransport, HttpResponse, HttpTransport
+
+
+def _consume_body(request):
+    # Streamed bodies, such as the chunks of an upload, are read as a transport would
+    data = request.data
+    if data is None or isinstance(data, (bytes, str, dict)):
+        return
+    if hasattr(data, 'read'):
+        while data.read(64 * 1024):
+            pass
+    else:
+        for _ in data:
+            pass
+
+
+class _StreamDownload(object):  # pylint: disable=too-few-public-methods
+    def __init__(self, response):
+        self.response = response
+        self._iterator = iter([response.body()] if response.body() else [])
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._iterator)
+
+
+
+class MockHttpResponse(HttpResponse):
+    def __init__(self, request, status_code, headers, body):
+        super(MockHttpResponse, self).__init__(request, None)
+        self.status_code = status_code
+        self.reason = 'OK' if status_code < 400 else 'Error'
+        self.headers = headers
+        self.content_type = headers.get('Content-Type')
+        self._body = body
+
+    def body(self):
+        return self._body
+
+    def stream_download(self, pipeline):
+        return _StreamDownload(self)
+
+
+class MockTransport(HttpTransport):
+    """A transport answering each request with what a responder returns for it.
+
+    :param responder: A callable taking an ~azure.core.pipeline.transport.HttpRequest, and returning
+     the status code, headers and body of the response to it.
+    :type responder: callable[[~azure.core.pipeline.transport.HttpRequest], tuple[int, dict, bytes]]
+    """
+
+    def __init__(self, responder):
+        self.responder = responder
+
+    def __exit__(self, *args):
+        pass
+
+    def open(self):
+        pass
+
+    def close(self):
+        pass
+
+    def send(self, request, **kwargs):
+        _consume_body(request)
+        status_code, headers, body = self.responder(request)
+        return MockHttpResponse(request, status_code, headers, body)
+
+
+class _AsyncStreamDownload(object):  # pylint: disable=too-few-public-methods
+    def __init__(self, response):
+        self.response = response
+        self._done = not response.body()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._done:
+            raise StopAsyncIteration()
+        self._done = True
+        return self.response.body()
+
+
+class AsyncMockHttpResponse(AsyncHttpResponse):
+    def __init__(self, request, status_code, headers, body):
+        super(AsyncMockHttpResponse, self).__init__(request, None)
+        self.status_code = status_code
+        self.reason = 'OK' if status_code < 400 else 'Error'
+        self.headers = headers
+        self.content_type = headers.get('Content-Type')
+        self._body = body
+
+    def body(self):
+        return self._body
+
+    async def load_body(self):
+        return
+
+    def stream_download(self, pipeline):
+        return _AsyncStreamDownload(self)
+
+
+class AsyncMockTransport(AsyncHttpTransport):
+    """The asynchronous MockTransport. The responder is the same, a synchronous callable."""
+
+    def __init__(self, responder):
+        self.responder = responder
+
+    async def __aexit__(self, *args):
+        pass
+
+    async def open(self):
+        pass
+
+    async def close(self):
+        pass
+
+    async def send(self, request, **kwargs):
+        _consume_body(request)
+        # Yield to the other tasks, as waiting on the network would
+        await asyncio.sleep(0)
+        status_code, headers, body = self.responder(request)
+        return AsyncMockHttpResponse(request, status_code, headers, body)
@@ -0,0 +1,312 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import argparse
+import asyncio
+import importlib.util
+import inspect
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import sys
+import threading
+import time
+from queue import Empty
+
+from .perf_stress_test import PerfStressTest
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+MODES = ('thread', 'process', 'asyncio')
+
+_LOGGER = logging.getLogger('azure_devtools.perfstress_tests')
+
+
+def discover_tests(test_path):
+    """Import the modules of a directory, and find the PerfStressTest subclasses they define.
+
+    :returns: The classes by name, with the path of the module defining them.
+    :rtype: dict[str, tuple[type, str]]
+    """
+    if test_path not in sys.path:
+        # So the tests can import the modules next to them
+        sys.path.insert(0, test_path)
+    tests = {}
+    for file_name in sorted(os.listdir(test_path)):
+        if not file_name.endswith('.py') or file_name.startswith('_'):
+            continue
+        module_path = os.path.join(test_path, file_name)
+        module = _load_module(module_path)
+        for name, cls in inspect.getmembers(module, inspect.isclass):
+            if issubclass(cls, PerfStressTest) and cls is not PerfStressTest and cls.__module__ == module.__name__:
+                tests[name] = (cls, module_path)
+    return tests
+
+
+def _load_module(module_path):
+    module_name = 'perfstress_tests_' + os.path.splitext(os.path.basename(module_path))[0]
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    spec = importlib.util.spec_from_file_location(module_name, module_path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def peak_memory_mb():
+    """The peak resident memory of this process in MB, or None where it cannot be read."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024.0 * 1024.0) if sys.platform == 'darwin' else peak / 1024.0
+
+
+class _WorkerResult(object):  # pylint: disable=too-few-public-methods
+    def __init__(self, latencies=None, error=None, memory=None):
+        self.latencies = latencies or []
+        self.error = error
+        self.memory = memory
+
+
+def _measure(run, measure_from, stop_at):
+    latencies = []
+    while True:
+        start = time.time()
+        if start >= stop_at:
+            return _WorkerResult(latencies)
+        began = time.perf_counter()
+        try:
+            run()
+        except Exception as e:  # pylint: disable=broad-except
+            return _WorkerResult(latencies, error=repr(e))
+        if start >= measure_from:
+            latencies.append(time.perf_counter() - began)
+
+
+async def _measure_async(run, measure_from, stop_at):
+    latencies = []
+    while True:
+        start = time.time()
+        if start >= stop_at:
+            return _WorkerResult(latencies)
+        began = time.perf_counter()
+        try:
+            await run()
+        except Exception as e:  # pylint: disable=broad-except
+            return _WorkerResult(latencies, error=repr(e))
+        if start >= measure_from:
+            latencies.append(time.perf_counter() - began)
+
+
+def _new_event_loop():
+    # Made current, for the clients the tests create to find it
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    return loop
+
+
+def _process_worker(module_path, class_name, arguments, barrier, results):
+    loop = _new_event_loop()
+    try:
+        test = getattr(_load_module(module_path), class_name)(arguments)
+        loop.run_until_complete(test.global_setup())
+        loop.run_until_complete(test.setup())
+    except Exception as e:  # pylint: disable=broad-except
+        barrier.abort()
+        results.put(([], 'Setup failed: {!r}'.format(e), peak_memory_mb()))
+        return
+    try:
+        barrier.wait()
+    except threading.BrokenBarrierError:
+        return
+    # Every process starts measuring at the same time, give or take how long the barrier takes to release them
+    measure_from = time.time() + arguments.warmup
+    result = _measure(test.run_sync, measure_from, measure_from + arguments.duration)
+    try:
+        if not arguments.no_cleanup:
+            loop.run_until_complete(test.cleanup())
+            loop.run_until_complete(test.global_cleanup())
+        loop.run_until_complete(test.close())
+    finally:
+        loop.close()
+    results.put((result.latencies, result.error, peak_memory_mb()))
+
+
+def _percentile(ordered, percent):
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100.0))]
+
+
+class PerfStressRunner(object):
+    """Run a PerfStressTest from parallel workers for a given duration, and report how it performed.
+
+    The test is discovered by name among the modules of `--test-path`, and its own options are added
+    to the command line. Workers are threads calling `run_sync`, processes calling `run_sync`, or asyncio
+    tasks calling `run_async`, depending on `--mode`. Each worker runs the operation for `--warmup`
+    seconds before it is measured, then for `--duration` seconds.
+
+    :param argv: The command line arguments. Default is `sys.argv[1:]`.
+    :type argv: list[str]
+    """
+
+    def __init__(self, argv=None):
+        parser = argparse.ArgumentParser(prog='perfstress', description='Run a performance test.')
+        parser.add_argument('test', help='The name of the test class to run.')
+        parser.add_argument('--test-path', default=os.path.join('tests', 'perfstress_tests'),
+                            help='The directory of the test modules. Default is tests/perfstress_tests.')
+        parser.add_argument('-d', '--duration', type=float, default=10, help='Seconds to measure for. Default 10.')
+        parser.add_argument('-w', '--warmup', type=float, default=5,
+                            help='Seconds to run before measuring. Default 5.')
+        parser.add_argument('-p', '--parallel', type=int, default=1, help='The number of workers. Default 1.')
+        parser.add_argument('-m', '--mode', choices=MODES, default='thread',
+                            help='Run the workers as threads, processes or asyncio tasks. Default thread.')
+        parser.add_argument('--json', dest='json_path', help='Also write the results to this JSON file.')
+        parser.add_argument('--no-cleanup', action='store_true', help='Do not run the cleanup of the test.')
+
+        known, _ = parser.parse_known_args(argv)
+        self.tests = discover_tests(os.path.abspath(known.test_path))
+        if known.test not in self.tests:
+            parser.error("No test named '{}' in {}. Tests found: {}".format(
+                known.test, known.test_path, ', '.join(sorted(self.tests)) or 'none'))
+        self.test_class, self.module_path = self.tests[known.test]
+        self.test_class.add_arguments(parser)
+        self.args = parser.parse_args(argv)
+        if self.args.parallel < 1:
+            parser.error('--parallel must be 1 or greater.')
+
+    def _run_threads(self, loop, tests, measure_from, stop_at):
+        results = [None] * len(tests)
+
+        def worker(index):
+            results[index] = _measure(tests[index].run_sync, measure_from, stop_at)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(len(tests))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def _run_local(self):
+        loop = _new_event_loop()
+        tests = [self.test_class(self.args) for _ in range(self.args.parallel)]
+        try:
+            loop.run_until_complete(tests[0].global_setup())
+            try:
+                loop.run_until_complete(asyncio.gather(*[t.setup() for t in tests]))
+                measure_from = time.time() + self.args.warmup
+                stop_at = measure_from + self.args.duration
+                if self.args.mode == 'asyncio':
+                    results = loop.run_until_complete(asyncio.gather(
+                        *[_measure_async(t.run_async, measure_from, stop_at) for t in tests]))
+                else:
+                    results = self._run_threads(loop, tests, measure_from, stop_at)
+                if not self.args.no_cleanup:
+                    loop.run_until_complete(asyncio.gather(*[t.cleanup() for t in tests]))
+            finally:
+                if not self.args.no_cleanup:
+                    loop.run_until_complete(tests[0].global_cleanup())
+                loop.run_until_complete(asyncio.gather(*[t.close() for t in tests]))
+        finally:
+            loop.close()
+        memory = peak_memory_mb()
+        for result in results:
+            result.memory = memory
+        return results
+
+    def _run_processes(self):
+        # Only the processes wait on the barrier, so one dying before it cannot block this one
+        barrier = multiprocessing.Barrier(self.args.parallel)
+        queue = multiprocessing.Queue()
+        processes = [
+            multiprocessing.Process(
+                target=_process_worker,
+                args=(self.module_path, self.test_class.__name__, self.args, barrier, queue))
+            for _ in range(self.args.parallel)]
+        for process in processes:
+            process.start()
+        results = []
+        while len(results) < len(processes):
+            try:
+                results.append(_WorkerResult(*queue.get(timeout=1)))
+            except Empty:
+                if any(p.exitcode not in (None, 0) for p in processes):
+                    # Release the processes waiting for the one that died
+                    barrier.abort()
+                if all(p.exitcode is not None for p in processes) and queue.empty():
+                    break
+        for process in processes:
+            process.join()
+            if process.exitcode:
+                results.append(_WorkerResult(error='Process exited with code {}'.format(process.exitcode)))
+        return results
+
+    def run(self):
+        """Run the test, print a summary, and write the results to `--json` if given.
+
+        :returns: The results: operations per second, latency percentiles in milliseconds,
+         peak memory in MB, and the errors the workers stopped on.
+        :rtype: dict
+        """
+        _LOGGER.info('Running %s', self.test_class.__name__)
+        if self.args.mode == 'process':
+            worker_results = self._run_processes()
+        else:
+            worker_results = self._run_local()
+
+        ordered = sorted(l * 1000 for r in worker_results for l in r.latencies)
+        memory = [r.memory for r in worker_results if r.memory is not None]
+        results = {
+            'test': self.test_class.__name__,
+            'mode': self.args.mode,
+            'parallel': self.args.parallel,
+            'warmup': self.args.warmup,
+            'duration': self.args.duration,
+            'arguments': dict((k, v) for k, v in vars(self.args).items() if k not in ('test', 'json_path')),
+            'operations': len(ordered),
+            'operations_per_second': len(ordered) / self.args.duration,
+            'latency_ms': {
+                'mean': sum(ordered) / len(ordered) if ordered else 0.0,
+                'p50': _percentile(ordered, 50),
+                'p90': _percentile(ordered, 90),
+                'p99': _percentile(ordered, 99),
+                'p99.9': _percentile(ordered, 99.9),
+                'max': ordered[-1] if ordered else 0.0,
+            },
+            'peak_memory_mb': max(memory) if memory else None,
+            'errors': [r.error for r in worker_results if r.error],
+            'python': platform.python_version(),
+        }
+        self._print(results)
+        if self.args.json_path:
+            with open(self.args.json_path, 'w') as f:
+                json.dump(results, f, indent=2)
+        return results
+
+    @staticmethod
+    def _print(results):
+        latency = results['latency_ms']
+        print('{test}: {operations_per_second:.2f} ops/s, {operations} operations in {duration}s '
+              'from {parallel} {mode} workers'.format(**results))
+        print('  latency ms: mean {:.3f}, p50 {:.3f}, p90 {:.3f}, p99 {:.3f}, p99.9 {:.3f}, max {:.3f}'.format(
+            latency['mean'], latency['p50'], latency['p90'], latency['p99'], latency['p99.9'], latency['max']))
+        if results['peak_memory_mb'] is not None:
+            print('  peak memory: {:.1f} MB per process'.format(results['peak_memory_mb']))
+        for error in results['errors']:
+            print('  worker stopped on error: {}'.format(error))
+
+
+def run_perfstress_cmd():
+    results = PerfStressRunner().run()
+    sys.exit(1 if results['errors'] else 0)
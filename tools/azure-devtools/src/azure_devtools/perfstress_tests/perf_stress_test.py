@@ -0,0 +1,48 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+
+class PerfStressTest(object):
+    """Base class for the tests run by PerfStressRunner.
+
+    A test runs one operation, with `run_sync` from threads and processes, and `run_async` from
+    asyncio tasks. Each worker has its own instance of the test. `global_setup` and `global_cleanup`
+    run once per process on the first instance, and `setup` and `cleanup` run on every instance,
+    outside of the measurement. All of them are coroutines, run on an event loop in every mode.
+    """
+
+    def __init__(self, arguments):
+        self.args = arguments
+
+    async def global_setup(self):
+        return
+
+    async def global_cleanup(self):
+        return
+
+    async def setup(self):
+        return
+
+    async def cleanup(self):
+        return
+
+    async def close(self):
+        """Release the resources of the instance, such as the clients it opened."""
+        return
+
+    def run_sync(self):
+        raise NotImplementedError("{} does not support synchronous runs.".format(type(self).__name__))
+
+    async def run_async(self):
+        raise NotImplementedError("{} does not support asynchronous runs.".format(type(self).__name__))
+
+    @staticmethod
+    def add_arguments(parser):
+        """Add the options of the test to the command line parser.
+
+        :param parser: The parser of the runner.
+        :type parser: ~argparse.ArgumentParser
+        """
+        return
@@ -0,0 +1,84 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import json
+import os
+import shutil
+import tempfile
+import textwrap
+import unittest
+
+from azure_devtools.perfstress_tests import PerfStressRunner
+
+
+_TESTS = textwrap.dedent('''
+    from azure_devtools.perfstress_tests import PerfStressTest
+
+
+    class NoOpTest(PerfStressTest):
+        def run_sync(self):
+            pass
+
+        async def run_async(self):
+            pass
+
+        @staticmethod
+        def add_arguments(parser):
+            parser.add_argument('--size', type=int, default=1)
+
+
+    class FailingTest(PerfStressTest):
+        def run_sync(self):
+            raise ValueError('failed')
+''')
+
+
+class TestPerfStressRunner(unittest.TestCase):
+    def setUp(self):
+        self.test_path = tempfile.mkdtemp()
+        with open(os.path.join(self.test_path, 'tests.py'), 'w') as f:
+            f.write(_TESTS)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_path, ignore_errors=True)
+
+    def _run(self, *argv):
+        return PerfStressRunner(list(argv) + ['--test-path', self.test_path, '-d', '0.2', '-w', '0.1']).run()
+
+    def test_discovers_tests_and_their_arguments(self):
+        runner = PerfStressRunner(['NoOpTest', '--test-path', self.test_path, '--size', '5'])
+        self.assertEqual(['FailingTest', 'NoOpTest'], sorted(runner.tests))
+        self.assertEqual(5, runner.args.size)
+
+    def test_unknown_test(self):
+        with self.assertRaises(SystemExit):
+            PerfStressRunner(['MissingTest', '--test-path', self.test_path])
+
+    def test_run_threads(self):
+        results = self._run('NoOpTest', '--parallel', '2')
+        self.assertGreater(results['operations'], 0)
+        self.assertEqual([], results['errors'])
+        self.assertLessEqual(results['latency_ms']['p50'], results['latency_ms']['max'])
+
+    def test_run_asyncio(self):
+        results = self._run('NoOpTest', '--mode', 'asyncio', '--parallel', '2')
+        self.assertGreater(results['operations'], 0)
+        self.assertEqual('asyncio', results['mode'])
+
+    def test_run_processes(self):
+        results = self._run('NoOpTest', '--mode', 'process', '--parallel', '2')
+        self.assertGreater(results['operations'], 0)
+        self.assertEqual([], results['errors'])
+
+    def test_worker_stops_on_error(self):
+        results = self._run('FailingTest')
+        self.assertEqual(0, results['operations'])
+        self.assertEqual(["ValueError('failed')"], results['errors'])
+
+    def test_json_output(self):
+        json_path = os.path.join(self.test_path, 'results.json')
+        results = self._run('NoOpTest', '--json', json_path)
+        with open(json_path) as f:
+            self.assertEqual(results, json.load(f))
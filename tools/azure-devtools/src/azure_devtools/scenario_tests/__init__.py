@@ -13,6 +13,7 @@ from .recording_processors import (
     LargeRequestBodyProcessor, LargeResponseBodyProcessor, LargeResponseBodyReplacer,
     OAuthRequestResponsesFilter, DeploymentNameReplacer, GeneralNameReplacer, AccessTokenReplacer, RequestUrlNormalizer,
 )
+from .replay_server import ReplayServer, ReplayStats
 from .utilities import create_random_name, get_sha1_hash
 
 __all__ = ['IntegrationTestBase', 'ReplayableTest', 'LiveTest',
@@ -23,6 +24,7 @@ __all__ = ['IntegrationTestBase', 'ReplayableTest', 'LiveTest',
            'LargeRequestBodyProcessor', 'LargeResponseBodyProcessor', 'LargeResponseBodyReplacer',
            'OAuthRequestResponsesFilter', 'DeploymentNameReplacer', 'GeneralNameReplacer',
            'AccessTokenReplacer', 'RequestUrlNormalizer',
+           'ReplayServer', 'ReplayStats',
            'live_only', 'record_only',
            'create_random_name', 'get_sha1_hash']
 __version__ = '0.5.2'
@@ -0,0 +1,276 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import io
+import logging
+import ssl
+import threading
+import time
+
+import six
+from six.moves import BaseHTTPServer, socketserver  # pylint: disable=import-error
+from six.moves.urllib_parse import urlparse  # pylint: disable=import-error
+from vcr.request import Request
+from vcr.serialize import deserialize
+from vcr.serializers import yamlserializer
+
+from .base import ReplayableTest
+
+
+_LOGGER = logging.getLogger('azure_devtools.scenario_tests')
+
+# Headers of a recorded response the server sets itself, or that describe how it was sent
+_SERVER_HEADERS = ('connection', 'content-encoding', 'content-length', 'date', 'keep-alive', 'server',
+                   'transfer-encoding')
+
+_CHUNK_SIZE = 64 * 1024
+
+
+def load_interactions(cassette_path):
+    """Read the recorded requests and responses of a cassette."""
+    with io.open(cassette_path, 'r', encoding='utf-8') as cassette:
+        return list(zip(*deserialize(cassette.read(), yamlserializer)))
+
+
+class ReplayStats(object):  # pylint: disable=too-few-public-methods
+    """Counters of the requests a ReplayServer received, with a sample of those no recording matched."""
+
+    def __init__(self):
+        self.requests = 0
+        self.misses = 0
+        self.bytes_sent = 0
+        self.missed = []
+        self._lock = threading.Lock()
+
+    def record(self, bytes_sent=0, missed=None):
+        with self._lock:
+            self.requests += 1
+            self.bytes_sent += bytes_sent
+            if missed:
+                self.misses += 1
+                if len(self.missed) < 20:
+                    self.missed.append(missed)
+
+    def __repr__(self):
+        return 'ReplayStats(requests={}, misses={}, bytes_sent={})'.format(
+            self.requests, self.misses, self.bytes_sent)
+
+
+class _Recording(object):  # pylint: disable=too-few-public-methods
+    def __init__(self, request, response):
+        self.request = request
+        self.status = response['status']['code']
+        self.reason = response['status'].get('message') or ''
+        self.headers = []
+        for key, values in response['headers'].items():
+            if key.lower() in _SERVER_HEADERS:
+                continue
+            for value in values if isinstance(values, list) else [values]:
+                self.headers.append((key, value))
+        body = response['body']['string'] or b''
+        self.body = body.encode('utf-8') if isinstance(body, six.text_type) else body
+        self.played = False
+
+
+class ReplayServer(object):  # pylint: disable=too-many-instance-attributes
+    """A local HTTP(S) server answering requests with the responses recorded in cassettes.
+
+    Unlike ReplayableTest, which patches the HTTP stack in-process, this serves recordings over real
+    sockets, so transports, connection pools and pipelines can be measured against it.
+
+    A request is matched on its method, path, query parameters and `match_headers`, ignoring the host.
+    Recordings matching the same request are served in the order they were recorded, and the last of
+    them is served again once all of them have been. The processors are applied to the recordings when
+    they are loaded, and to every request received, so they can normalize both sides of the match.
+    Unmatched requests get a 404 response, and are counted in `stats`.
+
+    :param cassettes: The paths of the cassettes to serve.
+    :param processors: RecordingProcessors applied to recorded and received requests, and to recorded responses.
+    :param match_headers: Request headers that must also match, such as 'x-ms-range' for ranged downloads.
+    :param float latency: Seconds to wait before sending each response.
+    :param int bandwidth: The most bytes per second sent for each response body.
+    :param str host: The address to listen on.
+    :param int port: The port to listen on. By default a free port is picked.
+    :param str certfile: A PEM certificate to serve HTTPS with. By default HTTP is served.
+    :param str keyfile: The private key of the certificate, if not in `certfile`.
+    """
+
+    def __init__(self, cassettes, processors=None, match_headers=None,  # pylint: disable=too-many-arguments
+                 latency=0, bandwidth=None, host='127.0.0.1', port=0, certfile=None, keyfile=None):
+        self.processors = processors or []
+        self.match_headers = [h.lower() for h in match_headers or []]
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.stats = ReplayStats()
+        self._recordings = {}
+        self._lock = threading.Lock()
+        for cassette in cassettes:
+            for request, response in load_interactions(cassette):
+                self._add_recording(request, response)
+
+        self._server = _ThreadingHTTPServer((host, port), _ReplayRequestHandler)
+        self._server.replay = self
+        self.scheme = 'http'
+        if certfile:
+            context = ssl.SSLContext(getattr(ssl, 'PROTOCOL_TLS_SERVER', ssl.PROTOCOL_SSLv23))
+            context.load_cert_chain(certfile, keyfile)
+            # The handshake is done by the thread handling the connection, not the one accepting it
+            self._server.socket = context.wrap_socket(self._server.socket, server_side=True,
+                                                      do_handshake_on_connect=False)
+            self.scheme = 'https'
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return '{}://{}:{}'.format(self.scheme, host, port)
+
+    def _process_request(self, request):
+        for processor in self.processors:
+            request = processor.process_request(request)
+            if not request:
+                return None
+        return request
+
+    def _add_recording(self, request, response):
+        request = self._process_request(request)
+        if not request:
+            return
+        for processor in self.processors:
+            response = processor.process_response(response)
+            if not response:
+                return
+        key = (request.method.upper(), urlparse(request.uri).path)
+        self._recordings.setdefault(key, []).append(_Recording(request, response))
+
+    def _matches(self, recorded, request):
+        if not ReplayableTest._custom_request_query_matcher(recorded, request):  # pylint: disable=protected-access
+            return False
+        return all(recorded.headers.get(h) == request.headers.get(h) for h in self.match_headers)
+
+    def match(self, request):
+        """Find the recording to answer a request with.
+
+        :param request: The received request.
+        :type request: ~vcr.request.Request
+        :returns: The recording, or None if no recording matches the request.
+        """
+        request = self._process_request(request)
+        if not request:
+            return None
+        candidates = self._recordings.get((request.method.upper(), urlparse(request.uri).path), [])
+        matching = [r for r in candidates if self._matches(r.request, request)]
+        if not matching:
+            return None
+        with self._lock:
+            for recording in matching:
+                if not recording.played:
+                    recording.played = True
+                    return recording
+        return matching[-1]
+
+    def reset(self):
+        """Start serving the recordings of each request from the first one again."""
+        with self._lock:
+            for recordings in self._recordings.values():
+                for recording in recordings:
+                    recording.played = False
+
+    def start(self):
+        if self._thread:
+            return
+        self._thread = threading.Thread(target=self._server.serve_forever, name='ReplayServer')
+        self._thread.daemon = True
+        self._thread.start()
+        _LOGGER.info('Replaying %d recorded requests at %s', sum(len(r) for r in self._recordings.values()),
+                     self.url)
+
+    def stop(self):
+        if self._thread:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+
+class _ThreadingHTTPServer(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+    replay = None
+
+
+class _ReplayRequestHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately, which Nagle's algorithm would hold back for delayed acknowledgements
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        if isinstance(self.request, ssl.SSLSocket):
+            self.request.do_handshake()
+        BaseHTTPServer.BaseHTTPRequestHandler.setup(self)
+
+    def _read_body(self):
+        if self.headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size = int(self.rfile.readline().split(b';')[0].strip(), 16)
+                if not size:
+                    self.rfile.readline()
+                    return b''.join(chunks)
+                chunks.append(self.rfile.read(size))
+                self.rfile.readline()
+        length = int(self.headers.get('content-length') or 0)
+        return self.rfile.read(length) if length else None
+
+    def _send_body(self, body, bandwidth):
+        start = time.time()
+        for offset in range(0, len(body), _CHUNK_SIZE):
+            chunk = body[offset:offset + _CHUNK_SIZE]
+            self.wfile.write(chunk)
+            if bandwidth:
+                ahead = (offset + len(chunk)) / float(bandwidth) - (time.time() - start)
+                if ahead > 0:
+                    time.sleep(ahead)
+
+    def _replay(self):
+        replay = self.server.replay
+        body = self._read_body()
+        uri = '{}://{}{}'.format(replay.scheme, self.headers.get('host', ''), self.path)
+        recording = replay.match(Request(self.command, uri, body, dict(self.headers.items())))
+        if replay.latency:
+            time.sleep(replay.latency)
+
+        # Counted before responding, so the stats include a request once its client has the response
+        if recording is None:
+            message = 'No recording matches {} {}'.format(self.command, self.path).encode('utf-8')
+            replay.stats.record(len(message), missed='{} {}'.format(self.command, self.path))
+            self.send_response(404, 'Not Found')
+            self.send_header('x-ms-error-code', 'RecordingNotFound')
+            self.send_header('Content-Type', 'text/plain')
+            self.send_header('Content-Length', str(len(message)))
+            self.end_headers()
+            self.wfile.write(message)
+            return
+
+        replay.stats.record(len(recording.body) if self.command != 'HEAD' else 0)
+        self.send_response(recording.status, recording.reason)
+        for key, value in recording.headers:
+            self.send_header(key, value)
+        self.send_header('Content-Length', str(len(recording.body)))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self._send_body(recording.body, replay.bandwidth)
+
+    do_GET = do_PUT = do_POST = do_DELETE = do_HEAD = do_PATCH = do_OPTIONS = do_MERGE = _replay
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        _LOGGER.debug('%s - %s', self.address_string(), format % args)
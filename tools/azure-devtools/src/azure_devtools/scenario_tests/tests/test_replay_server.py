@@ -0,0 +1,206 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from six.moves import http_client  # pylint: disable=import-error
+
+from azure_devtools.scenario_tests.recording_processors import RecordingProcessor
+from azure_devtools.scenario_tests.replay_server import ReplayServer, load_interactions
+
+
+CASSETTE = u"""interactions:
+- request:
+    body: null
+    headers: {}
+    method: GET
+    uri: https://account.blob.core.windows.net/container-1234/blob?comp=metadata
+  response:
+    body: {string: metadata}
+    headers:
+      Content-Length: ['999']
+      x-ms-meta-name: [value]
+    status: {code: 200, message: OK}
+- request:
+    body: null
+    headers: {}
+    method: GET
+    uri: https://account.blob.core.windows.net/container-1234/blob
+  response:
+    body: {string: first}
+    headers: {}
+    status: {code: 200, message: OK}
+- request:
+    body: null
+    headers: {}
+    method: GET
+    uri: https://account.blob.core.windows.net/container-1234/blob
+  response:
+    body: {string: second}
+    headers: {}
+    status: {code: 200, message: OK}
+- request:
+    body: null
+    headers:
+      x-ms-range: [bytes=0-3]
+    method: GET
+    uri: https://account.blob.core.windows.net/container-1234/ranged
+  response:
+    body: {string: head}
+    headers: {}
+    status: {code: 206, message: Partial Content}
+- request:
+    body: null
+    headers:
+      x-ms-range: [bytes=4-7]
+    method: GET
+    uri: https://account.blob.core.windows.net/container-1234/ranged
+  response:
+    body: {string: tail}
+    headers: {}
+    status: {code: 206, message: Partial Content}
+- request:
+    body: uploaded
+    headers: {}
+    method: PUT
+    uri: https://account.blob.core.windows.net/container-1234/blob
+  response:
+    body: {string: ''}
+    headers:
+      ETag: ['"0x1"']
+    status: {code: 201, message: Created}
+version: 1
+"""
+
+
+class _ContainerNameReplacer(RecordingProcessor):
+    """Replaces the random part of the container name, as the preparers' processors do"""
+
+    def process_request(self, request):
+        request.uri = request.uri.replace('container-1234', 'container-fake')
+        return request
+
+
+class TestReplayServer(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.cassette = os.path.join(self.directory, 'recording.yaml')
+        with open(self.cassette, 'w') as f:
+            f.write(CASSETTE)
+
+    def _serve(self, **kwargs):
+        server = ReplayServer([self.cassette], processors=[_ContainerNameReplacer()], **kwargs)
+        server.start()
+        self.addCleanup(server.stop)
+        return server
+
+    def _send(self, server, method, path, body=None, headers=None):
+        connection = http_client.HTTPConnection(*server._server.server_address[:2])  # pylint: disable=protected-access
+        try:
+            connection.request(method, path, body, headers or {})
+            response = connection.getresponse()
+            return response.status, dict(response.getheaders()), response.read()
+        finally:
+            connection.close()
+
+    def test_load_interactions(self):
+        interactions = load_interactions(self.cassette)
+
+        self.assertEqual(len(interactions), 6)
+        request, response = interactions[0]
+        self.assertEqual(request.method, 'GET')
+        self.assertEqual(response['body']['string'], b'metadata')
+
+    def test_match_by_method_path_and_query(self):
+        server = self._serve()
+
+        status, headers, body = self._send(server, 'GET', '/container-fake/blob?comp=metadata')
+        self.assertEqual((status, body), (200, b'metadata'))
+        self.assertEqual(headers['x-ms-meta-name'], 'value')
+        # the recorded length isn't repeated, the server sets its own
+        self.assertEqual(headers['Content-Length'], '8')
+
+        # the processors normalize received requests too
+        status, _, body = self._send(server, 'GET', '/container-1234/blob?comp=metadata')
+        self.assertEqual((status, body), (200, b'metadata'))
+
+        # query parameter values are matched case insensitively, their names and number exactly
+        self.assertEqual(self._send(server, 'GET', '/container-fake/blob?comp=METADATA')[2], b'metadata')
+        self.assertEqual(self._send(server, 'GET', '/container-fake/blob?comp=metadata&timeout=5')[0], 404)
+
+        status, headers, _ = self._send(server, 'PUT', '/container-fake/blob', body=b'uploaded')
+        self.assertEqual(status, 201)
+        self.assertEqual(headers['ETag'], '"0x1"')
+        self.assertEqual(self._send(server, 'DELETE', '/container-fake/blob')[0], 404)
+
+    def test_recordings_replayed_in_order_then_last_repeated(self):
+        server = self._serve()
+
+        bodies = [self._send(server, 'GET', '/container-fake/blob')[2] for _ in range(3)]
+        self.assertEqual(bodies, [b'first', b'second', b'second'])
+
+        server.reset()
+        self.assertEqual(self._send(server, 'GET', '/container-fake/blob')[2], b'first')
+
+    def test_match_headers(self):
+        server = self._serve(match_headers=['X-MS-Range'])
+
+        # the range recorded second is served first, when it's the one asked for
+        status, _, body = self._send(server, 'GET', '/container-fake/ranged', headers={'x-ms-range': 'bytes=4-7'})
+        self.assertEqual((status, body), (206, b'tail'))
+        self.assertEqual(self._send(server, 'GET', '/container-fake/ranged', headers={'x-ms-range': 'bytes=0-3'})[2],
+                         b'head')
+        self.assertEqual(self._send(server, 'GET', '/container-fake/ranged', headers={'x-ms-range': 'bytes=8-9'})[0],
+                         404)
+        self.assertEqual(self._send(server, 'GET', '/container-fake/ranged')[0], 404)
+
+    def test_headers_ignored_unless_matched(self):
+        server = self._serve()
+
+        bodies = [self._send(server, 'GET', '/container-fake/ranged', headers={'x-ms-range': 'bytes=4-7'})[2]
+                  for _ in range(2)]
+        self.assertEqual(bodies, [b'head', b'tail'])
+
+    def test_unmatched_request_and_stats(self):
+        server = self._serve()
+
+        self._send(server, 'GET', '/container-fake/blob')
+        status, headers, body = self._send(server, 'GET', '/container-fake/missing?comp=list')
+
+        self.assertEqual(status, 404)
+        self.assertEqual(headers['x-ms-error-code'], 'RecordingNotFound')
+        self.assertEqual(body, b'No recording matches GET /container-fake/missing?comp=list')
+        self.assertEqual(server.stats.requests, 2)
+        self.assertEqual(server.stats.misses, 1)
+        self.assertEqual(server.stats.missed, ['GET /container-fake/missing?comp=list'])
+        self.assertEqual(server.stats.bytes_sent, len(b'first') + len(body))
+
+    def test_chunked_request_body(self):
+        server = self._serve()
+        connection = http_client.HTTPConnection(*server._server.server_address[:2])  # pylint: disable=protected-access
+        self.addCleanup(connection.close)
+
+        connection.putrequest('PUT', '/container-fake/blob')
+        connection.putheader('Transfer-Encoding', 'chunked')
+        connection.endheaders()
+        for chunk in (b'upl', b'oaded'):
+            connection.send('{:x}\r\n'.format(len(chunk)).encode('ascii') + chunk + b'\r\n')
+        connection.send(b'0\r\n\r\n')
+        response = connection.getresponse()
+        response.read()
+        self.assertEqual(response.status, 201)
+
+        # the whole body was read, so the connection can be reused
+        connection.request('GET', '/container-fake/blob')
+        response = connection.getresponse()
+        self.assertEqual((response.status, response.read()), (200, b'first'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,253 @@
+"""Benchmark SDK clients against recordings served over real sockets by a ReplayServer.
+
+Each scenario points a client at a local replay of one of the package's test recordings, and runs
+one operation in a loop from parallel threads, so the transport, connection pool and pipeline are
+measured without a live service.
+
+    python -m devtools_testutils.replay_benchmark blob-download keyvault-get-secret --parallel 8 --duration 10
+"""
+import argparse
+import base64
+import datetime
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+from azure_devtools.scenario_tests import ReplayServer
+
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+
+# A syntactically valid storage account key, never checked by the replay server
+FAKE_KEY = base64.b64encode(b'replay-benchmark').decode('ascii')
+
+
+class FakeCredential(object):
+    """A token credential for clients whose requests are answered by a replay."""
+
+    def get_token(self, *scopes, **kwargs):  # pylint: disable=unused-argument
+        from azure.core.credentials import AccessToken
+        return AccessToken('fake-token', int(time.time()) + 3600)
+
+
+class ReplayScenario(object):  # pylint: disable=too-few-public-methods
+    """An operation of a client to benchmark against a recording.
+
+    :param str name: The name of the scenario on the command line.
+    :param str cassette: The path of the recording, relative to the root of the repository.
+    :param create_client: A callable taking the URL of the replay server and a transport, returning a client.
+    :param operation: A callable taking the client, running the operation once.
+    :param match_headers: Request headers the replay server must match, in addition to the URL.
+    """
+
+    def __init__(self, name, cassette, create_client, operation, match_headers=None):  # pylint: disable=too-many-arguments
+        self.name = name
+        self.cassette = os.path.join(REPO_ROOT, *cassette.split('/'))
+        self.create_client = create_client
+        self.operation = operation
+        self.match_headers = match_headers
+
+
+def _blob_client(url, transport):
+    from azure.storage.blob import BlobClient
+    return BlobClient(
+        url, 'utcontainerf6091415', 'blobf6091415',
+        credential={'account_name': 'blobstoragename', 'account_key': FAKE_KEY},
+        transport=transport)
+
+
+def _secret_client(url, transport):
+    from azure.keyvault.secrets import SecretClient
+    return SecretClient(url, FakeCredential(), transport=transport)
+
+
+def _configuration_client(url, transport):
+    from azure.appconfiguration import AzureAppConfigurationClient
+    return AzureAppConfigurationClient.from_connection_string(
+        'Endpoint={};Id=replay-benchmark;Secret={}'.format(url, FAKE_KEY),
+        transport=transport)
+
+
+SCENARIOS = dict((s.name, s) for s in [
+    ReplayScenario(
+        'blob-download',
+        'sdk/storage/azure-storage-blob/tests/recordings/test_common_blob.test_get_blob_with_existing_blob.yaml',
+        _blob_client,
+        lambda client: client.download_blob().readall(),
+        match_headers=['x-ms-range']),
+    ReplayScenario(
+        'blob-upload',
+        'sdk/storage/azure-storage-blob/tests/recordings/test_common_blob.test_get_blob_with_existing_blob.yaml',
+        _blob_client,
+        lambda client: client.upload_blob(b'a' * 1024, overwrite=True)),
+    ReplayScenario(
+        'keyvault-get-secret',
+        'sdk/keyvault/azure-keyvault-secrets/tests/recordings/test_secrets_client.test_secret_crud_operations.yaml',
+        _secret_client,
+        lambda client: client.get_secret('crud-secret')),
+    ReplayScenario(
+        'appconfig-get-setting',
+        'sdk/appconfiguration/azure-appconfiguration/tests/recordings/'
+        'test_azure_configuration_client.test_get_configuration_setting_label.yaml',
+        _configuration_client,
+        lambda client: client.get_configuration_setting(
+            'PYTHON_UNIT_test_key_a6af8952-54a6-11e9-b600-2816a84d0309',
+            label='test_label1_1d7b2b28-549e-11e9-b51c-2816a84d0309')),
+])
+
+
+def create_certificate(directory):
+    """Write a self-signed certificate for 127.0.0.1 and localhost, returning the paths of it and its key."""
+    from cryptography import x509
+    from cryptography.hazmat.backends import default_backend
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+    from cryptography.x509.oid import NameOID
+    import ipaddress
+
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048, backend=default_backend())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, u'localhost')])
+    now = datetime.datetime.utcnow()
+    certificate = x509.CertificateBuilder().subject_name(name).issuer_name(name).public_key(
+        key.public_key()).serial_number(x509.random_serial_number()).not_valid_before(
+            now - datetime.timedelta(days=1)).not_valid_after(now + datetime.timedelta(days=1)).add_extension(
+                x509.SubjectAlternativeName([
+                    x509.DNSName(u'localhost'), x509.IPAddress(ipaddress.ip_address(u'127.0.0.1'))]),
+                critical=False).sign(key, hashes.SHA256(), default_backend())
+    certfile = os.path.join(directory, 'replay.pem')
+    keyfile = os.path.join(directory, 'replay.key')
+    with open(certfile, 'wb') as f:
+        f.write(certificate.public_bytes(serialization.Encoding.PEM))
+    with open(keyfile, 'wb') as f:
+        f.write(key.private_bytes(
+            serialization.Encoding.PEM, serialization.PrivateFormat.TraditionalOpenSSL, serialization.NoEncryption()))
+    return certfile, keyfile
+
+
+def _percentile(ordered, percent):
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100.0))]
+
+
+def run_scenario(scenario, parallel=1, duration=10, warmup=2, certfile=None, keyfile=None,  # pylint: disable=too-many-arguments,too-many-locals
+                 latency=0, bandwidth=None):
+    """Run an operation from `parallel` threads against a replay, and measure it.
+
+    The operation runs for `warmup` seconds before the measurement starts, so connections are
+    already open and pooled. All threads share one client, as applications do.
+
+    :returns: The results as a dict: operations per second, latency percentiles in milliseconds,
+     errors, and the counters of the replay server and connection pool.
+    """
+    from azure.core.pipeline.transport import RequestsTransport
+
+    with ReplayServer([scenario.cassette], match_headers=scenario.match_headers, latency=latency,
+                      bandwidth=bandwidth, certfile=certfile, keyfile=keyfile) as server:
+        transport = RequestsTransport(connection_verify=False, pool_maxsize=max(parallel, 10))
+        client = scenario.create_client(server.url, transport)
+        latencies = [[] for _ in range(parallel)]
+        errors = [0] * parallel
+        measure_from = time.time() + warmup
+        stop_at = measure_from + duration
+
+        def worker(index):
+            while True:
+                start = time.time()
+                if start >= stop_at:
+                    return
+                try:
+                    scenario.operation(client)
+                except Exception:  # pylint: disable=broad-except
+                    if start >= measure_from:
+                        errors[index] += 1
+                    continue
+                if start >= measure_from:
+                    latencies[index].append(time.time() - start)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(parallel)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        ordered = sorted(l * 1000 for thread_latencies in latencies for l in thread_latencies)
+        results = {
+            'scenario': scenario.name,
+            'parallel': parallel,
+            'duration': duration,
+            'operations': len(ordered),
+            'operations_per_second': len(ordered) / float(duration),
+            'errors': sum(errors),
+            'latency_ms': dict(('p{}'.format(p), _percentile(ordered, p)) for p in (50, 90, 99)),
+            'replay': {
+                'requests': server.stats.requests,
+                'misses': server.stats.misses,
+                'missed': server.stats.missed,
+                'bytes_sent': server.stats.bytes_sent,
+            },
+        }
+        stats = getattr(transport, 'connection_stats', None)
+        if stats is not None:
+            results['connections'] = {'opened': stats.opened, 'reused': stats.reused, 'discarded': stats.discarded}
+        transport.close()
+    return results
+
+
+def _print_results(results):
+    latency = results['latency_ms']
+    print('{scenario}: {operations_per_second:.1f} ops/s over {duration}s with {parallel} threads, '
+          '{errors} errors'.format(**results))
+    print('  latency p50 {p50:.2f} ms, p90 {p90:.2f} ms, p99 {p99:.2f} ms'.format(**latency))
+    print('  replay: {requests} requests, {misses} unmatched'.format(**results['replay']))
+    for missed in results['replay']['missed']:
+        print('    no recording for {}'.format(missed))
+    if 'connections' in results:
+        print('  connections: {opened} opened, {reused} reused, {discarded} discarded'.format(
+            **results['connections']))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark SDK clients against a local replay of test recordings.')
+    parser.add_argument('scenarios', nargs='*', metavar='scenario',
+                        help='Scenarios to run, from: {}. All by default.'.format(', '.join(sorted(SCENARIOS))))
+    parser.add_argument('--parallel', type=int, default=1, help='Threads running the operation. Default 1.')
+    parser.add_argument('--duration', type=float, default=10, help='Seconds to measure for. Default 10.')
+    parser.add_argument('--warmup', type=float, default=2, help='Seconds to run before measuring. Default 2.')
+    parser.add_argument('--latency', type=float, default=0, help='Milliseconds the server waits before each response.')
+    parser.add_argument('--bandwidth', type=int, help='Bytes per second the server sends each response body at.')
+    parser.add_argument('--http', action='store_true', help='Serve HTTP instead of HTTPS with a self-signed certificate. '
+                        'The App Configuration client only supports HTTPS.')
+    parser.add_argument('--json', dest='json_path', help='Also write the results to this JSON file.')
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error('unknown scenarios: {}'.format(', '.join(unknown)))
+    # The self-signed certificate of the replay server is not verified
+    import urllib3
+    urllib3.disable_warnings()
+
+    directory = tempfile.mkdtemp()
+    try:
+        certfile, keyfile = (None, None) if args.http else create_certificate(directory)
+        all_results = []
+        for name in args.scenarios or sorted(SCENARIOS):
+            results = run_scenario(
+                SCENARIOS[name], parallel=args.parallel, duration=args.duration, warmup=args.warmup,
+                certfile=certfile, keyfile=keyfile, latency=args.latency / 1000.0, bandwidth=args.bandwidth)
+            _print_results(results)
+            all_results.append(results)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump(all_results, f, indent=2)
+    return 1 if any(r['errors'] or r['replay']['misses'] for r in all_results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -36,6 +36,7 @@ setup(
     entry_points = {
         'console_scripts': [
             'generate_package=packaging_tools.generate_package:generate_main',
+            'replay_benchmark=devtools_testutils.replay_benchmark:main',
         ],
     },
     extras_require={